@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
 import os
 import queue
 import sys
@@ -143,6 +144,25 @@ def main() -> None:  # noqa: C901, CCR001
         parser.add_argument('-n', action='store_true', help='send data to EDDN')
         parser.add_argument('-p', metavar='CMDR', help='Returns data from the specified player account')
         parser.add_argument('-j', help=argparse.SUPPRESS)  # Import JSON dump
+        parser.add_argument('--inara-queue', action='store_true', help='print the events waiting to be sent to Inara')
+        parser.add_argument(
+            '--journal-index',
+            action='store_true',
+            help='create, or bring up to date, the index of all Journal events. Once created the GUI keeps it updated'
+        )
+        parser.add_argument('--journal-search', metavar='TEXT', help='print indexed Journal events mentioning TEXT')
+        parser.add_argument('--journal-event', metavar='EVENT', help='print indexed Journal events of type EVENT')
+        parser.add_argument(
+            '--journal-limit', metavar='N', type=int, default=20,
+            help='print at most N, newest first, of the indexed Journal events found. Default 20'
+        )
+        parser.add_argument(
+            '--journal-reprocess', metavar='DIR', nargs='?', const='',
+            help='parse every Journal file in DIR, default the Journal directory, and print throughput and event counts'
+        )
+        parser.add_argument(
+            '--jobs', metavar='N', type=int, help='number of processes for --journal-reprocess. Default one per core'
+        )
         args = parser.parse_args()
 
         if args.version:
@@ -190,6 +210,47 @@ def main() -> None:  # noqa: C901, CCR001
                 logger.info(f'marked {d} for TRACE')
 
         log_locale('Initial Locale')
+        if args.inara_queue:
+            import inara
+            inara.print_queue_summary()
+            return
+
+        if args.journal_index or args.journal_search or args.journal_event:
+            import journal_index
+            index = journal_index.JournalIndex(journal_index.db_path())
+            try:
+                if args.journal_index:
+                    added = index.index_dir(config.get_str('journaldir') or config.default_journal_dir)
+                    print(f'Indexed {added} new events, {index.count()} in total')
+
+                if args.journal_search or args.journal_event:
+                    for entry in index.events(
+                        event=args.journal_event, text=args.journal_search, limit=args.journal_limit
+                    ):
+                        print(json.dumps(entry, ensure_ascii=False))
+
+            finally:
+                index.close()
+
+            return
+
+        if args.journal_reprocess is not None:
+            import journal_index
+            import journal_reprocess
+            journal_dir = args.journal_reprocess or config.get_str('journaldir') or config.default_journal_dir
+            reprocess_stats = journal_reprocess.ReprocessStats()
+            for result in journal_reprocess.reprocess(
+                journal_index.journal_files(journal_dir), jobs=args.jobs, stats=reprocess_stats
+            ):
+                if result.error:
+                    print(f'{result.path.name}: {result.error}', file=sys.stderr)
+
+            print(reprocess_stats)
+            for event, count in reprocess_stats.events.most_common():
+                print(f'{count:>10} {event}')
+
+            return
+
         if args.refresh_all:
             # Attempt to refresh all known CMDRs. This MAY cause additional output if a token is invalid.
             logger.debug("Refreshing all known CMDRs")
@@ -234,12 +295,7 @@ def main() -> None:  # noqa: C901, CCR001
 
                 logger.debug(f'Using logfile "{logfile}"')
                 with open(logfile, 'rb', 0) as loghandle:
-                    for line in loghandle:
-                        try:
-                            monitor.parse_entry(line)
-
-                        except Exception:
-                            logger.debug(f'Invalid journal entry {line!r}')
+                    monitor.catch_up(loghandle)
 
             except Exception:
                 logger.exception("Can't read Journal file")
@@ -458,6 +514,8 @@ def main() -> None:  # noqa: C901, CCR001
                 eddn_sender.export_commodities(data, monitor.is_beta)
                 eddn_sender.export_outfitting(data, monitor.is_beta)
                 eddn_sender.export_shipyard(data, monitor.is_beta)
+                # Waits for the EDDN worker to finish sending
+                eddn_sender.close()
 
             except Exception:
                 logger.exception('Failed to send data to EDDN')
@@ -495,6 +553,7 @@ def main() -> None:  # noqa: C901, CCR001
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # For --journal-reprocess in the frozen build
     try:
         check_for_fdev_updates(silent=True)
         main()
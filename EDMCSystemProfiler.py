@@ -36,6 +36,7 @@ from tkinter import ttk
 from tkinter import messagebox
 from monitor import monitor
 from EDMCLogging import get_main_logger
+import plug
 
 
 def get_sys_report(active_config: config.AbstractConfig) -> str:
@@ -98,6 +99,12 @@ def get_sys_report(active_config: config.AbstractConfig) -> str:
     report += f"- Game Build: {monitor.state['GameBuild']}\n"
     report += f"- Using Odyssey: {monitor.state['Odyssey']}\n"
     report += f"- Journal Dir Lockable: {lockable}\n"
+
+    hook_stats = plug.load_hook_stats()
+    if hook_stats:
+        report += "\nSlowest Plugin Hooks (--plugin-stats for all):\n"
+        report += plug.hook_stats_report(hook_stats, limit=5) + "\n"
+
     return report
 
 
@@ -190,6 +197,11 @@ if __name__ == "__main__":
         help="write the system information to the console",
         action="store_true",
     )
+    parser.add_argument(
+        "--plugin-stats",
+        help="write the timing of plugin hooks, from when EDMC last saved it, to the console",
+        action="store_true",
+    )
     args = parser.parse_args()
 
     # Suppress Logger
@@ -199,6 +211,11 @@ if __name__ == "__main__":
         sys.stderr._error = "inhibit log creation"  # type: ignore
 
     cur_config = config.get_config()
+    if args.plugin_stats:
+        hook_stats = plug.load_hook_stats()
+        print(plug.hook_stats_report(hook_stats) if hook_stats else "No plugin hook timing has been saved")
+        sys.exit(0)
+
     if args.out_console:
         sys_report = get_sys_report(cur_config)
         print(sys_report)
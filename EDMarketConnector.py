@@ -21,7 +21,7 @@ import sys
 import threading
 import webbrowser
 from os import chdir, environ
-from time import localtime, strftime, time
+from time import localtime, perf_counter, strftime, time
 from typing import TYPE_CHECKING, Any, Literal
 from constants import applongname, appname, protocolhandler_redirect
 
@@ -422,10 +422,54 @@ from theme import theme
 from ttkHyperlinkLabel import HyperlinkLabel, SHIPYARD_HTML_TEMPLATE
 
 
+class JournalSliceStats:
+    """Metrics of AppWindow.journal_event() processing the Journal event queue in time slices."""
+
+    def __init__(self) -> None:
+        self.slices = 0
+        self.yielded = 0  # Slices that ran out of time with events still queued
+        self.events = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.queue_depth = 0  # At the start of the last slice
+        self.max_queue_depth = 0
+
+    def record(self, queue_depth: int, events: int, seconds: float, yielded: bool) -> None:
+        """
+        Record a slice.
+
+        :param queue_depth: Events queued at its start.
+        :param events: Events it processed.
+        :param seconds: How long it took.
+        :param yielded: Whether it ran out of time.
+        """
+        self.slices += 1
+        self.yielded += yielded
+        self.events += events
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.queue_depth = queue_depth
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+        logger.trace_if(
+            'journal.slice',
+            f'{events} of {queue_depth} queued events in {seconds * 1000:.1f} ms{", yielding" if yielded else ""}'
+        )
+
+    def __str__(self) -> str:
+        """Summarise the metrics."""
+        return (
+            f'{self.events} events in {self.slices} slices ({self.yielded} yielded),'
+            f' mean {1000 * self.seconds / max(self.slices, 1):.1f} ms, max {1000 * self.max_seconds:.1f} ms,'
+            f' max queue depth {self.max_queue_depth}'
+        )
+
+
 class AppWindow:
     """Define the main application window."""
 
     _CAPI_RESPONSE_TK_EVENT_NAME = '<<CAPIResponse>>'
+    # Longest journal_event() processes queued events for before letting Tk catch up
+    _JOURNAL_SLICE_SECONDS = 0.05
     # Tkinter Event types
     EVENT_KEYPRESS = 2
     EVENT_BUTTON = 4
@@ -442,6 +486,8 @@ class AppWindow:
         self.w = master
         self.w.title(applongname)
         self.minimizing = False
+        self.journal_slice_stats = JournalSliceStats()
+        self.journal_slice_pending: str | None = None  # after_idle() id of the next slice, if any
         self.w.rowconfigure(0, weight=1)
         self.w.columnconfigure(0, weight=1)
 
@@ -734,6 +780,7 @@ class AppWindow:
         self.w.bind_all('<<Invoke>>', self.capi_request_data)  # Ask for CAPI queries to be performed
         self.w.bind_all(self._CAPI_RESPONSE_TK_EVENT_NAME, self.capi_handle_response)
         self.w.bind_all('<<JournalEvent>>', self.journal_event)  # type: ignore # Journal monitoring
+        self.w.bind_all('<<CompanionFileEvent>>', monitor.companion_file_event)  # Late NavRoute.json/FCMaterials.json
         self.w.bind_all('<<DashboardEvent>>', self.dashboard_event)  # Dashboard monitoring
         self.w.bind_all('<<PluginError>>', self.plugin_error)  # Statusbar
         self.w.bind_all('<<CompanionAuthEvent>>', self.auth)  # cAPI auth
@@ -1385,11 +1432,15 @@ class AppWindow:
         self.cooldown()
         logger.trace_if('capi.worker', '...done')
 
-    def journal_event(self, event: str):  # noqa: C901, CCR001 # Currently not easily broken up.
+    def journal_event(self, event: str | None):  # noqa: C901, CCR001 # Currently not easily broken up.
         """
         Handle a Journal event passed through event queue from monitor.py.
 
-        :param event: string JSON data of the event
+        Queued events are processed for at most _JOURNAL_SLICE_SECONDS, then
+        the rest are left to a further call scheduled with after_idle(), so
+        that a burst of them doesn't stop the UI responding.
+
+        :param event: string JSON data of the event, None if a further slice.
         :return:
         """
 
@@ -1407,184 +1458,206 @@ class AppWindow:
                 'FlightCon':  tr.tl('Helm'),  # LANG: Multicrew role
             }.get(role, role)
 
+        if event is None:
+            self.journal_slice_pending = None
+
+        elif self.journal_slice_pending is not None:
+            # The already scheduled slice will get to this event
+            return
+
         if monitor.thread is None:
             logger.debug('monitor.thread is None, assuming shutdown and returning')
             return
 
-        while not monitor.event_queue.empty():
-            entry = monitor.get_entry()
-            if not entry:
-                # This is expected due to some monitor.py code that appends `None`
-                logger.trace_if('journal.queue', 'No entry from monitor.get_entry()')
-                return
-
-            # Update main window
-            self.cooldown()
-            if monitor.cmdr and monitor.state['Captain']:
-                if not config.get_bool('hide_multicrew_captain', default=False):
-                    self.cmdr['text'] = f'{monitor.cmdr} / {monitor.state["Captain"]}'
-
-                else:
-                    self.cmdr['text'] = f'{monitor.cmdr}'
-
-                self.ship_label['text'] = tr.tl('Role') + ':'  # LANG: Multicrew role label in main window
-                self.ship.configure(state=tk.NORMAL, text=crewroletext(monitor.state['Role']), url=None)
-
-            elif monitor.cmdr:
-                if monitor.group and not config.get_bool("hide_private_group", default=False):
-                    self.cmdr['text'] = f'{monitor.cmdr} / {monitor.group}'
+        queue_depth = monitor.event_queue.qsize()
+        start = perf_counter()
+        events = 0
+        try:
+            while not monitor.event_queue.empty():
+                if perf_counter() - start >= self._JOURNAL_SLICE_SECONDS:
+                    # Let Tk catch up, then carry on with the rest
+                    self.journal_slice_pending = self.w.after_idle(self.journal_event, None)
+                    break
+
+                events += 1
+                entry = monitor.get_entry()
+                if not entry:
+                    # This is expected due to some monitor.py code that appends `None`
+                    logger.trace_if('journal.queue', 'No entry from monitor.get_entry()')
+                    return
 
-                else:
-                    self.cmdr['text'] = monitor.cmdr
+                # Update main window
+                self.cooldown()
+                if monitor.cmdr and monitor.state['Captain']:
+                    if not config.get_bool('hide_multicrew_captain', default=False):
+                        self.cmdr['text'] = f'{monitor.cmdr} / {monitor.state["Captain"]}'
 
-                self.ship_label['text'] = tr.tl('Ship') + ':'  # LANG: 'Ship' label in main UI
+                    else:
+                        self.cmdr['text'] = f'{monitor.cmdr}'
 
-                # TODO: Show something else when on_foot
-                if monitor.state['ShipName']:
-                    ship_text = monitor.state['ShipName']
+                    self.ship_label['text'] = tr.tl('Role') + ':'  # LANG: Multicrew role label in main window
+                    self.ship.configure(state=tk.NORMAL, text=crewroletext(monitor.state['Role']), url=None)
 
-                else:
-                    ship_text = ship_name_map.get(monitor.state['ShipType'], monitor.state['ShipType'])
+                elif monitor.cmdr:
+                    if monitor.group and not config.get_bool("hide_private_group", default=False):
+                        self.cmdr['text'] = f'{monitor.cmdr} / {monitor.group}'
 
-                if not ship_text:
-                    ship_text = ''
+                    else:
+                        self.cmdr['text'] = monitor.cmdr
 
-                # Ensure the ship type/name text is clickable, if it should be.
-                if monitor.state['Modules']:
-                    ship_state: Literal['normal', 'disabled'] = tk.NORMAL
+                    self.ship_label['text'] = tr.tl('Ship') + ':'  # LANG: 'Ship' label in main UI
 
-                else:
-                    ship_state = tk.DISABLED
+                    # TODO: Show something else when on_foot
+                    if monitor.state['ShipName']:
+                        ship_text = monitor.state['ShipName']
 
-                self.ship.configure(text=ship_text, url=self.shipyard_url, state=ship_state)
+                    else:
+                        ship_text = ship_name_map.get(monitor.state['ShipType'], monitor.state['ShipType'])
 
-            else:
-                self.cmdr['text'] = ''
-                self.ship_label['text'] = tr.tl('Ship') + ':'  # LANG: 'Ship' label in main UI
-                self.ship['text'] = ''
-
-            if monitor.cmdr and monitor.is_beta:
-                self.cmdr['text'] += ' (beta)'
-
-            self.update_suit_text()
-            self.suit_show_if_set()
-
-            self.edit_menu.entryconfigure(0, state=monitor.state['SystemName'] and tk.NORMAL or tk.DISABLED)  # Copy
-
-            if entry['event'] in (
-                    'Undocked',
-                    'StartJump',
-                    'SetUserShipName',
-                    'ShipyardBuy',
-                    'ShipyardSell',
-                    'ShipyardSwap',
-                    'ModuleBuy',
-                    'ModuleSell',
-                    'MaterialCollected',
-                    'MaterialDiscarded',
-                    'ScientificResearch',
-                    'EngineerCraft',
-                    'Synthesis',
-                    'JoinACrew'):
-                self.status['text'] = ''  # Periodically clear any old error
+                    if not ship_text:
+                        ship_text = ''
 
-            self.w.update_idletasks()
+                    # Ensure the ship type/name text is clickable, if it should be.
+                    if monitor.state['Modules']:
+                        ship_state: Literal['normal', 'disabled'] = tk.NORMAL
 
-            # Companion login
-            if entry['event'] in (None, 'StartUp', 'NewCommander', 'LoadGame') and monitor.cmdr:
-                if not config.get_list('cmdrs') or monitor.cmdr not in config.get_list('cmdrs'):
-                    config.set('cmdrs', config.get_list('cmdrs', default=[]) + [monitor.cmdr])
-                self.login()
+                    else:
+                        ship_state = tk.DISABLED
 
-            if monitor.cmdr and monitor.mode == 'CQC' and entry['event']:
-                err = plug.notify_journal_entry_cqc(monitor.cmdr, monitor.is_beta, entry, monitor.state)
-                if err:
-                    self.status['text'] = err
-                    if not config.get_int('hotkey_mute'):
-                        hotkeymgr.play_bad()
+                    self.ship.configure(text=ship_text, url=self.shipyard_url, state=ship_state)
 
-                return  # in CQC
+                else:
+                    self.cmdr['text'] = ''
+                    self.ship_label['text'] = tr.tl('Ship') + ':'  # LANG: 'Ship' label in main UI
+                    self.ship['text'] = ''
 
-            if not entry['event'] or not monitor.mode:
-                logger.trace_if('journal.queue', 'Startup, returning')
-                return  # Startup
+                if monitor.cmdr and monitor.is_beta:
+                    self.cmdr['text'] += ' (beta)'
 
-            if entry['event'] in ('StartUp', 'LoadGame') and monitor.started:
-                logger.info('StartUp or LoadGame event')
+                self.update_suit_text()
+                self.suit_show_if_set()
 
-                # Disable WinSparkle automatic update checks, IFF configured to do so when in-game
-                if config.get_int('disable_autoappupdatecheckingame'):
-                    if self.updater is not None:
-                        self.updater.set_automatic_updates_check(False)
-
-                    logger.info('Monitor: Disable WinSparkle automatic update checks')
-
-                # Can't start dashboard monitoring
-                if not dashboard.start(self.w, monitor.started):
-                    logger.info("Can't start Status monitoring")
-
-            # Export loadout
-            if entry['event'] == 'Loadout' and not monitor.state['Captain'] \
-                    and config.get_int('output') & config.OUT_SHIP:
-                monitor.export_ship()
-
-            if monitor.cmdr:
-                err = plug.notify_journal_entry(
-                    monitor.cmdr,
-                    monitor.is_beta,
-                    monitor.state['SystemName'],
-                    monitor.state['StationName'],
-                    entry,
-                    monitor.state
-                )
+                self.edit_menu.entryconfigure(0, state=monitor.state['SystemName'] and tk.NORMAL or tk.DISABLED)  # Copy
+
+                if entry['event'] in (
+                        'Undocked',
+                        'StartJump',
+                        'SetUserShipName',
+                        'ShipyardBuy',
+                        'ShipyardSell',
+                        'ShipyardSwap',
+                        'ModuleBuy',
+                        'ModuleSell',
+                        'MaterialCollected',
+                        'MaterialDiscarded',
+                        'ScientificResearch',
+                        'EngineerCraft',
+                        'Synthesis',
+                        'JoinACrew'):
+                    self.status['text'] = ''  # Periodically clear any old error
+
+                self.w.update_idletasks()
+
+                # Companion login
+                if entry['event'] in (None, 'StartUp', 'NewCommander', 'LoadGame') and monitor.cmdr:
+                    if not config.get_list('cmdrs') or monitor.cmdr not in config.get_list('cmdrs'):
+                        config.set('cmdrs', config.get_list('cmdrs', default=[]) + [monitor.cmdr])
+                    self.login()
+
+                if monitor.cmdr and monitor.mode == 'CQC' and entry['event']:
+                    err = plug.notify_journal_entry_cqc(monitor.cmdr, monitor.is_beta, entry, monitor.state)
+                    if err:
+                        self.status['text'] = err
+                        if not config.get_int('hotkey_mute'):
+                            hotkeymgr.play_bad()
+
+                    return  # in CQC
+
+                if not entry['event'] or not monitor.mode:
+                    logger.trace_if('journal.queue', 'Startup, returning')
+                    return  # Startup
+
+                if entry['event'] in ('StartUp', 'LoadGame') and monitor.started:
+                    logger.info('StartUp or LoadGame event')
+
+                    # Disable WinSparkle automatic update checks, IFF configured to do so when in-game
+                    if config.get_int('disable_autoappupdatecheckingame'):
+                        if self.updater is not None:
+                            self.updater.set_automatic_updates_check(False)
+
+                        logger.info('Monitor: Disable WinSparkle automatic update checks')
+
+                    # Can't start dashboard monitoring
+                    if not dashboard.start(self.w, monitor.started):
+                        logger.info("Can't start Status monitoring")
+
+                # Export loadout
+                if entry['event'] == 'Loadout' and not monitor.state['Captain'] \
+                        and config.get_int('output') & config.OUT_SHIP:
+                    monitor.export_ship()
+
+                if monitor.cmdr:
+                    err = plug.notify_journal_entry(
+                        monitor.cmdr,
+                        monitor.is_beta,
+                        monitor.state['SystemName'],
+                        monitor.state['StationName'],
+                        entry,
+                        monitor.state
+                    )
 
-                if err:
-                    self.status['text'] = err
-                    if not config.get_int('hotkey_mute'):
-                        hotkeymgr.play_bad()
-
-            auto_update = False
-            # Only if auth callback is not pending
-            if companion.session.state != companion.Session.STATE_AUTH:
-                # Only if configured to do so
-                if (not config.get_int('output') & config.OUT_MKT_MANUAL
-                        and config.get_int('output') & config.OUT_STATION_ANY):
-                    if entry['event'] in ('StartUp', 'Location', 'Docked') and monitor.state['StationName']:
-                        # TODO: Can you log out in a docked Taxi and then back in to
-                        #       the taxi, so 'Location' should be covered here too ?
-                        if entry['event'] == 'Docked' and entry.get('Taxi'):
-                            # In Odyssey there's a 'Docked' event for an Apex taxi,
-                            # but the CAPI data isn't updated until you Disembark.
-                            auto_update = False
-
-                        else:
+                    if err:
+                        self.status['text'] = err
+                        if not config.get_int('hotkey_mute'):
+                            hotkeymgr.play_bad()
+
+                auto_update = False
+                # Only if auth callback is not pending
+                if companion.session.state != companion.Session.STATE_AUTH:
+                    # Only if configured to do so
+                    if (not config.get_int('output') & config.OUT_MKT_MANUAL
+                            and config.get_int('output') & config.OUT_STATION_ANY):
+                        if entry['event'] in ('StartUp', 'Location', 'Docked') and monitor.state['StationName']:
+                            # TODO: Can you log out in a docked Taxi and then back in to
+                            #       the taxi, so 'Location' should be covered here too ?
+                            if entry['event'] == 'Docked' and entry.get('Taxi'):
+                                # In Odyssey there's a 'Docked' event for an Apex taxi,
+                                # but the CAPI data isn't updated until you Disembark.
+                                auto_update = False
+
+                            else:
+                                auto_update = True
+
+                        # In Odyssey if you are in a Taxi the `Docked` event for it is before
+                        # the CAPI data is updated, but CAPI *is* updated after you `Disembark`.
+                        elif entry['event'] == 'Disembark' and entry.get('Taxi') and entry.get('OnStation'):
                             auto_update = True
 
-                    # In Odyssey if you are in a Taxi the `Docked` event for it is before
-                    # the CAPI data is updated, but CAPI *is* updated after you `Disembark`.
-                    elif entry['event'] == 'Disembark' and entry.get('Taxi') and entry.get('OnStation'):
-                        auto_update = True
+                should_return: bool
+                new_data: dict[str, Any]
 
-            should_return: bool
-            new_data: dict[str, Any]
+                if auto_update:
+                    should_return, new_data = killswitch.check_killswitch('capi.auth', {})
+                    if not should_return:
+                        self.w.after(int(SERVER_RETRY * 1000), self.capi_request_data)
 
-            if auto_update:
-                should_return, new_data = killswitch.check_killswitch('capi.auth', {})
-                if not should_return:
-                    self.w.after(int(SERVER_RETRY * 1000), self.capi_request_data)
+                if entry['event'] in ('CarrierBuy', 'CarrierStats') and config.get_bool('capi_fleetcarrier'):
+                    should_return, new_data = killswitch.check_killswitch('capi.request.fleetcarrier', {})
+                    if not should_return:
+                        self.w.after(int(SERVER_RETRY * 1000), self.capi_request_fleetcarrier_data)
 
-            if entry['event'] in ('CarrierBuy', 'CarrierStats') and config.get_bool('capi_fleetcarrier'):
-                should_return, new_data = killswitch.check_killswitch('capi.request.fleetcarrier', {})
-                if not should_return:
-                    self.w.after(int(SERVER_RETRY * 1000), self.capi_request_fleetcarrier_data)
+                if entry['event'] == 'ShutDown':
+                    # Enable WinSparkle automatic update checks
+                    # NB: Do this blindly, in case option got changed whilst in-game
+                    if self.updater is not None:
+                        self.updater.set_automatic_updates_check(True)
 
-            if entry['event'] == 'ShutDown':
-                # Enable WinSparkle automatic update checks
-                # NB: Do this blindly, in case option got changed whilst in-game
-                if self.updater is not None:
-                    self.updater.set_automatic_updates_check(True)
+                    logger.info('Monitor: Enable WinSparkle automatic update checks')
 
-                logger.info('Monitor: Enable WinSparkle automatic update checks')
+        finally:
+            self.journal_slice_stats.record(
+                queue_depth, events, perf_counter() - start, self.journal_slice_pending is not None
+            )
 
     def auth(self, event=None) -> None:
         """
@@ -1616,18 +1689,19 @@ class AppWindow:
 
         Event is sent by code in dashboard.py.
         """
-        if not dashboard.status:
+        # Currently we don't do anything with these events
+        if not monitor.cmdr:
             return
 
-        entry = dashboard.status
-        # Currently we don't do anything with these events
-        if monitor.cmdr:
-            err = plug.notify_dashboard_entry(monitor.cmdr, monitor.is_beta, entry)
+        entry, changed = dashboard.take_changes()
+        if not entry or not changed:
+            return  # Stopped, or plugins already have this status
 
-            if err:
-                self.status['text'] = err
-                if not config.get_int('hotkey_mute'):
-                    hotkeymgr.play_bad()
+        err = plug.notify_dashboard_entry(monitor.cmdr, monitor.is_beta, entry, changed)
+        if err:
+            self.status['text'] = err
+            if not config.get_int('hotkey_mute'):
+                hotkeymgr.play_bad()
 
     def plugin_error(self, event=None) -> None:
         """Display asynchronous error from plugin."""
@@ -1915,6 +1989,7 @@ class AppWindow:
 
         logger.info('Closing journal monitor...')
         monitor.close()
+        logger.info(f'Journal event processing: {self.journal_slice_stats}')
 
         # Frontier auth/CAPI handling
         logger.info('Closing protocol handler...')
@@ -7,16 +7,20 @@ See LICENSE file.
 """
 from __future__ import annotations
 
-import json
+import os
 import sys
+import threading
 import time
 import tkinter as tk
 from calendar import timegm
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Mapping, cast
 from watchdog.observers.api import BaseObserver
+import edmc_data
 from config import config
 from EDMCLogging import get_main_logger
+from util import json_codec
 
 logger = get_main_logger()
 
@@ -29,10 +33,98 @@ else:
         """Dummy class to represent a file system event handler on platforms other than Windows."""
 
 
+# Status.json Flags and Flags2 bits, by value, named as in edmc_data without the prefix, e.g. 'HardpointsDeployed'
+FLAG_NAMES = {
+    value: name[len('Flags'):] for name, value in vars(edmc_data).items()
+    if name.startswith('Flags') and not name.startswith('Flags2') and isinstance(value, int)
+}
+FLAG2_NAMES = {
+    value: name[len('Flags2'):] for name, value in vars(edmc_data).items()
+    if name.startswith('Flags2') and isinstance(value, int)
+}
+
+
+@lru_cache(maxsize=8)
+def parse_timestamp(timestamp: str) -> int:
+    """
+    Convert a Status.json timestamp to seconds since the epoch.
+
+    Status.json is rewritten several times a second in combat, so the usual
+    `YYYY-MM-DDTHH:MM:SSZ` form is sliced rather than going through strptime().
+
+    :param timestamp: The timestamp, e.g. '2024-01-01T12:34:56Z'.
+    :return: Seconds since the epoch.
+    """
+    if len(timestamp) == 20 and timestamp[4] == timestamp[7] == '-' and timestamp[10] == 'T' \
+            and timestamp[13] == timestamp[16] == ':' and timestamp[19] == 'Z':
+        try:
+            return timegm((
+                int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]), 0, 0, 0
+            ))
+
+        except ValueError:
+            pass
+
+    return timegm(time.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ'))
+
+
+def status_delta(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Determine which Status.json fields have changed.
+
+    :param old: The previous status.
+    :param new: The current status.
+    :return: The new value of each field that has changed, or None for those that have gone, e.g. `Fuel` on foot.
+    """
+    changed = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    changed.update((key, None) for key in old.keys() - new.keys())
+    return changed
+
+
+def flag_names(flags: int, names: Mapping[int, str]) -> frozenset[str]:
+    """
+    Name the bits that are set in Flags or Flags2.
+
+    :param flags: The bits.
+    :param names: FLAG_NAMES or FLAG2_NAMES.
+    :return: The names of the bits, other than any not yet known.
+    """
+    named = []
+    while flags:
+        bit = flags & -flags
+        if (name := names.get(bit)) is not None:
+            named.append(name)
+
+        flags ^= bit
+
+    return frozenset(named)
+
+
+def decode_flag_changes(old: Mapping[str, Any], changed: dict[str, Any]) -> None:
+    """
+    Add the names of the Flags and Flags2 bits that have changed to a status delta.
+
+    These are as e.g. `FlagsOn` and `FlagsOff`, frozensets of names from FLAG_NAMES.
+
+    :param old: The previous status.
+    :param changed: The delta from status_delta(), which is updated.
+    """
+    for key, names in (('Flags', FLAG_NAMES), ('Flags2', FLAG2_NAMES)):
+        if key in changed:
+            was = old.get(key) or 0
+            now = changed[key] or 0
+            changed[f'{key}On'] = flag_names(now & ~was, names)
+            changed[f'{key}Off'] = flag_names(was & ~now, names)
+
+
 class Dashboard(FileSystemEventHandler):
     """Status.json handler."""
 
     _POLL = 1  # Fallback polling interval
+    # As for monitor.JournalDirScan, an mtime this recent isn't trusted, as a rewrite of the same size within the
+    # file system's timestamp granularity wouldn't change it
+    MTIME_SETTLE_SECONDS = 2.0
 
     def __init__(self) -> None:
         FileSystemEventHandler.__init__(self)  # futureproofing - not need for current version of watchdog
@@ -42,6 +134,15 @@ class Dashboard(FileSystemEventHandler):
         self.observer: Observer | None = None  # type: ignore
         self.observed = None                   # a watchdog ObservedWatch, or None if polling
         self.status: dict[str, Any] = {}       # Current status for communicating status back to main thread
+        self.status_lock = threading.Lock()     # process() can be called from the watchdog thread
+        # (st_mtime_ns, st_size) of Status.json when last read, None if it's to be read regardless
+        self.status_stat: tuple[int, int] | None = None
+        self.notified: dict[str, Any] = {}     # Status as of the last take_changes()
+
+        # Metrics
+        self.checks = 0
+        self.reads = 0
+        self.events = 0
 
     def start(self, root: tk.Tk, started: int) -> bool:
         """
@@ -113,7 +214,11 @@ class Dashboard(FileSystemEventHandler):
             self.observer.unschedule_all()
             logger.debug('Done.')
 
-        self.status = {}
+        with self.status_lock:
+            self.status = {}
+            self.status_stat = None
+            self.notified = {}
+
         logger.debug('Done.')
 
     def close(self) -> None:
@@ -132,6 +237,7 @@ class Dashboard(FileSystemEventHandler):
             logger.debug('Done')
             self.observer = None  # type: ignore
 
+        logger.debug(f'Status.json: {self.stats()}')
         logger.debug('Done.')
 
     def poll(self, first_time: bool = False) -> None:
@@ -142,7 +248,8 @@ class Dashboard(FileSystemEventHandler):
         """
         if not self.currentdir:
             # Stopped
-            self.status = {}
+            with self.status_lock:
+                self.status = {}
 
         else:
             self.process()
@@ -174,23 +281,77 @@ class Dashboard(FileSystemEventHandler):
         Process the contents of current Status.json file.
 
         Can be called either in watchdog thread or, if polling, in main thread.
+
+        The file is only read if its mtime or size has changed since it was
+        last read successfully, or it was then within `MTIME_SETTLE_SECONDS`
+        of being written, and `<<DashboardEvent>>` only generated if the status
+        it contains has changed.
         """
         if config.shutting_down:
             return
         try:
             status_json_path = Path(self.currentdir) / 'Status.json'
-            with open(status_json_path, 'rb') as h:
-                data = h.read().strip()
-                if data:  # Can be empty if polling while the file is being re-written
-                    entry = json.loads(data)
-                    # Status file is shared between beta and live. Filter out status not in this game session.
-                    entry_timestamp = timegm(time.strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ'))
-                    if entry_timestamp >= self.session_start and self.status != entry:
-                        self.status = entry
-                        self.root.event_generate('<<DashboardEvent>>', when="tail")
+            with self.status_lock:
+                self.checks += 1
+                st = os.stat(status_json_path)
+                if (st.st_mtime_ns, st.st_size) == self.status_stat:
+                    return
+
+                with open(status_json_path, 'rb') as h:
+                    data = h.read().strip()
+
+                self.reads += 1
+                if not data:  # Can be empty if polling while the file is being re-written
+                    return
+
+                entry = json_codec.loads(data)
+                # Only now that it's been read whole, and once it's too old for a rewrite to leave it unchanged
+                settled = time.time() - st.st_mtime_ns / 1e9 > self.MTIME_SETTLE_SECONDS
+                self.status_stat = (st.st_mtime_ns, st.st_size) if settled else None
+                # Status file is shared between beta and live. Filter out status not in this game session.
+                if parse_timestamp(entry['timestamp']) < self.session_start or self.status == entry:
+                    return
+
+                self.status = entry
+                self.events += 1
+
+            self.root.event_generate('<<DashboardEvent>>', when="tail")
         except Exception:
             logger.exception('Processing Status.json')
 
+    def take_changes(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Get the current status, and what has changed since the last call.
+
+        Several `<<DashboardEvent>>`s can be handled after the status has
+        changed more than once, so the delta is against what the last call
+        returned, rather than the previous contents of Status.json.
+
+        :return: The status, and the new value of each changed field, None for those that have gone.  If
+          `Flags` or `Flags2` have changed the names of the bits that have been set and cleared are added as
+          `FlagsOn` and `FlagsOff` or `Flags2On` and `Flags2Off`.
+        """
+        with self.status_lock:
+            status = self.status
+            changed = status_delta(self.notified, status)
+            decode_flag_changes(self.notified, changed)
+            self.notified = status
+
+        return status, changed
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report how much work reading Status.json has taken.
+
+        :return: dict of metrics.
+        """
+        with self.status_lock:
+            return {
+                'checks': self.checks,
+                'reads': self.reads,
+                'events': self.events,
+            }
+
 
 # singleton
 dashboard = Dashboard()
@@ -0,0 +1,383 @@
+"""
+journal_index.py - Index of every event in every Journal file.
+
+Copyright (c) EDCD, All Rights Reserved
+Licensed under the GNU General Public License.
+See LICENSE file.
+
+The monitor only reads the latest Journal file, so questions about the full
+history, e.g. "when was I last at X", mean re-reading all of them.  This
+keeps every event in an sqlite database, indexed on file, timestamp, event
+name, SystemAddress and MarketID, plus full-text search on the names in it.
+
+Indexing is incremental, each file being read on from where it got to last
+time.  It's opt-in: once the database has been created, with
+`EDMC.py --journal-index`, EDLogs keeps it up to date with a JournalIndexer.
+"""
+from __future__ import annotations
+
+import pathlib
+import queue
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+from config import config
+from EDMCLogging import get_main_logger
+from util import json_codec
+
+logger = get_main_logger()
+
+# Top-level keys whose values are indexed for full-text search
+NAME_KEYS = (
+    'StarSystem', 'SystemName', 'StationName', 'Body', 'BodyName', 'Name', 'Name_Localised', 'Type',
+    'Type_Localised', 'Ship', 'Ship_Localised', 'ShipName', 'Commander', 'Engineer', 'Faction', 'SignalName',
+    'Genus_Localised', 'Species_Localised', 'Variant_Localised', 'Settlement_Localised', 'DestinationSystem',
+)
+BATCH_LINES = 10000  # Lines inserted per transaction
+STOP_TIMEOUT = 5  # Seconds to wait, at shutdown, for the indexer to finish a batch
+
+
+def db_path() -> pathlib.Path:
+    """
+    Get where the index database is kept.
+
+    :return: The path.
+    """
+    return config.app_dir_path / JournalIndex.SQLITE_DB_FILENAME
+
+
+def journal_files(journal_dir: str | pathlib.Path) -> list[pathlib.Path]:
+    """
+    Find all Journal files.
+
+    :param journal_dir: The Journal directory.
+    :return: The files, in name order.
+    """
+    return sorted(pathlib.Path(journal_dir).glob('Journal*.log'))
+
+
+class JournalIndex:
+    """
+    sqlite3 storage of every Journal event.
+
+    Each connection must be used from only one thread, but as the database is
+    in WAL mode any number of them can read whilst one indexes.
+    """
+
+    SQLITE_DB_FILENAME = 'journal_index-v1.db'
+
+    def __init__(self, db_path: pathlib.Path) -> None:
+        """
+        Open, and if necessary initialise, the index database.
+
+        :param db_path: Path of the database file.
+        """
+        self.db_conn = sqlite3.connect(db_path)
+        try:
+            self.db_conn.execute("PRAGMA journal_mode=WAL")
+            self.db_conn.execute("PRAGMA synchronous=NORMAL")
+            self.db_conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    offset INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self.db_conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY,
+                    file_id INTEGER NOT NULL REFERENCES files (id),
+                    offset INTEGER NOT NULL,
+                    timestamp TEXT,
+                    event TEXT,
+                    system_address INTEGER,
+                    market_id INTEGER,
+                    data TEXT NOT NULL,
+                    UNIQUE (file_id, offset)
+                )
+            """)
+            self.db_conn.execute("CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp)")
+            self.db_conn.execute("CREATE INDEX IF NOT EXISTS events_event ON events (event, timestamp)")
+            self.db_conn.execute(
+                "CREATE INDEX IF NOT EXISTS events_system_address ON events (system_address, timestamp)"
+            )
+            self.db_conn.execute("CREATE INDEX IF NOT EXISTS events_market_id ON events (market_id, timestamp)")
+            # rowid is events.id
+            self.db_conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS event_names USING fts5 (names)")
+            self.db_conn.commit()
+
+        except Exception:
+            self.db_conn.close()
+            raise
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db_conn.close()
+
+    def index_file(self, path: pathlib.Path, stop: threading.Event | None = None) -> int:
+        """
+        Index any new events in a Journal file.
+
+        A trailing incomplete line is left for next time.  If the file has
+        shrunk it's assumed to have been replaced, and is indexed afresh.
+
+        :param path: The Journal file.
+        :param stop: If given, give up before the next batch of lines once this is set.
+        :return: The number of events added.
+        """
+        row = self.db_conn.execute("SELECT id, offset FROM files WHERE name = ?", (path.name,)).fetchone()
+        if row is None:
+            with self.db_conn:
+                row = self.db_conn.execute(
+                    "INSERT INTO files (name) VALUES (?) RETURNING id, offset", (path.name,)
+                ).fetchone()
+
+        file_id, offset = row
+
+        added = 0
+        with open(path, 'rb') as f:
+            size = f.seek(0, 2)
+            if size < offset:
+                logger.info(f'Journal file "{path.name}" has shrunk, re-indexing it')
+                self._forget_file(file_id)
+                offset = 0
+
+            f.seek(offset)
+            while stop is None or not stop.is_set():
+                rows, offset = self._read_lines(f, offset)
+                if not rows:
+                    break
+
+                with self.db_conn:
+                    for line_offset, timestamp, event, system_address, market_id, data, names in rows:
+                        cursor = self.db_conn.execute(
+                            "INSERT OR IGNORE INTO events"
+                            " (file_id, offset, timestamp, event, system_address, market_id, data)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (file_id, line_offset, timestamp, event, system_address, market_id, data)
+                        )
+                        if names and cursor.rowcount:
+                            self.db_conn.execute(
+                                "INSERT INTO event_names (rowid, names) VALUES (?, ?)", (cursor.lastrowid, names)
+                            )
+
+                    self.db_conn.execute("UPDATE files SET offset = ? WHERE id = ?", (offset, file_id))
+
+                added += len(rows)
+
+        return added
+
+    @staticmethod
+    def _read_lines(f, offset: int) -> tuple[list[tuple], int]:
+        """
+        Read, and decode, up to BATCH_LINES complete lines.
+
+        :param f: The Journal file, positioned at offset.
+        :param offset: Where in the file to read from.
+        :return: Rows for index_file() to insert, and the offset after the last complete line.
+        """
+        rows: list[tuple] = []
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # Still being written
+
+            line_offset = offset
+            offset += len(line)
+            try:
+                entry = json_codec.loads(line)
+
+            except json_codec.JSONDecodeError:
+                logger.debug(f'Invalid JSON at offset {line_offset} of "{f.name}"')
+                continue
+
+            if not isinstance(entry, dict):
+                continue
+
+            names = ' '.join(value for key in NAME_KEYS if isinstance(value := entry.get(key), str))
+            system_address = entry.get('SystemAddress')
+            market_id = entry.get('MarketID')
+            rows.append((
+                line_offset,
+                entry.get('timestamp'),
+                entry.get('event'),
+                system_address if isinstance(system_address, int) else None,
+                market_id if isinstance(market_id, int) else None,
+                line.decode('utf-8', errors='replace').strip(),
+                names,
+            ))
+            if len(rows) >= BATCH_LINES:
+                break
+
+        return rows, offset
+
+    def _forget_file(self, file_id: int) -> None:
+        """
+        Remove all of a file's events.
+
+        :param file_id: The file's id.
+        """
+        with self.db_conn:
+            self.db_conn.execute(
+                "DELETE FROM event_names WHERE rowid IN (SELECT id FROM events WHERE file_id = ?)", (file_id,)
+            )
+            self.db_conn.execute("DELETE FROM events WHERE file_id = ?", (file_id,))
+            self.db_conn.execute("UPDATE files SET offset = 0 WHERE id = ?", (file_id,))
+
+    def index_dir(self, journal_dir: str | pathlib.Path, stop: threading.Event | None = None) -> int:
+        """
+        Index any new events in all Journal files.
+
+        :param journal_dir: The Journal directory.
+        :param stop: If given, give up before the next file, or batch of lines, once this is set.
+        :return: The number of events added.
+        """
+        added = 0
+        for path in journal_files(journal_dir):
+            if stop is not None and stop.is_set():
+                break
+
+            try:
+                added += self.index_file(path, stop)
+
+            except OSError:
+                logger.exception(f'Failed to index "{path}"')
+
+        return added
+
+    def count(self) -> int:
+        """
+        Count the indexed events.
+
+        :return: The count.
+        """
+        return self.db_conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def events(  # noqa: CCR001
+        self, event: str | Iterable[str] | None = None, system_address: int | None = None,
+        market_id: int | None = None, since: str | None = None, until: str | None = None,
+        text: str | None = None, newest_first: bool = True, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Query the indexed events.
+
+        :param event: Only events of this name, or of any of these names.
+        :param system_address: Only events with this SystemAddress.
+        :param market_id: Only events with this MarketID.
+        :param since: Only events with a timestamp at or after this, e.g. '2024-01-01T00:00:00Z'.
+        :param until: Only events with a timestamp before this.
+        :param text: Only events with this phrase in their names, e.g. a system, station or body name.
+        :param newest_first: Order by timestamp descending rather than ascending.
+        :param limit: Maximum number of events to return.
+        :return: The events.
+        """
+        where = []
+        params: list[Any] = []
+        if event is not None:
+            events = [event] if isinstance(event, str) else list(event)
+            where.append(f"event IN ({', '.join('?' * len(events))})")
+            params.extend(events)
+
+        if system_address is not None:
+            where.append("system_address = ?")
+            params.append(system_address)
+
+        if market_id is not None:
+            where.append("market_id = ?")
+            params.append(market_id)
+
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since)
+
+        if until is not None:
+            where.append("timestamp < ?")
+            params.append(until)
+
+        if text is not None:
+            where.append("id IN (SELECT rowid FROM event_names WHERE event_names MATCH ?)")
+            # As a phrase, so that punctuation in names isn't taken as query syntax
+            params.append('"' + text.replace('"', '""') + '"')
+
+        sql = "SELECT data FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+
+        sql += f" ORDER BY timestamp {'DESC' if newest_first else 'ASC'}, id {'DESC' if newest_first else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [json_codec.loads(data) for data, in self.db_conn.execute(sql, params)]
+
+    def last_visit(self, name: str) -> dict[str, Any] | None:
+        """
+        Find the last arrival at, or docking with, a system or station.
+
+        :param name: The system or station name.
+        :return: The FSDJump, CarrierJump, Location or Docked event, or None if never visited.
+        """
+        for entry in self.events(event=('FSDJump', 'CarrierJump', 'Location', 'Docked'), text=name, limit=20):
+            if name.lower() in (str(entry.get('StarSystem', '')).lower(), str(entry.get('StationName', '')).lower()):
+                return entry
+
+        return None
+
+
+class JournalIndexer:
+    """Keeps a JournalIndex up to date on a thread of its own, so as not to hold up the monitor."""
+
+    def __init__(self, db_path: pathlib.Path) -> None:
+        """
+        Start the indexer thread.
+
+        :param db_path: Path of the database file.
+        """
+        self.db_path = db_path
+        # Journal files or directories to index, None to stop
+        self.queue: queue.Queue[pathlib.Path | None] = queue.Queue()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.worker, name='Journal indexer', daemon=True)
+        self.thread.start()
+
+    def submit(self, path: str | pathlib.Path) -> None:
+        """
+        Queue a Journal file, or the whole Journal directory, to be indexed.
+
+        :param path: The file or directory.
+        """
+        self.queue.put(pathlib.Path(path))
+
+    def worker(self) -> None:
+        """Index what's queued until told to stop."""
+        try:
+            index = JournalIndex(self.db_path)
+
+        except sqlite3.Error:
+            logger.exception(f'Failed to open Journal index "{self.db_path}"')
+            return
+
+        try:
+            while (path := self.queue.get()) is not None:
+                try:
+                    if path.is_dir():
+                        added = index.index_dir(path, self.stopping)
+
+                    else:
+                        added = index.index_file(path, self.stopping)
+
+                    logger.debug(f'Indexed {added} new events from "{path}"')
+
+                except (OSError, sqlite3.Error):
+                    logger.exception(f'Failed to index "{path}"')
+
+        finally:
+            index.close()
+
+    def stop(self) -> None:
+        """Stop the indexer, abandoning any catching up, waiting at most STOP_TIMEOUT."""
+        self.stopping.set()
+        self.queue.put(None)
+        self.thread.join(STOP_TIMEOUT)
+        if self.thread.is_alive():
+            logger.warning(f'Journal indexer still busy after {STOP_TIMEOUT}s, not waiting for it')
@@ -0,0 +1,213 @@
+"""
+journal_reprocess.py - Re-parse historical Journal files, in parallel.
+
+Copyright (c) EDCD, All Rights Reserved
+Licensed under the GNU General Public License.
+See LICENSE file.
+
+Rebuilding anything derived from the Journal, e.g. stats or an EDDN backfill
+from an archive, means running EDLogs.parse_entry() over every line of every
+file, which on one core takes hours for a long-time player's Journals.
+
+Journal files are independent enough that each can be parsed with a fresh
+EDLogs, so they're sharded across a pool of processes.  Each worker returns
+the results for a whole file, and reprocess() merges them back in file order
+as they arrive, along with the throughput achieved.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pathlib
+import time
+from collections import Counter
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, MutableMapping, NamedTuple
+
+from EDMCLogging import get_main_logger
+from monitor import CompanionFiles, CompanionFileWaits, EDLogs
+
+logger = get_main_logger()
+
+# Called with each parsed entry and the state after it, returns anything to be collected, or None.
+# Must be picklable, i.e. a module-level function, to be sent to the worker processes.
+ENTRY_HANDLER = Callable[[MutableMapping[str, Any], MutableMapping[str, Any]], Any]
+
+
+class NoCompanionFiles(CompanionFiles):
+    """
+    Companion files for historical Journal files, which are never there.
+
+    Any alongside them, e.g. Cargo.json, are from the game's last session, not
+    the one being reprocessed, so events about them are left as they are.
+    """
+
+    def read(self, path: str, retry: bool = True) -> dict[str, Any] | None:
+        """Never read a companion file."""
+        return None
+
+    def read_waiting(self, path: str) -> dict[str, Any] | None:
+        """Never read, or wait for, a companion file."""
+        return None
+
+
+class ReprocessEDLogs(EDLogs):
+    """EDLogs for historical files, which doesn't touch the Journal checkpoint or read companion files."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.companion_files = NoCompanionFiles()
+        self.companion_file_waits = CompanionFileWaits(self.companion_files)
+
+    def load_checkpoint(self, loghandle: BinaryIO) -> bool:
+        """Never restore from a checkpoint."""
+        return False
+
+    def save_checkpoint(self, loghandle: BinaryIO) -> None:
+        """Never save a checkpoint."""
+
+
+class FileResult(NamedTuple):
+    """The outcome of reprocessing one Journal file."""
+
+    path: pathlib.Path
+    lines: int
+    events: Counter[str]
+    results: list[Any]  # Whatever the handler returned, in Journal order
+    seconds: float  # CPU time in the worker
+    error: str | None = None
+
+
+class ReprocessStats:
+    """Totals for a reprocess() run."""
+
+    def __init__(self) -> None:
+        self.jobs = 1
+        self.files = 0
+        self.failed = 0
+        self.lines = 0
+        self.events: Counter[str] = Counter()
+        self.cpu_seconds = 0.0
+        self.start = time.perf_counter()
+        self.wall_seconds = 0.0
+
+    def merge(self, result: FileResult) -> None:
+        """
+        Add a file's result to the totals.
+
+        :param result: The file's result.
+        """
+        self.files += 1
+        self.failed += result.error is not None
+        self.lines += result.lines
+        self.events.update(result.events)
+        self.cpu_seconds += result.seconds
+        self.wall_seconds = time.perf_counter() - self.start
+
+    def lines_per_second(self) -> float:
+        """
+        Get the overall throughput.
+
+        :return: Lines/s.
+        """
+        return self.lines / self.wall_seconds if self.wall_seconds else 0.0
+
+    def lines_per_second_per_core(self) -> float:
+        """
+        Get the throughput per worker process.
+
+        :return: Lines/s/core.
+        """
+        return self.lines_per_second() / self.jobs
+
+    def __str__(self) -> str:
+        """Summarise the run."""
+        return (
+            f'{self.files} files ({self.failed} failed), {self.lines} lines in {self.wall_seconds:.1f}s'
+            f' with {self.jobs} jobs: {self.lines_per_second():.0f} lines/s,'
+            f' {self.lines_per_second_per_core():.0f} lines/s/core'
+        )
+
+
+def reprocess_file(path: pathlib.Path, handler: ENTRY_HANDLER | None = None) -> FileResult:
+    """
+    Parse a Journal file with a fresh EDLogs.
+
+    :param path: The Journal file.
+    :param handler: Called with each entry and the state after it.
+    :return: The file's result.
+    """
+    edlogs = ReprocessEDLogs()
+    # Companion files, e.g. Cargo.json, are never read, and NavRoute.json and FCMaterials.json aren't waited for
+    edlogs.currentdir = str(path.parent)
+    edlogs.catching_up = True
+    lines = 0
+    events: Counter[str] = Counter()
+    results = []
+    start = time.process_time()
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+
+            lines += 1
+            entry = edlogs.parse_entry(line)
+            if entry['event'] is None:
+                continue  # Invalid
+
+            events[entry['event']] += 1
+            if handler is not None and (result := handler(entry, edlogs.state)) is not None:
+                results.append(result)
+
+    except Exception as ex:
+        logger.exception(f'Failed to reprocess "{path}"')
+        return FileResult(path, lines, events, results, time.process_time() - start, repr(ex))
+
+    return FileResult(path, lines, events, results, time.process_time() - start)
+
+
+def _reprocess_file(args: tuple[pathlib.Path, ENTRY_HANDLER | None]) -> FileResult:
+    """Unpack the arguments for reprocess_file(), for Pool.imap()."""
+    return reprocess_file(*args)
+
+
+def reprocess(
+    paths: Iterable[pathlib.Path], handler: ENTRY_HANDLER | None = None, jobs: int | None = None,
+    stats: ReprocessStats | None = None
+) -> Iterator[FileResult]:
+    """
+    Parse Journal files across a pool of processes.
+
+    Results are yielded in the order of `paths` as soon as they, and those of
+    all the files before them, are complete.
+
+    :param paths: The Journal files.
+    :param handler: Called, in the worker processes, with each entry and the state after it.
+    :param jobs: Number of worker processes, default one per core.  With 1 files are parsed in this process.
+    :param stats: If given, updated with the totals as results are merged.
+    :return: Iterator of the files' results.
+    """
+    paths = list(paths)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    if stats is not None:
+        stats.jobs = jobs
+        stats.start = time.perf_counter()
+
+    if jobs == 1:
+        yield from _merge((reprocess_file(path, handler) for path in paths), stats)
+        return
+
+    with multiprocessing.Pool(jobs) as pool:
+        # One file at a time, they're big enough to outweigh the overhead and it keeps the workers evenly loaded
+        yield from _merge(pool.imap(_reprocess_file, ((path, handler) for path in paths), chunksize=1), stats)
+
+
+def _merge(results: Iterable[FileResult], stats: ReprocessStats | None) -> Iterator[FileResult]:
+    """Add results to the totals as they're passed on."""
+    for result in results:
+        if stats is not None:
+            stats.merge(result)
+
+        yield result
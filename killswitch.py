@@ -10,6 +10,7 @@ from __future__ import annotations
 import json
 import threading
 from copy import deepcopy
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING, Any, Callable, Mapping, MutableMapping, MutableSequence, NamedTuple, Sequence,
     TypedDict, TypeVar, cast, Union
@@ -278,6 +279,10 @@ class KillSwitchSet:
             if res.kill is None:
                 raise ValueError('Killswitch has rules but no kill data')
 
+        if isinstance(data, MappingProxyType):
+            # A read-only view, e.g. a plugin's journal entry.  Rules need something they can modify.
+            data = cast(T, dict(data))
+
         try:
             new_data = res.kill.apply_rules(deepcopy(data))
 
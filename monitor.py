@@ -7,6 +7,7 @@ See LICENSE file.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import pathlib
 import queue
@@ -15,17 +16,23 @@ import sys
 import threading
 from calendar import timegm
 from collections import defaultdict
-from os import SEEK_END, SEEK_SET, listdir
-from os.path import basename, expanduser, getctime, isdir, join
-from time import gmtime, localtime, mktime, sleep, strftime, strptime, time
-from typing import TYPE_CHECKING, Any, BinaryIO, MutableMapping
+from io import BytesIO
+from os import SEEK_END, SEEK_SET, fstat, listdir, sep, stat
+from os.path import basename, expanduser, isdir, join, realpath
+from time import gmtime, localtime, mktime, monotonic, perf_counter, sleep, strftime, strptime, time
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, MutableMapping
 import psutil
 import semantic_version
+import journal_index
 import util_ships
+from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver, ObservedWatch
 from config import config, appname, appversion
 from edmc_data import edmc_suit_shortnames, edmc_suit_symbol_localised, ship_name_map
 from EDMCLogging import get_main_logger
 from edshipyard import ships
+from util import json_codec
 
 if TYPE_CHECKING:
     import tkinter
@@ -36,19 +43,662 @@ STARTUP = 'journal.startup'
 MAX_NAVROUTE_DISCREPANCY = 5  # Timestamp difference in seconds
 MAX_FCMATERIALS_DISCREPANCY = 5  # Timestamp difference in seconds
 
-if sys.platform == 'win32':
-    from watchdog.events import FileSystemEventHandler, FileSystemEvent
-    from watchdog.observers import Observer
-    from watchdog.observers.api import BaseObserver
+# File systems on which file system events (e.g. inotify) can't be relied upon, so we poll instead
+NETWORK_FILESYSTEMS = frozenset(('9p', 'afpfs', 'cifs', 'davfs', 'nfs', 'nfs4', 'smb3', 'smbfs', 'webdav'))
 
-else:
-    # Linux's inotify doesn't work over CIFS or NFS, so poll
-    FileSystemEventHandler = object  # dummy
-    if TYPE_CHECKING:
-        # this isn't ever used, but this will make type checking happy
-        from watchdog.events import FileSystemEvent
-        from watchdog.observers import Observer
-        from watchdog.observers.api import BaseObserver
+
+def is_network_dir(path: str) -> bool:
+    """
+    Determine whether a directory looks to be on a network file system.
+
+    FUSE file systems (e.g. sshfs) count as network ones, as does anything
+    whose mount point can't be determined.
+
+    :param path: The directory to check.
+    :return: bool - True if the directory should be polled.
+    """
+    try:
+        partitions = psutil.disk_partitions(all=True)
+
+    except Exception:
+        logger.exception('Failed to list disk partitions')
+        return True
+
+    path = realpath(path)
+    mount = max(
+        (p for p in partitions if path == p.mountpoint or path.startswith(p.mountpoint.rstrip(sep) + sep)),
+        key=lambda p: len(p.mountpoint),
+        default=None
+    )
+    if mount is None:
+        return True
+
+    fstype = mount.fstype.lower()
+    return fstype in NETWORK_FILESYSTEMS or fstype.startswith('fuse')
+
+
+class GameProcessWatch:
+    """
+    Cached detection of the running game process.
+
+    Once the game's process has been found it's only checked for still being
+    alive.  Looking for it means scanning all processes, which is expensive on
+    busy hosts, so:
+
+    1. Scans are rate limited, backing off from `MIN_SCAN_INTERVAL` to
+      `MAX_SCAN_INTERVAL` whilst the game isn't running.
+    2. Processes found not to be the game are remembered by PID and not
+      inspected again, until the next full scan, every `FULL_SCAN_INTERVAL`.
+
+    `wake()`, for when there's reason to think the game has just started,
+    makes the next check a full scan.  A process can become the game without
+    changing PID, e.g. a Wine/Proton or launcher process exec()ing it.
+    """
+
+    MIN_SCAN_INTERVAL = 1.0
+    MAX_SCAN_INTERVAL = 30.0
+    FULL_SCAN_INTERVAL = 300.0
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()  # Used from both the Journal worker and main threads
+        self.process: psutil.Process | None = None
+        self.user: str | None = None  # Only processes of the same user as us count
+        self.not_game: set[int] = set()  # PIDs of processes that aren't the game
+        self.scan_interval = self.MIN_SCAN_INTERVAL
+        self.next_scan = 0.0
+        self.next_full_scan = 0.0
+
+        # Metrics
+        self.scans = 0
+        self.full_scans = 0
+        self.scan_seconds = 0.0
+        self.last_scan_seconds = 0.0
+        self.processes_inspected = 0
+        self.cached_answers = 0
+
+    def running(self) -> bool:
+        """
+        Determine if the game is currently running.
+
+        :return: bool - True if the game is running.
+        """
+        with self.lock:
+            if self.process is not None:
+                try:
+                    with self.process.oneshot():
+                        if self.process.status() in (psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING):
+                            return True
+
+                except psutil.NoSuchProcess:
+                    pass
+
+                # Process likely expired
+                logger.debug(f'Game process {self.process.pid} has gone')
+                self.process = None
+                self.scan_interval = self.MIN_SCAN_INTERVAL
+                self.next_scan = monotonic() + self.scan_interval
+
+            now = monotonic()
+            if now < self.next_scan:
+                self.cached_answers += 1
+                return False
+
+            self._scan(now)
+            return self.process is not None
+
+    def wake(self) -> None:
+        """Fully scan for the game process at the next check, rather than waiting out the backoff."""
+        with self.lock:
+            self.scan_interval = self.MIN_SCAN_INTERVAL
+            self.next_scan = 0.0
+            # A process already seen may since have exec()d the game
+            self.not_game.clear()
+            self.next_full_scan = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report the cost of looking for the game process.
+
+        :return: dict of metrics.
+        """
+        with self.lock:
+            return {
+                'scans': self.scans,
+                'full_scans': self.full_scans,
+                'scan_seconds': self.scan_seconds,
+                'last_scan_seconds': self.last_scan_seconds,
+                'processes_inspected': self.processes_inspected,
+                'cached_answers': self.cached_answers,
+                'scan_interval': self.scan_interval,
+            }
+
+    def _scan(self, now: float) -> None:
+        """
+        Look for the game process, must be called with the lock held.
+
+        :param now: The current `monotonic()` time.
+        """
+        start = perf_counter()
+        full_scan = now >= self.next_full_scan
+        if full_scan:
+            self.not_game.clear()
+            self.next_full_scan = now + self.FULL_SCAN_INTERVAL
+
+        inspected = 0
+        try:
+            if self.user is None:
+                self.user = psutil.Process().username()
+
+            pids = psutil.pids()
+            self.not_game.intersection_update(pids)  # Forget processes that have exited
+            for pid in pids:
+                if pid in self.not_game:
+                    continue
+
+                inspected += 1
+                try:
+                    proc = psutil.Process(pid)
+                    if 'EliteDangerous' in proc.name() and proc.username() == self.user:
+                        self.process = proc
+                        break
+
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    continue
+
+                except psutil.AccessDenied:
+                    pass  # Not one of ours, so not the game
+
+                self.not_game.add(pid)
+
+        except psutil.Error:
+            logger.exception('Failed to scan for game process')
+
+        elapsed = perf_counter() - start
+        self.scans += 1
+        self.full_scans += full_scan
+        self.scan_seconds += elapsed
+        self.last_scan_seconds = elapsed
+        self.processes_inspected += inspected
+
+        if self.process is not None:
+            self.scan_interval = self.MIN_SCAN_INTERVAL
+
+        else:
+            self.next_scan = now + self.scan_interval
+            self.scan_interval = min(self.scan_interval * 2, self.MAX_SCAN_INTERVAL)
+
+        logger.trace_if(
+            'journal.process',
+            f'{"Full" if full_scan else "Incremental"} scan for game process inspected {inspected} processes'
+            f' in {elapsed * 1000:.1f} ms, {"found" if self.process else "not found"}'
+        )
+
+
+class JournalDirScan:
+    """
+    Cached search for the newest Journal file in a directory.
+
+    Listing a Journal directory of thousands of files, and stat()ing each for
+    its ctime, on every poll is expensive, so:
+
+    1. Journal file names say when the file was started, so they're ordered on
+      that, as parsed from the name, rather than on ctime.
+    2. The directory is only listed again when its mtime has changed, as it
+      does whenever a file is created in it.  An mtime within
+      `MTIME_SETTLE_SECONDS` of the last listing isn't trusted, as a file
+      created within the file system's timestamp granularity wouldn't change it.
+    """
+
+    MTIME_SETTLE_SECONDS = 2.0
+
+    # Odyssey Update 11 has, e.g.    Journal.2022-03-15T152503.01.log
+    # Horizons Update 11 equivalent: Journal.220315152335.01.log
+    _RE_NAME = re.compile(r'^Journal(?:Alpha|Beta)?\.([0-9]{2,4})-?([0-9]{2})-?([0-9]{2})T?'
+                          r'([0-9]{2})([0-9]{2})([0-9]{2})\.([0-9]{2})\.log$')
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()  # Used from both the Journal worker and main threads
+        self.journals_dir: str | None = None
+        self.mtime_ns: int | None = None
+        self.settled = False  # Whether the mtime was already old enough to trust when last listed
+        self.newest: str | None = None
+        self.keys: dict[str, tuple[int, ...] | None] = {}  # Sort key by file name, None if not a Journal file
+
+        # Metrics
+        self.scans = 0
+        self.scan_seconds = 0.0
+        self.last_scan_seconds = 0.0
+        self.last_scan_files = 0
+        self.cached_answers = 0
+
+    @classmethod
+    def sort_key(cls, name: str) -> tuple[int, ...] | None:
+        """
+        Parse when a Journal file was started from its name.
+
+        :param name: The file name.
+        :return: (year, month, day, hour, minute, second, part), or None if not a Journal file name.
+        """
+        match = cls._RE_NAME.search(name)
+        if match is None:
+            return None
+
+        key = tuple(map(int, match.groups()))
+        if key[0] < 100:
+            key = (key[0] + 2000, *key[1:])
+
+        return key
+
+    def newest_filename(self, journals_dir: str) -> str | None:
+        """
+        Determine the newest Journal file in a directory.
+
+        :param journals_dir: The directory.
+        :return: The full path to the newest Journal file, or None if there are none.
+        """
+        with self.lock:
+            mtime_ns = stat(journals_dir).st_mtime_ns
+            if journals_dir == self.journals_dir and mtime_ns == self.mtime_ns and self.settled:
+                self.cached_answers += 1
+                return self.newest
+
+            if journals_dir != self.journals_dir:
+                self.keys.clear()
+
+            start = perf_counter()
+            names = listdir(journals_dir)
+            keys = {name: self.keys[name] if name in self.keys else self.sort_key(name) for name in names}
+            newest = max(((key, name) for name, key in keys.items() if key is not None), default=None)
+
+            self.journals_dir = journals_dir
+            self.mtime_ns = mtime_ns
+            self.settled = time() - mtime_ns / 1e9 > self.MTIME_SETTLE_SECONDS
+            self.keys = keys
+            self.newest = str(pathlib.Path(journals_dir) / newest[1]) if newest else None
+
+            elapsed = perf_counter() - start
+            self.scans += 1
+            self.scan_seconds += elapsed
+            self.last_scan_seconds = elapsed
+            self.last_scan_files = len(names)
+            logger.trace_if(
+                'journal.dirscan', f'Listed {len(names)} files in {elapsed * 1000:.1f} ms, newest "{self.newest}"'
+            )
+            return self.newest
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report the cost of finding the newest Journal file.
+
+        :return: dict of metrics.
+        """
+        with self.lock:
+            return {
+                'scans': self.scans,
+                'scan_seconds': self.scan_seconds,
+                'last_scan_seconds': self.last_scan_seconds,
+                'last_scan_files': self.last_scan_files,
+                'cached_answers': self.cached_answers,
+            }
+
+
+class CompanionFiles:
+    """
+    Cache of the parsed contents of the companion files the game writes alongside the Journal.
+
+    Each file's last good contents are kept, keyed on its (st_mtime_ns,
+    st_size), so reading it again is only a stat() unless it has changed.
+    The watchdog callbacks `refresh()` the files as soon as they're written,
+    so by the time the Journal event saying so is parsed that's usually a hit.
+
+    A file that can't be read or decoded, e.g. because it's only partly
+    written, is retried on a timer thread, up to `RETRY_ATTEMPTS` times
+    `RETRY_DELAY` apart, rather than by whoever wanted it waiting.  Unless
+    they can't do without it, see `read_waiting()`.
+
+    The contents are cached as read, and decoded afresh for each caller, so
+    that what one caller does with them can't affect another.
+    """
+
+    NAMES = frozenset(('Cargo.json', 'ShipLocker.json', 'Backpack.json', 'ModulesInfo.json', 'NavRoute.json',
+                       'FCMaterials.json'))
+    RETRY_ATTEMPTS = 5
+    RETRY_DELAY = 0.01
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()  # Used from the main, watchdog and retry timer threads
+        self.cache: dict[str, tuple[tuple[int, int], bytes]] = {}  # By path, contents known to decode to a dict
+        self.retries: dict[str, tuple[threading.Timer, int]] = {}  # Pending retry, and attempts left, by path
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.retried = 0
+
+    def read(self, path: str, retry: bool = True) -> dict[str, Any] | None:
+        """
+        Get a companion file's current contents.
+
+        :param path: The file.
+        :param retry: Whether to schedule a retry if it can't be read, False if the caller will try again itself.
+        :return: Its decoded contents, or None if it can't be read or decoded.
+        """
+        with self.lock:
+            return self._read(path, self.RETRY_ATTEMPTS if retry else 0)
+
+    def refresh(self, path: str) -> None:
+        """
+        Read a companion file into the cache, as it has changed.
+
+        :param path: The file.
+        """
+        with self.lock:
+            self._read(path, self.RETRY_ATTEMPTS)
+
+    def read_waiting(self, path: str) -> dict[str, Any] | None:
+        """
+        Get a companion file's current contents, waiting for them if they can't be read yet.
+
+        It's tried again up to `RETRY_ATTEMPTS` times, `RETRY_DELAY` apart.
+
+        :param path: The file.
+        :return: Its decoded contents, or None if it still can't be read or decoded.
+        """
+        for attempt in range(self.RETRY_ATTEMPTS + 1):
+            if attempt:
+                sleep(self.RETRY_DELAY)
+
+            if (data := self.read(path, retry=False)) is not None:
+                return data
+
+        return None
+
+    def _read(self, path: str, attempts: int) -> dict[str, Any] | None:
+        """
+        Get a companion file's current contents, must be called with the lock held.
+
+        :param path: The file.
+        :param attempts: Number of retries to allow if this fails.
+        :return: Its decoded contents, or None.
+        """
+        try:
+            st = stat(path)
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self.cache.get(path)
+            if cached and cached[0] == key:
+                self.hits += 1
+                return json_codec.loads(cached[1])
+
+            with open(path, 'rb') as h:
+                raw = h.read()
+
+            data = json_codec.loads(raw)
+
+            if not isinstance(data, dict):
+                raise ValueError(f'Not a JSON object: {data!r}')
+
+        except (OSError, ValueError) as e:  # json_codec.JSONDecodeError is a ValueError
+            self.failures += 1
+            logger.debug(f'Failed to read "{path}": {e!r}')
+            self._schedule_retry(path, attempts)
+            return None
+
+        self.misses += 1
+        self.cache[path] = (key, raw)
+        if (retry := self.retries.pop(path, None)) is not None:
+            retry[0].cancel()
+
+        return data
+
+    def _schedule_retry(self, path: str, attempts: int) -> None:
+        """
+        Retry reading a file in the background, unless already due to, must be called with the lock held.
+
+        :param path: The file.
+        :param attempts: Number of retries left.
+        """
+        if path in self.retries or attempts <= 0:
+            return
+
+        timer = threading.Timer(self.RETRY_DELAY, self._retry, (path,))
+        timer.name = 'Companion file retry'
+        timer.daemon = True
+        self.retries[path] = (timer, attempts - 1)
+        timer.start()
+
+    def _retry(self, path: str) -> None:
+        """
+        Timer callback to retry reading a file.
+
+        :param path: The file.
+        """
+        with self.lock:
+            _, attempts = self.retries.pop(path, (None, 0))
+            self.retried += 1
+            if self._read(path, attempts) is None and attempts <= 0:
+                logger.warning(f'Failed to read "{path}" after {self.RETRY_ATTEMPTS} retries, giving up')
+
+    def close(self) -> None:
+        """Cancel any pending retries."""
+        with self.lock:
+            for timer, _ in self.retries.values():
+                timer.cancel()
+
+            self.retries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report how well the cache is doing.
+
+        :return: dict of metrics.
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'failures': self.failures,
+                'retried': self.retried,
+            }
+
+
+class CompanionFileWaits:
+    """
+    Waits for companion files to catch up with the Journal events about them.
+
+    NavRoute.json and FCMaterials.json aren't always rewritten by the time the
+    Journal event saying they have been is parsed.  Each such file is waited
+    for, until a deadline, by checking it whenever the watchdog callbacks see
+    it change, via `check()`, and every `POLL_INTERVAL` on a timer in case
+    they don't, e.g. when polling.  Nothing is checked per Journal line.
+
+    The file is the one for the event if its timestamp is within the allowed
+    discrepancy of the event's.  Its contents are then queued, and `on_queued`
+    called, so that whoever owns the state they go into can have
+    `apply_ready()` pass them to `on_ready` on its own thread.
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, companion_files: CompanionFiles, on_queued: Callable[[], Any] | None = None) -> None:
+        self.lock = threading.Lock()  # Used from the main, watchdog and timer threads
+        self.companion_files = companion_files
+        self.on_queued = on_queued  # Called, on the watchdog or timer thread, when a file is queued for apply_ready()
+        # Event timestamp, allowed discrepancy, deadline, on_ready and poll timer, by path
+        self.waits: dict[str, tuple[float, float, float, Callable[[dict[str, Any]], Any], threading.Timer]] = {}
+        # on_ready and file contents for files that have turned up, for apply_ready()
+        self.ready: list[tuple[Callable[[dict[str, Any]], Any], dict[str, Any]]] = []
+
+        # Metrics
+        self.immediate = 0
+        self.late = 0
+        self.expired = 0
+
+    def wait(
+        self, path: str, timestamp: str, max_discrepancy: float, on_ready: Callable[[dict[str, Any]], Any]
+    ) -> dict[str, Any] | None:
+        """
+        Get a companion file's contents for a Journal event, or wait for them.
+
+        Any earlier wait for the same file is superseded.
+
+        :param path: The file.
+        :param timestamp: The Journal event's timestamp.
+        :param max_discrepancy: Seconds the file's timestamp may differ from the event's.
+        :param on_ready: Called with the file's contents if they're not ready yet, but are by the deadline.
+        :return: The file's contents if they're ready now, else None.
+        """
+        journal_time = mktime(strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ'))
+        with self.lock:
+            self._cancel(path)
+            if (data := self._ready(path, journal_time, max_discrepancy)) is not None:
+                self.immediate += 1
+                return data
+
+            timer = self._start_timer(path)
+            self.waits[path] = (journal_time, max_discrepancy, monotonic() + max_discrepancy, on_ready, timer)
+
+        return None
+
+    def check(self, path: str) -> None:
+        """
+        Check whether a file being waited for is now ready, as it has changed.
+
+        :param path: The file.
+        """
+        with self.lock:
+            if (wait := self.waits.get(path)) is None:
+                return
+
+            journal_time, max_discrepancy, _, on_ready, _ = wait
+            if (data := self._ready(path, journal_time, max_discrepancy)) is None:
+                return
+
+            self._cancel(path)
+            self.ready.append((on_ready, data))
+            self.late += 1
+
+        if self.on_queued is not None:
+            self.on_queued()
+
+    def apply_ready(self) -> None:
+        """Pass the contents of files that have turned up since the last call to their `on_ready`."""
+        with self.lock:
+            ready, self.ready = self.ready, []
+
+        for on_ready, data in ready:
+            on_ready(data)
+
+    def _poll(self, path: str) -> None:
+        """
+        Timer callback to check a file being waited for, giving up at the deadline.
+
+        :param path: The file.
+        """
+        self.check(path)
+        with self.lock:
+            if (wait := self.waits.get(path)) is None:
+                return
+
+            if monotonic() < wait[2]:
+                self.waits[path] = wait[:4] + (self._start_timer(path),)
+                return
+
+            del self.waits[path]
+            self.expired += 1
+
+        logger.debug(f'"{basename(path)}" not updated for the Journal event within {wait[1]}s, giving up')
+
+    def _ready(self, path: str, journal_time: float, max_discrepancy: float) -> dict[str, Any] | None:
+        """
+        Get a file's contents if they're for the Journal event, must be called with the lock held.
+
+        :param path: The file.
+        :param journal_time: The Journal event's time.
+        :param max_discrepancy: Seconds the file's timestamp may differ from the event's.
+        :return: The file's contents, or None.
+        """
+        if (data := self.companion_files.read(path, retry=False)) is None or 'timestamp' not in data:
+            return None
+
+        try:
+            discrepancy = abs(mktime(strptime(data['timestamp'], '%Y-%m-%dT%H:%M:%SZ')) - journal_time)
+
+        except (TypeError, ValueError):
+            logger.debug(f'Bad timestamp in "{path}": {data["timestamp"]!r}')
+            return None
+
+        if discrepancy > max_discrepancy:
+            logger.debug(f'Time discrepancy of {discrepancy}s for "{basename(path)}", more than {max_discrepancy}s')
+            return None
+
+        return data
+
+    def _start_timer(self, path: str) -> threading.Timer:
+        """
+        Start the timer for the next poll of a file.
+
+        :param path: The file.
+        :return: The timer.
+        """
+        timer = threading.Timer(self.POLL_INTERVAL, self._poll, (path,))
+        timer.name = 'Companion file wait'
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _cancel(self, path: str) -> None:
+        """
+        Stop waiting for a file, must be called with the lock held.
+
+        :param path: The file.
+        """
+        if (wait := self.waits.pop(path, None)) is not None:
+            wait[4].cancel()
+
+    def close(self) -> None:
+        """Stop waiting for anything, and forget any files that have turned up but not been applied."""
+        with self.lock:
+            for path in list(self.waits):
+                self._cancel(path)
+
+            self.ready.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report how often files weren't ready for their Journal events.
+
+        :return: dict of metrics.
+        """
+        with self.lock:
+            return {
+                'immediate': self.immediate,
+                'late': self.late,
+                'expired': self.expired,
+                'waiting': len(self.waits),
+                'unapplied': len(self.ready),
+            }
+
+
+# Returns the entry to pass on in place of the Journal one, if any, e.g. the contents of Cargo.json
+EventHandler = Callable[['EDLogs', MutableMapping[str, Any]], MutableMapping[str, Any] | None]
+
+
+def journal_event(*event_types: str) -> Callable[[EventHandler], EventHandler]:
+    """
+    Mark an `EDLogs` method as the `parse_entry()` handler for some Journal events.
+
+    A handler can return an entry for `parse_entry()` to return instead of
+    the one from the Journal.
+
+    :param event_types: The events handled, in lower case.
+    :return: Decorator.
+    """
+    def decorate(handler: EventHandler) -> EventHandler:
+        handler.journal_events = event_types  # type: ignore
+        return handler
+
+    return decorate
 
 
 # Journal handler
@@ -58,6 +708,18 @@ class EDLogs(FileSystemEventHandler):
     # Magic with FileSystemEventHandler can confuse type checkers when they do not have access to every import
     _POLL = 1		# Polling while running is cheap, so do it often
     _INACTIVE_POLL = 10		# Polling while not running isn't as cheap, so do it less often
+    _WATCHED_POLL = 5		# Housekeeping while running, when Journal changes are signalled by the observer
+    CHECKPOINT_FILENAME = 'journal_checkpoint.json'
+    _CHECKPOINT_VERSION = 2
+    _CHECKPOINT_TAG = '__edmc_type__'  # Key of objects standing for values JSON has no type for
+    _CHECKPOINT_SAMPLE = 4096  # Bytes from the start and end of the checkpointed contents that must match
+    # Everything that parse_entry() builds up, and so must be checkpointed
+    _CHECKPOINT_ATTRIBUTES = (
+        'state', 'version', 'version_semantic', 'is_beta', 'mode', 'group', 'cmdr', 'started', 'slef', 'live',
+        'stationservices',
+    )
+    _event_handlers: dict[str, EventHandler] = {}  # By lower case event, see journal_event()
+    _RE_EVENT = re.compile(rb'"event":\s*"(\w+)"')  # First match in a line is the event type
     _RE_CANONICALISE = re.compile(r'\$(.+)_name;')
     _RE_CATEGORY = re.compile(r'\$MICRORESOURCE_CATEGORY_(.+);')
     _RE_LOGFILE = re.compile(r'^Journal(Alpha|Beta)?\.[0-9]{2,4}(-)?[0-9]{2}(-)?[0-9]{2}(T)?[0-9]{2}[0-9]{2}[0-9]{2}'
@@ -71,8 +733,13 @@ class EDLogs(FileSystemEventHandler):
         self.currentdir: str | None = None  # The actual logdir that we're monitoring
         self.logfile: str | None = None
         self.observer: BaseObserver | None = None
-        self.observed = None  # a watchdog ObservedWatch, or None if polling
+        self.observed: ObservedWatch | None = None  # None if polling
         self.thread: threading.Thread | None = None
+        # Keeps the Journal index up to date, if it has been created
+        self.journal_indexer: journal_index.JournalIndexer | None = None
+        # Signalled by the watchdog callbacks, so the worker wakes as soon as the Journal changes
+        self.journal_changed = threading.Condition()
+        self._journal_change_pending = False
         # For communicating journal entries back to main thread
         self.event_queue: queue.Queue = queue.Queue(maxsize=0)
 
@@ -85,9 +752,17 @@ class EDLogs(FileSystemEventHandler):
         self.live = False
         # And whilst we're parsing *only to catch up on state*, we might not want to fully process some things
         self.catching_up = False
+        # Lines decoded and parsed, and skipped because nothing would handle them, by the last catch_up()
+        self.catch_up_decoded = 0
+        self.catch_up_skipped = 0
+        # Per event, count of and total seconds in handler calls, if enabled
+        self.handler_timing: defaultdict[str, list] | None = None
 
         self.game_was_running = False  # For generation of the "ShutDown" event
-        self.running_process = None
+        self.game_process = GameProcessWatch()
+        self.journal_dir_scan = JournalDirScan()
+        self.companion_files = CompanionFiles()
+        self.companion_file_waits = CompanionFileWaits(self.companion_files, self._companion_file_queued)
 
         # Context for journal handling
         self.version: str | None = None
@@ -98,12 +773,7 @@ class EDLogs(FileSystemEventHandler):
         self.cmdr: str | None = None
         self.started: int | None = None  # Timestamp of the LoadGame event
         self.slef: str | None = None
-
-        self._navroute_retries_remaining = 0
-        self._last_navroute_journal_timestamp: float | None = None
-
-        self._fcmaterials_retries_remaining = 0
-        self._last_fcmaterials_journal_timestamp: float | None = None
+        self.stationservices: list[str] | None = None
 
         # For determining Live versus Legacy galaxy.
         # The assumption is gameversion will parse via `coerce()` and always
@@ -179,6 +849,7 @@ class EDLogs(FileSystemEventHandler):
             'StationName':        None,
 
             'NavRoute':           None,
+            'FCMaterials':        None,
             'Powerplay':      {
                 'Power':          None,
                 'Rank':           None,
@@ -214,6 +885,12 @@ class EDLogs(FileSystemEventHandler):
             self.stop()
 
         self.currentdir = logdir
+        if self.journal_indexer is None and journal_index.db_path().exists():
+            self.journal_indexer = journal_index.JournalIndexer(journal_index.db_path())
+
+        if self.journal_indexer:
+            # Catch up on anything played since we last ran
+            self.journal_indexer.submit(logdir)
 
         # Latest pre-existing logfile - e.g. if E:D is already running.
         # Do this before setting up the observer in case the journal directory has gone away
@@ -226,10 +903,9 @@ class EDLogs(FileSystemEventHandler):
             return False
 
         # Set up a watchdog observer.
-        # File system events are unreliable/non-existent over network drives on Linux.
-        # We can't easily tell whether a path points to a network drive, so assume
-        # any non-standard logdir might be on a network drive and poll instead.
-        polling = bool(config.get_str('journaldir')) and sys.platform != 'win32'
+        # File system events are unreliable/non-existent over network drives on Linux,
+        # so poll those instead.
+        polling = sys.platform != 'win32' and is_network_dir(logdir)
         if not polling and not self.observer:
             logger.debug('Not polling, no observer, starting an observer...')
             self.observer = Observer()
@@ -245,7 +921,14 @@ class EDLogs(FileSystemEventHandler):
 
         if not self.observed and not polling:
             logger.debug('Not observed and not polling, setting observed...')
-            self.observed = self.observer.schedule(self, self.currentdir)  # type: ignore
+            try:
+                self.observed = self.observer.schedule(self, self.currentdir)  # type: ignore
+
+            except OSError:
+                # e.g. out of inotify watches, the worker will just poll
+                logger.exception('Failed to watch Journal Folder, polling instead')
+                polling = True
+
             logger.debug('Done')
 
         logger.info(f'{"Polling" if polling else "Monitoring"} Journal Folder: "{self.currentdir}"')
@@ -272,16 +955,7 @@ class EDLogs(FileSystemEventHandler):
         if journals_dir is None:
             return None
 
-        journal_files = (x for x in listdir(journals_dir) if self._RE_LOGFILE.search(x))
-        if journal_files:
-            # Odyssey Update 11 has, e.g.    Journal.2022-03-15T152503.01.log
-            # Horizons Update 11 equivalent: Journal.220315152335.01.log
-            # So we can no longer use a naive sort.
-            journals_dir_path = pathlib.Path(journals_dir)
-            journal_files = (journals_dir_path / pathlib.Path(x) for x in journal_files)
-            return str(max(journal_files, key=getctime))
-
-        return None
+        return self.journal_dir_scan.newest_filename(journals_dir)
 
     def stop(self) -> None:
         """Stop journal monitoring."""
@@ -317,6 +991,7 @@ class EDLogs(FileSystemEventHandler):
             logger.debug('Done')
 
         self.thread = None  # Orphan the worker thread - will terminate at next poll
+        self._signal_journal_change()  # ... which is now, if it's waiting on the observer
 
         logger.debug('Done.')
 
@@ -337,6 +1012,18 @@ class EDLogs(FileSystemEventHandler):
             self.observer = None
             logger.debug('Done')
 
+        if self.journal_indexer:
+            logger.debug('Stopping Journal indexer...')
+            self.journal_indexer.stop()
+            self.journal_indexer = None
+            logger.debug('Done')
+
+        logger.debug(f'Game process detection: {self.game_process.stats()}')
+        logger.debug(f'Journal directory scans: {self.journal_dir_scan.stats()}')
+        self.companion_file_waits.close()
+        logger.debug(f'Companion file waits: {self.companion_file_waits.stats()}')
+        self.companion_files.close()
+        logger.debug(f'Companion files: {self.companion_files.stats()}')
         logger.debug('Done.')
 
     def running(self) -> bool:
@@ -351,7 +1038,262 @@ class EDLogs(FileSystemEventHandler):
         """Watchdog callback when, e.g. client (re)started."""
         if not event.is_directory and self._RE_LOGFILE.search(str(basename(event.src_path))):
 
-            self.logfile = event.src_path  # type: ignore
+            self.logfile = event.src_path  # type: ignore
+            self.game_process.wake()  # New Journal, so the game has likely just started
+            self._signal_journal_change()
+
+        else:
+            self._refresh_companion_file(event)
+
+    def on_modified(self, event: 'FileSystemEvent') -> None:
+        """Watchdog callback when, e.g. the client wrote to the Journal."""
+        if not event.is_directory and self._RE_LOGFILE.search(str(basename(event.src_path))):
+            self._signal_journal_change()
+
+        else:
+            self._refresh_companion_file(event)
+
+    def _refresh_companion_file(self, event: 'FileSystemEvent') -> None:
+        """Read a companion file, e.g. Cargo.json, as soon as it's written, ready for the Journal event about it."""
+        if not event.is_directory and basename(str(event.src_path)) in CompanionFiles.NAMES:
+            self.companion_files.refresh(str(event.src_path))
+            self.companion_file_waits.check(str(event.src_path))
+
+    def _companion_file_queued(self) -> None:
+        """Have the main thread, which parses the Journal, apply a late NavRoute.json or FCMaterials.json."""
+        # Without a Tk root, e.g. in EDMC.py, the Journal is only caught up on, which doesn't wait for anything
+        if self.root is not None and not config.shutting_down:
+            self.root.event_generate('<<CompanionFileEvent>>', when="tail")
+
+    def companion_file_event(self, event=None) -> None:
+        """
+        Handle a `<<CompanionFileEvent>>`, by putting any late companion files into the state.
+
+        :param event: The Tk event.
+        """
+        self.companion_file_waits.apply_ready()
+
+    def _companion_file(self, name: str) -> str:
+        """
+        Get the path of a companion file.
+
+        :param name: The file name, e.g. 'Cargo.json'.
+        :return: The path in the current Journal directory.
+        """
+        if self.currentdir is None:
+            raise ValueError('currentdir unset')
+
+        return join(self.currentdir, name)
+
+    def _signal_journal_change(self) -> None:
+        """Wake the worker thread, if it's waiting for the Journal to change."""
+        with self.journal_changed:
+            self._journal_change_pending = True
+            self.journal_changed.notify_all()
+
+    def _wait_for_journal_change(self, timeout: float) -> None:
+        """
+        Wait for the Journal to change, as signalled by the watchdog callbacks.
+
+        :param timeout: Maximum time to wait, in seconds.
+        """
+        with self.journal_changed:
+            self.journal_changed.wait_for(lambda: self._journal_change_pending, timeout)
+            self._journal_change_pending = False
+
+    def catch_up(self, loghandle: BinaryIO) -> None:
+        """
+        Catch up on state from a Journal file, leaving it positioned at its end.
+
+        If there's a checkpoint for this file then state is restored from that,
+        and only the lines written since are parsed.  Otherwise, including if
+        the file has changed underneath the checkpoint, the whole file is
+        replayed.  Either way a new checkpoint is saved afterwards.
+
+        Lines for events without a handler can't affect state, so they're
+        skipped without being decoded.
+
+        :param loghandle: The Journal file, opened in binary mode.
+        """
+        self.catching_up = True
+        self.catch_up_decoded = self.catch_up_skipped = 0
+        if not self.load_checkpoint(loghandle):
+            loghandle.seek(0, SEEK_SET)
+
+        # Read in one go, iterating over an unbuffered file reads a byte at a time
+        for line in BytesIO(loghandle.read()):
+            event = self._RE_EVENT.search(line)
+            if event and event.group(1).decode().lower() not in self._event_handlers:
+                self.catch_up_skipped += 1
+                continue
+
+            self.catch_up_decoded += 1
+            try:
+                if b'"event":"Location"' in line:
+                    logger.trace_if('journal.locations', '"Location" event in the past at startup')
+
+                self.parse_entry(line)  # Some events are of interest even in the past
+
+            except Exception as ex:
+                logger.debug(f'Invalid journal entry:\n{line!r}\n', exc_info=ex)
+
+        self.catching_up = False
+        logger.debug(
+            f'Caught up, decoded {self.catch_up_decoded} lines and skipped {self.catch_up_skipped} without a handler'
+        )
+        self.save_checkpoint(loghandle)
+
+    def _checkpoint_identity(self, loghandle: BinaryIO, offset: int) -> tuple | None:
+        """
+        Identify a Journal file's contents up to an offset, cheaply.
+
+        This is the file's path and identity, plus a digest of its start and
+        of the bytes just before the offset.
+
+        :param loghandle: The Journal file.
+        :param offset: The offset.
+        :return: The identity, or None if the file is shorter than the offset.
+        """
+        st = fstat(loghandle.fileno())
+        if st.st_size < offset:
+            return None
+
+        position = loghandle.tell()
+        digest = hashlib.sha256()
+        loghandle.seek(0, SEEK_SET)
+        digest.update(loghandle.read(min(offset, self._CHECKPOINT_SAMPLE)))
+        loghandle.seek(max(0, offset - self._CHECKPOINT_SAMPLE), SEEK_SET)
+        digest.update(loghandle.read(min(offset, self._CHECKPOINT_SAMPLE)))
+        loghandle.seek(position, SEEK_SET)
+
+        return realpath(loghandle.name), st.st_dev, st.st_ino, offset, digest.hexdigest()
+
+    def load_checkpoint(self, loghandle: BinaryIO) -> bool:
+        """
+        Restore state from the checkpoint, if it's for this Journal file.
+
+        :param loghandle: The Journal file, which is positioned after the
+          checkpointed contents if successful.
+        :return: bool - True if state was restored.
+        """
+        checkpoint_path = config.app_dir_path / self.CHECKPOINT_FILENAME
+        try:
+            with open(checkpoint_path, encoding='utf-8') as h:
+                checkpoint = json.load(h, object_hook=self._checkpoint_decode)
+
+            if checkpoint['version'] != (self._CHECKPOINT_VERSION, str(appversion())):
+                logger.debug('Journal checkpoint is from a different version, ignoring')
+                return False
+
+            if checkpoint['identity'] != self._checkpoint_identity(loghandle, checkpoint['offset']):
+                logger.debug(f'Journal checkpoint is not for "{loghandle.name}", or it has changed, ignoring')
+                return False
+
+        except FileNotFoundError:
+            return False
+
+        except Exception:
+            logger.exception(f'Failed to load Journal checkpoint "{checkpoint_path}"')
+            return False
+
+        for name, value in checkpoint['attributes'].items():
+            setattr(self, name, value)
+
+        loghandle.seek(checkpoint['offset'], SEEK_SET)
+        logger.info(f'Restored state from Journal checkpoint, skipping {checkpoint["offset"]} bytes')
+        return True
+
+    def save_checkpoint(self, loghandle: BinaryIO) -> None:
+        """
+        Save a checkpoint of state, as of the current position in a Journal file.
+
+        :param loghandle: The Journal file.
+        """
+        offset = loghandle.tell()
+        checkpoint_path = config.app_dir_path / self.CHECKPOINT_FILENAME
+        try:
+            checkpoint = {
+                'version': (self._CHECKPOINT_VERSION, str(appversion())),
+                'identity': self._checkpoint_identity(loghandle, offset),
+                'offset': offset,
+                'attributes': {name: getattr(self, name) for name in self._CHECKPOINT_ATTRIBUTES},
+            }
+            # Write then rename, so there's never a partial checkpoint
+            temp_path = checkpoint_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as h:
+                json.dump(self._checkpoint_encode(checkpoint), h, separators=(',', ':'))
+
+            temp_path.replace(checkpoint_path)
+
+        except Exception:
+            logger.exception(f'Failed to save Journal checkpoint "{checkpoint_path}"')
+
+    @classmethod
+    def _checkpoint_encode(cls, value: Any) -> Any:
+        """
+        Convert a value into one that JSON can encode, and `_checkpoint_decode()` restore exactly.
+
+        Tuples, sets, `defaultdict(int)`s, versions and dicts whose keys aren't
+        all strings are encoded as objects tagged with their type.
+
+        :param value: The value.
+        :return: The value, ready for encoding as JSON.
+        :raises TypeError: If the value can't be restored from JSON.
+        """
+        value_type = type(value)
+        if value is None or value_type in (str, int, float, bool):
+            return value
+
+        if value_type is list:
+            return [cls._checkpoint_encode(v) for v in value]
+
+        if value_type is dict and cls._CHECKPOINT_TAG not in value and all(type(k) is str for k in value):
+            return {k: cls._checkpoint_encode(v) for k, v in value.items()}
+
+        items: list | str
+        if value_type is dict or (value_type is defaultdict and value.default_factory is int):
+            items = [[cls._checkpoint_encode(k), cls._checkpoint_encode(v)] for k, v in value.items()]
+
+        elif value_type in (tuple, set):
+            items = [cls._checkpoint_encode(v) for v in value]
+
+        elif value_type is semantic_version.Version:
+            items = str(value)
+
+        else:
+            raise TypeError(f"Can't checkpoint a {value_type.__name__}")
+
+        return {cls._CHECKPOINT_TAG: value_type.__name__, 'items': items}
+
+    @classmethod
+    def _checkpoint_decode(cls, obj: dict[str, Any]) -> Any:
+        """
+        Restore a value tagged by `_checkpoint_encode()`, as a `json.load()` object hook.
+
+        :param obj: A decoded JSON object.
+        :return: The value it stands for.
+        """
+        value_type = obj.get(cls._CHECKPOINT_TAG)
+        if value_type is None:
+            return obj
+
+        items = obj['items']
+        if value_type == 'dict':
+            return {k: v for k, v in items}
+
+        if value_type == 'defaultdict':
+            return defaultdict(int, items)
+
+        if value_type == 'tuple':
+            return tuple(items)
+
+        if value_type == 'set':
+            return set(items)
+
+        if value_type == 'Version':
+            return semantic_version.Version(items)
+
+        raise ValueError(f'Unknown type {value_type!r} in Journal checkpoint')
 
     def worker(self) -> None:  # noqa: C901, CCR001
         """
@@ -373,16 +1315,7 @@ class EDLogs(FileSystemEventHandler):
         if logfile:
             loghandle: BinaryIO = open(logfile, 'rb', 0)  # unbuffered
 
-            self.catching_up = True
-            for line in loghandle:
-                try:
-                    if b'"event":"Location"' in line:
-                        logger.trace_if('journal.locations', '"Location" event in the past at startup')
-
-                    self.parse_entry(line)  # Some events are of interest even in the past
-
-                except Exception as ex:
-                    logger.debug(f'Invalid journal entry:\n{line!r}\n', exc_info=ex)
+            self.catch_up(loghandle)
 
             # One-shot attempt to read in latest NavRoute, if present
             navroute_data = self._parse_navroute_file()
@@ -390,7 +1323,6 @@ class EDLogs(FileSystemEventHandler):
                 # If it's NavRouteClear contents, just keep those anyway.
                 self.state['NavRoute'] = navroute_data
 
-            self.catching_up = False
             log_pos = loghandle.tell()
 
         else:
@@ -466,7 +1398,11 @@ class EDLogs(FileSystemEventHandler):
                 for _ in range(10):
                     logger.trace_if('journal.file', "****")
                 logger.info(f'New Journal File. Was "{logfile}", now "{new_journal_file}"')
+                if logfile and self.journal_indexer:
+                    self.journal_indexer.submit(logfile)
+
                 logfile = new_journal_file
+                self.game_process.wake()
                 if loghandle:
                     loghandle.close()
 
@@ -474,8 +1410,13 @@ class EDLogs(FileSystemEventHandler):
                     loghandle = open(logfile, 'rb', 0)  # unbuffered
                     log_pos = 0
 
-            if self.game_was_running:
+            if emitter and emitter.is_alive():
+                # Woken as soon as the Journal changes, otherwise just for housekeeping
+                self._wait_for_journal_change(self._WATCHED_POLL if self.game_was_running else self._INACTIVE_POLL)
+
+            elif self.game_was_running:
                 sleep(self._POLL)
+
             else:
                 sleep(self._INACTIVE_POLL)
 
@@ -544,1332 +1485,1446 @@ class EDLogs(FileSystemEventHandler):
         Parse a Journal JSON line.
 
         This augments some events, sets internal state in reaction to many and
-        loads some extra files, e.g. Cargo.json, as necessary.
+        loads some extra files, e.g. Cargo.json, as necessary.  The work for each
+        event is done by its handler, see `journal_event()`.
 
         :param line: bytes - The entry being parsed.  Yes, this is bytes, not str.
-                             We rely on json.loads() dealing with this properly.
+                             We rely on json_codec.loads() dealing with this properly.
         :return: Dict of the processed event.
         """
-        # TODO(A_D): a bunch of these can be simplified to use if itertools.product and filters
         if line is None:
             return {'event': None}  # Fake startup event
 
         try:
             # Preserve property order because why not?
-            entry: MutableMapping[str, Any] = json.loads(line)
+            entry: MutableMapping[str, Any] = json_codec.loads(line)
             if 'timestamp' not in entry:
                 raise KeyError("Timestamp does not exist in the entry")
 
-            self.__navroute_retry()
-
             event_type = entry['event'].lower()
-            if event_type == 'fileheader':
-                self.live = False
-
-                self.cmdr = None
-                self.mode = None
-                self.group = None
-                self.state['SystemAddress'] = None
-                self.state['SystemName'] = None
-                self.state['SystemPopulation'] = None
-                self.state['StarPos'] = None
-                self.state['Body'] = None
-                self.state['BodyID'] = None
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                self.state['StationType'] = None
-                self.stationservices = None
-                self.started = None
-                self.__init_state()
-
-                # Do this AFTER __init_state() lest our nice new state entries be None
-                self.populate_version_info(entry)
-
-            elif event_type == 'commander':
-                self.live = True  # First event in 3.0
-                self.cmdr = entry['Name']
-                self.state['FID'] = entry['FID']
-                logger.trace_if(STARTUP, f'"Commander" event, {monitor.cmdr=}, {monitor.state["FID"]=}')
-
-            elif event_type == 'loadgame':
-                # Odyssey Release Update 5 -- This contains data that doesn't match the format used in FileHeader above
-                self.populate_version_info(entry, suppress=True)
-
-                # alpha4
-                # Odyssey: bool
-                self.cmdr = entry['Commander']
-                # 'Open', 'Solo', 'Group', or None for CQC (and Training - but no LoadGame event)
-                if not entry.get('Ship') and not entry.get('GameMode') or entry.get('GameMode', '').lower() == 'cqc':
-                    logger.trace_if('journal.loadgame.cqc', f'loadgame to cqc: {entry}')
-                    self.mode = 'CQC'
+            # Events that don't affect state have no handler, including:
+            #   CollectItems, DropItems, TradeMicroResources, UseConsumable - As of 4.0.0.400 we can
+            #     ignore these as an empty (see file) `ShipLocker` event and/or a `BackpackChange` is also
+            #     written.
+            #   ScanOrganic - Nothing of interest to our state.
+            #   MissionAbandoned - Is this paid at this point, or just a fine to pay later ?
+            #   SquadronCreated - v30 docs don't actually say anything about credits cost.
+            #   CarrierDecommission - v30 doc says nothing about citing the refund amount.
+            handler = self._event_handlers.get(event_type)
+            if handler is not None:
+                if self.handler_timing is None:
+                    replacement = handler(self, entry)
 
                 else:
-                    self.mode = entry.get('GameMode')
-
-                self.group = entry.get('Group')
-                self.state['SystemAddress'] = None
-                self.state['SystemName'] = None
-                self.state['SystemPopulation'] = None
-                self.state['StarPos'] = None
-                self.state['Body'] = None
-                self.state['BodyID'] = None
-                self.state['BodyType'] = None
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                self.state['StationType'] = None
-                self.stationservices = None
-                self.started = timegm(strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ'))
-                # Don't set Ship, ShipID etc since this will reflect Fighter or SRV if starting in those
-                self.state.update({
-                    'Captain':              None,
-                    'Credits':              entry['Credits'],
-                    'FID':                  entry.get('FID'),   # From 3.3
-                    'Horizons':             entry['Horizons'],  # From 3.0
-                    'Odyssey':              entry.get('Odyssey', False),  # From 4.0 Odyssey
-                    'Loan':                 entry['Loan'],
-                    # For Odyssey, by 4.0.0.100, and at least from Horizons 3.8.0.201 the order of events changed
-                    # to LoadGame being after some 'status' events.
-                    # 'Engineers':          {},  # 'EngineerProgress' event now before 'LoadGame'
-                    # 'Rank':               {},  # 'Rank'/'Progress' events now before 'LoadGame'
-                    # 'Reputation':         {},  # 'Reputation' event now before 'LoadGame'
-                    'Statistics':           {},  # Still after 'LoadGame' in 4.0.0.903
-                    'Role':                 None,
-                    'Taxi':                 None,
-                    'Dropship':             None,
-                })
-                if entry.get('Ship') is not None and self._RE_SHIP_ONFOOT.search(entry['Ship']):
-                    self.state['OnFoot'] = True
-
-                logger.trace_if(STARTUP, f'"LoadGame" event, {monitor.cmdr=}, {monitor.state["FID"]=}')
-
-            elif event_type == 'newcommander':
-                self.cmdr = entry['Name']
-                self.group = None
-
-            elif event_type == 'setusershipname':
-                self.state['ShipID'] = entry['ShipID']
-                if 'UserShipId' in entry:  # Only present when changing the ship's ident
-                    self.state['ShipIdent'] = entry['UserShipId']
-
-                self.state['ShipName'] = entry.get('UserShipName')
-                self.state['ShipType'] = self.canonicalise(entry['Ship'])
-
-            elif event_type == 'shipyardbuy':
-                self.state['ShipID'] = None
-                self.state['ShipIdent'] = None
-                self.state['ShipName'] = None
-                self.state['ShipType'] = self.canonicalise(entry['ShipType'])
-                self.state['HullValue'] = None
-                self.state['ModulesValue'] = None
-                self.state['Rebuy'] = None
-                self.state['Modules'] = None
-
-                self.state['Credits'] -= entry.get('ShipPrice', 0)
-
-            elif event_type == 'shipyardswap':
-                self.state['ShipID'] = entry['ShipID']
-                self.state['ShipIdent'] = None
-                self.state['ShipName'] = None
-                self.state['ShipType'] = self.canonicalise(entry['ShipType'])
-                self.state['HullValue'] = None
-                self.state['ModulesValue'] = None
-                self.state['Rebuy'] = None
-                self.state['Modules'] = None
-
-            elif (
-                event_type == 'loadout' and
-                'fighter' not in self.canonicalise(entry['Ship']) and
-                'buggy' not in self.canonicalise(entry['Ship'])
-            ):
-                self.state['ShipID'] = entry['ShipID']
-                self.state['ShipIdent'] = entry['ShipIdent']
-
-                # Newly purchased ships can show a ShipName of "" initially,
-                # and " " after a game restart/relog.
-                # Players *can* also purposefully set " " as the name, but anyone
-                # doing that gets to live with EDMC showing ShipType instead.
-                if entry['ShipName'] and entry['ShipName'] not in ('', ' '):
-                    self.state['ShipName'] = entry['ShipName']
-
-                self.state['ShipType'] = self.canonicalise(entry['Ship'])
-                self.state['HullValue'] = entry.get('HullValue')  # not present on exiting Outfitting
-                self.state['ModulesValue'] = entry.get('ModulesValue')  # not present on exiting Outfitting
-                self.state['UnladenMass'] = entry.get('UnladenMass')
-                self.state['CargoCapacity'] = entry.get('CargoCapacity')
-                self.state['MaxJumpRange'] = entry.get('MaxJumpRange')
-                self.state["FuelCapacity"] = {name: entry.get("FuelCapacity", {}).get(name) for name in
-                                              ("Main", "Reserve")}
-                self.state['Rebuy'] = entry.get('Rebuy')
-                # Remove spurious differences between initial Loadout event and subsequent
-                self.state['Modules'] = {}
-                for module in entry['Modules']:
-                    module = dict(module)
-                    module['Item'] = self.canonicalise(module['Item'])
-                    if ('Hardpoint' in module['Slot'] and
-                        not module['Slot'].startswith('TinyHardpoint') and
-                            module.get('AmmoInClip') == module.get('AmmoInHopper') == 1):  # lasers
-                        module.pop('AmmoInClip')
-                        module.pop('AmmoInHopper')
-
-                    self.state['Modules'][module['Slot']] = module
-                # SLEF
-                initial_dict: dict[str, dict[str, Any]] = {
-                    "header": {"appName": appname, "appVersion": str(appversion())}
-                }
-                data_dict = {}
-                for module in entry['Modules']:
-                    if module.get('Slot') == 'FuelTank':
-                        cap = module['Item'].split('size')
-                        cap = cap[1].split('_')
-                        cap = 2 ** int(cap[0])
-                        ship = ship_name_map[entry["Ship"]]
-                        fuel = {'Main': cap, 'Reserve': ships[ship]['reserveFuelCapacity']}
-                        data_dict.update({"FuelCapacity": fuel})
-                data_dict.update({
-                    'Ship': entry["Ship"],
-                    'ShipName': entry['ShipName'],
-                    'ShipIdent': entry['ShipIdent'],
-                    'HullValue': entry.get('HullValue'),  # type: ignore
-                    'ModulesValue': entry.get('ModulesValue'),  # type: ignore
-                    'Rebuy': entry['Rebuy'],
-                    'MaxJumpRange': entry['MaxJumpRange'],
-                    'UnladenMass': entry['UnladenMass'],
-                    'CargoCapacity': entry['CargoCapacity'],
-                    'Modules': entry['Modules'],
-                })
-                initial_dict.update({'data': data_dict})
-                output = json.dumps(initial_dict, indent=4)
-                self.slef = str(f"[{output}]")
-
-            elif event_type == 'modulebuy':
-                self.state['Modules'][entry['Slot']] = {
-                    'Slot':     entry['Slot'],
-                    'Item':     self.canonicalise(entry['BuyItem']),
-                    'On':       True,
-                    'Priority': 1,
-                    'Health':   1.0,
-                    'Value':    entry['BuyPrice'],
-                }
+                    start = perf_counter()
+                    replacement = handler(self, entry)
+                    timing = self.handler_timing[event_type]
+                    timing[0] += 1
+                    timing[1] += perf_counter() - start
 
-                self.state['Credits'] -= entry.get('BuyPrice', 0)
+                if replacement is not None:
+                    entry = replacement
 
-            elif event_type == 'moduleretrieve':
-                self.state['Credits'] -= entry.get('Cost', 0)
+            return entry
+
+        except Exception as ex:
+            logger.debug(f'Invalid journal entry:\n{line!r}\n', exc_info=ex)
+            return {'event': None}
+
+    @journal_event('fileheader')
+    def _parse_fileheader(self, entry: MutableMapping[str, Any]) -> None:
+        self.live = False
+        # Anything still to turn up was for the previous session
+        self.companion_file_waits.close()
 
-            elif event_type == 'modulesell':
-                self.state['Modules'].pop(entry['Slot'], None)
-                self.state['Credits'] += entry.get('SellPrice', 0)
+        self.cmdr = None
+        self.mode = None
+        self.group = None
+        self.state['SystemAddress'] = None
+        self.state['SystemName'] = None
+        self.state['SystemPopulation'] = None
+        self.state['StarPos'] = None
+        self.state['Body'] = None
+        self.state['BodyID'] = None
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        self.state['StationType'] = None
+        self.stationservices = None
+        self.started = None
+        self.__init_state()
 
-            elif event_type == 'modulesellremote':
-                self.state['Credits'] += entry.get('SellPrice', 0)
+        # Do this AFTER __init_state() lest our nice new state entries be None
+        self.populate_version_info(entry)
+
+    @journal_event('commander')
+    def _parse_commander(self, entry: MutableMapping[str, Any]) -> None:
+        self.live = True  # First event in 3.0
+        self.cmdr = entry['Name']
+        self.state['FID'] = entry['FID']
+        logger.trace_if(STARTUP, f'"Commander" event, {monitor.cmdr=}, {monitor.state["FID"]=}')
+
+    @journal_event('loadgame')
+    def _parse_loadgame(self, entry: MutableMapping[str, Any]) -> None:
+        # Odyssey Release Update 5 -- This contains data that doesn't match the format used in FileHeader above
+        self.populate_version_info(entry, suppress=True)
+
+        # alpha4
+        # Odyssey: bool
+        self.cmdr = entry['Commander']
+        # 'Open', 'Solo', 'Group', or None for CQC (and Training - but no LoadGame event)
+        if not entry.get('Ship') and not entry.get('GameMode') or entry.get('GameMode', '').lower() == 'cqc':
+            logger.trace_if('journal.loadgame.cqc', f'loadgame to cqc: {entry}')
+            self.mode = 'CQC'
 
-            elif event_type == 'modulestore':
-                self.state['Modules'].pop(entry['Slot'], None)
-                self.state['Credits'] -= entry.get('Cost', 0)
+        else:
+            self.mode = entry.get('GameMode')
 
-            elif event_type == 'moduleswap':
-                to_item = self.state['Modules'].get(entry['ToSlot'])
-                to_slot = entry['ToSlot']
-                from_slot = entry['FromSlot']
-                modules = self.state['Modules']
-                modules[to_slot] = modules[from_slot]
-                if to_item:
-                    modules[from_slot] = to_item
+        self.group = entry.get('Group')
+        self.state['SystemAddress'] = None
+        self.state['SystemName'] = None
+        self.state['SystemPopulation'] = None
+        self.state['StarPos'] = None
+        self.state['Body'] = None
+        self.state['BodyID'] = None
+        self.state['BodyType'] = None
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        self.state['StationType'] = None
+        self.stationservices = None
+        self.started = timegm(strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ'))
+        # Don't set Ship, ShipID etc since this will reflect Fighter or SRV if starting in those
+        self.state.update({
+            'Captain':              None,
+            'Credits':              entry['Credits'],
+            'FID':                  entry.get('FID'),   # From 3.3
+            'Horizons':             entry['Horizons'],  # From 3.0
+            'Odyssey':              entry.get('Odyssey', False),  # From 4.0 Odyssey
+            'Loan':                 entry['Loan'],
+            # For Odyssey, by 4.0.0.100, and at least from Horizons 3.8.0.201 the order of events changed
+            # to LoadGame being after some 'status' events.
+            # 'Engineers':          {},  # 'EngineerProgress' event now before 'LoadGame'
+            # 'Rank':               {},  # 'Rank'/'Progress' events now before 'LoadGame'
+            # 'Reputation':         {},  # 'Reputation' event now before 'LoadGame'
+            'Statistics':           {},  # Still after 'LoadGame' in 4.0.0.903
+            'Role':                 None,
+            'Taxi':                 None,
+            'Dropship':             None,
+        })
+        if entry.get('Ship') is not None and self._RE_SHIP_ONFOOT.search(entry['Ship']):
+            self.state['OnFoot'] = True
+
+        logger.trace_if(STARTUP, f'"LoadGame" event, {monitor.cmdr=}, {monitor.state["FID"]=}')
+
+    @journal_event('newcommander')
+    def _parse_newcommander(self, entry: MutableMapping[str, Any]) -> None:
+        self.cmdr = entry['Name']
+        self.group = None
 
-                else:
-                    modules.pop(from_slot, None)
-
-            elif event_type == 'undocked':
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                self.state['StationType'] = None
-                self.stationservices = None
-                self.state['IsDocked'] = False
-
-            elif event_type == 'embark':
-                # This event is logged when a player (on foot) gets into a ship or SRV
-                # Parameters:
-                #     • SRV: true if getting into SRV, false if getting into a ship
-                #     • Taxi: true when boarding a taxi transport ship
-                #     • Multicrew: true when boarding another player’s vessel
-                #     • ID: player’s ship ID (if players own vessel)
-                #     • StarSystem
-                #     • SystemAddress
-                #     • Body
-                #     • BodyID
-                #     • OnStation: bool
-                #     • OnPlanet: bool
-                #     • StationName (if at a station)
-                #     • StationType
-                #     • MarketID
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                if entry.get('OnStation'):
-                    self.state['StationName'] = entry.get('StationName', '')
-                    self.state['MarketID'] = entry.get('MarketID', '')
-
-                self.state['OnFoot'] = False
-                self.state['Taxi'] = entry['Taxi']
-
-                # We can't now have anything in the BackPack, it's all in the
-                # ShipLocker.
-                self.backpack_set_empty()
-
-            elif event_type == 'disembark':
-                # This event is logged when the player steps out of a ship or SRV
-                #
-                # Parameters:
-                #     • SRV: true if getting out of SRV, false if getting out of a ship
-                #     • Taxi: true when getting out of a taxi transport ship
-                #     • Multicrew: true when getting out of another player’s vessel
-                #     • ID: player’s ship ID (if players own vessel)
-                #     • StarSystem
-                #     • SystemAddress
-                #     • Body
-                #     • BodyID
-                #     • OnStation: bool
-                #     • OnPlanet: bool
-                #     • StationName (if at a station)
-                #     • StationType
-                #     • MarketID
-
-                if entry.get('OnStation', False):
-                    self.state['StationName'] = entry.get('StationName', '')
+    @journal_event('setusershipname')
+    def _parse_setusershipname(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['ShipID'] = entry['ShipID']
+        if 'UserShipId' in entry:  # Only present when changing the ship's ident
+            self.state['ShipIdent'] = entry['UserShipId']
+
+        self.state['ShipName'] = entry.get('UserShipName')
+        self.state['ShipType'] = self.canonicalise(entry['Ship'])
+
+    @journal_event('shipyardbuy')
+    def _parse_shipyardbuy(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['ShipID'] = None
+        self.state['ShipIdent'] = None
+        self.state['ShipName'] = None
+        self.state['ShipType'] = self.canonicalise(entry['ShipType'])
+        self.state['HullValue'] = None
+        self.state['ModulesValue'] = None
+        self.state['Rebuy'] = None
+        self.state['Modules'] = None
+
+        self.state['Credits'] -= entry.get('ShipPrice', 0)
+
+    @journal_event('shipyardswap')
+    def _parse_shipyardswap(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['ShipID'] = entry['ShipID']
+        self.state['ShipIdent'] = None
+        self.state['ShipName'] = None
+        self.state['ShipType'] = self.canonicalise(entry['ShipType'])
+        self.state['HullValue'] = None
+        self.state['ModulesValue'] = None
+        self.state['Rebuy'] = None
+        self.state['Modules'] = None
+
+    @journal_event('loadout')
+    def _parse_loadout(self, entry: MutableMapping[str, Any]) -> None:
+        if 'fighter' in self.canonicalise(entry['Ship']) or 'buggy' in self.canonicalise(entry['Ship']):
+            return
 
-                else:
-                    self.state['StationName'] = None
-
-                self.state['OnFoot'] = True
-                if self.state['Taxi'] is not None and self.state['Taxi'] != entry.get('Taxi', False):
-                    logger.warning('Disembarked from a taxi but we didn\'t know we were in a taxi?')
-
-                self.state['Taxi'] = False
-                self.state['Dropship'] = False
-
-            elif event_type == 'dropshipdeploy':
-                # We're definitely on-foot now
-                self.state['OnFoot'] = True
-                self.state['Taxi'] = False
-                self.state['Dropship'] = False
-
-            elif event_type == 'supercruiseexit':
-                # For any orbital station we have no way of determining the body
-                # it orbits:
-                #
-                #   In-ship Status.json doesn't specify this.
-                #   On-foot Status.json lists the station itself as Body.
-                #   Location for stations (on-foot or in-ship) has station as Body.
-                #   SupercruiseExit (own ship or taxi) lists the station as the Body.
-                if entry['BodyType'] == 'Station':
-                    self.state['Body'] = None
-                    self.state['BodyID'] = None
-
-            elif event_type == 'docked':
-                ###############################################################
-                # Track: Station
-                ###############################################################
-                self.state['IsDocked'] = True
-                self.state['StationName'] = entry.get('StationName')  # It may be None
-                self.state['MarketID'] = entry.get('MarketID')  # It may be None
-                self.state['StationType'] = entry.get('StationType')  # It may be None
-                self.stationservices = entry.get('StationServices')  # None under E:D < 2.4
-
-                # No need to set self.state['Taxi'] or Dropship here, if it's
-                # those, the next event is a Disembark anyway
-                ###############################################################
-
-            elif event_type in ('location', 'fsdjump', 'carrierjump'):
-                """
-                Notes on tracking of a player's location.
-
-                Body
-                ---
-                There are some caveats about tracking Body name, ID and type,
-                mostly due to close-orbiting binary planets/moons.
-
-                Presence on or near a Body is indicated in several scenarios:
-
-                1. When the player logs in.
-                2. When the player's location changes due to being docked
-                  on a Fleet Carrier when it jumps.
-                3. When the player flies within Orbital Cruise range of a
-                  Body.
-
-                For the first case this will always be a 'Location' event.
-                If landed on a Body, or docked at a surface port then this
-                will be indicated.  However, if docked at an orbital station
-                the 'Body' is the name of that station, with 'BodyType' having
-                'Station' as its value.
-
-                In the second case although it *should* be a 'CarrierJump'
-                event, for a while now it's actually been a 'Location' event.
-                This should follow the same rules as being docked at an
-                orbital station.
-
-                For the last case there are some caveats to do with close
-                orbiting binary bodies:
-
-                1. 'ApproachBody' indicates presence near the Body in question.
-                2. 'LeaveBody' indicates the player is no longer considered
-                  to be near the Body.  This is specifically when no longer
-                  in Orbital Cruise around the Body such that the HUD for that
-                  has been switched out for the normal SuperCruise one.
-                3. 'SupercruiseExit' does not indicate any change of presence
-                  near a Body.
-                4. 'SupercruiseEntry' *also* **DOES NOT** indicate that the
-                  player is no longer near the Body.  They can easily utilise
-                  Orbital Cruise to rapidly travel around the Body and then
-                  land on it again **without a fresh 'ApproachBody'** event.
-
-                  The only way to check for this is to utilise the Body (name)
-                  present in `Status.json` data, as this *will* correctly
-                  reflect the second Body.
-                """
-                ###############################################################
-                # Track: Body
-                ###############################################################
-                if event_type in ('location', 'carrierjump'):
-                    # We're not guaranteeing this is a planet, rather than a
-                    # station.
-                    self.state['Body'] = entry.get('Body')
-                    self.state['BodyID'] = entry.get('BodyID')
-                    self.state['BodyType'] = entry.get('BodyType')
-
-                elif event_type == 'fsdjump':
-                    self.state['Body'] = None
-                    self.state['BodyID'] = None
-                    self.state['BodyType'] = None
-                ###############################################################
-
-                ###############################################################
-                # Track: IsDocked
-                ###############################################################
-                if event_type == 'location':
-                    logger.trace_if('journal.locations', '"Location" event')
-                    self.state['IsDocked'] = entry.get('Docked', False)
-                ###############################################################
-
-                ###############################################################
-                # Track: Current System
-                ###############################################################
-                if 'StarPos' in entry:
-                    # Plugins need this as well, so copy in state
-                    self.state['StarPos'] = tuple(entry['StarPos'])
+        self.state['ShipID'] = entry['ShipID']
+        self.state['ShipIdent'] = entry['ShipIdent']
+
+        # Newly purchased ships can show a ShipName of "" initially,
+        # and " " after a game restart/relog.
+        # Players *can* also purposefully set " " as the name, but anyone
+        # doing that gets to live with EDMC showing ShipType instead.
+        if entry['ShipName'] and entry['ShipName'] not in ('', ' '):
+            self.state['ShipName'] = entry['ShipName']
+
+        self.state['ShipType'] = self.canonicalise(entry['Ship'])
+        self.state['HullValue'] = entry.get('HullValue')  # not present on exiting Outfitting
+        self.state['ModulesValue'] = entry.get('ModulesValue')  # not present on exiting Outfitting
+        self.state['UnladenMass'] = entry.get('UnladenMass')
+        self.state['CargoCapacity'] = entry.get('CargoCapacity')
+        self.state['MaxJumpRange'] = entry.get('MaxJumpRange')
+        self.state["FuelCapacity"] = {name: entry.get("FuelCapacity", {}).get(name) for name in
+                                      ("Main", "Reserve")}
+        self.state['Rebuy'] = entry.get('Rebuy')
+        # Remove spurious differences between initial Loadout event and subsequent
+        self.state['Modules'] = {}
+        for module in entry['Modules']:
+            module = dict(module)
+            module['Item'] = self.canonicalise(module['Item'])
+            if ('Hardpoint' in module['Slot'] and
+                not module['Slot'].startswith('TinyHardpoint') and
+                    module.get('AmmoInClip') == module.get('AmmoInHopper') == 1):  # lasers
+                module.pop('AmmoInClip')
+                module.pop('AmmoInHopper')
+
+            self.state['Modules'][module['Slot']] = module
+        # SLEF
+        initial_dict: dict[str, dict[str, Any]] = {
+            "header": {"appName": appname, "appVersion": str(appversion())}
+        }
+        data_dict = {}
+        for module in entry['Modules']:
+            if module.get('Slot') == 'FuelTank':
+                cap = module['Item'].split('size')
+                cap = cap[1].split('_')
+                cap = 2 ** int(cap[0])
+                ship = ship_name_map[entry["Ship"]]
+                fuel = {'Main': cap, 'Reserve': ships[ship]['reserveFuelCapacity']}
+                data_dict.update({"FuelCapacity": fuel})
+        data_dict.update({
+            'Ship': entry["Ship"],
+            'ShipName': entry['ShipName'],
+            'ShipIdent': entry['ShipIdent'],
+            'HullValue': entry.get('HullValue'),  # type: ignore
+            'ModulesValue': entry.get('ModulesValue'),  # type: ignore
+            'Rebuy': entry['Rebuy'],
+            'MaxJumpRange': entry['MaxJumpRange'],
+            'UnladenMass': entry['UnladenMass'],
+            'CargoCapacity': entry['CargoCapacity'],
+            'Modules': entry['Modules'],
+        })
+        initial_dict.update({'data': data_dict})
+        output = json.dumps(initial_dict, indent=4)
+        self.slef = str(f"[{output}]")
+
+    @journal_event('modulebuy')
+    def _parse_modulebuy(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Modules'][entry['Slot']] = {
+            'Slot':     entry['Slot'],
+            'Item':     self.canonicalise(entry['BuyItem']),
+            'On':       True,
+            'Priority': 1,
+            'Health':   1.0,
+            'Value':    entry['BuyPrice'],
+        }
 
-                else:
-                    logger.warning(f"'{event_type}' event without 'StarPos' !!!:\n{entry}\n")
+        self.state['Credits'] -= entry.get('BuyPrice', 0)
 
-                if 'SystemAddress' not in entry:
-                    logger.warning(f"{event_type} event without SystemAddress !!!:\n{entry}\n")
+    @journal_event('moduleretrieve')
+    def _parse_moduleretrieve(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
 
-                # But we'll still *use* the value, because if a 'location' event doesn't
-                # have this we've still moved and now don't know where and MUST NOT
-                # continue to use any old value.
-                # Yes, explicitly state `None` here, so it's crystal clear.
-                self.state['SystemAddress'] = entry.get('SystemAddress', None)
+    @journal_event('modulesell')
+    def _parse_modulesell(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Modules'].pop(entry['Slot'], None)
+        self.state['Credits'] += entry.get('SellPrice', 0)
 
-                self.state['SystemPopulation'] = entry.get('Population')
+    @journal_event('modulesellremote')
+    def _parse_modulesellremote(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('SellPrice', 0)
 
-                if entry['StarSystem'] == 'ProvingGround':
-                    self.state['SystemName'] = 'CQC'
+    @journal_event('modulestore')
+    def _parse_modulestore(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Modules'].pop(entry['Slot'], None)
+        self.state['Credits'] -= entry.get('Cost', 0)
 
-                else:
-                    self.state['SystemName'] = entry['StarSystem']
-                ###############################################################
-
-                ###############################################################
-                # Track: Current station, if applicable
-                ###############################################################
-                if event_type == 'fsdjump':
-                    self.state['StationName'] = None
-                    self.state['MarketID'] = None
-                    self.state['StationType'] = None
-                    self.stationservices = None
+    @journal_event('moduleswap')
+    def _parse_moduleswap(self, entry: MutableMapping[str, Any]) -> None:
+        to_item = self.state['Modules'].get(entry['ToSlot'])
+        to_slot = entry['ToSlot']
+        from_slot = entry['FromSlot']
+        modules = self.state['Modules']
+        modules[to_slot] = modules[from_slot]
+        if to_item:
+            modules[from_slot] = to_item
 
-                else:
-                    self.state['StationName'] = entry.get('StationName')  # It may be None
-                    # If on foot in-station 'Docked' is false, but we have a
-                    # 'BodyType' of 'Station', and the 'Body' is the station name
-                    # NB: No MarketID
-                    if entry.get('BodyType') and entry['BodyType'] == 'Station':
-                        self.state['StationName'] = entry.get('Body')
-
-                    self.state['MarketID'] = entry.get('MarketID')  # May be None
-                    self.state['StationType'] = entry.get('StationType')  # May be None
-                    self.stationservices = entry.get('StationServices')  # None in Odyssey for on-foot 'Location'
-                ###############################################################
-
-                ###############################################################
-                # Track: Whether in a Taxi/Dropship
-                ###############################################################
-                self.state['Taxi'] = entry.get('Taxi', None)
-                if not self.state['Taxi']:
-                    self.state['Dropship'] = None
-                ###############################################################
-
-            elif event_type == 'approachbody':
-                self.state['Body'] = entry['Body']
-                self.state['BodyID'] = entry.get('BodyID')
-                # This isn't in the event, but Journal doc for ApproachBody says:
-                #   when in Supercruise, and distance from planet drops to within the 'Orbital Cruise' zone
-                # Used in plugins/eddn.py for setting entry Body/BodyType
-                # on 'docked' events when Planetary.
-                self.state['BodyType'] = 'Planet'
-
-            elif event_type == 'leavebody':
-                # Triggered when ship goes above Orbital Cruise altitude, such
-                # that a new 'ApproachBody' would get triggered if the ship
-                # went back down.
-                self.state['Body'] = None
-                self.state['BodyID'] = None
-                self.state['BodyType'] = None
-
-            elif event_type == 'supercruiseentry':
-                # We only clear Body state if the Type is Station.  This is
-                # because we won't get a fresh ApproachBody if we don't leave
-                # Orbital Cruise but land again.
-                if self.state['BodyType'] == 'Station':
-                    self.state['Body'] = None
-                    self.state['BodyID'] = None
-                    self.state['BodyType'] = None
-
-                ###############################################################
-                # Track: Current station, if applicable
-                ###############################################################
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                self.state['StationType'] = None
-                self.stationservices = None
-                ###############################################################
-
-            elif event_type == 'music':
-                if entry['MusicTrack'] == 'MainMenu':
-                    # We'll get new Body state when the player logs back into
-                    # the game.
-                    self.state['Body'] = None
-                    self.state['BodyID'] = None
-                    self.state['BodyType'] = None
-
-            elif event_type in ('rank', 'promotion'):
-                payload = dict(entry)
-                payload.pop('event')
-                payload.pop('timestamp')
-
-                self.state['Rank'].update({k: (v, 0) for k, v in payload.items()})
-
-            elif event_type == 'progress':
-                rank = self.state['Rank']
-                for k, v in entry.items():
-                    if k in rank:
-                        # perhaps not taken promotion mission yet
-                        rank[k] = (rank[k][0], min(v, 100))
-
-            elif event_type in ('reputation', 'statistics'):
-                payload = dict(entry)
-                payload.pop('event')
-                payload.pop('timestamp')
-                # NB: We need the original casing for these keys
-                self.state[entry['event']] = payload
-
-            elif event_type == 'engineerprogress':
-                # Sanity check - at least once the 'Engineer' (name) was missing from this in early
-                # Odyssey 4.0.0.100.  Might only have been a server issue causing incomplete data.
-
-                if self.event_valid_engineerprogress(entry):
-                    engineers = self.state['Engineers']
-                    if 'Engineers' in entry:  # Startup summary
-                        self.state['Engineers'] = {
-                            e['Engineer']: ((e['Rank'], e.get('RankProgress', 0)) if 'Rank' in e else e['Progress'])
-                            for e in entry['Engineers']
-                        }
-
-                    else:  # Promotion
-                        engineer = entry['Engineer']
-                        if 'Rank' in entry:
-                            engineers[engineer] = (entry['Rank'], entry.get('RankProgress', 0))
-
-                        else:
-                            engineers[engineer] = entry['Progress']
-
-            elif event_type == 'cargo' and entry.get('Vessel') == 'Ship':
-                self.state['Cargo'] = defaultdict(int)
-                # From 3.3 full Cargo event (after the first one) is written to a separate file
-                if 'Inventory' not in entry:
-                    with open(join(self.currentdir, 'Cargo.json'), 'rb') as h:  # type: ignore
-                        entry = json.load(h)
-                        self.state['CargoJSON'] = entry
-
-                clean = self.coalesce_cargo(entry['Inventory'])
-
-                self.state['Cargo'].update({self.canonicalise(x['Name']): x['Count'] for x in clean})
-
-            elif event_type == 'cargotransfer':
-                for c in entry['Transfers']:
-                    name = self.canonicalise(c['Type'])
-                    if c['Direction'] == 'toship':
-                        self.state['Cargo'][name] += c['Count']
-
-                    else:
-                        # So it's *from* the ship
-                        self.state['Cargo'][name] -= c['Count']
-
-            elif event_type == 'shiplocker':
-                # As of 4.0.0.400 (2021-06-10)
-                # "ShipLocker" will be a full list written to the journal at startup/boarding, and also
-                # written to a separate shiplocker.json file - other updates will just update that file and mention it
-                # has changed with an empty shiplocker event in the main journal.
-
-                # Always attempt loading of this, but if it fails we'll hope this was
-                # a startup/boarding version and thus `entry` contains
-                # the data anyway.
-                currentdir_path = pathlib.Path(str(self.currentdir))
-                shiplocker_filename = currentdir_path / 'ShipLocker.json'
-                shiplocker_max_attempts = 5
-                shiplocker_fail_sleep = 0.01
-                attempts = 0
-                while attempts < shiplocker_max_attempts:
-                    attempts += 1
-                    try:
-                        with open(shiplocker_filename, 'rb') as h:
-                            entry = json.load(h)
-                            self.state['ShipLockerJSON'] = entry
-                            break
-
-                    except FileNotFoundError:
-                        logger.warning('ShipLocker event but no ShipLocker.json file')
-                        sleep(shiplocker_fail_sleep)
-                        pass
-
-                    except json.JSONDecodeError as e:
-                        logger.warning(f'ShipLocker.json failed to decode:\n{e!r}\n')
-                        sleep(shiplocker_fail_sleep)
-                        pass
+        else:
+            modules.pop(from_slot, None)
 
-                else:
-                    logger.warning(f'Failed to load & decode shiplocker after {shiplocker_max_attempts} tries. '
-                                   'Giving up.')
-
-                if not all(t in entry for t in ('Components', 'Consumables', 'Data', 'Items')):
-                    logger.warning('ShipLocker event is missing at least one category')
-
-                # This event has the current totals, so drop any current data
-                self.state['Component'] = defaultdict(int)
-                self.state['Consumable'] = defaultdict(int)
-                self.state['Item'] = defaultdict(int)
-                self.state['Data'] = defaultdict(int)
-
-                clean_components = self.coalesce_cargo(entry['Components'])
-                self.state['Component'].update(
-                    {self.canonicalise(x['Name']): x['Count'] for x in clean_components}
-                )
-
-                clean_consumables = self.coalesce_cargo(entry['Consumables'])
-                self.state['Consumable'].update(
-                    {self.canonicalise(x['Name']): x['Count'] for x in clean_consumables}
-                )
-
-                clean_items = self.coalesce_cargo(entry['Items'])
-                self.state['Item'].update(
-                    {self.canonicalise(x['Name']): x['Count'] for x in clean_items}
-                )
-
-                clean_data = self.coalesce_cargo(entry['Data'])
-                self.state['Data'].update(
-                    {self.canonicalise(x['Name']): x['Count'] for x in clean_data}
-                )
-
-            # Journal v31 implies this was removed before Odyssey launch
-            elif event_type == 'backpackmaterials':
-                # Last seen in a 4.0.0.102 journal file.
-                logger.warning(f'We have a BackPackMaterials event, defunct since > 4.0.0.102 ?:\n{entry}\n')
-                pass
+    @journal_event('undocked')
+    def _parse_undocked(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        self.state['StationType'] = None
+        self.stationservices = None
+        self.state['IsDocked'] = False
+
+    @journal_event('embark')
+    def _parse_embark(self, entry: MutableMapping[str, Any]) -> None:
+        # This event is logged when a player (on foot) gets into a ship or SRV
+        # Parameters:
+        #     • SRV: true if getting into SRV, false if getting into a ship
+        #     • Taxi: true when boarding a taxi transport ship
+        #     • Multicrew: true when boarding another player’s vessel
+        #     • ID: player’s ship ID (if players own vessel)
+        #     • StarSystem
+        #     • SystemAddress
+        #     • Body
+        #     • BodyID
+        #     • OnStation: bool
+        #     • OnPlanet: bool
+        #     • StationName (if at a station)
+        #     • StationType
+        #     • MarketID
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        if entry.get('OnStation'):
+            self.state['StationName'] = entry.get('StationName', '')
+            self.state['MarketID'] = entry.get('MarketID', '')
+
+        self.state['OnFoot'] = False
+        self.state['Taxi'] = entry['Taxi']
+
+        # We can't now have anything in the BackPack, it's all in the
+        # ShipLocker.
+        self.backpack_set_empty()
+
+    @journal_event('disembark')
+    def _parse_disembark(self, entry: MutableMapping[str, Any]) -> None:
+        # This event is logged when the player steps out of a ship or SRV
+        #
+        # Parameters:
+        #     • SRV: true if getting out of SRV, false if getting out of a ship
+        #     • Taxi: true when getting out of a taxi transport ship
+        #     • Multicrew: true when getting out of another player’s vessel
+        #     • ID: player’s ship ID (if players own vessel)
+        #     • StarSystem
+        #     • SystemAddress
+        #     • Body
+        #     • BodyID
+        #     • OnStation: bool
+        #     • OnPlanet: bool
+        #     • StationName (if at a station)
+        #     • StationType
+        #     • MarketID
+
+        if entry.get('OnStation', False):
+            self.state['StationName'] = entry.get('StationName', '')
+
+        else:
+            self.state['StationName'] = None
+
+        self.state['OnFoot'] = True
+        if self.state['Taxi'] is not None and self.state['Taxi'] != entry.get('Taxi', False):
+            logger.warning('Disembarked from a taxi but we didn\'t know we were in a taxi?')
+
+        self.state['Taxi'] = False
+        self.state['Dropship'] = False
+
+    @journal_event('dropshipdeploy')
+    def _parse_dropshipdeploy(self, entry: MutableMapping[str, Any]) -> None:
+        # We're definitely on-foot now
+        self.state['OnFoot'] = True
+        self.state['Taxi'] = False
+        self.state['Dropship'] = False
+
+    @journal_event('supercruiseexit')
+    def _parse_supercruiseexit(self, entry: MutableMapping[str, Any]) -> None:
+        # For any orbital station we have no way of determining the body
+        # it orbits:
+        #
+        #   In-ship Status.json doesn't specify this.
+        #   On-foot Status.json lists the station itself as Body.
+        #   Location for stations (on-foot or in-ship) has station as Body.
+        #   SupercruiseExit (own ship or taxi) lists the station as the Body.
+        if entry['BodyType'] == 'Station':
+            self.state['Body'] = None
+            self.state['BodyID'] = None
+
+    @journal_event('docked')
+    def _parse_docked(self, entry: MutableMapping[str, Any]) -> None:
+        ###############################################################
+        # Track: Station
+        ###############################################################
+        self.state['IsDocked'] = True
+        self.state['StationName'] = entry.get('StationName')  # It may be None
+        self.state['MarketID'] = entry.get('MarketID')  # It may be None
+        self.state['StationType'] = entry.get('StationType')  # It may be None
+        self.stationservices = entry.get('StationServices')  # None under E:D < 2.4
+
+        # No need to set self.state['Taxi'] or Dropship here, if it's
+        # those, the next event is a Disembark anyway
+        ###############################################################
+
+    @journal_event('location', 'fsdjump', 'carrierjump')
+    def _parse_location(self, entry: MutableMapping[str, Any]) -> None:
+        """
+        Notes on tracking of a player's location.
+
+        Body
+        ---
+        There are some caveats about tracking Body name, ID and type,
+        mostly due to close-orbiting binary planets/moons.
+
+        Presence on or near a Body is indicated in several scenarios:
+
+        1. When the player logs in.
+        2. When the player's location changes due to being docked
+          on a Fleet Carrier when it jumps.
+        3. When the player flies within Orbital Cruise range of a
+          Body.
+
+        For the first case this will always be a 'Location' event.
+        If landed on a Body, or docked at a surface port then this
+        will be indicated.  However, if docked at an orbital station
+        the 'Body' is the name of that station, with 'BodyType' having
+        'Station' as its value.
+
+        In the second case although it *should* be a 'CarrierJump'
+        event, for a while now it's actually been a 'Location' event.
+        This should follow the same rules as being docked at an
+        orbital station.
+
+        For the last case there are some caveats to do with close
+        orbiting binary bodies:
+
+        1. 'ApproachBody' indicates presence near the Body in question.
+        2. 'LeaveBody' indicates the player is no longer considered
+          to be near the Body.  This is specifically when no longer
+          in Orbital Cruise around the Body such that the HUD for that
+          has been switched out for the normal SuperCruise one.
+        3. 'SupercruiseExit' does not indicate any change of presence
+          near a Body.
+        4. 'SupercruiseEntry' *also* **DOES NOT** indicate that the
+          player is no longer near the Body.  They can easily utilise
+          Orbital Cruise to rapidly travel around the Body and then
+          land on it again **without a fresh 'ApproachBody'** event.
+
+          The only way to check for this is to utilise the Body (name)
+          present in `Status.json` data, as this *will* correctly
+          reflect the second Body.
+        """
+        event_type = entry['event'].lower()
+        ###############################################################
+        # Track: Body
+        ###############################################################
+        if event_type in ('location', 'carrierjump'):
+            # We're not guaranteeing this is a planet, rather than a
+            # station.
+            self.state['Body'] = entry.get('Body')
+            self.state['BodyID'] = entry.get('BodyID')
+            self.state['BodyType'] = entry.get('BodyType')
+
+        elif event_type == 'fsdjump':
+            self.state['Body'] = None
+            self.state['BodyID'] = None
+            self.state['BodyType'] = None
+        ###############################################################
+
+        ###############################################################
+        # Track: IsDocked
+        ###############################################################
+        if event_type == 'location':
+            logger.trace_if('journal.locations', '"Location" event')
+            self.state['IsDocked'] = entry.get('Docked', False)
+        ###############################################################
 
-            elif event_type in ('backpack', 'resupply'):
-                # as of v4.0.0.600, a `resupply` event is dropped when resupplying your suit at your ship.
-                # This event writes the same data as a backpack event. It will also be followed by a ShipLocker
-                # but that follows normal behaviour in its handler.
+        ###############################################################
+        # Track: Current System
+        ###############################################################
+        if 'StarPos' in entry:
+            # Plugins need this as well, so copy in state
+            self.state['StarPos'] = tuple(entry['StarPos'])
 
-                # TODO: v31 doc says this is`backpack.json` ... but Howard Chalkley
-                #       said it's `Backpack.json`
-                backpack_file = pathlib.Path(str(self.currentdir)) / 'Backpack.json'
-                backpack_data = None
+        else:
+            logger.warning(f"'{event_type}' event without 'StarPos' !!!:\n{entry}\n")
 
-                if not backpack_file.exists():
-                    logger.warning(f'Failed to find backpack.json file as it appears not to exist? {backpack_file=}')
+        if 'SystemAddress' not in entry:
+            logger.warning(f"{event_type} event without SystemAddress !!!:\n{entry}\n")
 
-                else:
-                    backpack_data = backpack_file.read_bytes()
+        # But we'll still *use* the value, because if a 'location' event doesn't
+        # have this we've still moved and now don't know where and MUST NOT
+        # continue to use any old value.
+        # Yes, explicitly state `None` here, so it's crystal clear.
+        self.state['SystemAddress'] = entry.get('SystemAddress', None)
+
+        self.state['SystemPopulation'] = entry.get('Population')
+
+        if entry['StarSystem'] == 'ProvingGround':
+            self.state['SystemName'] = 'CQC'
 
-                parsed = None
+        else:
+            self.state['SystemName'] = entry['StarSystem']
+        ###############################################################
+
+        ###############################################################
+        # Track: Current station, if applicable
+        ###############################################################
+        if event_type == 'fsdjump':
+            self.state['StationName'] = None
+            self.state['MarketID'] = None
+            self.state['StationType'] = None
+            self.stationservices = None
+
+        else:
+            self.state['StationName'] = entry.get('StationName')  # It may be None
+            # If on foot in-station 'Docked' is false, but we have a
+            # 'BodyType' of 'Station', and the 'Body' is the station name
+            # NB: No MarketID
+            if entry.get('BodyType') and entry['BodyType'] == 'Station':
+                self.state['StationName'] = entry.get('Body')
+
+            self.state['MarketID'] = entry.get('MarketID')  # May be None
+            self.state['StationType'] = entry.get('StationType')  # May be None
+            self.stationservices = entry.get('StationServices')  # None in Odyssey for on-foot 'Location'
+        ###############################################################
+
+        ###############################################################
+        # Track: Whether in a Taxi/Dropship
+        ###############################################################
+        self.state['Taxi'] = entry.get('Taxi', None)
+        if not self.state['Taxi']:
+            self.state['Dropship'] = None
+        ###############################################################
+
+    @journal_event('approachbody')
+    def _parse_approachbody(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Body'] = entry['Body']
+        self.state['BodyID'] = entry.get('BodyID')
+        # This isn't in the event, but Journal doc for ApproachBody says:
+        #   when in Supercruise, and distance from planet drops to within the 'Orbital Cruise' zone
+        # Used in plugins/eddn.py for setting entry Body/BodyType
+        # on 'docked' events when Planetary.
+        self.state['BodyType'] = 'Planet'
+
+    @journal_event('leavebody')
+    def _parse_leavebody(self, entry: MutableMapping[str, Any]) -> None:
+        # Triggered when ship goes above Orbital Cruise altitude, such
+        # that a new 'ApproachBody' would get triggered if the ship
+        # went back down.
+        self.state['Body'] = None
+        self.state['BodyID'] = None
+        self.state['BodyType'] = None
 
-                if backpack_data is None:
-                    logger.warning('Unable to read backpack data!')
+    @journal_event('supercruiseentry')
+    def _parse_supercruiseentry(self, entry: MutableMapping[str, Any]) -> None:
+        # We only clear Body state if the Type is Station.  This is
+        # because we won't get a fresh ApproachBody if we don't leave
+        # Orbital Cruise but land again.
+        if self.state['BodyType'] == 'Station':
+            self.state['Body'] = None
+            self.state['BodyID'] = None
+            self.state['BodyType'] = None
+
+        ###############################################################
+        # Track: Current station, if applicable
+        ###############################################################
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        self.state['StationType'] = None
+        self.stationservices = None
+        ###############################################################
+
+    @journal_event('music')
+    def _parse_music(self, entry: MutableMapping[str, Any]) -> None:
+        if entry['MusicTrack'] == 'MainMenu':
+            # We'll get new Body state when the player logs back into
+            # the game.
+            self.state['Body'] = None
+            self.state['BodyID'] = None
+            self.state['BodyType'] = None
+
+    @journal_event('rank', 'promotion')
+    def _parse_rank(self, entry: MutableMapping[str, Any]) -> None:
+        payload = dict(entry)
+        payload.pop('event')
+        payload.pop('timestamp')
+
+        self.state['Rank'].update({k: (v, 0) for k, v in payload.items()})
+
+    @journal_event('progress')
+    def _parse_progress(self, entry: MutableMapping[str, Any]) -> None:
+        rank = self.state['Rank']
+        for k, v in entry.items():
+            if k in rank:
+                # perhaps not taken promotion mission yet
+                rank[k] = (rank[k][0], min(v, 100))
+
+    @journal_event('reputation', 'statistics')
+    def _parse_reputation(self, entry: MutableMapping[str, Any]) -> None:
+        payload = dict(entry)
+        payload.pop('event')
+        payload.pop('timestamp')
+        # NB: We need the original casing for these keys
+        self.state[entry['event']] = payload
+
+    @journal_event('engineerprogress')
+    def _parse_engineerprogress(self, entry: MutableMapping[str, Any]) -> None:
+        # Sanity check - at least once the 'Engineer' (name) was missing from this in early
+        # Odyssey 4.0.0.100.  Might only have been a server issue causing incomplete data.
+
+        if self.event_valid_engineerprogress(entry):
+            engineers = self.state['Engineers']
+            if 'Engineers' in entry:  # Startup summary
+                self.state['Engineers'] = {
+                    e['Engineer']: ((e['Rank'], e.get('RankProgress', 0)) if 'Rank' in e else e['Progress'])
+                    for e in entry['Engineers']
+                }
 
-                elif len(backpack_data) == 0:
-                    logger.warning('Backpack.json was empty when we read it!')
+            else:  # Promotion
+                engineer = entry['Engineer']
+                if 'Rank' in entry:
+                    engineers[engineer] = (entry['Rank'], entry.get('RankProgress', 0))
 
                 else:
-                    try:
-                        parsed = json.loads(backpack_data)
+                    engineers[engineer] = entry['Progress']
 
-                    except json.JSONDecodeError:
-                        logger.exception('Unable to parse Backpack.json')
+    @journal_event('cargo')
+    def _parse_cargo(self, entry: MutableMapping[str, Any]) -> MutableMapping[str, Any] | None:
+        if entry.get('Vessel') != 'Ship':
+            return None
 
-                if parsed is not None:
-                    entry = parsed  # set entry so that it ends up in plugins with the right data
-                    # Store in monitor.state
-                    self.state['BackpackJSON'] = entry
+        self.state['Cargo'] = defaultdict(int)
+        # From 3.3 full Cargo event (after the first one) is written to a separate file
+        if 'Inventory' not in entry:
+            cargo_json = self.companion_files.read(self._companion_file('Cargo.json'))
+            if cargo_json is None:
+                raise ValueError('Cargo event but failed to read Cargo.json')
 
-                    # Assume this reflects the current state when written
-                    self.backpack_set_empty()
+            entry = cargo_json
+            self.state['CargoJSON'] = entry
 
-                    clean_components = self.coalesce_cargo(entry['Components'])
-                    self.state['BackPack']['Component'].update(
-                        {self.canonicalise(x['Name']): x['Count'] for x in clean_components}
-                    )
+        clean = self.coalesce_cargo(entry['Inventory'])
 
-                    clean_consumables = self.coalesce_cargo(entry['Consumables'])
-                    self.state['BackPack']['Consumable'].update(
-                        {self.canonicalise(x['Name']): x['Count'] for x in clean_consumables}
-                    )
+        self.state['Cargo'].update({self.canonicalise(x['Name']): x['Count'] for x in clean})
 
-                    clean_items = self.coalesce_cargo(entry['Items'])
-                    self.state['BackPack']['Item'].update(
-                        {self.canonicalise(x['Name']): x['Count'] for x in clean_items}
-                    )
+        return entry
 
-                    clean_data = self.coalesce_cargo(entry['Data'])
-                    self.state['BackPack']['Data'].update(
-                        {self.canonicalise(x['Name']): x['Count'] for x in clean_data}
-                    )
+    @journal_event('cargotransfer')
+    def _parse_cargotransfer(self, entry: MutableMapping[str, Any]) -> None:
+        for c in entry['Transfers']:
+            name = self.canonicalise(c['Type'])
+            if c['Direction'] == 'toship':
+                self.state['Cargo'][name] += c['Count']
 
-            elif event_type == 'backpackchange':
-                # Changes to Odyssey Backpack contents *other* than from a Transfer
-                # See TransferMicroResources event for that.
+            else:
+                # So it's *from* the ship
+                self.state['Cargo'][name] -= c['Count']
+
+    @journal_event('shiplocker')
+    def _parse_shiplocker(self, entry: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        # As of 4.0.0.400 (2021-06-10)
+        # "ShipLocker" will be a full list written to the journal at startup/boarding, and also
+        # written to a separate shiplocker.json file - other updates will just update that file and mention it
+        # has changed with an empty shiplocker event in the main journal.
+
+        # Always attempt loading of this, but if it fails we'll hope this was
+        # a startup/boarding version and thus `entry` contains
+        # the data anyway.
+        shiplocker = self.companion_files.read_waiting(self._companion_file('ShipLocker.json'))
+        if shiplocker is not None:
+            entry = shiplocker
+            self.state['ShipLockerJSON'] = entry
 
-                if entry.get('Added') is not None:
-                    changes = 'Added'
+        else:
+            logger.warning(
+                f'Failed to load & decode shiplocker after {CompanionFiles.RETRY_ATTEMPTS + 1} tries. Giving up.'
+            )
 
-                elif entry.get('Removed') is not None:
-                    changes = 'Removed'
+        if not all(t in entry for t in ('Components', 'Consumables', 'Data', 'Items')):
+            logger.warning('ShipLocker event is missing at least one category')
 
-                else:
-                    logger.warning(f'BackpackChange with neither Added nor Removed: {entry=}')
-                    changes = ''
+        # This event has the current totals, so drop any current data
+        self.state['Component'] = defaultdict(int)
+        self.state['Consumable'] = defaultdict(int)
+        self.state['Item'] = defaultdict(int)
+        self.state['Data'] = defaultdict(int)
 
-                if changes != '':
-                    for c in entry[changes]:
-                        category = self.category(c['Type'])
-                        name = self.canonicalise(c['Name'])
+        clean_components = self.coalesce_cargo(entry['Components'])
+        self.state['Component'].update(
+            {self.canonicalise(x['Name']): x['Count'] for x in clean_components}
+        )
 
-                        if changes == 'Removed':
-                            self.state['BackPack'][category][name] -= c['Count']
+        clean_consumables = self.coalesce_cargo(entry['Consumables'])
+        self.state['Consumable'].update(
+            {self.canonicalise(x['Name']): x['Count'] for x in clean_consumables}
+        )
 
-                        elif changes == 'Added':
-                            self.state['BackPack'][category][name] += c['Count']
+        clean_items = self.coalesce_cargo(entry['Items'])
+        self.state['Item'].update(
+            {self.canonicalise(x['Name']): x['Count'] for x in clean_items}
+        )
 
-                # Paranoia check to see if anything has gone negative.
-                # As of Odyssey Alpha Phase 1 Hotfix 2 keeping track of BackPack
-                # materials is impossible when used/picked up anyway.
-                for c in self.state['BackPack']:
-                    for m in self.state['BackPack'][c]:
-                        if self.state['BackPack'][c][m] < 0:
-                            self.state['BackPack'][c][m] = 0
+        clean_data = self.coalesce_cargo(entry['Data'])
+        self.state['Data'].update(
+            {self.canonicalise(x['Name']): x['Count'] for x in clean_data}
+        )
 
-            elif event_type == 'buymicroresources':
-                # From 4.0.0.400 we get an empty (see file) `ShipLocker` event,
-                # so we can ignore this for inventory purposes.
+        return entry
 
-                # But do record the credits balance change.
-                self.state['Credits'] -= entry.get('Price', 0)
+    # Journal v31 implies this was removed before Odyssey launch
+    @journal_event('backpackmaterials')
+    def _parse_backpackmaterials(self, entry: MutableMapping[str, Any]) -> None:
+        # Last seen in a 4.0.0.102 journal file.
+        logger.warning(f'We have a BackPackMaterials event, defunct since > 4.0.0.102 ?:\n{entry}\n')
+        pass
+
+    @journal_event('backpack', 'resupply')
+    def _parse_backpack(self, entry: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        # as of v4.0.0.600, a `resupply` event is dropped when resupplying your suit at your ship.
+        # This event writes the same data as a backpack event. It will also be followed by a ShipLocker
+        # but that follows normal behaviour in its handler.
+
+        # TODO: v31 doc says this is`backpack.json` ... but Howard Chalkley
+        #       said it's `Backpack.json`
+        parsed = self.companion_files.read(self._companion_file('Backpack.json'))
+        if parsed is None:
+            logger.warning('Unable to read backpack data!')
+
+        if parsed is not None:
+            entry = parsed  # set entry so that it ends up in plugins with the right data
+            # Store in monitor.state
+            self.state['BackpackJSON'] = entry
+
+            # Assume this reflects the current state when written
+            self.backpack_set_empty()
+
+            clean_components = self.coalesce_cargo(entry['Components'])
+            self.state['BackPack']['Component'].update(
+                {self.canonicalise(x['Name']): x['Count'] for x in clean_components}
+            )
 
-            elif event_type == 'sellmicroresources':
-                # As of 4.0.0.400 we can ignore this as an empty (see file)
-                # `ShipLocker` event is written for the full new inventory.
+            clean_consumables = self.coalesce_cargo(entry['Consumables'])
+            self.state['BackPack']['Consumable'].update(
+                {self.canonicalise(x['Name']): x['Count'] for x in clean_consumables}
+            )
 
-                # But still record the credits balance change.
-                self.state['Credits'] += entry.get('Price', 0)
+            clean_items = self.coalesce_cargo(entry['Items'])
+            self.state['BackPack']['Item'].update(
+                {self.canonicalise(x['Name']): x['Count'] for x in clean_items}
+            )
 
-            elif event_type in ('tradeMicroResources', 'collectitems', 'dropitems', 'useconsumable'):
-                # As of 4.0.0.400 we can ignore these as an empty (see file)
-                # `ShipLocker` event and/or a `BackpackChange` is also written.
-                pass
+            clean_data = self.coalesce_cargo(entry['Data'])
+            self.state['BackPack']['Data'].update(
+                {self.canonicalise(x['Name']): x['Count'] for x in clean_data}
+            )
 
-            # <https://forums.frontier.co.uk/threads/575010/>
-            # also there's one additional journal event that was missed out from
-            # this version of the docs: "SuitLoadout": # when starting on foot, or
-            # when disembarking from a ship, with the same info as found in "CreateSuitLoadout"
-            elif event_type == 'suitloadout':
-                suit_slotid, suitloadout_slotid = self.suitloadout_store_from_event(entry)
-                if not self.suit_and_loadout_setcurrent(suit_slotid, suitloadout_slotid):
-                    logger.error(f"Event was: {entry}")
-
-            elif event_type == 'switchsuitloadout':
-                # 4.0.0.101
-                #
-                # { "timestamp":"2021-05-21T10:39:43Z", "event":"SwitchSuitLoadout",
-                #   "SuitID":1700217809818876, "SuitName":"utilitysuit_class1",
-                #   "SuitName_Localised":"Maverick Suit", "LoadoutID":4293000002,
-                #   "LoadoutName":"K/P", "Modules":[ { "SlotName":"PrimaryWeapon1",
-                #   "SuitModuleID":1700217863661544,
-                #   "ModuleName":"wpn_m_assaultrifle_kinetic_fauto",
-                #   "ModuleName_Localised":"Karma AR-50" },
-                #   { "SlotName":"SecondaryWeapon", "SuitModuleID":1700216180036986,
-                #   "ModuleName":"wpn_s_pistol_plasma_charged",
-                #   "ModuleName_Localised":"Manticore Tormentor" } ] }
-                #
-                suitid, suitloadout_slotid = self.suitloadout_store_from_event(entry)
-                if not self.suit_and_loadout_setcurrent(suitid, suitloadout_slotid):
-                    logger.error(f"Event was: {entry}")
-
-            elif event_type == 'createsuitloadout':
-                # 4.0.0.101
-                #
-                # { "timestamp":"2021-05-21T11:13:15Z", "event":"CreateSuitLoadout", "SuitID":1700216165682989,
-                # "SuitName":"tacticalsuit_class1", "SuitName_Localised":"Dominator Suit", "LoadoutID":4293000004,
-                # "LoadoutName":"P/P/K", "Modules":[ { "SlotName":"PrimaryWeapon1", "SuitModuleID":1700216182854765,
-                # "ModuleName":"wpn_m_assaultrifle_plasma_fauto", "ModuleName_Localised":"Manticore Oppressor" },
-                # { "SlotName":"PrimaryWeapon2", "SuitModuleID":1700216190363340,
-                # "ModuleName":"wpn_m_shotgun_plasma_doublebarrel", "ModuleName_Localised":"Manticore Intimidator" },
-                # { "SlotName":"SecondaryWeapon", "SuitModuleID":1700217869872834,
-                # "ModuleName":"wpn_s_pistol_kinetic_sauto", "ModuleName_Localised":"Karma P-15" } ] }
-                #
-                suitid, suitloadout_slotid = self.suitloadout_store_from_event(entry)
-                # Creation doesn't mean equipping it
-                #  if not self.suit_and_loadout_setcurrent(suitid, suitloadout_slotid):
-                #      logger.error(f"Event was: {entry}")
-
-            elif event_type == 'deletesuitloadout':
-                # alpha4:
-                # { "timestamp":"2021-04-29T10:32:27Z", "event":"DeleteSuitLoadout", "SuitID":1698365752966423,
-                # "SuitName":"explorationsuit_class1", "SuitName_Localised":"Artemis Suit", "LoadoutID":4293000003,
-                # "LoadoutName":"Loadout 1" }
-
-                if self.state['SuitLoadouts']:
-                    loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
-                    try:
-                        self.state['SuitLoadouts'].pop(f'{loadout_id}')
-
-                    except KeyError:
-                        # This should no longer happen, as we're now handling CreateSuitLoadout properly
-                        logger.debug(f"loadout slot id {loadout_id} doesn't exist, not in last CAPI pull ?")
-
-            elif event_type == 'renamesuitloadout':
-                # alpha4
-                # Parameters:
-                #     • SuitID
-                #     • SuitName
-                #     • LoadoutID
-                #     • Loadoutname
-                # alpha4:
-                # { "timestamp":"2021-04-29T10:35:55Z", "event":"RenameSuitLoadout", "SuitID":1698365752966423,
-                # "SuitName":"explorationsuit_class1", "SuitName_Localised":"Artemis Suit", "LoadoutID":4293000003,
-                # "LoadoutName":"Art L/K" }
-                if self.state['SuitLoadouts']:
-                    loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
-                    try:
-                        self.state['SuitLoadouts'][loadout_id]['name'] = entry['LoadoutName']
-
-                    except KeyError:
-                        logger.debug(f"loadout slot id {loadout_id} doesn't exist, not in last CAPI pull ?")
-
-            elif event_type == 'buysuit':
-                # alpha4 :
-                # { "timestamp":"2021-04-29T09:03:37Z", "event":"BuySuit", "Name":"UtilitySuit_Class1",
-                # "Name_Localised":"Maverick Suit", "Price":150000, "SuitID":1698364934364699 }
-                loc_name = entry.get('Name_Localised', entry['Name'])
-                self.state['Suits'][entry['SuitID']] = {
-                    'name':      entry['Name'],
-                    'locName':   loc_name,
-                    'edmcName':  self.suit_sane_name(loc_name),
-                    'id':        None,  # Is this an FDev ID for suit type ?
-                    'suitId':    entry['SuitID'],
-                    'mods':      entry['SuitMods'],  # Suits can (rarely) be bought with modules installed
-                }
+        return entry
 
-                # update credits
-                if price := entry.get('Price') is None:
-                    logger.error(f"BuySuit didn't contain Price: {entry}")
+    @journal_event('backpackchange')
+    def _parse_backpackchange(self, entry: MutableMapping[str, Any]) -> None:
+        # Changes to Odyssey Backpack contents *other* than from a Transfer
+        # See TransferMicroResources event for that.
 
-                else:
-                    self.state['Credits'] -= price
-
-            elif event_type == 'sellsuit':
-                # Remove from known suits
-                # As of Odyssey Alpha Phase 2, Hotfix 5 (4.0.0.13) this isn't possible as this event
-                # doesn't contain the specific suit ID as per CAPI `suits` dict.
-                # alpha4
-                # This event is logged when a player sells a flight suit
-                #
-                # Parameters:
-                #     • Name
-                #     • Price
-                #     • SuitID
-                # alpha4:
-                # { "timestamp":"2021-04-29T09:15:51Z", "event":"SellSuit", "SuitID":1698364937435505,
-                # "Name":"explorationsuit_class1", "Name_Localised":"Artemis Suit", "Price":90000 }
-                if self.state['Suits']:
-                    try:
-                        self.state['Suits'].pop(entry['SuitID'])
-
-                    except KeyError:
-                        logger.debug(f"SellSuit for a suit we didn't know about? {entry['SuitID']}")
-
-                    # update credits total
-                    if price := entry.get('Price') is None:
-                        logger.error(f"SellSuit didn't contain Price: {entry}")
-
-                    else:
-                        self.state['Credits'] += price
-
-            elif event_type == 'upgradesuit':
-                # alpha4
-                # This event is logged when the player upgrades their flight suit
-                #
-                # Parameters:
-                #     • Name
-                #     • SuitID
-                #     • Class
-                #     • Cost
-                # TODO: Update self.state['Suits'] when we have an example to work from
-                self.state['Credits'] -= entry.get('Cost', 0)
-
-            elif event_type == 'loadoutequipmodule':
-                # alpha4:
-                # { "timestamp":"2021-04-29T11:11:13Z", "event":"LoadoutEquipModule", "LoadoutName":"Dom L/K/K",
-                # "SuitID":1698364940285172, "SuitName":"tacticalsuit_class1", "SuitName_Localised":"Dominator Suit",
-                # "LoadoutID":4293000001, "SlotName":"PrimaryWeapon2", "ModuleName":"wpn_m_assaultrifle_laser_fauto",
-                # "ModuleName_Localised":"TK Aphelion", "SuitModuleID":1698372938719590 }
-                if self.state['SuitLoadouts']:
-                    loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
-                    try:
-                        self.state['SuitLoadouts'][loadout_id]['slots'][entry['SlotName']] = {
-                            'name':           entry['ModuleName'],
-                            'locName':        entry.get('ModuleName_Localised', entry['ModuleName']),
-                            'id':             None,
-                            'weaponrackId':   entry['SuitModuleID'],
-                            'locDescription': '',
-                            'class':          entry['Class'],
-                            'mods':           entry['WeaponMods']
-                        }
-
-                    except KeyError:
-                        # TODO: Log the exception details too, for some clue about *which* key
-                        logger.error(f"LoadoutEquipModule: {entry}")
-
-            elif event_type == 'loadoutremovemodule':
-                # alpha4 - triggers if selecting an already-equipped weapon into a different slot
-                # { "timestamp":"2021-04-29T11:11:13Z", "event":"LoadoutRemoveModule", "LoadoutName":"Dom L/K/K",
-                # "SuitID":1698364940285172, "SuitName":"tacticalsuit_class1", "SuitName_Localised":"Dominator Suit",
-                # "LoadoutID":4293000001, "SlotName":"PrimaryWeapon1", "ModuleName":"wpn_m_assaultrifle_laser_fauto",
-                # "ModuleName_Localised":"TK Aphelion", "SuitModuleID":1698372938719590 }
-                if self.state['SuitLoadouts']:
-                    loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
-                    try:
-                        self.state['SuitLoadouts'][loadout_id]['slots'].pop(entry['SlotName'])
-
-                    except KeyError:
-                        logger.error(f"LoadoutRemoveModule: {entry}")
-
-            elif event_type == 'buyweapon':
-                # alpha4
-                # { "timestamp":"2021-04-29T11:10:51Z", "event":"BuyWeapon", "Name":"Wpn_M_AssaultRifle_Laser_FAuto",
-                # "Name_Localised":"TK Aphelion", "Price":125000, "SuitModuleID":1698372938719590 }
-                # update credits
-                if price := entry.get('Price') is None:
-                    logger.error(f"BuyWeapon didn't contain Price: {entry}")
+        if entry.get('Added') is not None:
+            changes = 'Added'
 
-                else:
-                    self.state['Credits'] -= price
-
-            elif event_type == 'sellweapon':
-                # We're not actually keeping track of all owned weapons, only those in
-                # Suit Loadouts.
-                # alpha4:
-                # { "timestamp":"2021-04-29T10:50:34Z", "event":"SellWeapon", "Name":"wpn_m_assaultrifle_laser_fauto",
-                # "Name_Localised":"TK Aphelion", "Price":75000, "SuitModuleID":1698364962722310 }
-
-                # We need to look over all Suit Loadouts for ones that used this specific weapon
-                # and update them to entirely empty that slot.
-                for sl in self.state['SuitLoadouts']:
-                    for w in self.state['SuitLoadouts'][sl]['slots']:
-                        if self.state['SuitLoadouts'][sl]['slots'][w]['weaponrackId'] == entry['SuitModuleID']:
-                            self.state['SuitLoadouts'][sl]['slots'].pop(w)
-                            # We've changed the dict, so iteration breaks, but also the weapon
-                            # could only possibly have been here once.
-                            break
-
-                # Update credits total
-                if price := entry.get('Price') is None:
-                    logger.error(f"SellWeapon didn't contain Price: {entry}")
+        elif entry.get('Removed') is not None:
+            changes = 'Removed'
 
-                else:
-                    self.state['Credits'] += price
+        else:
+            logger.warning(f'BackpackChange with neither Added nor Removed: {entry=}')
+            changes = ''
+
+        if changes != '':
+            for c in entry[changes]:
+                category = self.category(c['Type'])
+                name = self.canonicalise(c['Name'])
+
+                if changes == 'Removed':
+                    self.state['BackPack'][category][name] -= c['Count']
+
+                elif changes == 'Added':
+                    self.state['BackPack'][category][name] += c['Count']
+
+        # Paranoia check to see if anything has gone negative.
+        # As of Odyssey Alpha Phase 1 Hotfix 2 keeping track of BackPack
+        # materials is impossible when used/picked up anyway.
+        for c in self.state['BackPack']:
+            for m in self.state['BackPack'][c]:
+                if self.state['BackPack'][c][m] < 0:
+                    self.state['BackPack'][c][m] = 0
+
+    @journal_event('buymicroresources')
+    def _parse_buymicroresources(self, entry: MutableMapping[str, Any]) -> None:
+        # From 4.0.0.400 we get an empty (see file) `ShipLocker` event,
+        # so we can ignore this for inventory purposes.
+
+        # But do record the credits balance change.
+        self.state['Credits'] -= entry.get('Price', 0)
+
+    @journal_event('sellmicroresources')
+    def _parse_sellmicroresources(self, entry: MutableMapping[str, Any]) -> None:
+        # As of 4.0.0.400 we can ignore this as an empty (see file)
+        # `ShipLocker` event is written for the full new inventory.
+
+        # But still record the credits balance change.
+        self.state['Credits'] += entry.get('Price', 0)
+
+    # <https://forums.frontier.co.uk/threads/575010/>
+    # also there's one additional journal event that was missed out from
+    # this version of the docs: "SuitLoadout": # when starting on foot, or
+    # when disembarking from a ship, with the same info as found in "CreateSuitLoadout"
+    @journal_event('suitloadout')
+    def _parse_suitloadout(self, entry: MutableMapping[str, Any]) -> None:
+        suit_slotid, suitloadout_slotid = self.suitloadout_store_from_event(entry)
+        if not self.suit_and_loadout_setcurrent(suit_slotid, suitloadout_slotid):
+            logger.error(f"Event was: {entry}")
+
+    @journal_event('switchsuitloadout')
+    def _parse_switchsuitloadout(self, entry: MutableMapping[str, Any]) -> None:
+        # 4.0.0.101
+        #
+        # { "timestamp":"2021-05-21T10:39:43Z", "event":"SwitchSuitLoadout",
+        #   "SuitID":1700217809818876, "SuitName":"utilitysuit_class1",
+        #   "SuitName_Localised":"Maverick Suit", "LoadoutID":4293000002,
+        #   "LoadoutName":"K/P", "Modules":[ { "SlotName":"PrimaryWeapon1",
+        #   "SuitModuleID":1700217863661544,
+        #   "ModuleName":"wpn_m_assaultrifle_kinetic_fauto",
+        #   "ModuleName_Localised":"Karma AR-50" },
+        #   { "SlotName":"SecondaryWeapon", "SuitModuleID":1700216180036986,
+        #   "ModuleName":"wpn_s_pistol_plasma_charged",
+        #   "ModuleName_Localised":"Manticore Tormentor" } ] }
+        #
+        suitid, suitloadout_slotid = self.suitloadout_store_from_event(entry)
+        if not self.suit_and_loadout_setcurrent(suitid, suitloadout_slotid):
+            logger.error(f"Event was: {entry}")
+
+    @journal_event('createsuitloadout')
+    def _parse_createsuitloadout(self, entry: MutableMapping[str, Any]) -> None:
+        # 4.0.0.101
+        #
+        # { "timestamp":"2021-05-21T11:13:15Z", "event":"CreateSuitLoadout", "SuitID":1700216165682989,
+        # "SuitName":"tacticalsuit_class1", "SuitName_Localised":"Dominator Suit", "LoadoutID":4293000004,
+        # "LoadoutName":"P/P/K", "Modules":[ { "SlotName":"PrimaryWeapon1", "SuitModuleID":1700216182854765,
+        # "ModuleName":"wpn_m_assaultrifle_plasma_fauto", "ModuleName_Localised":"Manticore Oppressor" },
+        # { "SlotName":"PrimaryWeapon2", "SuitModuleID":1700216190363340,
+        # "ModuleName":"wpn_m_shotgun_plasma_doublebarrel", "ModuleName_Localised":"Manticore Intimidator" },
+        # { "SlotName":"SecondaryWeapon", "SuitModuleID":1700217869872834,
+        # "ModuleName":"wpn_s_pistol_kinetic_sauto", "ModuleName_Localised":"Karma P-15" } ] }
+        #
+        suitid, suitloadout_slotid = self.suitloadout_store_from_event(entry)
+        # Creation doesn't mean equipping it
+        #  if not self.suit_and_loadout_setcurrent(suitid, suitloadout_slotid):
+        #      logger.error(f"Event was: {entry}")
+
+    @journal_event('deletesuitloadout')
+    def _parse_deletesuitloadout(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4:
+        # { "timestamp":"2021-04-29T10:32:27Z", "event":"DeleteSuitLoadout", "SuitID":1698365752966423,
+        # "SuitName":"explorationsuit_class1", "SuitName_Localised":"Artemis Suit", "LoadoutID":4293000003,
+        # "LoadoutName":"Loadout 1" }
+
+        if self.state['SuitLoadouts']:
+            loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
+            try:
+                self.state['SuitLoadouts'].pop(f'{loadout_id}')
+
+            except KeyError:
+                # This should no longer happen, as we're now handling CreateSuitLoadout properly
+                logger.debug(f"loadout slot id {loadout_id} doesn't exist, not in last CAPI pull ?")
+
+    @journal_event('renamesuitloadout')
+    def _parse_renamesuitloadout(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4
+        # Parameters:
+        #     • SuitID
+        #     • SuitName
+        #     • LoadoutID
+        #     • Loadoutname
+        # alpha4:
+        # { "timestamp":"2021-04-29T10:35:55Z", "event":"RenameSuitLoadout", "SuitID":1698365752966423,
+        # "SuitName":"explorationsuit_class1", "SuitName_Localised":"Artemis Suit", "LoadoutID":4293000003,
+        # "LoadoutName":"Art L/K" }
+        if self.state['SuitLoadouts']:
+            loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
+            try:
+                self.state['SuitLoadouts'][loadout_id]['name'] = entry['LoadoutName']
+
+            except KeyError:
+                logger.debug(f"loadout slot id {loadout_id} doesn't exist, not in last CAPI pull ?")
+
+    @journal_event('buysuit')
+    def _parse_buysuit(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4 :
+        # { "timestamp":"2021-04-29T09:03:37Z", "event":"BuySuit", "Name":"UtilitySuit_Class1",
+        # "Name_Localised":"Maverick Suit", "Price":150000, "SuitID":1698364934364699 }
+        loc_name = entry.get('Name_Localised', entry['Name'])
+        self.state['Suits'][entry['SuitID']] = {
+            'name':      entry['Name'],
+            'locName':   loc_name,
+            'edmcName':  self.suit_sane_name(loc_name),
+            'id':        None,  # Is this an FDev ID for suit type ?
+            'suitId':    entry['SuitID'],
+            'mods':      entry['SuitMods'],  # Suits can (rarely) be bought with modules installed
+        }
 
-            elif event_type == 'upgradeweapon':
-                # We're not actually keeping track of all owned weapons, only those in
-                # Suit Loadouts.
-                self.state['Credits'] -= entry.get('Cost', 0)
+        # update credits
+        if price := entry.get('Price') is None:
+            logger.error(f"BuySuit didn't contain Price: {entry}")
 
-            elif event_type == 'scanorganic':
-                # Nothing of interest to our state.
-                pass
+        else:
+            self.state['Credits'] -= price
+
+    @journal_event('sellsuit')
+    def _parse_sellsuit(self, entry: MutableMapping[str, Any]) -> None:
+        # Remove from known suits
+        # As of Odyssey Alpha Phase 2, Hotfix 5 (4.0.0.13) this isn't possible as this event
+        # doesn't contain the specific suit ID as per CAPI `suits` dict.
+        # alpha4
+        # This event is logged when a player sells a flight suit
+        #
+        # Parameters:
+        #     • Name
+        #     • Price
+        #     • SuitID
+        # alpha4:
+        # { "timestamp":"2021-04-29T09:15:51Z", "event":"SellSuit", "SuitID":1698364937435505,
+        # "Name":"explorationsuit_class1", "Name_Localised":"Artemis Suit", "Price":90000 }
+        if self.state['Suits']:
+            try:
+                self.state['Suits'].pop(entry['SuitID'])
+
+            except KeyError:
+                logger.debug(f"SellSuit for a suit we didn't know about? {entry['SuitID']}")
 
-            elif event_type == 'sellorganicdata':
-                for bd in entry['BioData']:
-                    self.state['Credits'] += bd.get('Value', 0) + bd.get('Bonus', 0)
-
-            elif event_type == 'bookdropship':
-                self.state['Credits'] -= entry.get('Cost', 0)
-                self.state['Dropship'] = True
-                # Technically we *might* now not be OnFoot.
-                # The problem is that this event is recorded both for signing up for
-                # an on-foot CZ, and when you use the Dropship to return after the
-                # CZ completes.
-                #
-                # In the first case we're still in-station and thus still on-foot.
-                #
-                # In the second case we should instantly be in the Dropship and thus
-                # not still on-foot, BUT it doesn't really matter as the next significant
-                # event is going to be Disembark to on-foot anyway.
-
-            elif event_type == 'booktaxi':
-                self.state['Credits'] -= entry.get('Cost', 0)
-                # Dont set taxi state here, as we're not IN a taxi yet. Set it on Embark
-
-            elif event_type == 'canceldropship':
-                self.state['Credits'] += entry.get('Refund', 0)
-                self.state['Dropship'] = False
-                self.state['Taxi'] = False
-
-            elif event_type == 'canceltaxi':
-                self.state['Credits'] += entry.get('Refund', 0)
-                self.state['Taxi'] = False
-
-            elif event_type == 'navroute' and not self.catching_up:
-                # assume we've failed out the gate, then pull it back if things are fine
-                self._last_navroute_journal_timestamp = mktime(strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ'))
-                self._navroute_retries_remaining = 11
-
-                # Added in ED 3.7 - multi-hop route details in NavRoute.json
-                # rather than duplicating this, lets just call the function
-                if self.__navroute_retry():
-                    entry = self.state['NavRoute']
-
-            elif event_type == 'fcmaterials' and not self.catching_up:
-                # assume we've failed out the gate, then pull it back if things are fine
-                self._last_fcmaterials_journal_timestamp = mktime(strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ'))
-                self._fcmaterials_retries_remaining = 11
-
-                # Added in ED 4.0.0.1300 - Fleet Carrier Materials market in FCMaterials.json
-                # rather than duplicating this, lets just call the function
-                if fcmaterials := self.__fcmaterials_retry():
-                    entry = fcmaterials
-
-            elif event_type == 'moduleinfo':
-                with open(join(self.currentdir, 'ModulesInfo.json'), 'rb') as mf:  # type: ignore
-                    try:
-                        entry = json.load(mf)
-
-                    except json.JSONDecodeError:
-                        logger.exception('Failed decoding ModulesInfo.json')
-
-                    else:
-                        self.state['ModuleInfo'] = entry
-
-            elif event_type in ('collectcargo', 'marketbuy', 'buydrones', 'miningrefined'):
-                commodity = self.canonicalise(entry['Type'])
-                self.state['Cargo'][commodity] += entry.get('Count', 1)
-
-                if event_type == 'buydrones':
-                    self.state['Credits'] -= entry.get('TotalCost', 0)
-
-                elif event_type == 'marketbuy':
-                    self.state['Credits'] -= entry.get('TotalCost', 0)
-
-            elif event_type in ('ejectcargo', 'marketsell', 'selldrones'):
-                commodity = self.canonicalise(entry['Type'])
-                cargo = self.state['Cargo']
-                cargo[commodity] -= entry.get('Count', 1)
-                if cargo[commodity] <= 0:
-                    cargo.pop(commodity)
-
-                if event_type == 'marketsell':
-                    self.state['Credits'] += entry.get('TotalSale', 0)
-
-                elif event_type == 'selldrones':
-                    self.state['Credits'] += entry.get('TotalSale', 0)
-
-            elif event_type == 'searchandrescue':
-                for item in entry.get('Items', []):
-                    commodity = self.canonicalise(item['Name'])
-                    cargo = self.state['Cargo']
-                    cargo[commodity] -= item.get('Count', 1)
-                    if cargo[commodity] <= 0:
-                        cargo.pop(commodity)
-
-            elif event_type == 'materials':
-                for category in ('Raw', 'Manufactured', 'Encoded'):
-                    self.state[category] = defaultdict(int)
-                    self.state[category].update({
-                        self.canonicalise(x['Name']): x['Count'] for x in entry.get(category, [])
-                    })
-
-            elif event_type == 'materialcollected':
-                material = self.canonicalise(entry['Name'])
-                self.state[entry['Category']][material] += entry['Count']
-
-            elif event_type in ('materialdiscarded', 'scientificresearch'):
-                material = self.canonicalise(entry['Name'])
-                state_category = self.state[entry['Category']]
-                state_category[material] -= entry['Count']
-                if state_category[material] <= 0:
-                    state_category.pop(material)
-
-            elif event_type == 'synthesis':
-                for category in ('Raw', 'Manufactured', 'Encoded'):
-                    for x in entry['Materials']:
-                        material = self.canonicalise(x['Name'])
-                        if material in self.state[category]:
-                            self.state[category][material] -= x['Count']
-                            if self.state[category][material] <= 0:
-                                self.state[category].pop(material)
-
-            elif event_type == 'materialtrade':
-                category = self.category(entry['Paid']['Category'])
-                state_category = self.state[category]
-                paid = entry['Paid']
-                received = entry['Received']
-
-                state_category[paid['Material']] -= paid['Quantity']
-                if state_category[paid['Material']] <= 0:
-                    state_category.pop(paid['Material'])
-
-                category = self.category(received['Category'])
-                state_category[received['Material']] += received['Quantity']
-
-            elif event_type == 'engineercraft' or (
-                event_type == 'engineerlegacyconvert' and not entry.get('IsPreview')
-            ):
-
-                for category in ('Raw', 'Manufactured', 'Encoded'):
-                    for x in entry.get('Ingredients', []):
-                        material = self.canonicalise(x['Name'])
-                        if material in self.state[category]:
-                            self.state[category][material] -= x['Count']
-                            if self.state[category][material] <= 0:
-                                self.state[category].pop(material)
-
-                module = self.state['Modules'][entry['Slot']]
-                if module['Item'] != self.canonicalise(entry['Module']):
-                    raise ValueError(f"Module {entry['Slot']} is not {entry['Module']}")
-                module['Engineering'] = {
-                    'Engineer':      entry['Engineer'],
-                    'EngineerID':    entry['EngineerID'],
-                    'BlueprintName': entry['BlueprintName'],
-                    'BlueprintID':   entry['BlueprintID'],
-                    'Level':         entry['Level'],
-                    'Quality':       entry['Quality'],
-                    'Modifiers':     entry['Modifiers'],
+            # update credits total
+            if price := entry.get('Price') is None:
+                logger.error(f"SellSuit didn't contain Price: {entry}")
+
+            else:
+                self.state['Credits'] += price
+
+    @journal_event('upgradesuit')
+    def _parse_upgradesuit(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4
+        # This event is logged when the player upgrades their flight suit
+        #
+        # Parameters:
+        #     • Name
+        #     • SuitID
+        #     • Class
+        #     • Cost
+        # TODO: Update self.state['Suits'] when we have an example to work from
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('loadoutequipmodule')
+    def _parse_loadoutequipmodule(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4:
+        # { "timestamp":"2021-04-29T11:11:13Z", "event":"LoadoutEquipModule", "LoadoutName":"Dom L/K/K",
+        # "SuitID":1698364940285172, "SuitName":"tacticalsuit_class1", "SuitName_Localised":"Dominator Suit",
+        # "LoadoutID":4293000001, "SlotName":"PrimaryWeapon2", "ModuleName":"wpn_m_assaultrifle_laser_fauto",
+        # "ModuleName_Localised":"TK Aphelion", "SuitModuleID":1698372938719590 }
+        if self.state['SuitLoadouts']:
+            loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
+            try:
+                self.state['SuitLoadouts'][loadout_id]['slots'][entry['SlotName']] = {
+                    'name':           entry['ModuleName'],
+                    'locName':        entry.get('ModuleName_Localised', entry['ModuleName']),
+                    'id':             None,
+                    'weaponrackId':   entry['SuitModuleID'],
+                    'locDescription': '',
+                    'class':          entry['Class'],
+                    'mods':           entry['WeaponMods']
                 }
 
-                if 'ExperimentalEffect' in entry:
-                    module['Engineering']['ExperimentalEffect'] = entry['ExperimentalEffect']
-                    module['Engineering']['ExperimentalEffect_Localised'] = entry['ExperimentalEffect_Localised']
+            except KeyError:
+                # TODO: Log the exception details too, for some clue about *which* key
+                logger.error(f"LoadoutEquipModule: {entry}")
+
+    @journal_event('loadoutremovemodule')
+    def _parse_loadoutremovemodule(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4 - triggers if selecting an already-equipped weapon into a different slot
+        # { "timestamp":"2021-04-29T11:11:13Z", "event":"LoadoutRemoveModule", "LoadoutName":"Dom L/K/K",
+        # "SuitID":1698364940285172, "SuitName":"tacticalsuit_class1", "SuitName_Localised":"Dominator Suit",
+        # "LoadoutID":4293000001, "SlotName":"PrimaryWeapon1", "ModuleName":"wpn_m_assaultrifle_laser_fauto",
+        # "ModuleName_Localised":"TK Aphelion", "SuitModuleID":1698372938719590 }
+        if self.state['SuitLoadouts']:
+            loadout_id = self.suit_loadout_id_from_loadoutid(entry['LoadoutID'])
+            try:
+                self.state['SuitLoadouts'][loadout_id]['slots'].pop(entry['SlotName'])
+
+            except KeyError:
+                logger.error(f"LoadoutRemoveModule: {entry}")
 
-                else:
-                    module['Engineering'].pop('ExperimentalEffect', None)
-                    module['Engineering'].pop('ExperimentalEffect_Localised', None)
-
-            elif event_type == 'missioncompleted':
-                self.state['Credits'] += entry.get('Reward', 0)
-
-                for reward in entry.get('CommodityReward', []):
-                    commodity = self.canonicalise(reward['Name'])
-                    self.state['Cargo'][commodity] += reward.get('Count', 1)
-
-                for reward in entry.get('MaterialsReward', []):
-                    if 'Category' in reward:  # Category not present in E:D 3.0
-                        category = self.category(reward['Category'])
-                        material = self.canonicalise(reward['Name'])
-                        if category == 'Elements':
-                            category = 'Raw'
-                        self.state[category][material] += reward.get('Count', 1)
-
-            elif event_type == 'engineercontribution':
-                commodity = self.canonicalise(entry.get('Commodity'))
-                if commodity:
-                    self.state['Cargo'][commodity] -= entry['Quantity']
-                    if self.state['Cargo'][commodity] <= 0:
-                        self.state['Cargo'].pop(commodity)
-
-                material = self.canonicalise(entry.get('Material'))
-                if material:
-                    for category in ('Raw', 'Manufactured', 'Encoded'):
-                        if material in self.state[category]:
-                            self.state[category][material] -= entry['Quantity']
-                            if self.state[category][material] <= 0:
-                                self.state[category].pop(material)
-
-            elif event_type == 'technologybroker':
-                for thing in entry.get('Ingredients', []):  # 3.01
-                    for category in ('Cargo', 'Raw', 'Manufactured', 'Encoded'):
-                        item = self.canonicalise(thing['Name'])
-                        if item in self.state[category]:
-                            self.state[category][item] -= thing['Count']
-                            if self.state[category][item] <= 0:
-                                self.state[category].pop(item)
-
-                for thing in entry.get('Commodities', []):  # 3.02
-                    commodity = self.canonicalise(thing['Name'])
-                    self.state['Cargo'][commodity] -= thing['Count']
-                    if self.state['Cargo'][commodity] <= 0:
-                        self.state['Cargo'].pop(commodity)
-
-                for thing in entry.get('Materials', []):  # 3.02
-                    material = self.canonicalise(thing['Name'])
-                    category = thing['Category']
-                    self.state[category][material] -= thing['Count']
-                    if self.state[category][material] <= 0:
-                        self.state[category].pop(material)
+    @journal_event('buyweapon')
+    def _parse_buyweapon(self, entry: MutableMapping[str, Any]) -> None:
+        # alpha4
+        # { "timestamp":"2021-04-29T11:10:51Z", "event":"BuyWeapon", "Name":"Wpn_M_AssaultRifle_Laser_FAuto",
+        # "Name_Localised":"TK Aphelion", "Price":125000, "SuitModuleID":1698372938719590 }
+        # update credits
+        if price := entry.get('Price') is None:
+            logger.error(f"BuyWeapon didn't contain Price: {entry}")
 
-            elif event_type == 'joinacrew':
-                self.state['Captain'] = entry['Captain']
-                self.state['Role'] = 'Idle'
-                self.state['StarPos'] = None
-                self.state['SystemName'] = None
-                self.state['SystemAddress'] = None
-                self.state['SystemPopulation'] = None
-                self.state['StarPos'] = None
-                self.state['Body'] = None
-                self.state['BodyID'] = None
-                self.state['BodyType'] = None
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                self.state['StationType'] = None
-                self.stationservices = None
-                self.state['OnFoot'] = False
-
-            elif event_type == 'changecrewrole':
-                self.state['Role'] = entry['Role']
-
-            elif event_type == 'quitacrew':
-                self.state['Captain'] = None
-                self.state['Role'] = None
-                self.state['SystemName'] = None
-                self.state['SystemAddress'] = None
-                self.state['SystemPopulation'] = None
-                self.state['StarPos'] = None
-                self.state['Body'] = None
-                self.state['BodyID'] = None
-                self.state['BodyType'] = None
-                self.state['StationName'] = None
-                self.state['MarketID'] = None
-                self.state['StationType'] = None
-                self.stationservices = None
-
-                # TODO: on_foot: Will we get an event after this to know ?
-
-            elif event_type == 'friends':
-                if entry['Status'] in ('Online', 'Added'):
-                    self.state['Friends'].add(entry['Name'])
+        else:
+            self.state['Credits'] -= price
+
+    @journal_event('sellweapon')
+    def _parse_sellweapon(self, entry: MutableMapping[str, Any]) -> None:
+        # We're not actually keeping track of all owned weapons, only those in
+        # Suit Loadouts.
+        # alpha4:
+        # { "timestamp":"2021-04-29T10:50:34Z", "event":"SellWeapon", "Name":"wpn_m_assaultrifle_laser_fauto",
+        # "Name_Localised":"TK Aphelion", "Price":75000, "SuitModuleID":1698364962722310 }
+
+        # We need to look over all Suit Loadouts for ones that used this specific weapon
+        # and update them to entirely empty that slot.
+        for sl in self.state['SuitLoadouts']:
+            for w in self.state['SuitLoadouts'][sl]['slots']:
+                if self.state['SuitLoadouts'][sl]['slots'][w]['weaponrackId'] == entry['SuitModuleID']:
+                    self.state['SuitLoadouts'][sl]['slots'].pop(w)
+                    # We've changed the dict, so iteration breaks, but also the weapon
+                    # could only possibly have been here once.
+                    break
+
+        # Update credits total
+        if price := entry.get('Price') is None:
+            logger.error(f"SellWeapon didn't contain Price: {entry}")
 
-                else:
-                    self.state['Friends'].discard(entry['Name'])
+        else:
+            self.state['Credits'] += price
+
+    @journal_event('upgradeweapon')
+    def _parse_upgradeweapon(self, entry: MutableMapping[str, Any]) -> None:
+        # We're not actually keeping track of all owned weapons, only those in
+        # Suit Loadouts.
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('sellorganicdata')
+    def _parse_sellorganicdata(self, entry: MutableMapping[str, Any]) -> None:
+        for bd in entry['BioData']:
+            self.state['Credits'] += bd.get('Value', 0) + bd.get('Bonus', 0)
+
+    @journal_event('bookdropship')
+    def _parse_bookdropship(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+        self.state['Dropship'] = True
+        # Technically we *might* now not be OnFoot.
+        # The problem is that this event is recorded both for signing up for
+        # an on-foot CZ, and when you use the Dropship to return after the
+        # CZ completes.
+        #
+        # In the first case we're still in-station and thus still on-foot.
+        #
+        # In the second case we should instantly be in the Dropship and thus
+        # not still on-foot, BUT it doesn't really matter as the next significant
+        # event is going to be Disembark to on-foot anyway.
+
+    @journal_event('booktaxi')
+    def _parse_booktaxi(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+        # Dont set taxi state here, as we're not IN a taxi yet. Set it on Embark
+
+    @journal_event('canceldropship')
+    def _parse_canceldropship(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('Refund', 0)
+        self.state['Dropship'] = False
+        self.state['Taxi'] = False
+
+    @journal_event('canceltaxi')
+    def _parse_canceltaxi(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('Refund', 0)
+        self.state['Taxi'] = False
+
+    @journal_event('navroute')
+    def _parse_navroute(self, entry: MutableMapping[str, Any]) -> MutableMapping[str, Any] | None:
+        if self.catching_up:
+            return None
 
-            # Try to keep Credits total updated
-            elif event_type in ('multisellexplorationdata', 'sellexplorationdata'):
-                self.state['Credits'] += entry.get('TotalEarnings', 0)
+        # Added in ED 3.7 - multi-hop route details in NavRoute.json, which may not be written yet
+        navroute = self.companion_file_waits.wait(
+            self._companion_file('NavRoute.json'), entry['timestamp'], MAX_NAVROUTE_DISCREPANCY, self._navroute_ready
+        )
+        if navroute is not None and self._navroute_ready(navroute):
+            entry = navroute
 
-            elif event_type == 'buyexplorationdata':
-                self.state['Credits'] -= entry.get('Cost', 0)
+        return entry
 
-            elif event_type == 'buytradedata':
-                self.state['Credits'] -= entry.get('Cost', 0)
+    def _navroute_ready(self, navroute: dict[str, Any]) -> bool:
+        """
+        Record NavRoute.json once it's for the last NavRoute event.
 
-            elif event_type == 'buyammo':
-                self.state['Credits'] -= entry.get('Cost', 0)
+        :param navroute: Its contents.
+        :return: Whether it was a route, rather than already `NavRouteClear`ed.
+        """
+        if navroute['event'].lower() == 'navrouteclear':
+            logger.info('NavRoute file contained a NavRouteClear')
+            # We do *NOT* copy into/clear the `self.state['NavRoute']`
+            return False
 
-            elif event_type == 'communitygoalreward':
-                self.state['Credits'] += entry.get('Reward', 0)
+        logger.info('Successfully read NavRoute file for last NavRoute event.')
+        self.state['NavRoute'] = navroute
+        return True
 
-            elif event_type == 'crewhire':
-                self.state['Credits'] -= entry.get('Cost', 0)
+    @journal_event('fcmaterials')
+    def _parse_fcmaterials(self, entry: MutableMapping[str, Any]) -> MutableMapping[str, Any] | None:
+        if self.catching_up:
+            return None
 
-            elif event_type == 'fetchremotemodule':
-                self.state['Credits'] -= entry.get('TransferCost', 0)
+        # Added in ED 4.0.0.1300 - Fleet Carrier Materials market in FCMaterials.json, which may not be written yet
+        fcmaterials = self.companion_file_waits.wait(
+            self._companion_file('FCMaterials.json'), entry['timestamp'], MAX_FCMATERIALS_DISCREPANCY,
+            self._fcmaterials_ready
+        )
+        if fcmaterials is not None:
+            self._fcmaterials_ready(fcmaterials)
+            entry = fcmaterials
 
-            elif event_type == 'missionabandoned':
-                # Is this paid at this point, or just a fine to pay later ?
-                # self.state['Credits'] -= entry.get('Fine', 0)
-                pass
+        return entry
 
-            elif event_type in ('paybounties', 'payfines', 'paylegacyfines'):
-                self.state['Credits'] -= entry.get('Amount', 0)
+    def _fcmaterials_ready(self, fcmaterials: dict[str, Any]) -> None:
+        """
+        Record FCMaterials.json once it's for the last FCMaterials event.
 
-            elif event_type == 'redeemvoucher':
-                self.state['Credits'] += entry.get('Amount', 0)
+        :param fcmaterials: Its contents.
+        """
+        logger.info('Successfully read FCMaterials file for last FCMaterials event.')
+        self.state['FCMaterials'] = fcmaterials
 
-            elif event_type in ('refuelall', 'refuelpartial', 'repair', 'repairall', 'restockvehicle'):
-                self.state['Credits'] -= entry.get('Cost', 0)
+    @journal_event('moduleinfo')
+    def _parse_moduleinfo(self, entry: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        if (modules_info := self.companion_files.read(self._companion_file('ModulesInfo.json'))) is None:
+            logger.warning('Failed to read ModulesInfo.json')
 
-            elif event_type == 'sellshiponrebuy':
-                self.state['Credits'] += entry.get('ShipPrice', 0)
+        else:
+            entry = modules_info
+            self.state['ModuleInfo'] = entry
 
-            elif event_type == 'shipyardsell':
-                self.state['Credits'] += entry.get('ShipPrice', 0)
+        return entry
 
-            elif event_type == 'shipyardtransfer':
-                self.state['Credits'] -= entry.get('TransferPrice', 0)
+    @journal_event('collectcargo', 'marketbuy', 'buydrones', 'miningrefined')
+    def _parse_collectcargo(self, entry: MutableMapping[str, Any]) -> None:
+        event_type = entry['event'].lower()
+        commodity = self.canonicalise(entry['Type'])
+        self.state['Cargo'][commodity] += entry.get('Count', 1)
+
+        if event_type == 'buydrones':
+            self.state['Credits'] -= entry.get('TotalCost', 0)
+
+        elif event_type == 'marketbuy':
+            self.state['Credits'] -= entry.get('TotalCost', 0)
+
+    @journal_event('ejectcargo', 'marketsell', 'selldrones')
+    def _parse_ejectcargo(self, entry: MutableMapping[str, Any]) -> None:
+        event_type = entry['event'].lower()
+        commodity = self.canonicalise(entry['Type'])
+        cargo = self.state['Cargo']
+        cargo[commodity] -= entry.get('Count', 1)
+        if cargo[commodity] <= 0:
+            cargo.pop(commodity)
+
+        if event_type == 'marketsell':
+            self.state['Credits'] += entry.get('TotalSale', 0)
+
+        elif event_type == 'selldrones':
+            self.state['Credits'] += entry.get('TotalSale', 0)
+
+    @journal_event('searchandrescue')
+    def _parse_searchandrescue(self, entry: MutableMapping[str, Any]) -> None:
+        for item in entry.get('Items', []):
+            commodity = self.canonicalise(item['Name'])
+            cargo = self.state['Cargo']
+            cargo[commodity] -= item.get('Count', 1)
+            if cargo[commodity] <= 0:
+                cargo.pop(commodity)
+
+    @journal_event('materials')
+    def _parse_materials(self, entry: MutableMapping[str, Any]) -> None:
+        for category in ('Raw', 'Manufactured', 'Encoded'):
+            self.state[category] = defaultdict(int)
+            self.state[category].update({
+                self.canonicalise(x['Name']): x['Count'] for x in entry.get(category, [])
+            })
+
+    @journal_event('materialcollected')
+    def _parse_materialcollected(self, entry: MutableMapping[str, Any]) -> None:
+        material = self.canonicalise(entry['Name'])
+        self.state[entry['Category']][material] += entry['Count']
+
+    @journal_event('materialdiscarded', 'scientificresearch')
+    def _parse_materialdiscarded(self, entry: MutableMapping[str, Any]) -> None:
+        material = self.canonicalise(entry['Name'])
+        state_category = self.state[entry['Category']]
+        state_category[material] -= entry['Count']
+        if state_category[material] <= 0:
+            state_category.pop(material)
+
+    @journal_event('synthesis')
+    def _parse_synthesis(self, entry: MutableMapping[str, Any]) -> None:
+        for category in ('Raw', 'Manufactured', 'Encoded'):
+            for x in entry['Materials']:
+                material = self.canonicalise(x['Name'])
+                if material in self.state[category]:
+                    self.state[category][material] -= x['Count']
+                    if self.state[category][material] <= 0:
+                        self.state[category].pop(material)
 
-            elif event_type == 'powerplayfasttrack':
-                self.state['Credits'] -= entry.get('Cost', 0)
+    @journal_event('materialtrade')
+    def _parse_materialtrade(self, entry: MutableMapping[str, Any]) -> None:
+        category = self.category(entry['Paid']['Category'])
+        state_category = self.state[category]
+        paid = entry['Paid']
+        received = entry['Received']
 
-            elif event_type == 'powerplaysalary':
-                self.state['Credits'] += entry.get('Amount', 0)
+        state_category[paid['Material']] -= paid['Quantity']
+        if state_category[paid['Material']] <= 0:
+            state_category.pop(paid['Material'])
 
-            elif event_type == 'squadroncreated':
-                # v30 docs don't actually say anything about credits cost
-                pass
+        category = self.category(received['Category'])
+        state_category[received['Material']] += received['Quantity']
 
-            elif event_type == 'carrierbuy':
-                self.state['Credits'] -= entry.get('Price', 0)
+    @journal_event('engineercraft', 'engineerlegacyconvert')
+    def _parse_engineercraft(self, entry: MutableMapping[str, Any]) -> None:
+        if entry['event'].lower() == 'engineerlegacyconvert' and entry.get('IsPreview'):
+            return
 
-            elif event_type == 'carrierbanktransfer':
-                if newbal := entry.get('PlayerBalance'):
-                    self.state['Credits'] = newbal
+        for category in ('Raw', 'Manufactured', 'Encoded'):
+            for x in entry.get('Ingredients', []):
+                material = self.canonicalise(x['Name'])
+                if material in self.state[category]:
+                    self.state[category][material] -= x['Count']
+                    if self.state[category][material] <= 0:
+                        self.state[category].pop(material)
 
-            elif event_type == 'carrierdecommission':
-                # v30 doc says nothing about citing the refund amount
-                pass
+        module = self.state['Modules'][entry['Slot']]
+        if module['Item'] != self.canonicalise(entry['Module']):
+            raise ValueError(f"Module {entry['Slot']} is not {entry['Module']}")
+        module['Engineering'] = {
+            'Engineer':      entry['Engineer'],
+            'EngineerID':    entry['EngineerID'],
+            'BlueprintName': entry['BlueprintName'],
+            'BlueprintID':   entry['BlueprintID'],
+            'Level':         entry['Level'],
+            'Quality':       entry['Quality'],
+            'Modifiers':     entry['Modifiers'],
+        }
 
-            elif event_type == 'npccrewpaidwage':
-                self.state['Credits'] -= entry.get('Amount', 0)
+        if 'ExperimentalEffect' in entry:
+            module['Engineering']['ExperimentalEffect'] = entry['ExperimentalEffect']
+            module['Engineering']['ExperimentalEffect_Localised'] = entry['ExperimentalEffect_Localised']
 
-            elif event_type == 'resurrect':
-                self.state['Credits'] -= entry.get('Cost', 0)
+        else:
+            module['Engineering'].pop('ExperimentalEffect', None)
+            module['Engineering'].pop('ExperimentalEffect_Localised', None)
+
+    @journal_event('missioncompleted')
+    def _parse_missioncompleted(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('Reward', 0)
+
+        for reward in entry.get('CommodityReward', []):
+            commodity = self.canonicalise(reward['Name'])
+            self.state['Cargo'][commodity] += reward.get('Count', 1)
+
+        for reward in entry.get('MaterialsReward', []):
+            if 'Category' in reward:  # Category not present in E:D 3.0
+                category = self.category(reward['Category'])
+                material = self.canonicalise(reward['Name'])
+                if category == 'Elements':
+                    category = 'Raw'
+                self.state[category][material] += reward.get('Count', 1)
+
+    @journal_event('engineercontribution')
+    def _parse_engineercontribution(self, entry: MutableMapping[str, Any]) -> None:
+        commodity = self.canonicalise(entry.get('Commodity'))
+        if commodity:
+            self.state['Cargo'][commodity] -= entry['Quantity']
+            if self.state['Cargo'][commodity] <= 0:
+                self.state['Cargo'].pop(commodity)
+
+        material = self.canonicalise(entry.get('Material'))
+        if material:
+            for category in ('Raw', 'Manufactured', 'Encoded'):
+                if material in self.state[category]:
+                    self.state[category][material] -= entry['Quantity']
+                    if self.state[category][material] <= 0:
+                        self.state[category].pop(material)
 
-                # There should be a `Backpack` event as you 'come to' in the
-                # new location, so no need to zero out BackPack here.
+    @journal_event('technologybroker')
+    def _parse_technologybroker(self, entry: MutableMapping[str, Any]) -> None:
+        for thing in entry.get('Ingredients', []):  # 3.01
+            for category in ('Cargo', 'Raw', 'Manufactured', 'Encoded'):
+                item = self.canonicalise(thing['Name'])
+                if item in self.state[category]:
+                    self.state[category][item] -= thing['Count']
+                    if self.state[category][item] <= 0:
+                        self.state[category].pop(item)
+
+        for thing in entry.get('Commodities', []):  # 3.02
+            commodity = self.canonicalise(thing['Name'])
+            self.state['Cargo'][commodity] -= thing['Count']
+            if self.state['Cargo'][commodity] <= 0:
+                self.state['Cargo'].pop(commodity)
+
+        for thing in entry.get('Materials', []):  # 3.02
+            material = self.canonicalise(thing['Name'])
+            category = thing['Category']
+            self.state[category][material] -= thing['Count']
+            if self.state[category][material] <= 0:
+                self.state[category].pop(material)
+
+    @journal_event('joinacrew')
+    def _parse_joinacrew(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Captain'] = entry['Captain']
+        self.state['Role'] = 'Idle'
+        self.state['StarPos'] = None
+        self.state['SystemName'] = None
+        self.state['SystemAddress'] = None
+        self.state['SystemPopulation'] = None
+        self.state['StarPos'] = None
+        self.state['Body'] = None
+        self.state['BodyID'] = None
+        self.state['BodyType'] = None
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        self.state['StationType'] = None
+        self.stationservices = None
+        self.state['OnFoot'] = False
 
-            elif event_type == 'powerplay':
-                self.state['Powerplay']['Power'] = entry.get('Power', '')
-                self.state['Powerplay']['Rank'] = entry.get('Rank', 0)
-                self.state['Powerplay']['Merits'] = entry.get('Merits', 0)
-                self.state['Powerplay']['Votes'] = entry.get('Votes', 0)
-                self.state['Powerplay']['TimePledged'] = entry.get('TimePledged', 0)
+    @journal_event('changecrewrole')
+    def _parse_changecrewrole(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Role'] = entry['Role']
 
-            elif event_type == 'powerplaymerits':
-                self.state['Powerplay']['Merits'] = entry.get('TotalMerits', 0)
+    @journal_event('quitacrew')
+    def _parse_quitacrew(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Captain'] = None
+        self.state['Role'] = None
+        self.state['SystemName'] = None
+        self.state['SystemAddress'] = None
+        self.state['SystemPopulation'] = None
+        self.state['StarPos'] = None
+        self.state['Body'] = None
+        self.state['BodyID'] = None
+        self.state['BodyType'] = None
+        self.state['StationName'] = None
+        self.state['MarketID'] = None
+        self.state['StationType'] = None
+        self.stationservices = None
 
-            elif event_type == 'powerplayrank':
-                self.state['Powerplay']['Rank'] = entry.get('Rank', 0)
+        # TODO: on_foot: Will we get an event after this to know ?
 
-            return entry
+    @journal_event('friends')
+    def _parse_friends(self, entry: MutableMapping[str, Any]) -> None:
+        if entry['Status'] in ('Online', 'Added'):
+            self.state['Friends'].add(entry['Name'])
 
-        except Exception as ex:
-            logger.debug(f'Invalid journal entry:\n{line!r}\n', exc_info=ex)
-            return {'event': None}
+        else:
+            self.state['Friends'].discard(entry['Name'])
+
+    # Try to keep Credits total updated
+    @journal_event('multisellexplorationdata', 'sellexplorationdata')
+    def _parse_multisellexplorationdata(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('TotalEarnings', 0)
+
+    @journal_event('buyexplorationdata')
+    def _parse_buyexplorationdata(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('buytradedata')
+    def _parse_buytradedata(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('buyammo')
+    def _parse_buyammo(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('communitygoalreward')
+    def _parse_communitygoalreward(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('Reward', 0)
+
+    @journal_event('crewhire')
+    def _parse_crewhire(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('fetchremotemodule')
+    def _parse_fetchremotemodule(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('TransferCost', 0)
+
+    @journal_event('paybounties', 'payfines', 'paylegacyfines')
+    def _parse_paybounties(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Amount', 0)
+
+    @journal_event('redeemvoucher')
+    def _parse_redeemvoucher(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('Amount', 0)
+
+    @journal_event('refuelall', 'refuelpartial', 'repair', 'repairall', 'restockvehicle')
+    def _parse_refuelall(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('sellshiponrebuy')
+    def _parse_sellshiponrebuy(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('ShipPrice', 0)
+
+    @journal_event('shipyardsell')
+    def _parse_shipyardsell(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('ShipPrice', 0)
+
+    @journal_event('shipyardtransfer')
+    def _parse_shipyardtransfer(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('TransferPrice', 0)
+
+    @journal_event('powerplayfasttrack')
+    def _parse_powerplayfasttrack(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+    @journal_event('powerplaysalary')
+    def _parse_powerplaysalary(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] += entry.get('Amount', 0)
+
+    @journal_event('carrierbuy')
+    def _parse_carrierbuy(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Price', 0)
+
+    @journal_event('carrierbanktransfer')
+    def _parse_carrierbanktransfer(self, entry: MutableMapping[str, Any]) -> None:
+        if newbal := entry.get('PlayerBalance'):
+            self.state['Credits'] = newbal
+
+    @journal_event('npccrewpaidwage')
+    def _parse_npccrewpaidwage(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Amount', 0)
+
+    @journal_event('resurrect')
+    def _parse_resurrect(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Credits'] -= entry.get('Cost', 0)
+
+        # There should be a `Backpack` event as you 'come to' in the
+        # new location, so no need to zero out BackPack here.
+
+    @journal_event('powerplay')
+    def _parse_powerplay(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Powerplay']['Power'] = entry.get('Power', '')
+        self.state['Powerplay']['Rank'] = entry.get('Rank', 0)
+        self.state['Powerplay']['Merits'] = entry.get('Merits', 0)
+        self.state['Powerplay']['Votes'] = entry.get('Votes', 0)
+        self.state['Powerplay']['TimePledged'] = entry.get('TimePledged', 0)
+
+    @journal_event('powerplaymerits')
+    def _parse_powerplaymerits(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Powerplay']['Merits'] = entry.get('TotalMerits', 0)
+
+    @journal_event('powerplayrank')
+    def _parse_powerplayrank(self, entry: MutableMapping[str, Any]) -> None:
+        self.state['Powerplay']['Rank'] = entry.get('Rank', 0)
+
+    def enable_handler_timing(self, enabled: bool = True) -> None:
+        """
+        Turn timing of `parse_entry()` event handlers on, resetting it, or off.
+
+        :param enabled: Whether to time handlers.
+        """
+        self.handler_timing = defaultdict(lambda: [0, 0.0]) if enabled else None
 
     def populate_version_info(self, entry: MutableMapping[str, str], suppress: bool = False):
         """
@@ -2181,27 +3236,7 @@ class EDLogs(FileSystemEventHandler):
 
         :return: bool - True if the game is running.
         """
-        if self.running_process:
-            p = self.running_process
-            try:
-                with p.oneshot():
-                    if p.status() not in [psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING]:
-                        raise psutil.NoSuchProcess(p.pid)
-            except psutil.NoSuchProcess:
-                # Process likely expired
-                self.running_process = None
-        if not self.running_process:
-            try:
-                edmc_process = psutil.Process()
-                edmc_user = edmc_process.username()
-                for proc in psutil.process_iter(['name', 'username']):
-                    if 'EliteDangerous' in proc.info['name'] and proc.info['username'] == edmc_user:
-                        self.running_process = proc
-                        return True
-            except psutil.NoSuchProcess:
-                pass
-            return False
-        return bool(self.running_process)
+        return self.game_process.running()
 
     def ship(self, timestamped=True) -> MutableMapping[str, Any] | None:
         """
@@ -2402,52 +3437,16 @@ class EDLogs(FileSystemEventHandler):
 
     def _parse_navroute_file(self) -> dict[str, Any] | None:
         """Read and parse NavRoute.json."""
-        if self.currentdir is None:
-            raise ValueError('currentdir unset')
-
-        try:
-
-            with open(join(self.currentdir, 'NavRoute.json')) as f:
-                raw = f.read()
-
-        except Exception as e:
-            logger.exception(f'Could not open navroute file. Bailing: {e}')
-            return None
-
-        try:
-            data = json.loads(raw)
-
-        except json.JSONDecodeError:
-            logger.exception('Failed to decode NavRoute.json')
-            return None
-
-        if 'timestamp' not in data:  # quick sanity check
+        data = self.companion_files.read(self._companion_file('NavRoute.json'))
+        if data is None or 'timestamp' not in data:  # quick sanity check
             return None
 
         return data
 
     def _parse_fcmaterials_file(self) -> dict[str, Any] | None:
         """Read and parse FCMaterials.json."""
-        if self.currentdir is None:
-            raise ValueError('currentdir unset')
-
-        try:
-
-            with open(join(self.currentdir, 'FCMaterials.json')) as f:
-                raw = f.read()
-
-        except Exception as e:
-            logger.exception(f'Could not open FCMaterials file. Bailing: {e}')
-            return None
-
-        try:
-            data = json.loads(raw)
-
-        except json.JSONDecodeError:
-            logger.exception('Failed to decode FCMaterials.json')
-            return None
-
-        if 'timestamp' not in data:  # quick sanity check
+        data = self.companion_files.read(self._companion_file('FCMaterials.json'))
+        if data is None or 'timestamp' not in data:  # quick sanity check
             return None
 
         return data
@@ -2456,83 +3455,6 @@ class EDLogs(FileSystemEventHandler):
     def _parse_journal_timestamp(source: str) -> float:
         return mktime(strptime(source, '%Y-%m-%dT%H:%M:%SZ'))
 
-    def __navroute_retry(self) -> bool:
-        """Retry reading navroute files."""
-        if self._navroute_retries_remaining == 0:
-            return False
-
-        logger.debug(f'Navroute read retry [{self._navroute_retries_remaining}]')
-        self._navroute_retries_remaining -= 1
-
-        if self._last_navroute_journal_timestamp is None:
-            logger.critical('Asked to retry for navroute but also no set time to compare? This is a bug.')
-            return False
-
-        if (file := self._parse_navroute_file()) is None:
-            logger.debug(
-                'Failed to parse NavRoute.json. '
-                + ('Trying again' if self._navroute_retries_remaining > 0 else 'Giving up')
-            )
-            return False
-
-        # _parse_navroute_file verifies that this exists for us
-        file_time = self._parse_journal_timestamp(file['timestamp'])
-        if abs(file_time - self._last_navroute_journal_timestamp) > MAX_NAVROUTE_DISCREPANCY:
-            logger.debug(
-                f'Time discrepancy of more than {MAX_NAVROUTE_DISCREPANCY}s --'
-                f' ({abs(file_time - self._last_navroute_journal_timestamp)}).'
-                f' {"Trying again" if self._navroute_retries_remaining > 0 else "Giving up"}.'
-            )
-            return False
-
-        # Handle it being `NavRouteClear`d already
-        if file['event'].lower() == 'navrouteclear':
-            logger.info('NavRoute file contained a NavRouteClear')
-            # We do *NOT* copy into/clear the `self.state['NavRoute']`
-        else:
-            # everything is good, lets set what we need to and make sure we dont try again
-            logger.info('Successfully read NavRoute file for last NavRoute event.')
-            self.state['NavRoute'] = file
-
-        self._navroute_retries_remaining = 0
-        self._last_navroute_journal_timestamp = None
-        return True
-
-    def __fcmaterials_retry(self) -> dict[str, Any] | None:
-        """Retry reading FCMaterials files."""
-        if self._fcmaterials_retries_remaining == 0:
-            return None
-
-        logger.debug(f'FCMaterials read retry [{self._fcmaterials_retries_remaining}]')
-        self._fcmaterials_retries_remaining -= 1
-
-        if self._last_fcmaterials_journal_timestamp is None:
-            logger.critical('Asked to retry for FCMaterials but also no set time to compare? This is a bug.')
-            return None
-
-        if (file := self._parse_fcmaterials_file()) is None:
-            logger.debug(
-                'Failed to parse FCMaterials.json. '
-                + ('Trying again' if self._fcmaterials_retries_remaining > 0 else 'Giving up')
-            )
-            return None
-
-        # _parse_fcmaterials_file verifies that this exists for us
-        file_time = self._parse_journal_timestamp(file['timestamp'])
-        if abs(file_time - self._last_fcmaterials_journal_timestamp) > MAX_FCMATERIALS_DISCREPANCY:
-            logger.debug(
-                f'Time discrepancy of more than {MAX_FCMATERIALS_DISCREPANCY}s --'
-                f' ({abs(file_time - self._last_fcmaterials_journal_timestamp)}).'
-                f' {"Trying again" if self._fcmaterials_retries_remaining > 0 else "Giving up"}.'
-            )
-            return None
-
-        # everything is good, lets set what we need to and make sure we dont try again
-        logger.info('Successfully read FCMaterials file for last FCMaterials event.')
-        self._fcmaterials_retries_remaining = 0
-        self._last_fcmaterials_journal_timestamp = None
-        return file
-
     def is_live_galaxy(self) -> bool:
         """
         Indicate if current tracking indicates Live galaxy.
@@ -2555,5 +3477,11 @@ class EDLogs(FileSystemEventHandler):
         return False
 
 
+EDLogs._event_handlers = {
+    event_type: handler
+    for handler in vars(EDLogs).values()
+    for event_type in getattr(handler, 'journal_events', ())
+}
+
 # singleton
 monitor = EDLogs()
@@ -9,15 +9,21 @@ from __future__ import annotations
 
 import copy
 import importlib.util
+import json
 import logging
 import operator
 import os
 import sys
+import threading
 import tkinter as tk
+from bisect import bisect_left
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from queue import Full, Queue
+from time import monotonic, perf_counter
 from tkinter import ttk
-from typing import Any, Mapping, MutableMapping
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, MutableMapping
 
 import companion
 import myNotebook as nb  # noqa: N813
@@ -31,6 +37,18 @@ PLUGINS = []
 PLUGINS_not_py3 = []
 PLUGINS_broken = []
 
+# Plugin hook calls taking longer than this (seconds) are logged, as they freeze the UI
+SLOW_HOOK_SECONDS = 0.1
+SLOW_HOOK_WARNING_INTERVAL = 60  # Minimum seconds between warnings about the same plugin hook
+HOOK_STATS_FILENAME = 'plugin_stats.json'
+HOOK_STATS_SAVE_INTERVAL = 60  # Minimum seconds between saves of the hook stats prompted by slow hooks
+
+# For plugins that have their hooks called on a worker thread, see PluginWorker
+WORKER_QUEUE_SIZE = 1000  # Calls waiting for the worker, beyond which new ones are dropped
+WORKER_STUCK_SECONDS = 30  # A single call taking longer than this is logged as stuck
+WORKER_WATCHDOG_INTERVAL = 5
+WORKER_STOP_TIMEOUT = 5  # Seconds to wait for a worker to finish its queue at shutdown
+
 
 # For asynchronous error display
 class LastError:
@@ -46,6 +64,219 @@ class LastError:
 last_error = LastError()
 
 
+class HookStats:
+    """Call count and latency histogram for one hook of one plugin."""
+
+    # Upper bounds (milliseconds) of the histogram buckets.  There's one more for anything slower.
+    BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.slow = 0
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+        self.last_warning = -float(SLOW_HOOK_WARNING_INTERVAL)
+
+    def record(self, seconds: float) -> bool:
+        """
+        Record a call.
+
+        :param seconds: How long it took.
+        :returns: True if it was slow and that should be logged.
+        """
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+        # This is on every plugin call, so avoid the bisect for the usual case
+        if seconds < 0.001:
+            self.histogram[0] += 1
+            return False
+
+        self.histogram[bisect_left(self.BUCKETS, seconds * 1000)] += 1
+        if seconds < SLOW_HOOK_SECONDS:
+            return False
+
+        self.slow += 1
+        now = monotonic()
+        if now - self.last_warning < SLOW_HOOK_WARNING_INTERVAL:
+            return False
+
+        self.last_warning = now
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Get the stats in a form that can be saved as JSON.
+
+        :returns: The stats.
+        """
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'max_seconds': self.max_seconds,
+            'slow': self.slow,
+            'histogram': self.histogram,
+        }
+
+
+class JournalEventIndex:
+    """Which plugins to notify of each Journal event."""
+
+    def __init__(self) -> None:
+        self.by_event: dict[str, list[Plugin]] = {}
+        # Plugins that haven't declared journal_events, so are notified of every event
+        self.undeclared: list[Plugin] = []
+
+    def build(self, plugins: list[Plugin]) -> None:
+        """
+        Index the plugins by the Journal events they've declared.
+
+        :param plugins: All loaded plugins, in the order they should be notified.
+        """
+        events = set().union(*(p.journal_events for p in plugins if p.journal_events is not None))
+        self.by_event = {
+            event: [p for p in plugins if p.journal_events is None or event in p.journal_events] for event in events
+        }
+        self.undeclared = [p for p in plugins if p.journal_events is None]
+
+    def plugins_for(self, event: str) -> list[Plugin]:
+        """
+        Get the plugins to notify of an event.
+
+        :param event: The Journal event name.
+        :returns: The plugins, in load order.
+        """
+        return self.by_event.get(event, self.undeclared)
+
+
+journal_event_index = JournalEventIndex()
+
+
+class PluginWorker:
+    """Calls a plugin's non-UI hooks, in order, on a thread of its own."""
+
+    def __init__(self, plugin: Plugin) -> None:
+        self.plugin = plugin
+        # (hook name, function, arguments), or None to stop
+        self.queue: Queue[tuple[str, Callable[..., Any], tuple[Any, ...]] | None] = Queue(WORKER_QUEUE_SIZE)
+        self.dropped = 0
+        self.last_drop_warning = -float(SLOW_HOOK_WARNING_INTERVAL)
+        self.busy_hook: str | None = None
+        self.busy_since: float | None = None
+        self.stuck = False  # Set by the watchdog, cleared when the call returns
+        self.stuck_calls = 0
+        self.thread = threading.Thread(target=self.run, name=f'Plugin "{plugin.name}" worker', daemon=True)
+        self.thread.start()
+
+    def submit(self, hook: str, func: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue a call to a hook.
+
+        :param hook: Name of the hook.
+        :param func: The plugin's implementation of it.
+        :param args: Arguments to pass.  These must not be changed afterwards.
+        """
+        try:
+            self.queue.put_nowait((hook, func, args))
+
+        except Full:
+            self.dropped += 1
+            now = monotonic()
+            if now - self.last_drop_warning >= SLOW_HOOK_WARNING_INTERVAL:
+                self.last_drop_warning = now
+                logger.warning(
+                    f'Plugin "{self.plugin.name}" is not keeping up, {self.dropped} calls dropped, including {hook}()'
+                )
+
+    def run(self) -> None:
+        """Call the queued hooks until told to stop."""
+        while (item := self.queue.get()) is not None:
+            hook, func, args = item
+            self.busy_hook = hook
+            self.busy_since = monotonic()
+            try:
+                error = _call_hook(self.plugin, hook, func, *args)
+                if error:
+                    show_error(error)
+
+            except Exception:
+                logger.exception(f'Plugin "{self.plugin.name}" failed in {hook}()')
+
+            finally:
+                self.busy_since = None
+                self.stuck = False
+
+    def check(self, now: float) -> None:
+        """
+        Log if the current call has been running too long.
+
+        :param now: The current monotonic() time.
+        """
+        busy_since = self.busy_since
+        if busy_since is not None and not self.stuck and now - busy_since > WORKER_STUCK_SECONDS:
+            self.stuck = True
+            self.stuck_calls += 1
+            logger.warning(
+                f'Plugin "{self.plugin.name}" has been stuck in {self.busy_hook}() for {now - busy_since:.0f}s,'
+                f' {self.queue.qsize()} calls waiting'
+            )
+
+    def stop(self) -> None:
+        """Let the worker finish what's queued, waiting at most WORKER_STOP_TIMEOUT."""
+        try:
+            self.queue.put(None, timeout=WORKER_STOP_TIMEOUT)
+            self.thread.join(WORKER_STOP_TIMEOUT)
+
+        except Full:
+            pass
+
+        if self.thread.is_alive():
+            logger.warning(f'Plugin "{self.plugin.name}" worker did not finish, {self.queue.qsize()} calls abandoned')
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Get the worker's state in a form that can be saved as JSON.
+
+        :returns: The state.
+        """
+        return {
+            'queued': self.queue.qsize(), 'dropped': self.dropped, 'stuck': self.stuck, 'stuck_calls': self.stuck_calls
+        }
+
+
+class PluginWatchdog:
+    """Checks, on its own thread, for plugin workers that are stuck."""
+
+    def __init__(self) -> None:
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the watchdog thread."""
+        self.thread = threading.Thread(target=self.run, name='Plugin worker watchdog', daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Check all workers every WORKER_WATCHDOG_INTERVAL."""
+        while not self.stopping.wait(WORKER_WATCHDOG_INTERVAL):
+            now = monotonic()
+            for plugin in PLUGINS:
+                if plugin.worker is not None:
+                    plugin.worker.check(now)
+
+    def stop(self) -> None:
+        """Stop the watchdog thread, if it was started."""
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+worker_watchdog = PluginWatchdog()
+
+
 class Plugin:
     """An EDMC plugin."""
 
@@ -62,6 +293,14 @@ class Plugin:
         self.folder: str | None = name  # basename of plugin folder. None for internal plugins.
         self.module = None  # None for disabled plugins.
         self.logger: logging.Logger | None = plugin_logger
+        # Whether journal_entry() accepts read-only views rather than copies.
+        self.journal_entry_readonly: bool = False
+        # Journal events to notify the plugin of, None for all of them.
+        self.journal_events: frozenset[str] | None = None
+        # Timing of calls to the plugin's hooks, by hook name.
+        self.hook_stats: dict[str, HookStats] = {}
+        # If the plugin wants its non-UI hooks called off the main thread.
+        self.worker: PluginWorker | None = None
 
         if loadfile:
             logger.info(f'loading plugin "{name.replace(".", "_")}" from "{loadfile}"')
@@ -75,9 +314,15 @@ class Plugin:
                     sys.modules[module.__name__] = module
                     spec.loader.exec_module(module)
                     if getattr(module, 'plugin_start3', None):
-                        newname = module.plugin_start3(Path(loadfile).resolve().parent)
+                        newname = _call_hook(
+                            self, 'plugin_start3', module.plugin_start3, Path(loadfile).resolve().parent
+                        )
                         self.name = str(newname) if newname else self.name
                         self.module = module
+                        self.journal_entry_readonly = bool(getattr(module, 'journal_entry_readonly', False))
+                        self.journal_events = self._get_journal_events()
+                        if getattr(module, 'hooks_off_main_thread', False):
+                            self.worker = PluginWorker(self)
                     elif getattr(module, 'plugin_start', None):
                         logger.warning(f'plugin {name} needs migrating\n')
                         PLUGINS_not_py3.append(self)
@@ -100,6 +345,30 @@ class Plugin:
         """
         return getattr(self.module, funcname, None)
 
+    def _get_journal_events(self) -> frozenset[str] | None:
+        """
+        Get the Journal events the plugin has declared it wants to be notified of.
+
+        :returns: The event names, or None for all events.
+        """
+        events = getattr(self.module, 'journal_events', None)
+        if events is None:
+            return None
+
+        if not isinstance(events, str):
+            try:
+                events = frozenset(events)
+
+            except TypeError:
+                pass
+
+            else:
+                if all(isinstance(event, str) for event in events):
+                    return events
+
+        logger.error(f'Plugin "{self.name}": journal_events is not a collection of event names, ignoring it')
+        return None
+
     def get_app(self, parent: tk.Frame) -> tk.Frame | None:
         """
         If the plugin provides mainwindow content create and return it.
@@ -110,7 +379,7 @@ class Plugin:
         plugin_app = self._get_func('plugin_app')
         if plugin_app:
             try:
-                appitem = plugin_app(parent)
+                appitem = _call_hook(self, 'plugin_app', plugin_app, parent)
                 if appitem is None:
                     return None
                 if isinstance(appitem, tuple):
@@ -141,7 +410,7 @@ class Plugin:
         plugin_prefs = self._get_func('plugin_prefs')
         if plugin_prefs:
             try:
-                frame = plugin_prefs(parent, cmdr, is_beta)
+                frame = _call_hook(self, 'plugin_prefs', plugin_prefs, parent, cmdr, is_beta)
                 if isinstance(frame, nb.Frame):
                     return frame
                 raise TypeError(f'Expected nb.Frame from plugin_prefs, got {type(frame).__name__}')
@@ -150,6 +419,158 @@ class Plugin:
         return None
 
 
+def _call_hook(plugin: Plugin, hook: str, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call a plugin hook, recording how long it took.
+
+    :param plugin: The plugin.
+    :param hook: Name of the hook.
+    :param func: The plugin's implementation of it.
+    :param args: Arguments to pass.
+    :returns: Whatever func returns.
+    """
+    start = perf_counter()
+    try:
+        return func(*args)
+
+    finally:
+        seconds = perf_counter() - start
+        stats = plugin.hook_stats.get(hook)
+        if stats is None:
+            stats = plugin.hook_stats[hook] = HookStats()
+
+        if stats.record(seconds):
+            freezing = ', freezing the UI' if threading.current_thread() is threading.main_thread() else ''
+            logger.warning(
+                f'Plugin "{plugin.name}" took {seconds * 1000:.0f} ms in {hook}(){freezing}.'
+                f'  {stats.slow} of {stats.calls} calls have taken over {SLOW_HOOK_SECONDS * 1000:.0f} ms'
+            )
+            save_hook_stats(throttle=True)
+
+
+def _dispatch_hook(plugin: Plugin, hook: str, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call a non-UI plugin hook, or queue the call if the plugin has a worker.
+
+    :param plugin: The plugin.
+    :param hook: Name of the hook.
+    :param func: The plugin's implementation of it.
+    :param args: Arguments to pass.  These must not be changed afterwards.
+    :returns: Whatever func returns, or None if it was queued.
+    """
+    if plugin.worker is None:
+        return _call_hook(plugin, hook, func, *args)
+
+    plugin.worker.submit(hook, func, *args)
+    return None
+
+
+def hook_stats() -> dict[str, dict[str, dict[str, Any]]]:
+    """
+    Get the timing of all loaded plugins' hooks.
+
+    :returns: Stats by plugin name then hook name.
+    """
+    # list() as workers might be adding hooks as we go
+    return {
+        plugin.name: {hook: stats.as_dict() for hook, stats in list(plugin.hook_stats.items())}
+        for plugin in PLUGINS if plugin.hook_stats
+    }
+
+
+# Slow hooks can prompt a save from any thread
+_hook_stats_lock = threading.Lock()
+_hook_stats_saved = -float(HOOK_STATS_SAVE_INTERVAL)
+
+
+def save_hook_stats(throttle: bool = False) -> None:
+    """
+    Save the timing of all loaded plugins' hooks, for the System Profiler.
+
+    :param throttle: Don't save if they were saved less than HOOK_STATS_SAVE_INTERVAL ago.
+    """
+    global _hook_stats_saved
+
+    path = config.app_dir_path / HOOK_STATS_FILENAME
+    with _hook_stats_lock:
+        now = monotonic()
+        if throttle and now - _hook_stats_saved < HOOK_STATS_SAVE_INTERVAL:
+            return
+
+        _hook_stats_saved = now
+        try:
+            # Write then rename, so the System Profiler never reads a partial file
+            temp_path = path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'buckets': HookStats.BUCKETS,
+                    'plugins': hook_stats(),
+                    'workers': {
+                        plugin.name: plugin.worker.as_dict() for plugin in PLUGINS if plugin.worker is not None
+                    },
+                }, f, indent=1)
+
+            temp_path.replace(path)
+
+        except OSError:
+            logger.exception('Failed to save plugin hook stats')
+
+
+def load_hook_stats() -> dict[str, Any] | None:
+    """
+    Load the plugin hook timing saved by the last, or currently, running EDMarketConnector.
+
+    :returns: What save_hook_stats() saved, or None if there's nothing.
+    """
+    try:
+        with open(config.app_dir_path / HOOK_STATS_FILENAME, encoding='utf-8') as f:
+            return json.load(f)
+
+    except (OSError, ValueError):
+        return None
+
+
+def hook_stats_report(saved: dict[str, Any], limit: int | None = None) -> str:
+    """
+    Format saved plugin hook timing as text.
+
+    :param saved: As returned by load_hook_stats().
+    :param limit: Only include this many hooks, those with the most total time.
+    :returns: The report, one line per hook, then one per plugin worker.
+    """
+    buckets = saved['buckets']
+    rows = [
+        (plugin, hook, stats)
+        for plugin, hooks in saved['plugins'].items()
+        for hook, stats in hooks.items()
+    ]
+    rows.sort(key=lambda row: row[2]['seconds'], reverse=True)
+    lines = []
+    for plugin, hook, stats in rows[:limit]:
+        # 95th percentile, as the upper bound of the histogram bucket it's in
+        wanted = 0.95 * stats['calls']
+        seen = 0
+        for bucket, count in enumerate(stats['histogram']):
+            seen += count
+            if seen >= wanted:
+                break
+
+        p95 = f'<={buckets[bucket]} ms' if bucket < len(buckets) else f'>{buckets[-1]} ms'
+        lines.append(
+            f'- {plugin} {hook}(): {stats["calls"]} calls, {stats["seconds"]:.2f} s total,'
+            f' mean {1000 * stats["seconds"] / max(stats["calls"], 1):.1f} ms, p95 {p95},'
+            f' max {1000 * stats["max_seconds"]:.0f} ms, {stats["slow"]} slow'
+        )
+
+    for plugin, worker in saved.get('workers', {}).items():
+        lines.append(
+            f'- {plugin} worker: {worker["queued"]} queued, {worker["dropped"]} dropped,'
+            f' {worker["stuck_calls"]} calls stuck{" (stuck now)" if worker["stuck"] else ""}'
+        )
+
+    return '\n'.join(lines)
+
+
 def load_plugins(master: tk.Tk) -> None:
     """Find and load all plugins."""
     last_error.root = master
@@ -162,6 +583,9 @@ def load_plugins(master: tk.Tk) -> None:
 
     found = _load_found_plugins()
     PLUGINS.extend(sorted(found, key=lambda p: operator.attrgetter('name')(p).lower()))
+    journal_event_index.build(PLUGINS)
+    if any(p.worker is not None for p in PLUGINS):
+        worker_watchdog.start()
 
 
 def _load_internal_plugins():
@@ -259,18 +683,26 @@ def notify_stop() -> str | None:
     If your plugin uses threads then stop and join() them before returning.
     .. versionadded:: 2.3.7
     """
+    for plugin in PLUGINS:
+        if plugin.worker is not None:
+            logger.info(f'Waiting for plugin "{plugin.name}" worker to finish...')
+            plugin.worker.stop()
+
+    worker_watchdog.stop()
+
     error = None
     for plugin in PLUGINS:
         plugin_stop = plugin._get_func('plugin_stop')
         if plugin_stop:
             try:
                 logger.info(f'Asking plugin "{plugin.name}" to stop...')
-                newerror = plugin_stop()
+                newerror = _call_hook(plugin, 'plugin_stop', plugin_stop)
                 error = error or newerror
             except Exception:
                 logger.exception(f'Plugin "{plugin.name}" failed')
 
     logger.info('Done')
+    save_hook_stats()
 
     return error
 
@@ -280,7 +712,7 @@ def _notify_prefs_plugins(fn_name: str, cmdr: str | None, is_beta: bool) -> None
         prefs_callback = plugin._get_func(fn_name)
         if prefs_callback:
             try:
-                prefs_callback(cmdr, is_beta)
+                _call_hook(plugin, fn_name, prefs_callback, cmdr, is_beta)
             except Exception:
                 logger.exception(f'Plugin "{plugin.name}" failed')
 
@@ -324,6 +756,12 @@ def notify_journal_entry(
     :param state: A dictionary containing info about the Cmdr, current ship and cargo
     :param is_beta: whether the player is in a Beta universe.
     :returns: Error message from the first plugin that returns one (if any)
+
+    Plugins that set `journal_entry_readonly = True` are passed read-only views
+    of `entry` and `state`, shared between them, rather than a copy of each.
+    Plugins with a worker are passed deep copies, as `state` will have moved
+    on by the time they're called.
+    Plugins that declare `journal_events` are only sent those events.
     """
     if entry['event'] in 'Location':
         logger.trace_if('journal.locations', 'Notifying plugins of "Location" event')
@@ -337,12 +775,32 @@ def notify_journal_entry(
             error = f"Event at {entry['timestamp']} beyond Time Delta of 60 minutes. Skipping."
             return error
 
-    for plugin in PLUGINS:
+    # One pair of read-only views shared by every plugin that has declared it can cope with them
+    entry_view = MappingProxyType(entry)
+    state_view = MappingProxyType(state)
+    for plugin in journal_event_index.plugins_for(entry['event']):
         journal_entry = plugin._get_func('journal_entry')
         if journal_entry:
             try:
-                # Pass a copy of the journal entry in case the callee modifies it
-                newerror = journal_entry(cmdr, is_beta, system, station, dict(entry), dict(state))
+                if plugin.worker is not None:
+                    # The main thread carries on updating state, including e.g. state['Cargo'], whilst the worker
+                    # reads it, so views or shallow copies won't do
+                    newerror = _dispatch_hook(
+                        plugin, 'journal_entry', journal_entry, cmdr, is_beta, system, station, copy.deepcopy(entry),
+                        copy.deepcopy(state)
+                    )
+
+                elif plugin.journal_entry_readonly:
+                    newerror = _call_hook(
+                        plugin, 'journal_entry', journal_entry, cmdr, is_beta, system, station, entry_view, state_view
+                    )
+
+                else:
+                    # Pass a copy of the journal entry in case the callee modifies it
+                    newerror = _dispatch_hook(
+                        plugin, 'journal_entry', journal_entry, cmdr, is_beta, system, station, dict(entry), dict(state)
+                    )
+
                 error = error or newerror
             except Exception:
                 logger.exception(f'Plugin "{plugin.name}" failed')
@@ -364,12 +822,14 @@ def notify_journal_entry_cqc(
     :returns: Error message from the first plugin that returns one (if any)
     """
     error = None
-    for plugin in PLUGINS:
+    for plugin in journal_event_index.plugins_for(entry['event']):
         cqc_callback = plugin._get_func('journal_entry_cqc')
         if cqc_callback is not None and callable(cqc_callback):
             try:
                 # Pass a copy of the journal entry in case the callee modifies it
-                newerror = cqc_callback(cmdr, is_beta, copy.deepcopy(entry), copy.deepcopy(state))
+                newerror = _dispatch_hook(
+                    plugin, 'journal_entry_cqc', cqc_callback, cmdr, is_beta, copy.deepcopy(entry), copy.deepcopy(state)
+                )
                 error = error or newerror
 
             except Exception:
@@ -378,25 +838,42 @@ def notify_journal_entry_cqc(
     return error
 
 
-def notify_dashboard_entry(cmdr: str, is_beta: bool, entry: MutableMapping[str, Any],) -> str | None:
+def notify_dashboard_entry(
+    cmdr: str, is_beta: bool, entry: MutableMapping[str, Any], changed: Mapping[str, Any] | None = None
+) -> str | None:
     """
     Send a status entry to each plugin.
 
     :param cmdr: The piloting Cmdr name
     :param is_beta: whether the player is in a Beta universe.
     :param entry: The status entry as a dictionary
+    :param changed: What has changed since the last status, from `dashboard.take_changes()`.  If given, also
+      sent to plugins' `dashboard_delta()`.
     :returns: Error message from the first plugin that returns one (if any)
     """
     error = None
+    # Neither of these is changed once taken, so plugins can share read-only views of them, even on workers.  Only
+    # the top level is read-only, so PLUGINS.md asks dashboard_delta() not to change anything in them.
+    entry_view = MappingProxyType(entry)
+    changed_view = MappingProxyType(changed) if changed is not None else None
     for plugin in PLUGINS:
         status = plugin._get_func('dashboard_entry')
         if status:
             try:
-                # Pass a copy of the status entry in case the callee modifies it
-                newerror = status(cmdr, is_beta, dict(entry))
+                # Pass a copy of the status entry, including e.g. Pips and Fuel, in case the callee modifies it
+                newerror = _dispatch_hook(plugin, 'dashboard_entry', status, cmdr, is_beta, copy.deepcopy(entry))
                 error = error or newerror
             except Exception:
                 logger.exception(f'Plugin "{plugin.name}" failed')
+
+        delta = plugin._get_func('dashboard_delta') if changed_view is not None else None
+        if delta:
+            try:
+                newerror = _dispatch_hook(plugin, 'dashboard_delta', delta, cmdr, is_beta, changed_view, entry_view)
+                error = error or newerror
+            except Exception:
+                logger.exception(f'Plugin "{plugin.name}" failed')
+
     return error
 
 
@@ -411,11 +888,14 @@ def notify_capidata(data: companion.CAPIData, is_beta: bool) -> str | None:
     error = None
     for plugin in PLUGINS:
         # TODO: Handle it being Legacy data
-        cmdr_data = plugin._get_func('cmdr_data_legacy' if data.source_host == companion.SERVER_LEGACY else 'cmdr_data')
+        hook = 'cmdr_data_legacy' if data.source_host == companion.SERVER_LEGACY else 'cmdr_data'
+        cmdr_data = plugin._get_func(hook)
 
         if cmdr_data:
             try:
-                newerror = cmdr_data(data, is_beta)
+                # A worker reads it whilst the main thread goes on to use and update it, so pass a copy
+                plugin_data = copy.deepcopy(data) if plugin.worker is not None else data
+                newerror = _dispatch_hook(plugin, hook, cmdr_data, plugin_data, is_beta)
                 error = error or newerror
 
             except Exception:
@@ -437,7 +917,7 @@ def notify_capi_fleetcarrierdata(data: companion.CAPIData) -> str | None:
         if fc_callback is not None and callable(fc_callback):
             try:
                 # Pass a copy of the CAPIData in case the callee modifies it
-                newerror = fc_callback(copy.deepcopy(data))
+                newerror = _dispatch_hook(plugin, 'capi_fleetcarrier', fc_callback, copy.deepcopy(data))
                 error = error if error else newerror
 
             except Exception:
@@ -21,6 +21,7 @@ referenced in this file (or only in any other core plugin), and if so...
 # pylint: disable=import-error
 from __future__ import annotations
 
+import gzip
 import http
 import itertools
 import json
@@ -28,10 +29,12 @@ import os
 import pathlib
 import re
 import sqlite3
+import threading
+import time
 import tkinter as tk
 from platform import system
+from queue import Empty, Queue
 from textwrap import dedent
-from threading import Lock
 from typing import Any, Iterator, Mapping, MutableMapping
 import requests
 import companion
@@ -46,7 +49,7 @@ from monitor import monitor
 from myNotebook import Frame
 from prefs import prefsVersion
 from ttkHyperlinkLabel import HyperlinkLabel
-from util import text
+from util import json_codec, text
 from l10n import translations as tr
 from plugins.common_coreutils import PADX, PADY, BUTTONX, this_format_common
 
@@ -138,13 +141,226 @@ HORIZONS_SKU = 'ELITE_HORIZONS_V_PLANETARY_LANDINGS'
 # one.
 
 
+class EDDNQueueDB:
+    """
+    sqlite3 storage for the queue of EDDN messages.
+
+    The database is used in WAL mode with `synchronous=NORMAL`, so commits
+    don't each cost an fsync.  Writes are also group-committed: they're only
+    committed once `COMMIT_ROWS` are pending, the oldest pending write is
+    `COMMIT_WINDOW` old, or `commit()` is called.  The SQL for all statements
+    is fixed, so sqlite3's statement cache means each is only prepared once.
+
+    Messages are stored as the gzip-compressed, compact JSON that is POSTed
+    to the Gateway, alongside their `$schemaRef` and, for station data, the
+    market id they're about.
+
+    Not thread-safe, only use it from the thread that created it.
+    """
+
+    COMMIT_WINDOW = 0.25  # Longest a write may stay uncommitted [seconds]
+    COMMIT_ROWS = 1000  # Commit early once this many writes are pending
+
+    SQL_INSERT = """
+        INSERT INTO messages (
+            created, cmdr, edmc_version, game_version, game_build, schema_ref, market_id, message
+        )
+        VALUES (
+            ?, ?, ?, ?, ?, ?, ?, ?
+        )
+    """
+    SQL_DELETE = "DELETE FROM messages WHERE id = ?"
+    SQL_SELECT = "SELECT schema_ref, message FROM messages WHERE id = ?"
+    SQL_SELECT_OLDEST = "SELECT id, schema_ref, message FROM messages ORDER BY created LIMIT ?"
+    # Only the newest message per schema and market is of any use
+    SQL_DELETE_SUPERSEDED = """
+        DELETE FROM messages
+        WHERE market_id IS NOT NULL AND id NOT IN (
+            SELECT MAX(id) FROM messages
+            WHERE market_id IS NOT NULL
+            GROUP BY schema_ref, market_id
+        )
+    """
+    # The same for one schema and market, using the messages_market index
+    SQL_DELETE_SUPERSEDED_MARKET = """
+        DELETE FROM messages
+        WHERE schema_ref = ?1 AND market_id = ?2 AND id < (
+            SELECT MAX(id) FROM messages WHERE schema_ref = ?1 AND market_id = ?2
+        )
+    """
+
+    def __init__(self, db_path: pathlib.Path) -> None:
+        """
+        Open, and if necessary initialise, a v2 EDDN queue database.
+
+        :param db_path: Path of the database file.
+        """
+        self.db_path = db_path
+        self.db_conn = sqlite3.connect(db_path)
+        self.db = self.db_conn.cursor()
+        try:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.create_schema()
+
+        except Exception:
+            # Cleanup, as setup failed
+            self.db.close()
+            self.db_conn.close()
+            raise
+
+        self.pending_writes = 0
+        self.commit_deadline: float | None = None
+        # Markets with station data messages inserted since the last delete_superseded(), by ($schemaRef, market
+        # id), or None if the whole queue, e.g. as left by a previous run, needs checking
+        self.new_markets: set[tuple[str, int]] | None = None
+
+    def create_schema(self) -> None:
+        """Ensure the messages table and its indexes exist."""
+        try:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created TEXT NOT NULL,
+                    cmdr TEXT NOT NULL,
+                    edmc_version TEXT,
+                    game_version TEXT,
+                    game_build TEXT,
+                    schema_ref TEXT NOT NULL,
+                    market_id INTEGER,
+                    message BLOB NOT NULL
+                )
+            """)
+
+            self.db.execute("CREATE INDEX IF NOT EXISTS messages_created ON messages (created)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS messages_cmdr ON messages (cmdr)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS messages_market ON messages (schema_ref, market_id)")
+
+            logger.info(f"New '{self.db_path.name}' created")
+
+        except sqlite3.OperationalError as e:
+            if str(e) != "table messages already exists":
+                raise e
+
+    def insert(
+        self, created: str, cmdr: str, edmc_version: str, game_version: str, game_build: str,
+        schema_ref: str, market_id: int | None, message: bytes
+    ) -> int:
+        """
+        Add a message to the queue.
+
+        :param market_id: The market the message is about, only for station data.
+        :param message: The gzip-compressed message.
+        :return: ID of the inserted row.
+        """
+        self.db.execute(
+            self.SQL_INSERT, (created, cmdr, edmc_version, game_version, game_build, schema_ref, market_id, message)
+        )
+        row_id = self.db.lastrowid or -1
+        if market_id is not None and self.new_markets is not None:
+            self.new_markets.add((schema_ref, market_id))
+
+        self._written(1)
+        return row_id
+
+    def delete(self, row_ids: list[int]) -> None:
+        """
+        Delete messages from the queue.
+
+        :param row_ids: ids of the messages to be deleted.
+        """
+        if not row_ids:
+            return
+
+        self.db.executemany(self.SQL_DELETE, [(row_id,) for row_id in row_ids])
+        self._written(len(row_ids))
+
+    def get(self, row_id: int) -> tuple[str, bytes] | None:
+        """
+        Fetch a queued message.
+
+        :param row_id: id of the message.
+        :return: Tuple of ($schemaRef, compressed message), or None if there's no such row.
+        """
+        return self.db.execute(self.SQL_SELECT, (row_id,)).fetchone()
+
+    def oldest(self, limit: int) -> list[tuple[int, str, bytes]]:
+        """
+        Fetch the oldest queued messages.
+
+        :param limit: Maximum number of messages to fetch.
+        :return: List of (id, $schemaRef, compressed message) tuples, oldest first.
+        """
+        return self.db.execute(self.SQL_SELECT_OLDEST, (limit,)).fetchall()
+
+    def delete_superseded(self) -> int:
+        """
+        Delete station data messages that a newer one for the same market supersedes.
+
+        Only markets with messages inserted since the last call are checked,
+        except on the first call, which checks the whole queue.
+
+        :return: Number of messages deleted.
+        """
+        if self.new_markets is None:
+            self.db.execute(self.SQL_DELETE_SUPERSEDED)
+            self.new_markets = set()
+
+        elif self.new_markets:
+            self.db.executemany(self.SQL_DELETE_SUPERSEDED_MARKET, self.new_markets)
+            self.new_markets.clear()
+
+        else:
+            return 0
+
+        deleted = max(0, self.db.rowcount)
+        if deleted:
+            self._written(deleted)
+
+        return deleted
+
+    def _written(self, count: int) -> None:
+        """Account for pending writes, committing if enough have built up."""
+        self.pending_writes += count
+        if self.commit_deadline is None:
+            self.commit_deadline = time.monotonic() + self.COMMIT_WINDOW
+
+        if self.pending_writes >= self.COMMIT_ROWS:
+            self.commit()
+
+    def commit(self) -> None:
+        """Commit any pending writes."""
+        if self.pending_writes:
+            logger.trace_if("plugin.eddn.send", f"Committing {self.pending_writes} writes")
+            self.db_conn.commit()
+
+        self.pending_writes = 0
+        self.commit_deadline = None
+
+    def commit_if_due(self) -> None:
+        """Commit pending writes if the oldest has waited `COMMIT_WINDOW`."""
+        if self.commit_deadline is not None and time.monotonic() >= self.commit_deadline:
+            self.commit()
+
+    def close(self) -> None:
+        """Commit any pending writes and close the database."""
+        self.commit()
+        logger.debug('Closing db cursor.')
+        self.db.close()
+
+        logger.debug('Closing db connection.')
+        self.db_conn.close()
+
+
 class EDDNSender:
     """Handle sending of EDDN messages to the Gateway."""
 
     SQLITE_DB_FILENAME_V1 = 'eddn_queue-v1.db'
+    SQLITE_DB_FILENAME_V2 = 'eddn_queue-v2.db'
     # EDDN schema types that pertain to station data
     STATION_SCHEMAS = ('commodity', 'fcmaterials_capi', 'fcmaterials_journal', 'outfitting', 'shipyard')
     TIMEOUT = 10  # requests timeout
+    REPLAY_NOW = 'replay'  # Worker queue item requesting a queue replay
     UNKNOWN_SCHEMA_RE = re.compile(
         r"^FAIL: \[JsonValidationException\('Schema "
         r"https://eddn.edcd.io/schemas/(?P<schema_name>.+)/(?P<schema_version>[0-9]+) is unknown, "
@@ -155,6 +371,9 @@ class EDDNSender:
         """
         Prepare the system for processing messages.
 
+        All database and network I/O happens on the worker thread started
+        here, which will:
+
         - Ensure the sqlite3 database for EDDN replays exists and has schema.
         - Convert any legacy file into the database.
         - (Future) Handle any database migrations.
@@ -167,93 +386,192 @@ class EDDNSender:
         self.session = requests.Session()
         self.session.headers['User-Agent'] = user_agent
 
-        self.db_conn = self.sqlite_queue_v1()
-        self.db = self.db_conn.cursor()
-
-        #######################################################################
-        # Queue database migration
-        #######################################################################
-        self.convert_legacy_file()
-        #######################################################################
+        # Owned by, and only ever used from, the worker thread
+        self.store: EDDNQueueDB
 
-        self.queue_processing = Lock()
-        # Initiate retry/send-now timer
-        logger.trace_if(
-            "plugin.eddn.send",
-            f"First queue run scheduled for {self.eddn.REPLAY_STARTUP_DELAY}ms from now"
-        )
-        if not os.getenv("EDMC_NO_UI"):
-            self.eddn.parent.after(self.eddn.REPLAY_STARTUP_DELAY, self.queue_check_and_send, True)
+        # Replay rate limit towards the Gateway, and throughput tracking
+        self.replay_rate = max(1, config.get_int('eddn_replay_rate', default=self.eddn.REPLAY_RATE))
+        self.replay_started: float | None = None
+        self.replay_sent = 0
+        # Consecutive failed attempts, for backing off
+        self.replay_failures = 0
+        # Superseded station data messages dropped instead of being sent
+        self.coalesced = 0
 
-    def sqlite_queue_v1(self) -> sqlite3.Connection:
-        """
-        Initialise a v1 EDDN queue database.
+        # Latest status text, for the main thread to display on <<EDDNStatus>>
+        self.ui_status = ''
 
-        :return: sqlite3 connection
-        """
-        db_conn = sqlite3.connect(config.app_dir_path / self.SQLITE_DB_FILENAME_V1)
-        db = db_conn.cursor()
-
-        try:
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created TEXT NOT NULL,
-                    cmdr TEXT NOT NULL,
-                    edmc_version TEXT,
-                    game_version TEXT,
-                    game_build TEXT,
-                    message TEXT NOT NULL
-                )
-            """)
-
-            db.execute("CREATE INDEX IF NOT EXISTS messages_created ON messages (created)")
-            db.execute("CREATE INDEX IF NOT EXISTS messages_cmdr ON messages (cmdr)")
-
-            logger.info("New 'eddn_queue-v1.db' created")
-
-        except sqlite3.OperationalError as e:
-            if str(e) != "table messages already exists":
-                # Cleanup, as schema creation failed
-                db.close()
-                db_conn.close()
-                raise e
-
-        return db_conn
+        # Items for the worker: (cmdr, msg, send_now), REPLAY_NOW, or None to stop
+        self.queue: Queue = Queue()
+        self.closing = False
+        self.thread: threading.Thread | None = threading.Thread(target=self.worker, name='EDDN worker')
+        self.thread.daemon = True
+        self.thread.start()
 
     def convert_legacy_file(self):
         """Convert a legacy file's contents into the sqlite3 db."""
         filename = config.app_dir_path / 'replay.jsonl'
         try:
             with open(filename, 'r+', buffering=1) as replay_file:
-                logger.info("Converting legacy `replay.jsonl` to `eddn_queue-v1.db`")
+                logger.info(f"Converting legacy `replay.jsonl` to `{self.SQLITE_DB_FILENAME_V2}`")
                 for line in replay_file:
                     cmdr, msg = json.loads(line)
-                    self.add_message(cmdr, msg)
+                    self.store_message(cmdr, msg)
 
         except FileNotFoundError:
             return
 
-        logger.info("Conversion to `eddn_queue-v1.db` complete, removing `replay.jsonl`")
+        self.store.commit()
+
+        logger.info(f"Conversion to `{self.SQLITE_DB_FILENAME_V2}` complete, removing `replay.jsonl`")
         # Best effort at removing the file/contents
         with open(filename, 'w') as replay_file:
             replay_file.truncate()
         os.unlink(filename)
 
+    def convert_v1_database(self) -> None:
+        """Convert a v1 queue database, with uncompressed messages, into the v2 one."""
+        filename = config.app_dir_path / self.SQLITE_DB_FILENAME_V1
+        if not filename.exists():
+            return
+
+        logger.info(f"Converting `{self.SQLITE_DB_FILENAME_V1}` to `{self.SQLITE_DB_FILENAME_V2}`")
+        db_conn = sqlite3.connect(filename)
+        skipped = 0
+        try:
+            for row_id, cmdr, message in db_conn.execute(
+                "SELECT id, cmdr, message FROM messages ORDER BY created"
+            ):
+                try:
+                    self.store_message(cmdr, json.loads(message))
+
+                except (ValueError, KeyError, TypeError) as e:  # json.JSONDecodeError is a ValueError
+                    # As replaying it would have failed, there's no point keeping it
+                    logger.warning(f"Skipping malformed message {row_id=} in `{self.SQLITE_DB_FILENAME_V1}`: {e!r}")
+                    skipped += 1
+
+        finally:
+            db_conn.close()
+
+        self.store.commit()
+        logger.info(
+            f"Conversion to `{self.SQLITE_DB_FILENAME_V2}` complete, {skipped} malformed messages skipped,"
+            f" removing `{self.SQLITE_DB_FILENAME_V1}`"
+        )
+        for suffix in ('', '-wal', '-shm'):
+            pathlib.Path(f'{filename}{suffix}').unlink(missing_ok=True)
+
     def close(self) -> None:
-        """Clean up any resources."""
-        logger.debug('Closing db cursor.')
-        if self.db:
-            self.db.close()
+        """
+        Clean up any resources.
 
-        logger.debug('Closing db connection.')
-        if self.db_conn:
-            self.db_conn.close()
+        Messages already handed to `add_message()` are still recorded, and
+        sent if asked for, before the worker thread exits.
+        """
+        logger.debug('Signalling worker to stop...')
+        self.closing = True
+        self.queue.put(None)
+        if self.thread:
+            logger.debug('Joining worker thread...')
+            self.thread.join()
+            self.thread = None
 
         logger.debug('Closing EDDN requests.Session.')
         self.session.close()
 
-    def add_message(self, cmdr: str, msg: MutableMapping[str, Any]) -> int:
+    def worker(self) -> None:  # noqa: CCR001
+        """
+        Record, send and replay messages until told to stop.
+
+        This is the target function of the sender's thread.  It owns the
+        queue database connection, and all network I/O to the Gateway,
+        including retries with backoff.
+        """
+        logger.debug('Starting...')
+        try:
+            self.store = EDDNQueueDB(config.app_dir_path / self.SQLITE_DB_FILENAME_V2)
+
+            ###################################################################
+            # Queue database migration
+            ###################################################################
+            self.convert_legacy_file()
+            self.convert_v1_database()
+            ###################################################################
+
+        except Exception:
+            logger.exception("Couldn't open the EDDN queue database, nothing will be sent")
+            return
+
+        next_replay: float | None = None
+        if not os.getenv("EDMC_NO_UI"):
+            logger.trace_if(
+                "plugin.eddn.send",
+                f"First queue run scheduled for {self.eddn.REPLAY_STARTUP_DELAY}ms from now"
+            )
+            next_replay = time.monotonic() + self.eddn.REPLAY_STARTUP_DELAY / 1000
+
+        while True:
+            # Wake up for whichever is due first, the next replay, or committing pending writes
+            deadlines = [d for d in (next_replay, self.store.commit_deadline) if d is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            try:
+                item = self.queue.get(timeout=timeout)
+
+            except Empty:
+                if next_replay is None or time.monotonic() < next_replay:
+                    self.store.commit_if_due()
+                    continue
+
+                item = self.REPLAY_NOW
+
+            if item is None:
+                logger.debug('Empty queue message, exiting')
+                break
+
+            if item == self.REPLAY_NOW:
+                delay = self.queue_check_and_send()
+                logger.trace_if("plugin.eddn.send", f"Next run scheduled for {delay}ms from now")
+                if not os.getenv("EDMC_NO_UI"):
+                    next_replay = time.monotonic() + delay / 1000
+
+                self.store.commit_if_due()
+                continue
+
+            cmdr, msg, send_now = item
+            row_id = self.store_message(cmdr, msg)
+            if send_now and row_id != -1:
+                if self.send_message_by_id(row_id):
+                    self.replay_failures = 0
+
+                elif next_replay is not None:
+                    # Leave it queued, and try again after backing off
+                    self.replay_failures += 1
+                    next_replay = min(next_replay, time.monotonic() + self.replay_backoff() / 1000)
+
+            self.store.commit_if_due()
+
+        self.store.close()
+        logger.debug('Done.')
+
+    def add_message(self, cmdr: str, msg: MutableMapping[str, Any], send_now: bool = False) -> None:
+        """
+        Queue an EDDN message for the worker to record and, optionally, send.
+
+        This only hands the message over, it never blocks on database or
+        network I/O.
+
+        :param cmdr: Name of the Commander that created this message.
+        :param msg: The full, transmission-ready, EDDN message.
+        :param send_now: Whether to attempt sending straight after recording.
+        """
+        logger.trace_if("plugin.eddn.send", f"Queueing message for {msg['$schemaRef']=}, {send_now=}")
+        self.queue.put((cmdr, msg, send_now))
+
+    def request_replay(self) -> None:
+        """Ask the worker to check for, and send, queued messages now."""
+        self.queue.put(self.REPLAY_NOW)
+
+    def store_message(self, cmdr: str, msg: MutableMapping[str, Any]) -> int:
         """
         Add an EDDN message to the database.
 
@@ -261,6 +579,8 @@ class EDDNSender:
         of `header`, `$schemaRef` and `message`.  Code handling this not being
         the case is only for loading the legacy `replay.json` file messages.
 
+        It is stored exactly as it will be sent, i.e. compact and compressed.
+
         NB: Although `cmdr` *should* be the same as `msg->header->uploaderID`
             we choose not to assume that.
 
@@ -289,26 +609,45 @@ class EDDNSender:
         uploader = msg['header']['uploaderID']
 
         try:
-            self.db.execute(
-                """
-                INSERT INTO messages (
-                    created, cmdr, edmc_version, game_version, game_build, message
-                )
-                VALUES (
-                    ?, ?, ?, ?, ?, ?
-                )
-                """,
-                (created, uploader, edmc_version, game_version, game_build, json.dumps(msg))
+            encoded, _ = text.gzip(json_codec.dumps_bytes(msg), max_size=0)
+            row_id = self.store.insert(
+                created, uploader, edmc_version, game_version, game_build, msg['$schemaRef'],
+                self.station_market_id(msg), encoded
             )
-            self.db_conn.commit()
 
         except Exception:
             logger.exception('INSERT error')
             # Can't possibly be a valid row id
             return -1
 
-        logger.trace_if("plugin.eddn.send", f"Message for {msg['$schemaRef']=} recorded, id={self.db.lastrowid}")
-        return self.db.lastrowid or -1
+        logger.trace_if("plugin.eddn.send", f"Message for {msg['$schemaRef']=} recorded, id={row_id}")
+        return row_id
+
+    def station_market_id(self, msg: Mapping[str, Any]) -> int | None:
+        """
+        Determine the market a station data message is about.
+
+        :param msg: The full EDDN message.
+        :return: The market id, or None if this isn't station data.
+        """
+        if not any(s in msg['$schemaRef'] for s in self.STATION_SCHEMAS):
+            return None
+
+        # fcmaterials schemas use the Journal's capitalisation
+        return msg['message'].get('marketId', msg['message'].get('MarketID'))
+
+    def coalesce_queue(self) -> None:
+        """Drop queued station data messages that a newer one for the same market supersedes."""
+        try:
+            dropped = self.store.delete_superseded()
+
+        except Exception:
+            logger.exception("DB error dropping superseded messages")
+            return
+
+        if dropped:
+            self.coalesced += dropped
+            logger.info(f"Dropped {dropped} superseded station messages, {self.coalesced} sends saved in total")
 
     def delete_message(self, row_id: int) -> None:
         """
@@ -317,13 +656,7 @@ class EDDNSender:
         :param row_id: id of message to be deleted.
         """
         logger.trace_if("plugin.eddn.send", f"Deleting message with {row_id=}")
-        self.db.execute(
-            """
-            DELETE FROM messages WHERE id = :row_id
-            """,
-            {'row_id': row_id}
-        )
-        self.db_conn.commit()
+        self.store.delete([row_id])
 
     def send_message_by_id(self, id: int):
         """
@@ -333,16 +666,13 @@ class EDDNSender:
         :return:
         """
         logger.trace_if("plugin.eddn.send", f"Sending message with {id=}")
-        self.db.execute(
-            """
-            SELECT * FROM messages WHERE id = :row_id
-            """,
-            {'row_id': id}
-        )
-        row = dict(zip([c[0] for c in self.db.description], self.db.fetchone()))
+        row = self.store.get(id)
+        if row is None:
+            logger.warning(f"No queued message with {id=}")
+            return False
 
         try:
-            if self.send_message(row['message']):
+            if self.send_message(*row):
                 self.delete_message(id)
                 return True
 
@@ -356,15 +686,29 @@ class EDDNSender:
         Set the UI status text, if applicable.
 
         When running as a CLI there is no such thing, so log to INFO instead.
+        Otherwise the text is passed to the main thread via `<<EDDNStatus>>`,
+        as Tk isn't thread-safe.
         :param text: The status text to be set/logged.
         """
         if os.getenv('EDMC_NO_UI'):
             logger.info(text)
             return
 
-        self.eddn.parent.nametowidget(f".{appname.lower()}.status")['text'] = text
+        self.ui_status = text
+        if not config.shutting_down:
+            self.eddn.parent.event_generate('<<EDDNStatus>>', when="tail")
 
-    def send_message(self, msg: str) -> bool:
+    @staticmethod
+    def decode(msg: bytes) -> dict[str, Any]:
+        """
+        Decode a stored, compressed, message.
+
+        :param msg: The gzip-compressed message.
+        :return: The message.
+        """
+        return json_codec.loads(gzip.decompress(msg))
+
+    def send_message(self, schema_ref: str, msg: bytes) -> bool:
         """
         Transmit a fully-formed EDDN message to the Gateway.
 
@@ -373,28 +717,33 @@ class EDDNSender:
         are checked.
 
         It *is* however the one 'sending' place that the EDDN killswitches are checked.
+        Only if that killswitch is active is the message decoded, so that any
+        rules can be applied, otherwise the stored bytes are sent as-is.
 
         Should catch and handle all failure conditions.  A `True` return might
         mean that the message was successfully sent, *or* that this message
         should not be retried after a failure, i.e. too large.
 
-        :param msg: Fully formed, string, message.
+        :param schema_ref: The `$schemaRef` of the message.
+        :param msg: Fully formed message, compact JSON, gzip-compressed.
         :return: `True` for "now remove this message from the queue"
         """
         logger.trace_if("plugin.eddn.send", "Sending message")
-        should_return: bool
-        new_data: dict[str, Any]
+        encoded = msg
+        if killswitch.get_disabled('plugins.eddn.send').disabled:
+            should_return: bool
+            new_data: dict[str, Any]
 
-        should_return, new_data = killswitch.check_killswitch('plugins.eddn.send', json.loads(msg))
-        if should_return:
-            logger.warning('eddn.send has been disabled via killswitch. Returning.')
-            return False
+            should_return, new_data = killswitch.check_killswitch('plugins.eddn.send', self.decode(msg))
+            if should_return:
+                logger.warning('eddn.send has been disabled via killswitch. Returning.')
+                return False
+
+            schema_ref = new_data.get('$schemaRef', 'Unset $schemaRef!')
+            encoded, _ = text.gzip(json_codec.dumps_bytes(new_data), max_size=0)
 
-        # Even the smallest possible message compresses somewhat, so always compress
-        encoded, compressed = text.gzip(json.dumps(new_data, separators=(',', ':')), max_size=0)
-        headers: dict[str, str] | None = None
-        if compressed:
-            headers = {'Content-Encoding': 'gzip'}
+        # Even the smallest possible message compresses somewhat, so it's always compressed
+        headers = {'Content-Encoding': 'gzip'}
 
         try:
             r = self.session.post(self.eddn_endpoint, data=encoded, timeout=self.TIMEOUT, headers=headers)
@@ -403,12 +752,12 @@ class EDDNSender:
 
             if r.status_code == http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE:
                 extra_data = {
-                    'schema_ref': new_data.get('$schemaRef', 'Unset $schemaRef!'),
+                    'schema_ref': schema_ref,
                     'sent_data_len': str(len(encoded)),
                 }
 
                 if '/journal/' in extra_data['schema_ref']:
-                    extra_data['event'] = new_data.get('message', {}).get('event', 'No Event Set')
+                    extra_data['event'] = self.decode(encoded).get('message', {}).get('event', 'No Event Set')
 
                 self._log_response(r, header_msg='Got "Payload Too Large" while POSTing data', **extra_data)
                 return True
@@ -425,7 +774,7 @@ class EDDNSender:
 
             if e.response.status_code == http.HTTPStatus.BAD_REQUEST:  # type: ignore
                 # EDDN straight up says no, so drop the message
-                logger.debug(f"EDDN responded '400 Bad Request' to the message, dropping:\n{msg!r}")
+                logger.debug(f"EDDN responded '400 Bad Request' to the message, dropping:\n{self.decode(encoded)!r}")
                 return True
 
             # This should catch anything else, e.g. timeouts, gateway errors
@@ -442,89 +791,129 @@ class EDDNSender:
 
         return False
 
-    def queue_check_and_send(self, reschedule: bool = False) -> None:  # noqa: CCR001
+    def delete_messages(self, row_ids: list[int]) -> None:
         """
-        Check if we should be sending queued messages, and send if we should.
+        Delete several queued messages by row id, in a single transaction.
 
-        :param reschedule: Boolean indicating if we should call `after()` again.
+        :param row_ids: ids of the messages to be deleted.
         """
-        logger.trace_if("plugin.eddn.send", "Called")
-        # Mutex in case we're already processing
-        if not self.queue_processing.acquire(blocking=False):
-            logger.trace_if("plugin.eddn.send", "Couldn't obtain mutex")
-            if reschedule:
-                logger.trace_if(
-                    "plugin.eddn.send",
-                    f"Next run scheduled for {self.eddn.REPLAY_PERIOD}ms from now",
-                )
-                self.eddn.parent.after(
-                    self.eddn.REPLAY_PERIOD, self.queue_check_and_send, reschedule
-                )
+        logger.trace_if("plugin.eddn.send", f"Deleting {len(row_ids)} messages")
+        self.store.delete(row_ids)
+        self.store.commit()
 
-            else:
-                logger.trace_if(
-                    "plugin.eddn.send",
-                    "NO next run scheduled (there should be another one already set)",
-                )
+    def replay_batch(self, limit: int) -> tuple[int, bool]:
+        """
+        Send up to `limit` of the oldest queued messages.
 
-            return
-        logger.trace_if("plugin.eddn.send", "Obtained mutex")
-        # Used to indicate if we've rescheduled at the faster rate already.
-        have_rescheduled = False
-        # We send either if docked or 'Delay sending until docked' not set
-        if this.docked or not config.get_int('output') & config.OUT_EDDN_DELAY:
-            logger.trace_if("plugin.eddn.send", "Should send")
-            # We need our own cursor here, in case the semantics of
-            # tk `after()` could allow this to run in the middle of other
-            # database usage.
-            db_cursor = self.db_conn.cursor()
-
-            # Options:
-            #  1. Process every queued message, regardless.
-            #  2. Bail if we get any sort of connection error from EDDN.
-
-            # Every queued message that is for *this* commander.  We do **NOT**
+        All rows are fetched with a single query, and those that are done with,
+        whether successfully sent or to be dropped, are deleted in one
+        transaction at the end.
+
+        :param limit: Maximum number of messages to attempt.
+        :return: Tuple of (number of messages done with, whether the Gateway
+          accepted everything we tried).
+        """
+        try:
+            # Every queued message, regardless of commander.  We do **NOT**
             # check if it's station/not-station, as the control of if a message
             # was even created, versus the Settings > EDDN options, is applied
             # *then*, not at time of sending.
+            rows = self.store.oldest(limit)
+
+        except Exception:
+            logger.exception("DB error querying queued messages")
+            return 0, False
+
+        done: list[int] = []
+        gateway_ok = True
+        for row_id, schema_ref, message in rows:
+            if self.closing:
+                logger.debug('Shutting down, abandoning rest of replay batch')
+                break
+
             try:
-                db_cursor.execute(
-                    """
-                    SELECT id FROM messages
-                    ORDER BY created
-                    LIMIT 1
-                    """
-                )
+                if not self.send_message(schema_ref, message):
+                    #  `False` means "failed to send, but not because the message
+                    #   is bad", i.e. an EDDN Gateway problem.  Thus, in that case
+                    #   we do *NOT* attempt the rest of the batch.
+                    gateway_ok = False
+                    break
 
-            except Exception:
-                logger.exception("DB error querying queued messages")
+            except requests.exceptions.HTTPError as e:
+                logger.warning(f"HTTPError: {str(e)}")
+                gateway_ok = False
+                break
 
-            else:
-                row = db_cursor.fetchone()
-                if row:
-                    row = dict(zip([c[0] for c in db_cursor.description], row))
-                    if self.send_message_by_id(row['id']):
-                        # If `True` was returned then we're done with this message.
-                        #  `False` means "failed to send, but not because the message
-                        #   is bad", i.e. an EDDN Gateway problem.  Thus, in that case
-                        #   we do *NOT* schedule attempting the next message.
-                        # Always re-schedule as this is only a "Don't hammer EDDN" delay
-                        logger.trace_if("plugin.eddn.send", f"Next run scheduled for {self.eddn.REPLAY_DELAY}ms from "
-                                                            "now")
-                        self.eddn.parent.after(self.eddn.REPLAY_DELAY, self.queue_check_and_send, reschedule)
-                        have_rescheduled = True
-
-                db_cursor.close()
+            done.append(row_id)
 
-        else:
+        try:
+            self.delete_messages(done)
+
+        except Exception:
+            logger.exception("DB error deleting sent messages")
+
+        return len(done), gateway_ok
+
+    def queue_check_and_send(self) -> int:
+        """
+        Check if we should be sending queued messages, and send if we should.
+
+        Each run sends a batch of up to `EDDN.REPLAY_BATCH_SIZE` messages. The
+        returned delay is chosen so that the average rate towards the Gateway
+        doesn't exceed the configured `eddn_replay_rate`, and backs off if the
+        Gateway is having problems.
+
+        :return: Delay until the next run should happen [milliseconds].
+        """
+        logger.trace_if("plugin.eddn.send", "Called")
+        # We send either if docked or 'Delay sending until docked' not set
+        if not (this.docked or not config.get_int('output') & config.OUT_EDDN_DELAY):
             logger.trace_if("plugin.eddn.send", "Should NOT send")
+            return self.eddn.REPLAY_PERIOD
+
+        logger.trace_if("plugin.eddn.send", "Should send")
+        self.coalesce_queue()
+        pass_start = time.monotonic()
+        sent, gateway_ok = self.replay_batch(self.eddn.REPLAY_BATCH_SIZE)
+        pass_time = time.monotonic() - pass_start
+        if sent:
+            if self.replay_started is None:
+                self.replay_started = pass_start
+
+            self.replay_sent += sent
+            logger.trace_if("plugin.eddn.send", f"Replayed {sent} messages in {pass_time:.2f}s")
+
+        if not gateway_ok:
+            self.replay_failures += 1
+            return self.replay_backoff()
+
+        self.replay_failures = 0
+        if sent == self.eddn.REPLAY_BATCH_SIZE:
+            # There might be more queued, so keep going, but only as fast as
+            # the rate limit allows.  This is only a "Don't hammer EDDN" delay.
+            return max(self.eddn.REPLAY_DELAY, int((sent / self.replay_rate - pass_time) * 1000))
+
+        self.report_replay_throughput()
+        return self.eddn.REPLAY_PERIOD
+
+    def replay_backoff(self) -> int:
+        """
+        Calculate the delay before retrying after consecutive Gateway failures.
+
+        :return: Delay [milliseconds], doubling per failure up to `EDDN.REPLAY_PERIOD`.
+        """
+        return min(self.eddn.REPLAY_PERIOD, self.eddn.REPLAY_RETRY_DELAY * 2 ** max(0, self.replay_failures - 1))
 
-        self.queue_processing.release()
-        logger.trace_if("plugin.eddn.send", "Mutex released")
-        if reschedule and not have_rescheduled:
-            # Set us up to run again per the configured period
-            logger.trace_if("plugin.eddn.send", f"Next run scheduled for {self.eddn.REPLAY_PERIOD}ms from now")
-            self.eddn.parent.after(self.eddn.REPLAY_PERIOD, self.queue_check_and_send, reschedule)
+    def report_replay_throughput(self) -> None:
+        """Log the throughput of the queue replay that has just finished, if any."""
+        if self.replay_started is None:
+            return
+
+        elapsed = time.monotonic() - self.replay_started
+        rate = self.replay_sent / elapsed if elapsed > 0 else float(self.replay_sent)
+        logger.info(f"Replayed {self.replay_sent} queued messages in {elapsed:.1f}s ({rate:.1f} messages/s)")
+        self.replay_started = None
+        self.replay_sent = 0
 
     def _log_response(
         self,
@@ -583,7 +972,10 @@ class EDDN:
     # FIXME: Change back to `300_000`
     REPLAY_STARTUP_DELAY = 10_000  # Delay during startup before checking queue [milliseconds]
     REPLAY_PERIOD = 300_000  # How often to try (re-)sending the queue, [milliseconds]
-    REPLAY_DELAY = 400  # Roughly two messages per second, accounting for send delays [milliseconds]
+    REPLAY_DELAY = 400  # Minimum delay between replay batches [milliseconds]
+    REPLAY_RETRY_DELAY = 15_000  # Initial backoff after a Gateway failure, doubling up to REPLAY_PERIOD [milliseconds]
+    REPLAY_BATCH_SIZE = 25  # Maximum number of queued messages sent per replay batch
+    REPLAY_RATE = 10  # Default maximum replay rate, override with config `eddn_replay_rate` [messages/second]
     REPLAYFLUSH = 20  # Update log on disk roughly every 10 seconds
     MODULE_RE = re.compile(r'^Hpt_|^Int_|Armour_', re.IGNORECASE)
     CANONICALISE_RE = re.compile(r'\$(.+)_name;')
@@ -599,9 +991,15 @@ class EDDN:
             self.eddn_url = self.DEFAULT_URL
 
         self.sender = EDDNSender(self, self.eddn_url)
+        if self.parent:
+            self.parent.bind_all('<<EDDNStatus>>', self.update_status)
 
         self.fss_signals: list[Mapping[str, Any]] = []
 
+    def update_status(self, event=None) -> None:
+        """Display the sender's latest status text, in the main thread."""
+        self.parent.nametowidget(f".{appname.lower()}.status")['text'] = self.sender.ui_status
+
     def close(self):
         """Close down the EDDN class instance."""
         logger.debug('Closing Sender...')
@@ -1025,9 +1423,8 @@ class EDDN:
                 if 'header' not in msg:
                     msg['header'] = self.standard_header()
 
-                msg_id = self.sender.add_message(cmdr, msg)
                 # 'Station data' is never delayed on construction of message
-                self.sender.send_message_by_id(msg_id)
+                self.sender.add_message(cmdr, msg, send_now=True)
 
         elif config.get_int('output') & config.OUT_EDDN_SEND_NON_STATION:
             # Any data that isn't 'station' is configured to be sent
@@ -1035,11 +1432,10 @@ class EDDN:
             if 'header' not in msg:
                 msg['header'] = self.standard_header()
 
-            msg_id = self.sender.add_message(cmdr, msg)
-            if this.docked or not config.get_int('output') & config.OUT_EDDN_DELAY:
-                # No delay in sending configured, so attempt immediately
-                logger.trace_if("plugin.eddn.send", "Sending 'non-station' message")
-                self.sender.send_message_by_id(msg_id)
+            # If no delay in sending is configured then attempt immediately
+            self.sender.add_message(
+                cmdr, msg, send_now=this.docked or not config.get_int('output') & config.OUT_EDDN_DELAY
+            )
 
     def standard_header(
         self, game_version: str | None = None, game_build: str | None = None
@@ -2351,7 +2747,7 @@ def journal_entry(  # noqa: C901, CCR001
 
     if event_name == 'docked':
         # Trigger a send/retry of pending EDDN messages
-        this.eddn.parent.after(this.eddn.REPLAY_DELAY, this.eddn.sender.queue_check_and_send, False)
+        this.eddn.sender.request_replay()
 
     elif event_name == 'music':
         if entry['MusicTrack'] == 'MainMenu':
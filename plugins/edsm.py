@@ -22,14 +22,16 @@ referenced in this file (or only in any other core plugin), and if so...
 from __future__ import annotations
 
 import json
+import sqlite3
 import threading
 import tkinter as tk
 from datetime import datetime, timedelta, timezone
-from queue import Queue
+from pathlib import Path
+from queue import Empty, Queue
 from threading import Thread
-from time import sleep
+from time import sleep, time
 from tkinter import ttk
-from typing import Any, Literal, Mapping, MutableMapping, cast, Sequence
+from typing import Any, Literal, Mapping, cast, Sequence
 import requests
 import killswitch
 import monitor
@@ -41,6 +43,7 @@ from edmc_data import DEBUG_WEBSERVER_HOST, DEBUG_WEBSERVER_PORT
 from EDMCLogging import get_main_logger
 from ttkHyperlinkLabel import HyperlinkLabel
 from l10n import translations as tr
+from util import json_codec
 from plugins.common_coreutils import (api_keys_label_common, PADX, PADY, BUTTONX, SEPY, BOXY, STATION_UNDOCKED,
                                       show_pwd_var_common, station_link_common, this_format_common,
                                       cmdr_data_initial_common)
@@ -60,12 +63,153 @@ logger = get_main_logger()
 EDSM_POLL = 0.1
 _TIMEOUT = 20
 DISCARDED_EVENTS_SLEEP = 10
+MAX_EVENTS_PER_SEND = 100  # Largest batch of events sent in one API call
+RETRY_DELAY = 10  # Initial delay (seconds) before re-trying a failed send, doubled on each failure
+KILLSWITCH_RECHECK = 60  # How often (seconds) to see if sending has been re-enabled, whilst the killswitch is active
+
+# journal_entry() only reads entry and state, see PLUGINS.md
+journal_entry_readonly = True
 
 # trace-if events
 CMDR_EVENTS = 'plugin.edsm.cmdr-events'
 CMDR_CREDS = 'plugin.edsm.cmdr-credentials'
 
 
+class EDSMOutboxDB:
+    """
+    sqlite3 storage for batches of events waiting to be sent to EDSM.
+
+    Batches survive restarts, and those that fail to send are retried with
+    exponential backoff, up to `MAX_ATTEMPTS` times.  Only the worker thread
+    uses this, so no locking is needed.
+    """
+
+    SQLITE_DB_FILENAME = 'edsm_outbox-v1.db'
+    MAX_ATTEMPTS = 8  # Batches that fail to send this many times are dropped
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Open, and if necessary initialise, the outbox database.
+
+        :param db_path: Path of the database file.
+        """
+        self.db_conn = sqlite3.connect(db_path)
+        try:
+            self.db_conn.execute("PRAGMA journal_mode=WAL")
+            self.db_conn.execute("PRAGMA synchronous=NORMAL")
+            self.db_conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cmdr TEXT NOT NULL,
+                    game_version TEXT NOT NULL,
+                    game_build TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    events TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0
+                )
+            """)
+            self.db_conn.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_cmdr ON outbox (cmdr, game_version, game_build)"
+            )
+            self.db_conn.commit()
+            # Anything already queued is from a previous session
+            self.backlog_id: int = self.db_conn.execute("SELECT IFNULL(MAX(id), 0) FROM outbox").fetchone()[0]
+
+        except Exception:
+            self.db_conn.close()
+            raise
+
+    def add(self, cmdr: str, game_version: str, game_build: str, events: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Add a batch of events to the outbox.
+
+        :param cmdr: The commander the events are for.
+        :param game_version: The game version the events came from.
+        :param game_build: The game build the events came from.
+        :param events: The events.
+        """
+        with self.db_conn:
+            self.db_conn.execute(
+                "INSERT INTO outbox (cmdr, game_version, game_build, count, events) VALUES (?, ?, ?, ?, ?)",
+                (cmdr, game_version, game_build, len(events), json_codec.dumps(events))
+            )
+
+    def next_due(self) -> float | None:
+        """
+        Find when the oldest batch in the outbox is due to be sent.
+
+        :return: The time the oldest batch is due, or None if the outbox is empty.
+        """
+        row = self.db_conn.execute("SELECT next_attempt FROM outbox ORDER BY id LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def next_batch(self, limit: int) -> tuple[list[int], str, str, str, list[Mapping[str, Any]]] | None:
+        """
+        Pack the oldest batch, and any later ones that can be sent with it, into one.
+
+        Batches can only be combined if they're for the same commander and
+        game version, and the total doesn't exceed `limit` events.  A single
+        batch larger than `limit` is returned as is.
+
+        :param limit: Maximum number of events, if combining batches.
+        :return: (ids, cmdr, game_version, game_build, events), or None if the outbox is empty.
+        """
+        oldest = self.db_conn.execute(
+            "SELECT cmdr, game_version, game_build FROM outbox ORDER BY id LIMIT 1"
+        ).fetchone()
+        if oldest is None:
+            return None
+
+        row_ids: list[int] = []
+        events: list[Mapping[str, Any]] = []
+        for row_id, count, data in self.db_conn.execute(
+            "SELECT id, count, events FROM outbox WHERE cmdr = ? AND game_version = ? AND game_build = ? ORDER BY id",
+            oldest
+        ):
+            if events and len(events) + count > limit:
+                break
+
+            row_ids.append(row_id)
+            events.extend(json_codec.loads(data))
+
+        cmdr, game_version, game_build = oldest
+        return row_ids, cmdr, game_version, game_build, events
+
+    def delete(self, row_ids: Sequence[int]) -> None:
+        """
+        Delete batches from the outbox.
+
+        :param row_ids: ids of the batches to delete.
+        """
+        with self.db_conn:
+            self.db_conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in row_ids])
+
+    def failed(self, row_ids: Sequence[int], now: float) -> int:
+        """
+        Record a failed attempt at sending batches, scheduling their retry.
+
+        :param row_ids: ids of the batches that failed to send.
+        :param now: The current time.
+        :return: The number of batches dropped for having failed too often.
+        """
+        with self.db_conn:
+            self.db_conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt = ? + ? * (1 << attempts) WHERE id = ?",
+                [(now, RETRY_DELAY, row_id) for row_id in row_ids]
+            )
+            dropped = self.db_conn.executemany(
+                "DELETE FROM outbox WHERE id = ? AND attempts >= ?",
+                [(row_id, self.MAX_ATTEMPTS) for row_id in row_ids]
+            ).rowcount
+
+        return max(0, dropped)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db_conn.close()
+
+
 class This:
     """Holds module globals."""
 
@@ -81,6 +225,8 @@ class This:
         self.session: requests.Session = requests.Session()
         self.session.headers['User-Agent'] = user_agent
         self.queue: Queue = Queue()		# Items to be sent to EDSM by worker thread
+        self.outbox: EDSMOutboxDB | None = None  # Batches waiting to be sent, only used by worker thread
+        self.rate_limit_reset: float = 0  # Don't send again before this time, as we've used up our rate limit
         self.discarded_events: set[str] = set()  # List discarded events from EDSM
         self.lastlookup: dict[str, Any]  # Result of last system lookup
 
@@ -491,7 +637,7 @@ def credentials(cmdr: str) -> tuple[str, str] | None:
 
 
 def journal_entry(  # noqa: C901, CCR001
-    cmdr: str, is_beta: bool, system: str, station: str, entry: MutableMapping[str, Any], state: Mapping[str, Any]
+    cmdr: str, is_beta: bool, system: str, station: str, entry: Mapping[str, Any], state: Mapping[str, Any]
 ) -> str:
     """
     Handle a new Journal event.
@@ -602,7 +748,7 @@ entry: {entry!r}'''
             '_shipId': state['ShipID'],
         }
 
-        entry.update(transient)
+        entry = {**entry, **transient}
 
         if entry['event'] == 'LoadGame':
             # Synthesise Materials events on LoadGame since we will have missed it
@@ -707,10 +853,17 @@ def process_discarded_events() -> None:
     logger.debug('Got "events to discard" list, commencing queue consumption...')
 
 
-def send_to_edsm(  # noqa: CCR001
-    data: dict[str, Sequence[object]], pending: list[Mapping[str, Any]], closing: bool
-) -> list[Mapping[str, Any]]:
-    """Send data to the EDSM API endpoint and handle the API response."""
+def send_to_edsm(data: dict[str, Sequence[object]], pending: list[Mapping[str, Any]], notify: bool) -> None:
+    """
+    Send data to the EDSM API endpoint and handle the API response.
+
+    Rather than waiting here when we've used up our rate limit, the reset time
+    is recorded in `this.rate_limit_reset` for `send_outbox()` to respect.
+
+    :param data: The POST data.
+    :param pending: The events being sent.
+    :param notify: Whether to update the main window's system status from the response.
+    """
     response = this.session.post(TARGET_URL, data=data, timeout=_TIMEOUT)
     logger.trace_if('plugin.edsm.api', f'API response content: {response.content!r}')
 
@@ -728,14 +881,8 @@ def send_to_edsm(  # noqa: CCR001
     if remaining is not None and reset is not None:
         # Respect rate limits if they exist
         if remaining == 0:
-            # Calculate sleep time until the rate limit reset time
-            reset_time = datetime.utcfromtimestamp(reset)
-            current_time = datetime.utcnow()
-
-            sleep_time = (reset_time - current_time).total_seconds()
-
-            if sleep_time > 0:
-                sleep(sleep_time)
+            this.rate_limit_reset = reset
+            logger.debug(f'Rate limit reached, not sending again for {max(0, reset - time()):.0f}s')
 
     response.raise_for_status()
     reply = response.json()
@@ -761,7 +908,7 @@ def send_to_edsm(  # noqa: CCR001
             logger.warning(f'EDSM API call status not 1XX, 2XX or 5XX: {msg.num}')
 
         for e, r in zip(pending, reply['events']):
-            if not closing and e['event'] in ('StartUp', 'Location', 'FSDJump', 'CarrierJump'):
+            if notify and e['event'] in ('StartUp', 'Location', 'FSDJump', 'CarrierJump'):
                 # Update main window's system status
                 this.lastlookup = r
                 # calls update_status in main thread
@@ -770,8 +917,106 @@ def send_to_edsm(  # noqa: CCR001
             if r['msgnum'] // 100 != 1:
                 logger.warning(f'EDSM event with not-1xx status:\n{r["msgnum"]}\n'
                                f'{r["msg"]}\n{json.dumps(e, separators=(",", ": "))}')
-        pending = []
-    return pending
+
+
+def outbox_wait() -> float | None:
+    """
+    Work out how long until the outbox can next be sent from.
+
+    :return: Seconds until the oldest batch can be sent, or None if there's nothing to send.
+    """
+    if this.outbox is None:
+        return None
+
+    due = this.outbox.next_due()
+    if due is None:
+        return None
+
+    if killswitch.get_disabled('plugins.edsm.worker').disabled:
+        # Nothing can be sent, so only check back occasionally rather than spinning on a batch that's due
+        return KILLSWITCH_RECHECK
+
+    return max(0.0, max(due, this.rate_limit_reset) - time())
+
+
+def send_outbox(closing: bool) -> None:  # noqa: CCR001
+    """
+    Send batches from the outbox, for as long as the rate limit and any retry backoff allow.
+
+    Batches for the same commander are packed together, up to
+    `MAX_EVENTS_PER_SEND` events per API call.  When closing, at most one
+    call is made, anything left over is sent after the next start up.
+
+    :param closing: Whether the worker is closing down.
+    """
+    if this.outbox is None or killswitch.get_disabled('plugins.edsm.worker').disabled:
+        return
+
+    while outbox_wait() == 0:
+        batch = this.outbox.next_batch(MAX_EVENTS_PER_SEND)
+        if batch is None:
+            return
+
+        row_ids, cmdr, game_version, game_build, pending = batch
+        creds = credentials(cmdr)
+        if creds is None:
+            logger.warning(f'No credentials for {cmdr=} any more, discarding {len(pending)} queued events')
+            this.outbox.delete(row_ids)
+            continue
+
+        username, apikey = creds
+        logger.trace_if(CMDR_EVENTS, f'({cmdr=}): Sending {len(pending)} events using {username=} from credentials()')
+
+        data = {
+            'commanderName': username.encode('utf-8'),
+            'apiKey': apikey,
+            'fromSoftware': applongname,
+            'fromSoftwareVersion': str(appversion()),
+            'fromGameVersion': game_version,
+            'fromGameBuild': game_build,
+            'message': json_codec.dumps_bytes(pending),
+        }
+
+        if any(p for p in pending if p['event'] in ('CarrierJump', 'FSDJump', 'Location', 'Docked')):
+            data_elided = data.copy()
+            data_elided['apiKey'] = '<elided>'
+            if isinstance(data_elided['message'], bytes):
+                data_elided['message'] = data_elided['message'].decode('utf-8')
+            if isinstance(data_elided['commanderName'], bytes):
+                data_elided['commanderName'] = data_elided['commanderName'].decode('utf-8')
+            logger.trace_if(
+                'journal.locations',
+                "pending has at least one of ('CarrierJump', 'FSDJump', 'Location', 'Docked')"
+                " Attempting API call with the following events:"
+            )
+            for p in pending:
+                logger.trace_if('journal.locations', f"Event: {p!r}")
+                if p['event'] in 'Location':
+                    logger.trace_if(
+                        'journal.locations',
+                        f'Attempting API call for "Location" event with timestamp: {p["timestamp"]}'
+                    )
+            logger.trace_if(
+                'journal.locations', f'Overall POST data (elided) is:\n{json.dumps(data_elided, indent=2)}'
+            )
+
+        try:
+            # Don't show stale system status from batches left over from a previous session
+            send_to_edsm(data, pending, not closing and row_ids[0] > this.outbox.backlog_id)
+
+        except Exception as e:
+            logger.debug(f'Attempt to send {len(pending)} API events failed', exc_info=e)
+            dropped = this.outbox.failed(row_ids, time())
+            if dropped:
+                logger.warning(f'Dropped {dropped} batches of events that failed to send too many times')
+
+            # LANG: EDSM Plugin - Error connecting to EDSM API
+            plug.show_error(tr.tl("Error: Can't connect to EDSM"))
+            return
+
+        this.outbox.delete(row_ids)
+        if closing:
+            return
 
 
 def worker() -> None:  # noqa: CCR001 C901
@@ -779,7 +1024,8 @@ def worker() -> None:  # noqa: CCR001 C901
     Handle uploading events to EDSM API.
 
     This function is the target function of a thread. It processes events from the queue until the
-    queued item is None, uploading the events to the EDSM API.
+    queued item is None, batching them up in the outbox and uploading them to the EDSM API whenever
+    the rate limit allows.
 
     :return: None
     """
@@ -790,15 +1036,32 @@ def worker() -> None:  # noqa: CCR001 C901
     last_game_version = ""
     last_game_build = ""
 
+    try:
+        this.outbox = EDSMOutboxDB(config.app_dir_path / EDSMOutboxDB.SQLITE_DB_FILENAME)
+
+    except Exception:
+        logger.exception("Couldn't open the EDSM outbox database, nothing will be sent")
+        this.outbox = None
+
     # Process the Discard Queue
     process_discarded_events()
 
+    # Send anything left over from the last session
+    send_outbox(this.shutting_down)
+
     while True:
         if this.shutting_down:
             logger.debug(f'{this.shutting_down=}, so setting closing = True')
             closing = True
 
-        item: tuple[str, str, str, Mapping[str, Any]] | None = this.queue.get()
+        try:
+            # Wake up when the outbox can next be sent from, if not before
+            item: tuple[str, str, str, Mapping[str, Any]] | None = this.queue.get(timeout=outbox_wait())
+
+        except Empty:
+            send_outbox(closing)
+            continue
+
         if item:
             (cmdr, game_version, game_build, entry) = item
             logger.trace_if(CMDR_EVENTS, f'De-queued ({cmdr=}, {game_version=}, {game_build=}, {entry["event"]=})')
@@ -865,63 +1128,35 @@ def worker() -> None:  # noqa: CCR001 C901
                                     f'"Location" event in pending passed should_send(), timestamp: {p["timestamp"]}'
                                 )
 
-                    creds = credentials(cmdr)
-                    if creds is None:
+                    if credentials(cmdr) is None:
                         raise ValueError("Unexpected lack of credentials")
 
-                    username, apikey = creds
-                    logger.trace_if(CMDR_EVENTS, f'({cmdr=}, {entry["event"]=}): Using {username=} from credentials()')
-
-                    data = {
-                        'commanderName': username.encode('utf-8'),
-                        'apiKey': apikey,
-                        'fromSoftware': applongname,
-                        'fromSoftwareVersion': str(appversion()),
-                        'fromGameVersion': game_version,
-                        'fromGameBuild': game_build,
-                        'message': json.dumps(pending, ensure_ascii=False).encode('utf-8'),
-                    }
+                    if this.outbox is not None:
+                        this.outbox.add(cmdr, game_version, game_build, pending)
 
-                    if any(p for p in pending if p['event'] in ('CarrierJump', 'FSDJump', 'Location', 'Docked')):
-                        data_elided = data.copy()
-                        data_elided['apiKey'] = '<elided>'
-                        if isinstance(data_elided['message'], bytes):
-                            data_elided['message'] = data_elided['message'].decode('utf-8')
-                        if isinstance(data_elided['commanderName'], bytes):
-                            data_elided['commanderName'] = data_elided['commanderName'].decode('utf-8')
-                        logger.trace_if(
-                            'journal.locations',
-                            "pending has at least one of ('CarrierJump', 'FSDJump', 'Location', 'Docked')"
-                            " Attempting API call with the following events:"
-                        )
-                        for p in pending:
-                            logger.trace_if('journal.locations', f"Event: {p!r}")
-                            if p['event'] in 'Location':
-                                logger.trace_if(
-                                    'journal.locations',
-                                    f'Attempting API call for "Location" event with timestamp: {p["timestamp"]}'
-                                )
-                        logger.trace_if(
-                            'journal.locations', f'Overall POST data (elided) is:\n{json.dumps(data_elided, indent=2)}'
-                        )
-
-                    pending = send_to_edsm(data, pending, closing)
+                    pending = []
 
                 break  # No exception, so assume success
 
             except Exception as e:
-                logger.debug(f'Attempt to send API events: retrying == {retrying}', exc_info=e)
+                logger.debug(f'Attempt to queue API events: retrying == {retrying}', exc_info=e)
                 retrying += 1
 
         else:
             # LANG: EDSM Plugin - Error connecting to EDSM API
             plug.show_error(tr.tl("Error: Can't connect to EDSM"))
+
+        send_outbox(closing)
         if entry['event'].lower() in ('shutdown', 'commander', 'fileheader'):
             # Game shutdown or new login, so we MUST not hang on to pending
             pending = []
             logger.trace_if(CMDR_EVENTS, f'Blanked pending because of event: {entry["event"]}')
         if closing:
             logger.debug('closing, so returning.')
+            if this.outbox is not None:
+                this.outbox.close()
+                this.outbox = None
+
             return
 
         last_game_version = game_version
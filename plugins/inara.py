@@ -22,6 +22,8 @@ referenced in this file (or only in any other core plugin), and if so...
 from __future__ import annotations
 
 import json
+import pathlib
+import sqlite3
 import threading
 import time
 import tkinter as tk
@@ -29,7 +31,7 @@ from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from operator import itemgetter
-from threading import Lock, Thread
+from threading import Lock, RLock, Thread
 from tkinter import ttk
 from typing import Any, Callable, Deque, Mapping, NamedTuple, Sequence, cast, Union
 import requests
@@ -44,6 +46,7 @@ from EDMCLogging import get_main_logger
 from monitor import monitor
 from ttkHyperlinkLabel import HyperlinkLabel
 from l10n import translations as tr
+from util import json_codec
 from plugins.common_coreutils import (api_keys_label_common, PADX, PADY, BUTTONX, SEPY, station_name_setter_common,
                                       show_pwd_var_common, station_link_common, this_format_common)
 
@@ -79,6 +82,192 @@ class Event:
     data: EVENT_DATA
 
 
+class InaraQueueDB:
+    """
+    sqlite3 storage for events waiting to be sent to Inara.
+
+    Events survive restarts, and those that fail to send are retried with
+    exponential backoff, up to `MAX_ATTEMPTS` times.  It's used from both the
+    worker and main threads, so all access is serialised with a lock.
+
+    Events are stored per commander and FID only, API keys are looked up from
+    the config when sending rather than being stored here too.
+    """
+
+    SQLITE_DB_FILENAME = 'inara_queue-v1.db'
+    MAX_ATTEMPTS = 8  # Events that fail to send this many times are dropped
+
+    def __init__(self, db_path: pathlib.Path) -> None:
+        """
+        Open, and if necessary initialise, the queue database.
+
+        :param db_path: Path of the database file.
+        """
+        self.db_lock = Lock()
+        self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
+        try:
+            self.db_conn.execute("PRAGMA journal_mode=WAL")
+            self.db_conn.execute("PRAGMA synchronous=NORMAL")
+            self.db_conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cmdr TEXT,
+                    fid TEXT,
+                    name TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0
+                )
+            """)
+            self.db_conn.execute("CREATE INDEX IF NOT EXISTS events_cmdr ON events (cmdr, fid)")
+            self.db_conn.commit()
+            # Anything already queued is from a previous session
+            self.backlog_id: int = self.db_conn.execute("SELECT IFNULL(MAX(id), 0) FROM events").fetchone()[0]
+
+        except Exception:
+            self.db_conn.close()
+            raise
+
+    def add(self, events: Mapping[Credentials, Sequence[Event]]) -> int:
+        """
+        Add events to the queue, in one transaction.
+
+        :param events: The events to add, per set of credentials.
+        :return: The number of events added.
+        """
+        rows = [
+            (creds.cmdr, creds.fid, event.name, event.timestamp, json_codec.dumps(event.data))
+            for creds, event_list in events.items() for event in event_list
+        ]
+        if not rows:
+            return 0
+
+        with self.db_lock, self.db_conn:
+            self.db_conn.executemany(
+                "INSERT INTO events (cmdr, fid, name, timestamp, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+        return len(rows)
+
+    def due(self, now: float) -> list[tuple[str | None, str | None]]:
+        """
+        Find the commanders whose oldest queued event is due to be sent.
+
+        Only the oldest event is considered so that events are always sent in
+        the order they were queued.
+
+        :param now: The current time.
+        :return: List of (cmdr, fid) tuples with events to send now.
+        """
+        with self.db_lock:
+            # sqlite takes the bare `next_attempt` from the row that has the MIN(id)
+            rows = self.db_conn.execute(
+                "SELECT cmdr, fid, MIN(id), next_attempt FROM events GROUP BY cmdr, fid"
+            ).fetchall()
+
+        return [(cmdr, fid) for cmdr, fid, _, next_attempt in rows if next_attempt <= now]
+
+    def batch(self, cmdr: str | None, fid: str | None, limit: int) -> list[tuple[int, Event]]:
+        """
+        Fetch the oldest queued events for a commander.
+
+        :param cmdr: The commander.
+        :param fid: The commander's FID.
+        :param limit: Maximum number of events to fetch.
+        :return: List of (id, Event) tuples, oldest first.
+        """
+        with self.db_lock:
+            rows = self.db_conn.execute(
+                """
+                SELECT id, name, timestamp, data FROM events
+                WHERE cmdr IS ? AND fid IS ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (cmdr, fid, limit)
+            ).fetchall()
+
+        return [(row_id, Event(name, timestamp, json_codec.loads(data))) for row_id, name, timestamp, data in rows]
+
+    def delete(self, row_ids: Sequence[int]) -> None:
+        """
+        Delete events from the queue.
+
+        :param row_ids: ids of the events to delete.
+        """
+        with self.db_lock, self.db_conn:
+            self.db_conn.executemany("DELETE FROM events WHERE id = ?", [(row_id,) for row_id in row_ids])
+
+    def discard(self, cmdr: str | None, fid: str | None) -> int:
+        """
+        Delete all of a commander's queued events.
+
+        :param cmdr: The commander.
+        :param fid: The commander's FID.
+        :return: The number of events deleted.
+        """
+        with self.db_lock, self.db_conn:
+            return max(0, self.db_conn.execute(
+                "DELETE FROM events WHERE cmdr IS ? AND fid IS ?", (cmdr, fid)
+            ).rowcount)
+
+    def failed(self, row_ids: Sequence[int], now: float) -> int:
+        """
+        Record a failed attempt at sending events, scheduling their retry.
+
+        :param row_ids: ids of the events that failed to send.
+        :param now: The current time.
+        :return: The number of events dropped for having failed too often.
+        """
+        params = [(now, WORKER_WAIT_TIME, row_id) for row_id in row_ids]
+        with self.db_lock, self.db_conn:
+            self.db_conn.executemany(
+                "UPDATE events SET attempts = attempts + 1, next_attempt = ? + ? * (1 << attempts) WHERE id = ?",
+                params
+            )
+            dropped = self.db_conn.executemany(
+                "DELETE FROM events WHERE id = ? AND attempts >= ?",
+                [(row_id, self.MAX_ATTEMPTS) for row_id in row_ids]
+            ).rowcount
+
+        return max(0, dropped)
+
+    def filter(self, creds: Credentials, predicate: Callable[[Event], bool]) -> None:
+        """
+        Remove the queued events for a set of credentials that don't satisfy a predicate.
+
+        :param creds: The credentials.
+        :param predicate: Events for which this is False are removed.
+        """
+        with self.db_lock:
+            rows = self.db_conn.execute(
+                "SELECT id, name, timestamp, data FROM events WHERE cmdr IS ? AND fid IS ?",
+                (creds.cmdr, creds.fid)
+            ).fetchall()
+
+        self.delete([
+            row_id for row_id, name, timestamp, data in rows
+            if not predicate(Event(name, timestamp, json_codec.loads(data)))
+        ])
+
+    def summary(self) -> list[tuple[str | None, int, str, int]]:
+        """
+        Summarise the queue per commander.
+
+        :return: List of (cmdr, number of events, oldest event timestamp, most attempts) tuples.
+        """
+        with self.db_lock:
+            return self.db_conn.execute(
+                "SELECT cmdr, COUNT(*), MIN(timestamp), MAX(attempts) FROM events GROUP BY cmdr ORDER BY cmdr"
+            ).fetchall()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self.db_lock:
+            self.db_conn.close()
+
+
 class This:
     """Holds module globals."""
 
@@ -111,6 +300,7 @@ class This:
         self.on_foot = False
 
         self.timer_run = True
+        self.stop_event = threading.Event()  # Wakes the worker up to stop
 
         # Main window clicks
         self.system_link: tk.Widget = None  # type: ignore
@@ -128,14 +318,20 @@ class This:
         self.apikey: nb.EntryMenu
         self.apikey_label: tk.Label
 
+        # Events collected since the worker last moved them into the persistent queue
         self.events: dict[Credentials, Deque[Event]] = defaultdict(deque)
-        self.event_lock: Lock = threading.Lock()  # protects events, for use when rewriting events
+        self.event_lock: RLock = threading.RLock()  # protects events, for use when rewriting events
+        self.event_db: InaraQueueDB | None = None
+        # Filters for the worker to apply to the persistent queue, also protected by event_lock
+        self.queue_filters: list[tuple[Credentials, Callable[[Event], bool]]] = []
 
     def filter_events(self, key: Credentials, predicate: Callable[[Event], bool]) -> None:
         """
         filter_events is the equivalent of running filter() on any event list in the events dict.
 
         it will automatically handle locking, and replacing the event list with the filtered version.
+        Events that are already in the persistent queue, waiting to be sent, are filtered too, by the
+        worker, so the predicate mustn't depend on anything that may have changed by then.
 
         :param key: the key to filter
         :param predicate: the predicate to use while filtering
@@ -144,6 +340,8 @@ class This:
             tmp = self.events[key].copy()
             self.events[key].clear()
             self.events[key].extend(filter(predicate, tmp))
+            if self.event_db is not None:
+                self.queue_filters.append((key, predicate))
 
 
 this = This()
@@ -152,6 +350,8 @@ this = This()
 LAST_UPDATE_CONF_KEY = 'inara_last_update'
 EVENT_COLLECT_TIME = 31  # Minimum time to take collecting events before requesting a send
 WORKER_WAIT_TIME = 35  # Minimum time for worker to wait between sends
+MAX_EVENTS_PER_SEND = 100  # Most events sent in one API request, e.g. when replaying a backlog
+WORKER_STOP_TIMEOUT = 5  # Longest to wait, at shutdown, for the worker to finish a send
 
 
 TARGET_URL = 'https://inara.cz/inapi/v1/'
@@ -201,8 +401,15 @@ def plugin_start3(plugin_dir: str) -> str:
     """
     Start this plugin.
 
-    Start the worker thread to handle sending to Inara API.
+    Open the persistent event queue, and start the worker thread to handle
+    sending to Inara API.
     """
+    try:
+        this.event_db = InaraQueueDB(config.app_dir_path / InaraQueueDB.SQLITE_DB_FILENAME)
+
+    except Exception:
+        logger.exception("Couldn't open the Inara queue database, nothing will be sent")
+
     logger.debug('Starting worker thread...')
     this.thread = Thread(target=new_worker, name='Inara worker')
     this.thread.daemon = True
@@ -223,13 +430,20 @@ def plugin_app(parent: tk.Tk) -> None:
 
 def plugin_stop() -> None:
     """Plugin shutdown hook."""
-    logger.debug('We have no way to ask new_worker to stop, but...')
-    # The Newthis/new_worker doesn't have a method to ask the new_worker to
-    # stop.  We're relying on it being a daemon thread and thus exiting when
-    # there are no non-daemon (i.e. main) threads running.
-
     this.timer_run = False
 
+    logger.debug('Signalling worker to stop...')
+    this.stop_event.set()
+    # Events not yet sent are kept in the persistent queue for next time
+    this.thread.join(WORKER_STOP_TIMEOUT)
+    if this.thread.is_alive():
+        # Stuck in a request, leave the queue open for it, the daemon thread won't hold up exit
+        logger.warning(f'Inara worker still sending after {WORKER_STOP_TIMEOUT}s, not waiting for it')
+
+    elif this.event_db is not None:
+        this.event_db.close()
+        this.event_db = None
+
     logger.debug('Done.')
 
 
@@ -825,12 +1039,11 @@ def journal_entry(  # noqa: C901, CCR001
             loadout = make_loadout(state)
             if this.loadout != loadout:
                 this.loadout = loadout
+                ship_id = loadout['shipGameID']
 
                 this.filter_events(
                     current_credentials,
-                    lambda e: (
-                        e.name != 'setCommanderShipLoadout'
-                        or cast(dict, e.data)['shipGameID'] != cast(dict, this.loadout)['shipGameID'])
+                    lambda e: e.name != 'setCommanderShipLoadout' or cast(dict, e.data)['shipGameID'] != ship_id
                 )
 
                 new_add_event('setCommanderShipLoadout', entry['timestamp'], this.loadout)
@@ -1503,44 +1716,122 @@ def new_worker():
     """
     Handle sending events to the Inara API.
 
-    Will only ever send one message per WORKER_WAIT_TIME, regardless of status.
+    Collected events are moved into the persistent queue, from which each
+    commander's oldest events are sent in batches of up to MAX_EVENTS_PER_SEND.
+    Will only ever send one batch per commander per WORKER_WAIT_TIME, regardless
+    of status.
     """
     logger.debug('Starting...')
     while True:
-        events = get_events()
+        flush_events()
         disabled_killswitch = killswitch.get_disabled("plugins.inara.worker")
         if disabled_killswitch.disabled:
             logger.warning(f"Inara worker disabled via killswitch. ({disabled_killswitch.reason})")
+
+        else:
+            send_queued_events()
+
+        if this.stop_event.wait(WORKER_WAIT_TIME):
+            break
+
+    # Catch anything queued since the last pass
+    flush_events()
+    logger.debug('Done.')
+
+
+def flush_events() -> None:
+    """Filter the persistent queue, and move collected events into it."""
+    if this.event_db is None:
+        return
+
+    with this.event_lock:
+        # Taken along with the events, as filters only apply to events collected before them
+        filters, this.queue_filters = this.queue_filters, []
+        events = get_events()
+
+    for key, predicate in filters:
+        try:
+            this.event_db.filter(key, predicate)
+
+        except Exception:
+            logger.exception('Failed to filter queued events')
+
+    try:
+        added = this.event_db.add(events)
+
+    except Exception:
+        logger.exception('Failed to queue events, they have been lost')
+        return
+
+    if added:
+        logger.trace_if('plugin.inara.events', f'Queued {added} events')
+
+
+def send_queued_events() -> None:
+    """Send a batch of the oldest queued events for each commander with any due."""
+    if this.event_db is None:
+        return
+
+    now = time.time()
+    for cmdr, fid in this.event_db.due(now):
+        if (api_key := credentials(cmdr)) is None:
+            # The API key has since been removed, so these can't be sent
+            discarded = this.event_db.discard(cmdr, fid)
+            logger.warning(f'No Inara API key for {cmdr}, discarded {discarded} queued events')
             continue
 
-        for creds, event_list in events.items():
-            event_list = clean_event_list(event_list)
-            if not event_list:
-                continue
+        creds = Credentials(cmdr, fid, api_key)
+        batch = this.event_db.batch(cmdr, fid, MAX_EVENTS_PER_SEND)
+        row_ids = [row_id for row_id, _ in batch]
+        # Don't show stale location or ship from events left over from a previous session, which always come first
+        backlog = clean_event_list([event for row_id, event in batch if row_id <= this.event_db.backlog_id])
+        event_list = backlog + clean_event_list([event for row_id, event in batch if row_id > this.event_db.backlog_id])
+        if not event_list:
+            this.event_db.delete(row_ids)
+            continue
 
-            event_data = [
-                {'eventName': e.name, 'eventTimestamp': e.timestamp, 'eventData': e.data} for e in event_list
-            ]
+        event_data = [
+            {'eventName': e.name, 'eventTimestamp': e.timestamp, 'eventData': e.data} for e in event_list
+        ]
+
+        data = {
+            'header': {
+                'appName': applongname,
+                'appVersion': str(appversion()),
+                'APIkey': creds.api_key,
+                'commanderName': creds.cmdr,
+                'commanderFrontierID': creds.fid,
+            },
+            'events': event_data
+        }
 
-            data = {
-                'header': {
-                    'appName': applongname,
-                    'appVersion': str(appversion()),
-                    'APIkey': creds.api_key,
-                    'commanderName': creds.cmdr,
-                    'commanderFrontierID': creds.fid,
-                },
-                'events': event_data
-            }
+        logger.info(f'Sending {len(event_data)} events for {creds.cmdr}')
+        logger.trace_if('plugin.inara.events', f'Events:\n{json.dumps(data)}\n')
 
-            logger.info(f'Sending {len(event_data)} events for {creds.cmdr}')
-            logger.trace_if('plugin.inara.events', f'Events:\n{json.dumps(data)}\n')
+        if try_send_data(TARGET_URL, data, replayed=len(backlog)):
+            this.event_db.delete(row_ids)
 
-            try_send_data(TARGET_URL, data)
+        elif dropped := this.event_db.failed(row_ids, now):
+            logger.warning(
+                f'Dropped {dropped} events for {creds.cmdr} after {InaraQueueDB.MAX_ATTEMPTS} failed attempts'
+            )
 
-        time.sleep(WORKER_WAIT_TIME)
 
-    logger.debug('Done.')
+def print_queue_summary() -> None:
+    """Print a summary of the events waiting to be sent to Inara, for the CLI."""
+    event_db = InaraQueueDB(config.app_dir_path / InaraQueueDB.SQLITE_DB_FILENAME)
+    try:
+        summary = event_db.summary()
+
+    finally:
+        event_db.close()
+
+    if not summary:
+        print('No events queued for Inara')
+        return
+
+    for cmdr, count, oldest, attempts in summary:
+        print(f'{cmdr}: {count} events, oldest {oldest}, {attempts} failed attempts')
 
 
 def get_events(clear: bool = True) -> dict[Credentials, list[Event]]:
@@ -1561,41 +1852,49 @@ def get_events(clear: bool = True) -> dict[Credentials, list[Event]]:
     return events_copy
 
 
-def try_send_data(url: str, data: Mapping[str, Any]) -> None:
+def try_send_data(url: str, data: Mapping[str, Any], replayed: int = 0) -> bool:
     """
-    Attempt repeatedly to send the payload.
+    Attempt to send the payload.
+
+    Failures are retried by the worker, with backoff, from the persistent queue.
 
     :param url: target URL for the payload
     :param data: the payload
+    :param replayed: the number of leading events left over from a previous session
+    :return: True if the payload was sent
     """
-    for attempt in range(3):
-        logger.debug(f"Sending data to API, attempt #{attempt + 1}")
-        try:
-            if send_data(url, data):
-                break
+    logger.debug("Sending data to API")
+    try:
+        return send_data(url, data, replayed)
 
-        except Exception as e:
-            logger.debug('Unable to send events', exc_info=e)
-            return
+    except Exception as e:
+        logger.debug('Unable to send events', exc_info=e)
+        return False
 
 
-def send_data(url: str, data: Mapping[str, Any]) -> bool:
+def send_data(url: str, data: Mapping[str, Any], replayed: int = 0) -> bool:
     """
     Send a set of events to the Inara API.
 
     :param url: The target URL to post the data.
     :param data: The data to be POSTed.
+    :param replayed: The number of leading events left over from a previous session.
     :return: True if the data was sent successfully, False otherwise.
     """
-    response = this.session.post(url, data=json.dumps(data, separators=(',', ':')), timeout=_TIMEOUT)
+    response = this.session.post(url, data=json_codec.dumps_bytes(data), timeout=_TIMEOUT)
     response.raise_for_status()
     reply = response.json()
     status = reply['header']['eventStatus']
 
-    if status // 100 != 2:  # 2xx == OK (maybe with warnings)
-        handle_api_error(data, status, reply)
-    else:
-        handle_success_reply(data, reply)
+    try:
+        if status // 100 != 2:  # 2xx == OK (maybe with warnings)
+            handle_api_error(data, status, reply)
+        else:
+            handle_success_reply(data, reply, replayed)
+
+    except Exception:
+        # Inara has the events now, so they mustn't be sent again
+        logger.exception('Failed to handle the Inara reply')
 
     return True  # Regardless of errors above, we DID manage to send it, therefore inform our caller as such
 
@@ -1615,19 +1914,21 @@ def handle_api_error(data: Mapping[str, Any], status: int, reply: dict[str, Any]
     plug.show_error(tr.tl('Error: Inara {MSG}').format(MSG=error_message))
 
 
-def handle_success_reply(data: Mapping[str, Any], reply: dict[str, Any]) -> None:
+def handle_success_reply(data: Mapping[str, Any], reply: dict[str, Any], replayed: int = 0) -> None:
     """
     Handle successful API response.
 
     :param data: The original data that was sent.
     :param reply: The JSON reply from the API.
+    :param replayed: The number of leading events left over from a previous session.
     """
-    for data_event, reply_event in zip(data['events'], reply['events']):
+    for index, (data_event, reply_event) in enumerate(zip(data['events'], reply['events'])):
         reply_status = reply_event['eventStatus']
         reply_text = reply_event.get("eventStatusText", "")
         if reply_status != 200:
             handle_individual_error(data_event, reply_status, reply_text)
-        handle_special_events(data_event, reply_event)
+        if index >= replayed:
+            handle_special_events(data_event, reply_event)
 
 
 def handle_individual_error(data_event: dict[str, Any], reply_status: int, reply_text: str) -> None:
@@ -1664,11 +1965,12 @@ def handle_special_events(data_event: dict[str, Any], reply_event: dict[str, Any
         'setCommanderTravelLocation'
     ):
         this.lastlocation = reply_event.get('eventData', {})
-        if not config.shutting_down:
+        # system_link is None until plugin_app() has been called
+        if not config.shutting_down and this.system_link is not None:
             this.system_link.event_generate('<<InaraLocation>>', when="tail")
     elif data_event['eventName'] in ('addCommanderShip', 'setCommanderShip'):
         this.lastship = reply_event.get('eventData', {})
-        if not config.shutting_down:
+        if not config.shutting_down and this.system_link is not None:
             this.system_link.event_generate('<<InaraShip>>', when="tail")
 
 
@@ -22,7 +22,7 @@ referenced in this file (or only in any other core plugin), and if so...
 from __future__ import annotations
 
 import tkinter as tk
-from typing import Any
+from typing import Any, Mapping
 import requests
 from companion import CAPIData
 from config import appname, config
@@ -32,6 +32,9 @@ from plugins.common_coreutils import (station_link_common, this_format_common,
 
 logger = get_main_logger()
 
+# journal_entry() only reads entry and state, see PLUGINS.md
+journal_entry_readonly = True
+
 
 class This:
     """Holds module globals."""
@@ -80,7 +83,7 @@ def plugin_stop() -> None:
 
 
 def journal_entry(
-    cmdr: str, is_beta: bool, system: str, station: str, entry: dict[str, Any], state: dict[str, Any]
+    cmdr: str, is_beta: bool, system: str, station: str, entry: Mapping[str, Any], state: Mapping[str, Any]
 ) -> str:
     """
     Handle a new Journal event.
@@ -0,0 +1,116 @@
+"""
+Benchmark reading Status.json, as Dashboard.process() does on every poll and watchdog event.
+
+The original, which read, decoded and strptime()d the file every time, is
+compared with the current Dashboard when the file hasn't changed, and when
+it has.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+from calendar import timegm
+from typing import Any, Callable
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+from dashboard import Dashboard  # noqa: E402
+from util import json_codec  # noqa: E402
+
+STATUS = {
+    'timestamp': '2024-01-01T12:34:56Z', 'event': 'Status', 'Flags': 16842765, 'Flags2': 0, 'Pips': [4, 4, 4],
+    'FireGroup': 0, 'GuiFocus': 0, 'Fuel': {'FuelMain': 32.0, 'FuelReservoir': 0.63}, 'Cargo': 0.0,
+    'LegalState': 'Clean', 'Balance': 123456789, 'Destination': {'System': 10477373803, 'Body': 0, 'Name': 'Sol'},
+}
+
+
+class Root:
+    """Stand-in for the Tk root, counting events."""
+
+    def __init__(self) -> None:
+        self.events = 0
+
+    def event_generate(self, *args, **kwargs) -> None:
+        """Count the event."""
+        self.events += 1
+
+
+class OriginalDashboard(Dashboard):
+    """Dashboard.process() as it was."""
+
+    def process(self, logfile: str | None = None) -> None:
+        """Read, decode and compare Status.json every time."""
+        status_json_path = pathlib.Path(self.currentdir) / 'Status.json'
+        with open(status_json_path, 'rb') as h:
+            data = h.read().strip()
+            if data:
+                entry = json_codec.loads(data)
+                entry_timestamp = timegm(time.strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ'))
+                if entry_timestamp >= self.session_start and self.status != entry:
+                    self.status = entry
+                    self.root.event_generate('<<DashboardEvent>>', when="tail")
+
+
+def measure(name: str, func: Callable[[], Any], calls: int, repeat: int) -> None:
+    """
+    Time calls.
+
+    :param name: Name to report.
+    :param func: The call.
+    :param calls: Calls per run.
+    :param repeat: Number of runs to take the median of.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+
+        timings.append(time.perf_counter() - start)
+
+    print(f'{name:>32}: {1e6 * statistics.median(timings) / calls:>8.1f} us/call')
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=2000, help='Calls per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs to take the median of')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        status_path = pathlib.Path(journal_dir) / 'Status.json'
+        status_path.write_text(json.dumps(STATUS))
+        settled = time.time() - 2 * Dashboard.MTIME_SETTLE_SECONDS
+        os.utime(status_path, (settled, settled))  # Else it's read every time, as it might yet change unnoticed
+        dashboards = {'original': OriginalDashboard(), 'current': Dashboard()}
+        for dashboard in dashboards.values():
+            dashboard.root = Root()  # type: ignore
+            dashboard.currentdir = journal_dir
+            dashboard.session_start = 0
+
+        for name, dashboard in dashboards.items():
+            measure(f'{name}, unchanged', dashboard.process, args.calls, args.repeat)
+
+        fuel = iter(range(1_000_000_000))
+
+        def change() -> None:
+            status_path.write_text(json.dumps({**STATUS, 'Fuel': {'FuelMain': next(fuel), 'FuelReservoir': 0.63}}))
+
+        measure('rewriting Status.json', change, args.calls, args.repeat)
+        for name, dashboard in dashboards.items():
+            def change_then_process(dashboard: Dashboard = dashboard) -> None:
+                change()
+                dashboard.process()
+
+            measure(f'{name}, changed (inc. rewrite)', change_then_process, args.calls, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark inserts and deletes on the EDDN queue database, per-row commits versus EDDNQueueDB."""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+from plugins.eddn import EDDNQueueDB  # noqa: E402
+
+MESSAGE = gzip.compress(json.dumps({
+    '$schemaRef': 'https://eddn.edcd.io/schemas/journal/1',
+    'header': {'uploaderID': 'Benchmark', 'softwareName': 'EDMC', 'softwareVersion': '0.0.0'},
+    'message': {'event': 'Scan', 'timestamp': '2024-01-01T00:00:00Z', 'BodyName': 'Sol 3', 'StarSystem': 'Sol'},
+}, separators=(',', ':')).encode())
+SCHEMA_REF = 'https://eddn.edcd.io/schemas/journal/1'
+
+
+def rows(count: int) -> list[tuple[str, str, str, str, str, str, None, bytes]]:
+    """Generate `count` rows of message data."""
+    return [
+        (f'2024-01-01T00:00:{i:08d}Z', 'Benchmark', '0.0.0', '4.0.0.0', '1', SCHEMA_REF, None, MESSAGE)
+        for i in range(count)
+    ]
+
+
+def per_row_commits(db_path: pathlib.Path, data: list) -> tuple[float, float]:
+    """Insert then delete every row, committing each, with the default rollback journal."""
+    store = EDDNQueueDB(db_path)
+    store.close()
+    db_conn = sqlite3.connect(db_path)
+    db_conn.execute("PRAGMA journal_mode=DELETE")
+    db = db_conn.cursor()
+    ids = []
+    start = time.perf_counter()
+    for row in data:
+        db.execute(EDDNQueueDB.SQL_INSERT, row)
+        db_conn.commit()
+        ids.append(db.lastrowid)
+
+    inserts = len(data) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for row_id in ids:
+        db.execute(EDDNQueueDB.SQL_DELETE, (row_id,))
+        db_conn.commit()
+
+    deletes = len(ids) / (time.perf_counter() - start)
+    db_conn.close()
+    return inserts, deletes
+
+
+def queue_db(db_path: pathlib.Path, data: list) -> tuple[float, float]:
+    """Insert then delete every row through EDDNQueueDB, in WAL mode with group commit."""
+    store = EDDNQueueDB(db_path)
+    ids = []
+    start = time.perf_counter()
+    for row in data:
+        ids.append(store.insert(*row))
+        store.commit_if_due()
+
+    store.commit()
+    inserts = len(data) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for row_id in ids:
+        store.delete([row_id])
+        store.commit_if_due()
+
+    store.commit()
+    deletes = len(ids) / (time.perf_counter() - start)
+    store.close()
+    return inserts, deletes
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000, help='Number of queued messages to insert and delete')
+    parser.add_argument('--dir', help='Directory for the database files, default is a temporary directory')
+    args = parser.parse_args()
+
+    data = rows(args.rows)
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        for name, func in (('per-row commit', per_row_commits), ('EDDNQueueDB', queue_db)):
+            inserts, deletes = func(pathlib.Path(tmpdir) / f'{name.replace(" ", "_")}.db', data)
+            print(f'{name:>15}: {inserts:>10.0f} inserts/s {deletes:>10.0f} deletes/s')
+
+
+if __name__ == '__main__':
+    main()
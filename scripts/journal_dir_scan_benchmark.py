@@ -0,0 +1,108 @@
+"""
+Benchmark finding the newest Journal file in a directory of thousands of them.
+
+The original listdir(), regex match and getctime() on every Journal file is
+compared with JournalDirScan listing the directory afresh, listing it again
+once it has changed, and answering from its cache when it hasn't.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import re
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+from monitor import JournalDirScan  # noqa: E402
+
+RE_LOGFILE = re.compile(r'^Journal(Alpha|Beta)?\.[0-9]{2,4}(-)?[0-9]{2}(-)?[0-9]{2}(T)?[0-9]{2}[0-9]{2}[0-9]{2}'
+                        r'\.[0-9]{2}\.log$')
+
+
+def make_journal_dir(journal_dir: pathlib.Path, files: int) -> str:
+    """
+    Create empty Journal files, a quarter with legacy names, plus some other files.
+
+    :param journal_dir: The directory.
+    :param files: Number of Journal files.
+    :return: The name of the newest.
+    """
+    start = time.mktime((2016, 1, 1, 0, 0, 0, 0, 0, 0))
+    name = ''
+    for n in range(files):
+        started = time.localtime(start + n * 3 * 3600)
+        if n < files // 4:
+            name = time.strftime('Journal.%y%m%d%H%M%S.01.log', started)
+
+        else:
+            name = time.strftime('Journal.%Y-%m-%dT%H%M%S.01.log', started)
+
+        (journal_dir / name).touch()
+
+    for other in ('Cargo.json', 'Market.json', 'NavRoute.json', 'Status.json', 'ShipLocker.json'):
+        (journal_dir / other).touch()
+
+    return name
+
+
+def original(journals_dir: str) -> str | None:
+    """Find the newest Journal file as EDLogs.journal_newest_filename() used to."""
+    journal_files = (x for x in os.listdir(journals_dir) if RE_LOGFILE.search(x))
+    journals_dir_path = pathlib.Path(journals_dir)
+    return str(max((journals_dir_path / x for x in journal_files), key=os.path.getctime))
+
+
+def relist(scan: JournalDirScan, journals_dir: str) -> str | None:
+    """Find the newest Journal file as if the directory had changed, with the names already parsed."""
+    scan.mtime_ns = None
+    return scan.newest_filename(journals_dir)
+
+
+def measure(name: str, func: Callable[[], str | None], repeat: int) -> None:
+    """
+    Time repeated calls.
+
+    :param name: Name to report.
+    :param func: The call.
+    :param repeat: Number of calls to take the median of.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    print(f'{name:>24}: {1000 * statistics.median(timings):>10.3f} ms/call')
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=10000, help='Number of Journal files')
+    parser.add_argument('--repeat', type=int, default=20, help='Number of calls to take the median of')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        newest = make_journal_dir(pathlib.Path(journal_dir), args.files)
+        # Make the directory's mtime old enough to be trusted
+        old = time.time() - 60
+        os.utime(journal_dir, (old, old))
+
+        scan = JournalDirScan()
+        assert scan.newest_filename(journal_dir) == str(pathlib.Path(journal_dir) / newest)
+        print(f'{args.files} Journal files')
+        measure('original', lambda: original(journal_dir), args.repeat)
+        measure('JournalDirScan listing', lambda: JournalDirScan().newest_filename(journal_dir), args.repeat)
+        measure('JournalDirScan relisting', lambda: relist(scan, journal_dir), args.repeat)
+        measure('JournalDirScan cached', lambda: scan.newest_filename(journal_dir), args.repeat)
+        print(scan.stats())
+
+
+if __name__ == '__main__':
+    main()
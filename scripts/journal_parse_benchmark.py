@@ -0,0 +1,270 @@
+"""
+Benchmark parsing a whole Journal, reporting lines/s and, optionally, time per event handler.
+
+Both EDLogs.parse_entry() on every line and EDLogs.catch_up(), which skips
+lines for events without a handler, are measured.  With --baseline the
+parse_entry() of monitor.py as it was at a git revision, e.g. the if/elif chain
+from before per-event handlers, is measured too, for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import pathlib
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Iterator
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+from monitor import EDLogs  # noqa: E402
+
+SECONDS_PER_JUMP = 90
+
+
+class BenchmarkEDLogs(EDLogs):
+    """EDLogs that doesn't touch the real Journal checkpoint."""
+
+    def load_checkpoint(self, loghandle) -> bool:
+        """Never restore from a checkpoint."""
+        return False
+
+    def save_checkpoint(self, loghandle) -> None:
+        """Never save a checkpoint."""
+
+
+def synthesise_journal(hours: float, seed: int = 0) -> Iterator[dict[str, Any]]:  # noqa: CCR001
+    """
+    Generate the events of a plausible exploring and trading session.
+
+    :param hours: Length of the session.
+    :param seed: Random seed, so that runs are comparable.
+    :return: Iterator of Journal events, without timestamps.
+    """
+    rng = random.Random(seed)
+    yield {'event': 'Fileheader', 'part': 1, 'language': 'English/UK', 'Odyssey': True,
+           'gameversion': '4.0.0.1904', 'build': 'r304032/r0 '}
+    yield {'event': 'Commander', 'FID': 'F1234567', 'Name': 'Benchmark'}
+    yield {'event': 'Materials', 'Raw': [{'Name': 'iron', 'Count': 20}, {'Name': 'nickel', 'Count': 15}],
+           'Manufactured': [{'Name': 'heatconductionwiring', 'Name_Localised': 'Heat Conduction Wiring', 'Count': 3}],
+           'Encoded': [{'Name': 'shielddensityreports', 'Name_Localised': 'Untypical Shield Scans', 'Count': 7}]}
+    yield {'event': 'Rank', 'Combat': 3, 'Trade': 5, 'Explore': 6, 'Soldier': 0, 'Exobiologist': 1,
+           'Empire': 0, 'Federation': 2, 'CQC': 0}
+    yield {'event': 'Progress', 'Combat': 40, 'Trade': 12, 'Explore': 88, 'Soldier': 0, 'Exobiologist': 5,
+           'Empire': 0, 'Federation': 31, 'CQC': 0}
+    yield {'event': 'Reputation', 'Empire': 10.0, 'Federation': 35.5, 'Alliance': 0.0}
+    yield {'event': 'EngineerProgress', 'Engineers': [
+        {'Engineer': 'Felicity Farseer', 'EngineerID': 300100, 'Progress': 'Unlocked', 'RankProgress': 0, 'Rank': 5},
+        {'Engineer': 'Elvira Martuuk', 'EngineerID': 300160, 'Progress': 'Known'},
+    ]}
+    yield {'event': 'LoadGame', 'FID': 'F1234567', 'Commander': 'Benchmark', 'Horizons': True, 'Odyssey': True,
+           'Ship': 'Krait_MkII', 'Ship_Localised': 'Krait Mk II', 'ShipID': 5, 'ShipName': 'Bench',
+           'ShipIdent': 'BN-01', 'FuelLevel': 32.0, 'FuelCapacity': 32.0, 'GameMode': 'Open',
+           'Credits': 123456789, 'Loan': 0, 'language': 'English/UK', 'gameversion': '4.0.0.1904',
+           'build': 'r304032/r0 '}
+    yield {'event': 'Statistics', 'Bank_Account': {'Current_Wealth': 123456789, 'Spent_On_Ships': 1000},
+           'Exploration': {'Systems_Visited': 1000, 'Total_Hyperspace_Jumps': 2000}}
+    yield {'event': 'Loadout', 'Ship': 'krait_mkii', 'ShipID': 5, 'ShipName': 'Bench', 'ShipIdent': 'BN-01',
+           'HullValue': 42409425, 'ModulesValue': 100000000, 'HullHealth': 1.0, 'UnladenMass': 500.0,
+           'CargoCapacity': 64, 'MaxJumpRange': 30.5, 'FuelCapacity': {'Main': 32.0, 'Reserve': 0.63},
+           'Rebuy': 7000000, 'Modules': [
+               {'Slot': 'FuelTank', 'Item': 'int_fueltank_size5_class3', 'On': True, 'Priority': 1, 'Health': 1.0},
+               {'Slot': 'MediumHardpoint1', 'Item': 'hpt_pulselaser_gimbal_medium', 'On': True, 'Priority': 0,
+                'AmmoInClip': 1, 'AmmoInHopper': 1, 'Health': 1.0},
+               {'Slot': 'FrameShiftDrive', 'Item': 'int_hyperdrive_size5_class5', 'On': True, 'Priority': 0,
+                'Health': 1.0, 'Engineering': {'Engineer': 'Felicity Farseer', 'BlueprintName': 'FSD_LongRange',
+                                               'Level': 5, 'Quality': 1.0, 'Modifiers': []}},
+           ]}
+    yield {'event': 'Cargo', 'Vessel': 'Ship', 'Count': 0, 'Inventory': []}
+    yield {'event': 'Location', 'Docked': False, 'StarSystem': 'Sol', 'SystemAddress': 10477373803,
+           'StarPos': [0.0, 0.0, 0.0], 'Population': 22780919531, 'Body': 'Sol', 'BodyID': 0, 'BodyType': 'Star'}
+
+    for jump in range(int(hours * 3600 / SECONDS_PER_JUMP)):
+        system = f'Benchmark Sector AB-C d{jump}'
+        address = 1000000 + jump
+        yield {'event': 'Music', 'MusicTrack': 'Supercruise'}
+        for _ in range(rng.randint(0, 3)):
+            yield {'event': 'ReceiveText', 'From': '', 'Message': '$COMMS_entered:#name=Someplace;',
+                   'Message_Localised': 'Entered Channel: Someplace', 'Channel': 'npc'}
+
+        yield {'event': 'FSDTarget', 'Name': system, 'SystemAddress': address, 'StarClass': 'K',
+               'RemainingJumpsInRoute': 5}
+        yield {'event': 'StartJump', 'JumpType': 'Hyperspace', 'StarSystem': system, 'SystemAddress': address,
+               'StarClass': 'K'}
+        yield {'event': 'FSDJump', 'StarSystem': system, 'SystemAddress': address,
+               'StarPos': [jump * 1.5, 10.0, -jump * 2.0], 'SystemAllegiance': '', 'SystemEconomy': '$economy_None;',
+               'Population': 0, 'Body': f'{system} A', 'BodyID': 1, 'BodyType': 'Star', 'JumpDist': 28.5,
+               'FuelUsed': 3.2, 'FuelLevel': 28.8}
+        yield {'event': 'Music', 'MusicTrack': 'Exploration'}
+        for n in range(rng.randint(2, 12)):
+            yield {'event': 'FSSSignalDiscovered', 'SystemAddress': address, 'SignalName': f'Signal {n}',
+                   'SignalType': 'Generic', 'IsStation': False}
+
+        yield {'event': 'FSSDiscoveryScan', 'Progress': 0.2, 'BodyCount': 12, 'NonBodyCount': 4,
+               'SystemName': system, 'SystemAddress': address}
+        for body in range(rng.randint(1, 10)):
+            yield {'event': 'Scan', 'ScanType': 'AutoScan', 'BodyName': f'{system} {body}', 'BodyID': body + 2,
+                   'StarSystem': system, 'SystemAddress': address, 'DistanceFromArrivalLS': 123.4 * body,
+                   'TidalLock': False, 'TerraformState': '', 'PlanetClass': 'Icy body', 'Atmosphere': '',
+                   'Volcanism': '', 'MassEM': 0.01, 'Radius': 1234567.0, 'SurfaceGravity': 0.5,
+                   'SurfaceTemperature': 80.0, 'SurfacePressure': 0.0, 'Landable': True,
+                   'Materials': [{'Name': 'iron', 'Percent': 18.5}, {'Name': 'nickel', 'Percent': 14.0}],
+                   'Composition': {'Ice': 0.7, 'Rock': 0.2, 'Metal': 0.1}, 'SemiMajorAxis': 1.0e10,
+                   'Eccentricity': 0.01, 'OrbitalInclination': 0.5, 'Periapsis': 10.0, 'OrbitalPeriod': 1.0e7,
+                   'RotationPeriod': 1.0e5, 'AxialTilt': 0.1, 'WasDiscovered': False, 'WasMapped': False}
+
+        yield {'event': 'FuelScoop', 'Scooped': 3.2, 'Total': 32.0}
+        yield {'event': 'ReservoirReplenished', 'FuelMain': 31.5, 'FuelReservoir': 0.63}
+        if rng.random() < 0.3:
+            yield {'event': 'MaterialCollected', 'Category': 'Raw', 'Name': 'iron', 'Count': 3}
+
+        if jump % 5 == 4:
+            station = f'Benchmark Port {jump}'
+            yield {'event': 'SupercruiseExit', 'StarSystem': system, 'SystemAddress': address,
+                   'Body': station, 'BodyID': 20, 'BodyType': 'Station'}
+            yield {'event': 'Docked', 'StationName': station, 'StationType': 'Coriolis', 'StarSystem': system,
+                   'SystemAddress': address, 'MarketID': 3220000000 + jump,
+                   'StationServices': ['dock', 'autodock', 'commodities', 'refuel', 'repair', 'outfitting'],
+                   'StationEconomies': [{'Name': '$economy_Industrial;', 'Proportion': 1.0}], 'DistFromStarLS': 500.0}
+            yield {'event': 'Music', 'MusicTrack': 'Starport'}
+            yield {'event': 'MarketBuy', 'MarketID': 3220000000 + jump, 'Type': 'gold', 'Count': 10,
+                   'BuyPrice': 9000, 'TotalCost': 90000}
+            yield {'event': 'Cargo', 'Vessel': 'Ship', 'Count': 10, 'Inventory': [{'Name': 'gold', 'Count': 10,
+                                                                                   'Stolen': 0}]}
+            yield {'event': 'MarketSell', 'MarketID': 3220000000 + jump, 'Type': 'gold', 'Count': 10,
+                   'SellPrice': 9500, 'TotalSale': 95000, 'AvgPricePaid': 9000}
+            yield {'event': 'Cargo', 'Vessel': 'Ship', 'Count': 0, 'Inventory': []}
+            yield {'event': 'RefuelAll', 'Cost': 100, 'Amount': 3.2}
+            yield {'event': 'Undocked', 'StationName': station, 'StationType': 'Coriolis',
+                   'MarketID': 3220000000 + jump}
+            yield {'event': 'SupercruiseEntry', 'StarSystem': system, 'SystemAddress': address}
+
+
+def journal_lines(hours: float) -> list[bytes]:
+    """
+    Synthesise a Journal, as the lines read from its file.
+
+    :param hours: Length of the session.
+    :return: Lines, as bytes.
+    """
+    lines = []
+    start = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, 0))
+    for n, event in enumerate(synthesise_journal(hours)):
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(start + n * 5))
+        lines.append(json.dumps({'timestamp': timestamp, **event}, separators=(', ', ':')).encode() + b'\r\n')
+
+    return lines
+
+
+def load_baseline(revision: str, journal_dir: str) -> type[EDLogs]:
+    """
+    Load EDLogs from monitor.py as it was at a git revision.
+
+    :param revision: The git revision.
+    :param journal_dir: Directory to put the old monitor.py in.
+    :return: The old EDLogs class.
+    """
+    path = pathlib.Path(journal_dir) / 'monitor_baseline.py'
+    path.write_bytes(subprocess.run(['git', 'show', f'{revision}:monitor.py'], check=True, capture_output=True).stdout)
+    spec = importlib.util.spec_from_file_location('monitor_baseline', path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.EDLogs
+
+
+def parse(
+    lines: list[bytes], journal_dir: str, profile: bool, edlogs_class: type[EDLogs] = BenchmarkEDLogs
+) -> tuple[float, EDLogs]:
+    """
+    Parse all lines with a fresh EDLogs.
+
+    :param lines: The Journal lines.
+    :param journal_dir: Directory for any companion files.
+    :param profile: Whether to time event handlers.
+    :param edlogs_class: The EDLogs to use, e.g. a baseline one.
+    :return: Seconds taken, and the EDLogs used.
+    """
+    edlogs = edlogs_class()
+    edlogs.currentdir = journal_dir
+    edlogs.catching_up = True
+    if profile:
+        edlogs.enable_handler_timing()
+
+    start = time.perf_counter()
+    for line in lines:
+        edlogs.parse_entry(line)
+
+    return time.perf_counter() - start, edlogs
+
+
+def catch_up(journal: pathlib.Path) -> tuple[float, EDLogs]:
+    """
+    Catch up on a Journal file with a fresh EDLogs.
+
+    :param journal: The Journal file.
+    :return: Seconds taken, and the EDLogs used.
+    """
+    edlogs = BenchmarkEDLogs()
+    edlogs.currentdir = str(journal.parent)
+    with open(journal, 'rb', 0) as loghandle:
+        start = time.perf_counter()
+        edlogs.catch_up(loghandle)
+
+    return time.perf_counter() - start, edlogs
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--journal', help='Journal file to parse, default is to synthesise one')
+    parser.add_argument('--hours', type=float, default=8, help='Length of session to synthesise')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs to take the median of')
+    parser.add_argument('--profile', action='store_true', help='Report time per event handler')
+    parser.add_argument(
+        '--baseline', metavar='REVISION', help="Also measure parse_entry() from this git revision's monitor.py"
+    )
+    args = parser.parse_args()
+
+    if args.journal:
+        lines = pathlib.Path(args.journal).read_bytes().splitlines(keepends=True)
+
+    else:
+        lines = journal_lines(args.hours)
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        timings = [parse(lines, journal_dir, False)[0] for _ in range(args.repeat)]
+        print(f'parse_entry(): {len(lines)} lines, {len(lines) / statistics.median(timings):.0f} lines/s')
+        if args.baseline:
+            baseline = load_baseline(args.baseline, journal_dir)
+            baseline_timings = [parse(lines, journal_dir, False, baseline)[0] for _ in range(args.repeat)]
+            print(
+                f'     baseline: {len(lines)} lines, {len(lines) / statistics.median(baseline_timings):.0f} lines/s'
+                f' at {args.baseline}, {statistics.median(baseline_timings) / statistics.median(timings):.2f}x'
+                ' as long'
+            )
+
+        journal = pathlib.Path(journal_dir) / 'Journal.2024-01-01T000000.01.log'
+        journal.write_bytes(b''.join(lines))
+        results = [catch_up(journal) for _ in range(args.repeat)]
+        edlogs = results[0][1]
+        print(
+            f'   catch_up(): {len(lines)} lines, {len(lines) / statistics.median(r[0] for r in results):.0f} lines/s,'
+            f' {edlogs.catch_up_decoded} decoded, {edlogs.catch_up_skipped} skipped'
+        )
+
+        if args.profile:
+            _, edlogs = parse(lines, journal_dir, True)
+            for event_type, (calls, seconds) in sorted(
+                edlogs.handler_timing.items(), key=lambda item: item[1][1], reverse=True  # type: ignore
+            ):
+                print(f'{event_type:>24}: {calls:>8} calls {1e6 * seconds / calls:>8.1f} us/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark the latency from a line being appended to the Journal to EDLogs dispatching it, watched versus polled."""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+from monitor import EDLogs  # noqa: E402
+from watchdog.observers import Observer  # noqa: E402
+
+JOURNAL_NAME = 'Journal.2024-01-01T000000.01.log'
+
+
+class BenchmarkEDLogs(EDLogs):
+    """EDLogs that always believes the game is running, so it's checking the Journal as often as it ever does."""
+
+    def game_running(self) -> bool:
+        """Pretend the game is running."""
+        return True
+
+
+class Root:
+    """Stand-in for the Tk root, recording when each line was dispatched to the main thread."""
+
+    def __init__(self, edlogs: EDLogs) -> None:
+        self.edlogs = edlogs
+        self.dispatched: dict[int, float] = {}
+        self.event = threading.Event()
+
+    def event_generate(self, *args, **kwargs) -> None:
+        """Drain the queued lines, as get_entry() would."""
+        now = time.perf_counter()
+        while not self.edlogs.event_queue.empty():
+            line = self.edlogs.event_queue.get_nowait()
+            if line and b'"seq":' in line:
+                self.dispatched[int(line.split(b'"seq":')[1].split(b'}')[0])] = now
+
+        self.event.set()
+
+
+def run(journal_dir: pathlib.Path, watch: bool, lines: int, interval: float) -> list[float]:
+    """
+    Append lines to a Journal, returning the append-to-dispatch latency of each.
+
+    :param journal_dir: Directory to create the Journal in.
+    :param watch: Whether to use a watchdog observer, rather than polling.
+    :param lines: Number of lines to append.
+    :param interval: Delay between appending lines.
+    :return: Latencies, in seconds.
+    """
+    logfile = journal_dir / JOURNAL_NAME
+    logfile.write_text('{"timestamp":"2024-01-01T00:00:00Z", "event":"Fileheader", "part":1}\n')
+    (journal_dir / 'NavRoute.json').write_text('{"timestamp":"2024-01-01T00:00:00Z", "event":"NavRoute"}')
+
+    edlogs = BenchmarkEDLogs()
+    root = Root(edlogs)
+    edlogs.root = root  # type: ignore
+    edlogs.currentdir = str(journal_dir)
+    edlogs.logfile = str(logfile)
+    if watch:
+        edlogs.observer = Observer()
+        edlogs.observer.daemon = True
+        edlogs.observer.start()
+        edlogs.observed = edlogs.observer.schedule(edlogs, str(journal_dir))
+
+    edlogs.thread = threading.Thread(target=edlogs.worker, name='Journal worker', daemon=True)
+    edlogs.thread.start()
+    time.sleep(1)  # Let it catch up on the Fileheader
+
+    appended: dict[int, float] = {}
+    with open(logfile, 'a', buffering=1) as journal:
+        for seq in range(lines):
+            appended[seq] = time.perf_counter()
+            journal.write(f'{{"timestamp":"2024-01-01T00:00:00Z", "event":"Music", "seq":{seq}}}\n')
+            time.sleep(interval)
+
+    deadline = time.monotonic() + EDLogs._INACTIVE_POLL
+    while len(root.dispatched) < lines and time.monotonic() < deadline:
+        root.event.wait(0.1)
+
+    edlogs.close()
+    return [root.dispatched[seq] - appended[seq] for seq in appended if seq in root.dispatched]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lines', type=int, default=20, help='Number of Journal lines to append')
+    parser.add_argument('--interval', type=float, default=0.25, help='Seconds between appending lines')
+    parser.add_argument('--dir', help='Directory for the Journal files, default is a temporary directory')
+    args = parser.parse_args()
+
+    for name, watch in (('watched', True), ('polled', False)):
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+            latencies = run(pathlib.Path(tmpdir), watch, args.lines, args.interval)
+
+        if not latencies:
+            print(f'{name:>8}: no lines dispatched')
+            continue
+
+        latencies_ms = sorted(1000 * latency for latency in latencies)
+        print(
+            f'{name:>8}: {len(latencies_ms)}/{args.lines} lines, '
+            f'median {statistics.median(latencies_ms):7.1f} ms, '
+            f'max {latencies_ms[-1]:7.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark the JSON codec backends on Journal lines and CAPI payloads."""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+from typing import Any, Callable
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+sys.path.append('scripts')
+from journal_parse_benchmark import journal_lines  # noqa: E402
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def capi_market(commodities: int = 400) -> dict[str, Any]:
+    """
+    Synthesise a CAPI /market response.
+
+    :param commodities: Number of commodities in the market.
+    :return: The response.
+    """
+    return {
+        'id': 3228342528,
+        'name': 'Benchmark Port',
+        'outpostType': 'starport',
+        'imported': ['Gold', 'Silver'],
+        'exported': ['Water', 'Biowaste'],
+        'services': {'commodities': 'ok', 'outfitting': 'ok', 'shipyard': 'ok', 'refuel': 'ok'},
+        'commodities': [
+            {
+                'id': 128049152 + n, 'name': f'Commodity{n}', 'legality': '', 'buyPrice': 1000 + n,
+                'sellPrice': 900 + n, 'meanPrice': 950 + n, 'demandBracket': 2, 'stockBracket': 0,
+                'stock': 0, 'demand': 12345 + n, 'statusFlags': [], 'categoryname': 'Metals',
+                'locName': f'Commodity {n}',
+            }
+            for n in range(commodities)
+        ],
+        'prohibited': {'128049212': 'BasicNarcotics'},
+    }
+
+
+def measure(name: str, func: Callable[[Any], Any], payloads: list[Any], repeat: int) -> float:
+    """
+    Time a function over all payloads.
+
+    :param name: Name to report.
+    :param func: The function.
+    :param payloads: Its arguments.
+    :param repeat: Number of runs to take the best of.
+    :return: Best items per second.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            func(payload)
+
+        best = min(best, time.perf_counter() - start)
+
+    rate = len(payloads) / best
+    print(f'{name:>32}: {rate:>12.0f} /s')
+    return rate
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--journal', help='Journal file to use, default is to synthesise one')
+    parser.add_argument('--capi', help='CAPI response JSON file to use, default is to synthesise a /market one')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs to take the best of')
+    args = parser.parse_args()
+
+    if args.journal:
+        lines = pathlib.Path(args.journal).read_bytes().splitlines(keepends=True)
+
+    else:
+        lines = journal_lines(8)
+
+    if args.capi:
+        capi = [json.loads(pathlib.Path(args.capi).read_bytes())] * 200
+
+    else:
+        capi = [capi_market()] * 200
+
+    entries = [json.loads(line) for line in lines]
+    codecs: list[tuple[str, Callable[[Any], Any], Callable[[Any], Any]]] = [
+        ('json', json.loads, lambda obj: json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')),
+    ]
+    if orjson is not None:
+        codecs.append(('orjson', orjson.loads, orjson.dumps))
+
+    else:
+        print('orjson is not installed, only measuring the stdlib json')
+
+    capi_encoded = [json.dumps(payload).encode('utf-8') for payload in capi]
+    for name, loads, dumps in codecs:
+        measure(f'{name} loads Journal lines', loads, lines, args.repeat)
+        measure(f'{name} dumps Journal entries', dumps, entries, args.repeat)
+        measure(f'{name} loads CAPI', loads, capi_encoded, args.repeat)
+        measure(f'{name} dumps CAPI', dumps, capi, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark the cost of dispatching Journal events to plugins' journal_entry().
+
+Plugins that are passed copies of entry and state are compared with ones that
+set `journal_entry_readonly` and so are passed the shared read-only views, and
+with ones that also declare `journal_events` so are only sent FSDJump.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import types
+from typing import Any, Mapping
+
+# Yes this is gross. No I cant fix it. EDMC doesn't use python modules currently and changing that would be messy.
+sys.path.append('.')
+sys.path.append('scripts')
+import plug  # noqa: E402
+from config import config  # noqa: E402
+from journal_parse_benchmark import BenchmarkEDLogs, journal_lines  # noqa: E402
+
+
+def journal_entry(
+    cmdr: str, is_beta: bool, system: str, station: str, entry: Mapping[str, Any], state: Mapping[str, Any]
+) -> str | None:
+    """Do what most plugins do with most events, i.e. look and return."""
+    if entry['event'] == 'FSDJump' and state['Role']:
+        return 'multicrew'
+
+    return None
+
+
+def make_plugins(count: int, readonly: bool, events: frozenset[str] | None) -> list[plug.Plugin]:
+    """
+    Make some do-nothing plugins.
+
+    :param count: How many.
+    :param readonly: Whether they accept read-only views.
+    :param events: The Journal events they declare, or None for all.
+    :return: The plugins.
+    """
+    plugins = []
+    for n in range(count):
+        plugin = plug.Plugin(f'benchmark{n}', None, None)
+        plugin.module = types.SimpleNamespace(journal_entry=journal_entry)  # type: ignore
+        plugin.journal_entry_readonly = readonly
+        plugin.journal_events = events
+        plugins.append(plugin)
+
+    return plugins
+
+
+def dispatch(entries: list[dict[str, Any]], state: dict[str, Any], repeat: int) -> float:
+    """
+    Dispatch every entry to the currently loaded plugins.
+
+    :param entries: Journal entries.
+    :param state: The `monitor.state` to pass with them.
+    :param repeat: Number of runs to take the median of.
+    :return: Median microseconds per event.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for entry in entries:
+            plug.notify_journal_entry('Benchmark', False, 'Sol', None, entry, state)
+
+        timings.append(time.perf_counter() - start)
+
+    return 1e6 * statistics.median(timings) / len(entries)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hours', type=float, default=1, help='Length of session to synthesise')
+    parser.add_argument('--plugins', type=int, nargs='+', default=[1, 10, 50], help='Numbers of plugins to measure')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs to take the median of')
+    args = parser.parse_args()
+
+    # The synthesised Journal is from the past
+    config.set_skip_timecheck()
+    # Don't log every one of the do-nothing plugins being 'loaded'
+    plug.logger.setLevel(logging.WARNING)
+    edlogs = BenchmarkEDLogs()
+    edlogs.catching_up = True
+    with tempfile.TemporaryDirectory() as journal_dir:
+        edlogs.currentdir = journal_dir
+        entries = [entry for entry in map(edlogs.parse_entry, journal_lines(args.hours)) if entry.get('event')]
+
+    state = edlogs.state
+    print(f'{len(entries)} events, state has {len(state)} keys')
+    for count in args.plugins:
+        results = []
+        for readonly, events in ((False, None), (True, None), (True, frozenset({'FSDJump'}))):
+            plug.PLUGINS[:] = make_plugins(count, readonly, events)
+            plug.journal_event_index.build(plug.PLUGINS)
+            results.append(dispatch(entries, state, args.repeat))
+
+        copies, views, declared = results
+        print(f'{count:>4} plugins: copies {copies:>8.2f} us/event, views {views:>8.2f} us/event,'
+              f' declared {declared:>8.2f} us/event')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Tests of reading Status.json."""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import time
+
+import pytest
+
+import edmc_data
+from dashboard import Dashboard
+
+
+class Root:
+    """Stand-in for the Tk root, counting events."""
+
+    def __init__(self) -> None:
+        self.events = 0
+
+    def event_generate(self, *args, **kwargs) -> None:
+        """Count the event."""
+        self.events += 1
+
+
+def write_status(path: pathlib.Path, mtime: float, **fields) -> None:
+    """Write Status.json, with a given mtime."""
+    path.write_text(json.dumps({'timestamp': '2024-01-01T00:00:00Z', 'event': 'Status', **fields}))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def dashboard(tmp_path: pathlib.Path) -> Dashboard:
+    """Make a Dashboard for Status.json in tmp_path."""
+    dashboard = Dashboard()
+    dashboard.root = Root()  # type: ignore
+    dashboard.currentdir = str(tmp_path)
+    dashboard.session_start = 0
+    return dashboard
+
+
+def test_recent_rewrite_read(dashboard: Dashboard, tmp_path: pathlib.Path) -> None:
+    """A rewrite that leaves the mtime and size as they were is noticed, unless the mtime had settled."""
+    path = tmp_path / 'Status.json'
+    now = time.time()
+    write_status(path, now, Flags=1)
+    dashboard.process()
+    write_status(path, now, Flags=2)  # Within the file system's timestamp granularity
+    dashboard.process()
+    assert dashboard.status['Flags'] == 2
+    reads = dashboard.reads
+
+    settled = now - 2 * Dashboard.MTIME_SETTLE_SECONDS
+    write_status(path, settled, Flags=3)
+    dashboard.process()
+    dashboard.process()
+    assert (dashboard.status['Flags'], dashboard.reads) == (3, reads + 1)
+    assert dashboard.root.events == 3  # type: ignore
+
+
+def test_take_changes_coalesced(dashboard: Dashboard, tmp_path: pathlib.Path) -> None:
+    """Several statuses between takes give one delta, against what was last taken."""
+    path = tmp_path / 'Status.json'
+    write_status(path, 0, Flags=edmc_data.FlagsDocked, Fuel={'FuelMain': 32.0, 'FuelReservoir': 0.63})
+    dashboard.process()
+    dashboard.take_changes()
+
+    # Hardpoints deployed then retracted, and Docked cleared, both before the next take
+    write_status(
+        path, 1, Flags=edmc_data.FlagsDocked | edmc_data.FlagsHardpointsDeployed,
+        Fuel={'FuelMain': 32.0, 'FuelReservoir': 0.63}
+    )
+    dashboard.process()
+    write_status(path, 2, Flags=edmc_data.FlagsLanded)
+    dashboard.process()
+    assert dashboard.root.events == 3  # type: ignore
+
+    status, changed = dashboard.take_changes()
+    assert status['Flags'] == edmc_data.FlagsLanded
+    assert changed == {
+        'Flags': edmc_data.FlagsLanded, 'FlagsOn': {'Landed'}, 'FlagsOff': {'Docked'}, 'Fuel': None
+    }
+    assert dashboard.take_changes()[1] == {}
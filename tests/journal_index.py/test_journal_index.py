@@ -0,0 +1,96 @@
+"""Tests of the Journal index."""
+from __future__ import annotations
+
+import json
+import pathlib
+import threading
+
+import pytest
+
+import journal_index
+from journal_index import JournalIndex
+
+
+def line(event: str, timestamp: str, **fields) -> bytes:
+    """Make a Journal line."""
+    return json.dumps({'timestamp': timestamp, 'event': event, **fields}).encode('utf-8') + b'\n'
+
+
+JUMP = line('FSDJump', '2024-01-01T10:00:00Z', StarSystem='Shinrarta Dezhra', SystemAddress=3932277478106)
+DOCKED = line(
+    'Docked', '2024-01-01T10:05:00Z', StarSystem='Shinrarta Dezhra', StationName='Jameson Memorial',
+    SystemAddress=3932277478106, MarketID=128666762
+)
+MUSIC = line('Music', '2024-01-01T10:06:00Z', MusicTrack='Exploration')
+JUMP2 = line('FSDJump', '2024-01-02T10:00:00Z', StarSystem='Sol', SystemAddress=10477373803)
+
+
+@pytest.fixture
+def index(tmp_path: pathlib.Path):
+    """Make an empty index."""
+    index = JournalIndex(tmp_path / JournalIndex.SQLITE_DB_FILENAME)
+    yield index
+    index.close()
+
+
+def test_incremental(index: JournalIndex, tmp_path: pathlib.Path) -> None:
+    """Only new, complete, lines are indexed."""
+    journal = tmp_path / 'Journal.2024-01-01T100000.01.log'
+    journal.write_bytes(JUMP + DOCKED[:20])
+    assert index.index_file(journal) == 1
+    assert index.index_file(journal) == 0
+
+    journal.write_bytes(JUMP + DOCKED + MUSIC)
+    assert index.index_file(journal) == 2
+    assert index.count() == 3
+
+
+def test_shrunk(index: JournalIndex, tmp_path: pathlib.Path) -> None:
+    """A file that has shrunk is indexed afresh."""
+    journal = tmp_path / 'Journal.2024-01-01T100000.01.log'
+    journal.write_bytes(JUMP + DOCKED)
+    index.index_file(journal)
+    journal.write_bytes(MUSIC)
+    assert index.index_file(journal) == 1
+    assert [entry['event'] for entry in index.events()] == ['Music']
+    assert index.events(text='Shinrarta') == []
+
+
+def test_stop(monkeypatch: pytest.MonkeyPatch, index: JournalIndex, tmp_path: pathlib.Path) -> None:
+    """Indexing a file stops between batches when asked to, and carries on from there next time."""
+    journal = tmp_path / 'Journal.2024-01-01T100000.01.log'
+    journal.write_bytes(JUMP + DOCKED + MUSIC)
+    monkeypatch.setattr(journal_index, 'BATCH_LINES', 1)
+    stop = threading.Event()
+    read_lines = JournalIndex._read_lines
+
+    def read_then_stop(f, offset: int) -> tuple[list[tuple], int]:
+        stop.set()  # As if at shutdown, whilst reading the first batch
+        return read_lines(f, offset)
+
+    monkeypatch.setattr(JournalIndex, '_read_lines', staticmethod(read_then_stop))
+    assert index.index_file(journal, stop) == 1
+    assert index.index_file(journal, stop) == 0
+
+    monkeypatch.setattr(JournalIndex, '_read_lines', staticmethod(read_lines))
+    assert index.index_file(journal) == 2
+    assert [entry['event'] for entry in index.events(newest_first=False)] == ['FSDJump', 'Docked', 'Music']
+
+
+def test_queries(index: JournalIndex, tmp_path: pathlib.Path) -> None:
+    """Events can be found by name, SystemAddress, MarketID, time and the names in them."""
+    (tmp_path / 'Journal.2024-01-01T100000.01.log').write_bytes(JUMP + DOCKED + MUSIC)
+    (tmp_path / 'Journal.2024-01-02T100000.01.log').write_bytes(JUMP2 + b'not json\n')
+    assert index.index_dir(tmp_path) == 4
+
+    assert [entry['StarSystem'] for entry in index.events(event='FSDJump')] == ['Sol', 'Shinrarta Dezhra']
+    assert [e['event'] for e in index.events(system_address=3932277478106, newest_first=False)] == ['FSDJump', 'Docked']
+    assert [entry['event'] for entry in index.events(market_id=128666762)] == ['Docked']
+    assert len(index.events(since='2024-01-01T10:05:00Z', until='2024-01-02T00:00:00Z')) == 2
+    assert len(index.events(limit=1)) == 1
+    assert [entry['event'] for entry in index.events(text='jameson memorial')] == ['Docked']
+    assert index.events(text='Memorial "Jameson') == []
+
+    assert index.last_visit('Jameson Memorial')['event'] == 'Docked'  # type: ignore
+    assert index.last_visit('Sol')['timestamp'] == '2024-01-02T10:00:00Z'  # type: ignore
+    assert index.last_visit('Achenar') is None
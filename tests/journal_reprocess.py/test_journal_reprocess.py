@@ -0,0 +1,70 @@
+"""Tests of reprocessing historical Journal files."""
+from __future__ import annotations
+
+import json
+import pathlib
+from typing import Any, MutableMapping
+
+import pytest
+
+from journal_reprocess import ReprocessStats, reprocess
+
+
+def jumps(entry: MutableMapping[str, Any], state: MutableMapping[str, Any]) -> str | None:
+    """Collect the systems jumped to, from state."""
+    return state['SystemName'] if entry['event'] == 'FSDJump' else None
+
+
+def journal(path: pathlib.Path, systems: list[str]) -> pathlib.Path:
+    """Write a Journal file with a jump to each system."""
+    entries = [{'event': 'Fileheader', 'part': 1, 'language': 'English/UK', 'gameversion': '4.0.0.1904',
+                'build': 'r304032/r0 '}]
+    entries += [{'event': 'FSDJump', 'StarSystem': system, 'SystemAddress': n, 'StarPos': [0, 0, 0]}
+                for n, system in enumerate(systems)]
+    path.write_text(''.join(
+        json.dumps({'timestamp': '2024-01-01T00:00:00Z', **entry}) + '\r\n' for entry in entries
+    ) + 'not json\r\n')
+    return path
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_reprocess(tmp_path: pathlib.Path, jobs: int) -> None:
+    """Results are merged back in file order, whether or not a pool is used."""
+    paths = [journal(tmp_path / f'Journal.2024-01-0{n}T000000.01.log', [f'System {n}-{m}' for m in range(n)])
+             for n in range(1, 4)]
+    stats = ReprocessStats()
+    results = list(reprocess(paths, jumps, jobs, stats))
+
+    assert [result.path for result in results] == paths
+    assert [result.results for result in results] == [
+        ['System 1-0'], ['System 2-0', 'System 2-1'], ['System 3-0', 'System 3-1', 'System 3-2']
+    ]
+    assert stats.jobs == jobs
+    assert stats.files == 3
+    assert stats.failed == 0
+    assert stats.lines == 3 * 2 + 6
+    assert stats.events == {'Fileheader': 3, 'FSDJump': 6}
+
+
+def cargo(entry: MutableMapping[str, Any], state: MutableMapping[str, Any]) -> dict[str, int] | None:
+    """Collect the cargo, from state."""
+    return dict(state['Cargo']) if entry['event'] in ('Cargo', 'CollectCargo') else None
+
+
+def test_companion_files_ignored(tmp_path: pathlib.Path) -> None:
+    """A companion file alongside historical Journals isn't taken to be from then."""
+    (tmp_path / 'Cargo.json').write_text(json.dumps({
+        'timestamp': '2024-06-01T00:00:00Z', 'event': 'Cargo', 'Vessel': 'Ship',
+        'Inventory': [{'Name': 'painite', 'Count': 64, 'Stolen': 0}]
+    }))
+    path = tmp_path / 'Journal.2024-01-01T000000.01.log'
+    path.write_text(''.join(json.dumps({'timestamp': '2024-01-01T00:00:00Z', **entry}) + '\r\n' for entry in [
+        {'event': 'Cargo', 'Vessel': 'Ship', 'Inventory': [{'Name': 'gold', 'Count': 2, 'Stolen': 0}]},
+        {'event': 'CollectCargo', 'Type': 'silver', 'Stolen': False},
+        {'event': 'Cargo', 'Vessel': 'Ship', 'Count': 3},  # Only in Cargo.json, as it was then
+    ]))
+    [result] = reprocess([path], cargo, 1)
+
+    assert result.error is None
+    assert result.results == [{'gold': 2}, {'gold': 2, 'silver': 1}]
+    assert result.events == {'Cargo': 1, 'CollectCargo': 1}
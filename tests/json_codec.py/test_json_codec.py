@@ -0,0 +1,62 @@
+"""Test the JSON codec, with whichever backends are available."""
+from __future__ import annotations
+
+import importlib
+import json
+from types import ModuleType
+from typing import Any, Iterator
+
+import pytest
+
+from util import json_codec
+
+BACKENDS = ['json']
+if importlib.util.find_spec('orjson') is not None:
+    BACKENDS.append('orjson')
+
+
+@pytest.fixture(params=BACKENDS)
+def codec(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[ModuleType]:
+    """Provide the codec module, reloaded to use each available backend."""
+    monkeypatch.setenv('EDMC_JSON_BACKEND', request.param)
+    module = importlib.reload(json_codec)
+    assert module.BACKEND == request.param
+    yield module
+    monkeypatch.undo()
+    importlib.reload(json_codec)
+
+
+@pytest.mark.parametrize(
+    'obj',
+    [
+        {'timestamp': '2024-01-01T00:00:00Z', 'event': 'FSDJump', 'StarPos': [1.5, -2.25, 3.0], 'Population': 0},
+        {'event': 'ReceiveText', 'From': 'Zoë', 'Message': '日本語', 'Nested': {'List': [None, True, False]}},
+        [1, 2**63 - 1, -(2**63)],
+        'just a string',
+    ]
+)
+def test_round_trip(codec: ModuleType, obj: Any) -> None:
+    """Encoding then decoding gives back the same object, and the encoding is compact UTF-8."""
+    assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.loads(codec.dumps_bytes(obj)) == obj
+    assert codec.dumps_bytes(obj) == json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def test_loads_bytes_and_str(codec: ModuleType) -> None:
+    """Journal lines are bytes, with a trailing CRLF."""
+    assert codec.loads(b'{ "timestamp":"2024-01-01T00:00:00Z", "event":"Music" }\r\n')['event'] == 'Music'
+    assert codec.loads(bytearray(b'{"a":1}')) == {'a': 1}
+    assert codec.loads('{"a":1}') == {'a': 1}
+
+
+def test_invalid(codec: ModuleType) -> None:
+    """Invalid JSON raises the stdlib's JSONDecodeError, or a subclass."""
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"event": "Music"')
+
+
+def test_fallback(codec: ModuleType) -> None:
+    """Objects orjson can't encode still get encoded."""
+    obj = {1: 'one', 'big': 2**70}
+    assert codec.loads(codec.dumps(obj)) == {'1': 'one', 'big': 2**70}
+    assert codec.loads(codec.dumps_bytes(obj)) == {'1': 'one', 'big': 2**70}
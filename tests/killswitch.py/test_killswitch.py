@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import copy
+from types import MappingProxyType
+
 import pytest
 import semantic_version
 
@@ -82,6 +84,8 @@ def test_operator_precedence(
         # this is true because delete-action keyerrors, thus causing failsafe
         (['delete-action'], {'a': 1}, {'a': 1}, True),
         (['delete-action'], {'a': 1, 'b': {'c': 2}}, {'b': {}}, False),
+        # read-only views are copied before rules are applied
+        (['delete-action'], MappingProxyType({'a': 1, 'b': {'c': 2}}), {'b': {}}, False),
     ]
 )
 def test_check_multiple(
@@ -0,0 +1,282 @@
+"""Tests of EDLogs.parse_entry()."""
+from __future__ import annotations
+
+import json
+import pathlib
+
+import pytest
+
+import monitor
+from monitor import EDLogs
+
+TIMESTAMP = '2024-01-01T00:00:00Z'
+
+
+@pytest.fixture
+def edlogs(tmp_path: pathlib.Path) -> EDLogs:
+    """EDLogs reading companion files from tmp_path."""
+    edlogs = EDLogs()
+    edlogs.currentdir = str(tmp_path)
+    return edlogs
+
+
+def parse(edlogs: EDLogs, **entry) -> dict:
+    """Parse a Journal line."""
+    return edlogs.parse_entry(json.dumps({'timestamp': TIMESTAMP, **entry}).encode())
+
+
+def test_cargo_entry_is_file_contents(edlogs: EDLogs, tmp_path: pathlib.Path) -> None:
+    """A Cargo event without its Inventory is passed on as the contents of Cargo.json."""
+    cargo = {'timestamp': TIMESTAMP, 'event': 'Cargo', 'Vessel': 'Ship', 'Count': 3,
+             'Inventory': [{'Name': 'gold', 'Count': 3, 'Stolen': 0}]}
+    (tmp_path / 'Cargo.json').write_text(json.dumps(cargo))
+
+    entry = parse(edlogs, event='Cargo', Vessel='Ship', Count=3)
+
+    assert entry == cargo
+    assert edlogs.state['Cargo'] == {'gold': 3}
+
+
+def test_moduleinfo_entry_is_file_contents(edlogs: EDLogs, tmp_path: pathlib.Path) -> None:
+    """A ModuleInfo event is passed on as the contents of ModulesInfo.json."""
+    modules_info = {'timestamp': TIMESTAMP, 'event': 'ModuleInfo',
+                    'Modules': [{'Slot': 'MainEngines', 'Item': 'int_engine_size3_class5', 'Power': 0.5}]}
+    (tmp_path / 'ModulesInfo.json').write_text(json.dumps(modules_info))
+
+    entry = parse(edlogs, event='ModuleInfo')
+
+    assert entry == modules_info
+    assert edlogs.state['ModuleInfo'] == modules_info
+
+
+def test_handler_without_replacement(edlogs: EDLogs) -> None:
+    """An event whose handler returns nothing is passed on as it was."""
+    entry = parse(edlogs, event='Cargo', Vessel='SRV', Count=0, Inventory=[])
+
+    assert entry == {'timestamp': TIMESTAMP, 'event': 'Cargo', 'Vessel': 'SRV', 'Count': 0, 'Inventory': []}
+
+
+# Every event that parse_entry()'s if/elif chain, before per-event handlers, had a branch doing anything for
+HANDLED_EVENTS = {
+    'approachbody', 'backpack', 'backpackchange', 'backpackmaterials', 'bookdropship', 'booktaxi', 'buyammo',
+    'buydrones', 'buyexplorationdata', 'buymicroresources', 'buysuit', 'buytradedata', 'buyweapon', 'canceldropship',
+    'canceltaxi', 'cargo', 'cargotransfer', 'carrierbanktransfer', 'carrierbuy', 'carrierjump', 'changecrewrole',
+    'collectcargo', 'commander', 'communitygoalreward', 'createsuitloadout', 'crewhire', 'deletesuitloadout',
+    'disembark', 'docked', 'dropshipdeploy', 'ejectcargo', 'embark', 'engineercontribution', 'engineercraft',
+    'engineerlegacyconvert', 'engineerprogress', 'fcmaterials', 'fetchremotemodule', 'fileheader', 'friends',
+    'fsdjump', 'joinacrew', 'leavebody', 'loadgame', 'loadout', 'loadoutequipmodule', 'loadoutremovemodule',
+    'location', 'marketbuy', 'marketsell', 'materialcollected', 'materialdiscarded', 'materials', 'materialtrade',
+    'miningrefined', 'missioncompleted', 'modulebuy', 'moduleinfo', 'moduleretrieve', 'modulesell', 'modulesellremote',
+    'modulestore', 'moduleswap', 'multisellexplorationdata', 'music', 'navroute', 'newcommander', 'npccrewpaidwage',
+    'paybounties', 'payfines', 'paylegacyfines', 'powerplay', 'powerplayfasttrack', 'powerplaymerits', 'powerplayrank',
+    'powerplaysalary', 'progress', 'promotion', 'quitacrew', 'rank', 'redeemvoucher', 'refuelall', 'refuelpartial',
+    'renamesuitloadout', 'repair', 'repairall', 'reputation', 'restockvehicle', 'resupply', 'resurrect',
+    'scientificresearch', 'searchandrescue', 'selldrones', 'sellexplorationdata', 'sellmicroresources',
+    'sellorganicdata', 'sellshiponrebuy', 'sellsuit', 'sellweapon', 'setusershipname', 'shiplocker', 'shipyardbuy',
+    'shipyardsell', 'shipyardswap', 'shipyardtransfer', 'statistics', 'suitloadout', 'supercruiseentry',
+    'supercruiseexit', 'switchsuitloadout', 'synthesis', 'technologybroker', 'undocked', 'upgradesuit',
+    'upgradeweapon',
+}
+# Those it only had a `pass` branch for, or, for TradeMicroResources, a branch that never matched
+UNHANDLED_EVENTS = {
+    'carrierdecommission', 'collectitems', 'dropitems', 'missionabandoned', 'scanorganic', 'squadroncreated',
+    'trademicroresources', 'useconsumable',
+}
+
+
+def test_handler_registry() -> None:
+    """Every event the if/elif chain handled has a handler, and nothing else does."""
+    assert set(EDLogs._event_handlers) == HANDLED_EVENTS
+
+
+def test_handler_dispatch(edlogs: EDLogs, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A line for each event reaches its handler, whatever its case, and only handled events do."""
+    called: list[str] = []
+
+    def recorded(event_type: str, handler):
+        def record(self: EDLogs, entry: dict):
+            called.append(event_type)
+            return handler(self, entry)
+
+        return record
+
+    monkeypatch.setattr(EDLogs, '_event_handlers', {
+        event_type: recorded(event_type, handler) for event_type, handler in EDLogs._event_handlers.items()
+    })
+    try:
+        for event_type in sorted(HANDLED_EVENTS | UNHANDLED_EVENTS):
+            # Most handlers then fail on the missing fields, which parse_entry() logs
+            parse(edlogs, event=event_type.upper())
+
+    finally:
+        edlogs.companion_file_waits.close()
+
+    assert called == sorted(HANDLED_EVENTS)
+
+
+def test_companion_file_reads_are_independent(edlogs: EDLogs, tmp_path: pathlib.Path) -> None:
+    """Changing what one Cargo event was passed doesn't affect the next, or state."""
+    cargo = {'timestamp': TIMESTAMP, 'event': 'Cargo', 'Vessel': 'Ship', 'Count': 3,
+             'Inventory': [{'Name': 'gold', 'Count': 3, 'Stolen': 0}]}
+    (tmp_path / 'Cargo.json').write_text(json.dumps(cargo))
+
+    entry = parse(edlogs, event='Cargo', Vessel='Ship', Count=3)
+    entry['Inventory'].clear()
+
+    assert parse(edlogs, event='Cargo', Vessel='Ship', Count=3) == cargo
+    assert edlogs.state['CargoJSON'] == cargo
+
+
+def test_shiplocker_not_stale(edlogs: EDLogs, tmp_path: pathlib.Path) -> None:
+    """A ShipLocker event is never passed on with older contents of ShipLocker.json."""
+    shiplocker = {'timestamp': TIMESTAMP, 'event': 'ShipLocker', 'Items': [{'Name': 'largecapacitypowerregulator',
+                  'OwnerID': 0, 'Count': 1}], 'Components': [], 'Consumables': [], 'Data': []}
+    path = tmp_path / 'ShipLocker.json'
+    path.write_text(json.dumps(shiplocker))
+    assert parse(edlogs, event='ShipLocker') == shiplocker
+
+    path.write_text('{"timestamp": ')  # Partly written
+    entry = parse(edlogs, event='ShipLocker')
+
+    assert entry["event"] is None  # Not passed on with the previous contents
+
+
+class Root:
+    """Stand-in for the Tk root, recording events."""
+
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    def event_generate(self, sequence: str, **kwargs) -> None:
+        """Record the event."""
+        self.events.append(sequence)
+
+
+def test_late_navroute_applied_on_main_thread(edlogs: EDLogs, tmp_path: pathlib.Path) -> None:
+    """A NavRoute.json that turns up late goes into the state when the main thread is told, not per Journal line."""
+    root = Root()
+    edlogs.root = root  # type: ignore
+    navroute = {'timestamp': TIMESTAMP, 'event': 'NavRoute', 'Route': [{'StarSystem': 'Sol'}]}
+    path = tmp_path / 'NavRoute.json'
+    try:
+        assert parse(edlogs, event='NavRoute') == {'timestamp': TIMESTAMP, 'event': 'NavRoute'}
+        path.write_text(json.dumps(navroute))
+        edlogs.companion_file_waits.check(str(path))  # As the watchdog would, on its thread
+        assert root.events == ['<<CompanionFileEvent>>']
+        parse(edlogs, event='Music', MusicTrack='Exploration')
+        assert edlogs.state['NavRoute'] is None
+
+        edlogs.companion_file_event()  # On the main thread
+        assert edlogs.state['NavRoute'] == navroute
+
+    finally:
+        edlogs.companion_file_waits.close()
+
+
+def journal_line(event: str, **fields) -> bytes:
+    """Make a Journal line."""
+    return json.dumps({'timestamp': TIMESTAMP, 'event': event, **fields}).encode() + b'\n'
+
+
+EARLIER = [
+    journal_line('Fileheader', part=1, language='English/UK', Odyssey=True, gameversion='4.0.0.1800', build='r1'),
+    journal_line('Commander', FID='F1234', Name='Jameson'),
+    journal_line(
+        'LoadGame', FID='F1234', Commander='Jameson', Horizons=True, Odyssey=True, Ship='SideWinder', ShipID=1,
+        ShipName='', ShipIdent='', GameMode='Solo', Credits=1000, Loan=0, gameversion='4.0.0.1800', build='r1'
+    ),
+    journal_line('Materials', Raw=[{'Name': 'iron', 'Count': 5}], Manufactured=[], Encoded=[]),
+    journal_line('Cargo', Vessel='Ship', Count=2, Inventory=[{'Name': 'gold', 'Count': 2, 'Stolen': 0}]),
+    journal_line('Friends', Status='Online', Name='Alice'),
+    journal_line('BuySuit', Name='UtilitySuit_Class1', Price=150000, SuitID=1698364934364699, SuitMods=[]),
+    journal_line('Location', StarSystem='Sol', SystemAddress=10477373803, StarPos=[0.0, 0.0, 0.0], Docked=False),
+]
+LATER = [
+    journal_line('MarketBuy', MarketID=1, Type='gold', Count=3, BuyPrice=1, TotalCost=3),
+    journal_line('Friends', Status='Online', Name='Bob'),
+    journal_line('FSDJump', StarSystem='Alpha Centauri', SystemAddress=1, StarPos=[3.0, -0.1, 3.2]),
+]
+
+
+def catch_up(path: pathlib.Path) -> EDLogs:
+    """Catch up on a Journal file."""
+    edlogs = EDLogs()
+    edlogs.currentdir = str(path.parent)
+    with open(path, 'rb') as loghandle:
+        edlogs.catch_up(loghandle)
+
+    return edlogs
+
+
+def checkpointed(edlogs: EDLogs) -> dict:
+    """Everything that's checkpointed, with the type of every value, recursively."""
+    def typed(value):
+        if isinstance(value, dict):
+            return type(value), {typed(k): typed(v) for k, v in value.items()}
+
+        if isinstance(value, (list, tuple, set)):
+            return type(value), [typed(v) for v in value]
+
+        return type(value), value
+
+    return {name: typed(getattr(edlogs, name)) for name in EDLogs._CHECKPOINT_ATTRIBUTES}
+
+
+def replay(lines: list[bytes]) -> EDLogs:
+    """Parse Journal lines, as a catch-up without a checkpoint would."""
+    edlogs = EDLogs()
+    edlogs.catching_up = True
+    for line in lines:
+        edlogs.parse_entry(line)
+
+    edlogs.catching_up = False
+    return edlogs
+
+
+@pytest.fixture
+def journal(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> pathlib.Path:
+    """A Journal file, checkpointed after its EARLIER lines, which LATER lines are then added to."""
+    monkeypatch.setattr(monitor.config, 'app_dir_path', tmp_path)
+    path = tmp_path / 'Journal.2024-01-01T000000.01.log'
+    path.write_bytes(b''.join(EARLIER))
+    catch_up(path)
+    with open(path, 'ab') as h:
+        h.write(b''.join(LATER))
+
+    return path
+
+
+def test_checkpoint_restore(journal: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    """Restoring a checkpoint and parsing the lines since is the same as replaying the whole Journal."""
+    restored = catch_up(journal)
+    assert restored.catch_up_decoded == len(LATER)
+
+    (tmp_path / EDLogs.CHECKPOINT_FILENAME).unlink()
+    replayed = catch_up(journal)
+    assert replayed.catch_up_decoded == len(EARLIER) + len(LATER)
+
+    assert checkpointed(restored) == checkpointed(replayed)
+    assert replayed.state['Friends'] == {'Alice', 'Bob'}
+    assert replayed.state['Cargo'] == {'gold': 5}
+    assert replayed.state['StarPos'] == (3.0, -0.1, 3.2)
+    assert list(replayed.state['Suits']) == [1698364934364699]
+
+
+@pytest.mark.parametrize('change', ['rewritten', 'truncated', 'corrupt'])
+def test_checkpoint_invalid(journal: pathlib.Path, tmp_path: pathlib.Path, change: str) -> None:
+    """A checkpoint for a Journal that has since changed, or that can't be read, is ignored."""
+    if change == 'rewritten':
+        journal.write_bytes(journal.read_bytes().replace(b'"Alice"', b'"Carol"'))
+
+    elif change == 'truncated':
+        journal.write_bytes(b''.join(EARLIER[:3]))
+
+    else:
+        checkpoint = tmp_path / EDLogs.CHECKPOINT_FILENAME
+        checkpoint.write_bytes(checkpoint.read_bytes()[:100])
+
+    edlogs = catch_up(journal)
+
+    lines = journal.read_bytes().splitlines()
+    assert edlogs.catch_up_decoded == len(lines)
+    assert checkpointed(edlogs) == checkpointed(replay(lines))
@@ -0,0 +1,118 @@
+"""Tests of calling plugin hooks."""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import pytest
+
+import plug
+
+
+@pytest.fixture
+def worker_plugin() -> Iterator[tuple[plug.Plugin, threading.Event, list[tuple[Any, ...]]]]:
+    """A plugin with hooks_off_main_thread, whose journal_entry() waits to be released."""
+    release = threading.Event()
+    calls: list[tuple[Any, ...]] = []
+
+    def journal_entry(cmdr, is_beta, system, station, entry, state) -> None:
+        release.wait(5)
+        calls.append((dict(entry), dict(state['Cargo']), list(state['Modules'])))
+
+    plugin = plug.Plugin('worker', None, None)
+    plugin.module = SimpleNamespace(journal_entry=journal_entry)  # type: ignore
+    plugin.worker = plug.PluginWorker(plugin)
+    plug.journal_event_index.build([plugin])
+    yield plugin, release, calls
+
+    release.set()
+    plugin.worker.stop()
+    plug.journal_event_index.build([])
+
+
+def test_worker_gets_snapshot_of_nested_state(worker_plugin) -> None:
+    """Changes the main thread makes to nested state after dispatch aren't seen by a worker."""
+    plugin, release, calls = worker_plugin
+    entry = {'event': 'MarketBuy', 'Type': 'gold', 'Count': 2}
+    state: dict[str, Any] = {'Cargo': defaultdict(int, {'gold': 2}), 'Modules': ['MainEngines']}
+
+    plug.notify_journal_entry('Jameson', False, 'Sol', None, entry, state)
+    # As the following events would, whilst the worker is still to read them
+    entry['Count'] = 99
+    state['Cargo']['gold'] += 5
+    state['Cargo']['silver'] = 1
+    state['Modules'].append('FrameShiftDrive')
+    release.set()
+    plugin.worker.stop()
+
+    assert calls == [({'event': 'MarketBuy', 'Type': 'gold', 'Count': 2}, {'gold': 2}, ['MainEngines'])]
+
+
+def test_worker_gets_copy_of_capi_data() -> None:
+    """Changes the main thread makes to CAPI data after dispatch aren't seen by a worker."""
+    release = threading.Event()
+    calls: list[dict[str, Any]] = []
+
+    def cmdr_data(data, is_beta) -> None:
+        release.wait(5)
+        calls.append(dict(data['commander']))
+
+    plugin = plug.Plugin('worker', None, None)
+    plugin.module = SimpleNamespace(cmdr_data=cmdr_data)  # type: ignore
+    plugin.worker = plug.PluginWorker(plugin)
+    data = plug.companion.CAPIData({'commander': {'name': 'Jameson', 'credits': 100}})
+    try:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(plug, 'PLUGINS', [plugin])
+            plug.notify_capidata(data, False)
+
+        data['commander']['credits'] = 0  # As the main thread would, whilst the worker is still to read it
+
+    finally:
+        release.set()
+        plugin.worker.stop()
+
+    assert calls == [{'name': 'Jameson', 'credits': 100}]
+
+
+def test_save_hook_stats_throttled(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """Slow hooks only prompt a save of the stats every HOOK_STATS_SAVE_INTERVAL, which is never left partial."""
+    monkeypatch.setattr(plug.config, 'app_dir_path', tmp_path)
+    monkeypatch.setattr(plug, 'SLOW_HOOK_SECONDS', 0)
+    monkeypatch.setattr(plug, 'SLOW_HOOK_WARNING_INTERVAL', 0)
+    plugin = plug.Plugin('slow', None, None)
+    monkeypatch.setattr(plug, 'PLUGINS', [plugin])
+    path = tmp_path / plug.HOOK_STATS_FILENAME
+
+    plug.save_hook_stats()
+    path.unlink()
+    for _ in range(3):
+        plug._call_hook(plugin, 'journal_entry', lambda: None)
+
+    assert not path.exists()
+
+    plug.save_hook_stats()  # As at shutdown
+    assert plug.load_hook_stats()['plugins']['slow']['journal_entry']['calls'] == 3  # type: ignore
+    assert [p.name for p in tmp_path.iterdir()] == [plug.HOOK_STATS_FILENAME]
+
+
+def test_dashboard_entry_gets_deep_copy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A plugin changing nested fields of the status it's passed doesn't affect other plugins."""
+    seen: list[list[int]] = []
+
+    def dashboard_entry(cmdr, is_beta, entry) -> None:
+        seen.append(list(entry['Pips']))
+        entry['Pips'][0] = 0
+
+    plugins = [plug.Plugin(name, None, None) for name in ('first', 'second')]
+    for plugin in plugins:
+        plugin.module = SimpleNamespace(dashboard_entry=dashboard_entry)  # type: ignore
+
+    monkeypatch.setattr(plug, 'PLUGINS', plugins)
+    entry = {'event': 'Status', 'Pips': [4, 4, 4]}
+    plug.notify_dashboard_entry('Jameson', False, entry)
+
+    assert seen == [[4, 4, 4], [4, 4, 4]]
+    assert entry['Pips'] == [4, 4, 4]
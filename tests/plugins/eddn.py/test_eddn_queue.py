@@ -0,0 +1,108 @@
+"""Tests of the EDDN queue database."""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sqlite3
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import pytest
+
+with mock.patch.dict(os.environ, EDMC_NO_UI='1'):  # Else importing the plugin needs a Tk root
+    from plugins import eddn
+
+COMMODITY = 'https://eddn.edcd.io/schemas/commodity/3'
+JOURNAL = 'https://eddn.edcd.io/schemas/journal/1'
+
+
+def message(schema_ref: str, timestamp: str, **fields) -> dict[str, Any]:
+    """Make a full EDDN message."""
+    return {
+        '$schemaRef': schema_ref,
+        'header': {'uploaderID': 'Jameson', 'softwareName': 'test', 'softwareVersion': '5.13.0'},
+        'message': {'timestamp': timestamp, **fields},
+    }
+
+
+def test_convert_v1_database(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    """A v1 queue's messages are converted, bar malformed ones, and the v1 database is removed."""
+    monkeypatch.setenv('EDMC_NO_UI', '1')  # No replays
+    monkeypatch.setattr(eddn.config, 'app_dir_path', tmp_path)
+    v1_path = tmp_path / eddn.EDDNSender.SQLITE_DB_FILENAME_V1
+    good = [
+        message(JOURNAL, '2024-01-01T00:00:00Z', event='FSDJump'),
+        message(COMMODITY, '2024-01-01T00:00:02Z', marketId=128666762, commodities=[]),
+    ]
+    with sqlite3.connect(v1_path) as db_conn:
+        db_conn.execute("""
+            CREATE TABLE messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created TEXT NOT NULL,
+                cmdr TEXT NOT NULL,
+                edmc_version TEXT,
+                game_version TEXT,
+                game_build TEXT,
+                message TEXT NOT NULL
+            )
+        """)
+        db_conn.executemany(
+            "INSERT INTO messages (created, cmdr, message) VALUES (?, 'Jameson', ?)",
+            [
+                ('2024-01-01T00:00:00Z', json.dumps(good[0])),
+                ('2024-01-01T00:00:01Z', '{"$schemaRef": '),  # Truncated
+                ('2024-01-01T00:00:01Z', json.dumps({'$schemaRef': JOURNAL})),  # No message
+                ('2024-01-01T00:00:02Z', json.dumps(good[1])),
+            ]
+        )
+
+    db_conn.close()
+    sender = eddn.EDDNSender(SimpleNamespace(REPLAY_RATE=eddn.EDDN.REPLAY_RATE), 'http://localhost')  # type: ignore
+    sender.close()
+
+    store = eddn.EDDNQueueDB(tmp_path / eddn.EDDNSender.SQLITE_DB_FILENAME_V2)
+    try:
+        rows = store.oldest(10)
+
+    finally:
+        store.close()
+
+    assert [eddn.EDDNSender.decode(msg) for _, _, msg in rows] == good
+    assert [schema_ref for _, schema_ref, _ in rows] == [JOURNAL, COMMODITY]
+    assert not v1_path.exists()
+
+
+@pytest.fixture
+def store(tmp_path: pathlib.Path):
+    """Make an empty v2 queue."""
+    store = eddn.EDDNQueueDB(tmp_path / eddn.EDDNSender.SQLITE_DB_FILENAME_V2)
+    yield store
+    store.close()
+
+
+def insert(store: eddn.EDDNQueueDB, created: str, schema_ref: str, market_id: int | None) -> int:
+    """Queue a message."""
+    return store.insert(created, 'Jameson', '5.13.0', '4.0', 'r1', schema_ref, market_id, b'')
+
+
+def test_coalesce_new_markets_only(store: eddn.EDDNQueueDB) -> None:
+    """Only the whole queue, and then markets with newly queued messages, have superseded messages dropped."""
+    insert(store, '2024-01-01T00:00:00Z', COMMODITY, 1)
+    insert(store, '2024-01-01T00:00:01Z', COMMODITY, 1)
+    journal = insert(store, '2024-01-01T00:00:02Z', JOURNAL, None)
+    assert store.delete_superseded() == 1  # As left by a previous run, the whole queue
+    assert store.delete_superseded() == 0
+
+    # Inserted behind the store's back, so it can't know market 2 has new messages
+    for created in ('2024-01-01T00:00:03Z', '2024-01-01T00:00:04Z'):
+        store.db.execute(store.SQL_INSERT, (created, 'Jameson', '', '', '', COMMODITY, 2, b''))
+
+    market_1 = insert(store, '2024-01-01T00:00:05Z', COMMODITY, 1)
+    outfitting = insert(store, '2024-01-01T00:00:06Z', 'https://eddn.edcd.io/schemas/outfitting/2', 1)
+    assert store.delete_superseded() == 1
+    assert store.db.execute(
+        "SELECT id, market_id FROM messages WHERE market_id IS NOT 2 ORDER BY id"
+    ).fetchall() == [(journal, None), (market_1, 1), (outfitting, 1)]
+    assert store.db.execute("SELECT COUNT(*) FROM messages WHERE market_id = 2").fetchone() == (2,)
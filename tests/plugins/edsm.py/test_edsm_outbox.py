@@ -0,0 +1,99 @@
+"""Tests of the persistent EDSM outbox."""
+from __future__ import annotations
+
+import os
+import pathlib
+from unittest import mock
+
+import pytest
+
+with mock.patch.dict(os.environ, EDMC_NO_UI='1'):  # Else importing the plugin needs a Tk root
+    from plugins import edsm
+
+
+def event(timestamp: str, name: str = 'FSDJump') -> dict[str, str]:
+    """Make an EDSM API event."""
+    return {'timestamp': timestamp, 'event': name}
+
+
+@pytest.fixture
+def db_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Path of the outbox database."""
+    return tmp_path / edsm.EDSMOutboxDB.SQLITE_DB_FILENAME
+
+
+@pytest.fixture
+def outbox(db_path: pathlib.Path):
+    """Make an empty outbox."""
+    outbox = edsm.EDSMOutboxDB(db_path)
+    yield outbox
+    outbox.close()
+
+
+def test_next_batch(outbox: edsm.EDSMOutboxDB) -> None:
+    """Batches for the same commander and game version are combined, up to the limit, oldest first."""
+    outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:00Z')])
+    outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:01Z'), event('2024-01-01T00:00:02Z')])
+    outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:03Z')])
+    outbox.add('Other', '4.0', 'r1', [event('2024-01-01T00:00:04Z')])
+
+    batch = outbox.next_batch(3)
+    assert batch is not None
+    row_ids, cmdr, game_version, game_build, events = batch
+    assert (len(row_ids), cmdr, game_version, game_build) == (2, 'Jameson', '4.0', 'r1')
+    assert events == [event('2024-01-01T00:00:00Z'), event('2024-01-01T00:00:01Z'), event('2024-01-01T00:00:02Z')]
+
+
+def test_backoff(outbox: edsm.EDSMOutboxDB) -> None:
+    """The oldest batch isn't due again until a failed send has backed off, doubling each time."""
+    assert outbox.next_due() is None
+    outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:00Z')])
+    batch = outbox.next_batch(edsm.MAX_EVENTS_PER_SEND)
+    assert batch is not None
+    row_ids = batch[0]
+    assert outbox.next_due() == 0
+
+    assert outbox.failed(row_ids, 1000) == 0
+    assert outbox.next_due() == 1000 + edsm.RETRY_DELAY
+    outbox.failed(row_ids, 2000)
+    assert outbox.next_due() == 2000 + 2 * edsm.RETRY_DELAY
+
+
+def test_max_attempts(outbox: edsm.EDSMOutboxDB) -> None:
+    """Batches are dropped after failing to send MAX_ATTEMPTS times, others aren't."""
+    outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:00Z')])
+    batch = outbox.next_batch(edsm.MAX_EVENTS_PER_SEND)
+    assert batch is not None
+    row_ids = batch[0]
+    outbox.add('Other', '4.0', 'r1', [event('2024-01-01T00:00:01Z')])
+    for _ in range(edsm.EDSMOutboxDB.MAX_ATTEMPTS - 1):
+        assert outbox.failed(row_ids, 0) == 0
+
+    assert outbox.failed(row_ids, 0) == 1
+    batch = outbox.next_batch(edsm.MAX_EVENTS_PER_SEND)
+    assert batch is not None
+    assert batch[1:] == ('Other', '4.0', 'r1', [event('2024-01-01T00:00:01Z')])
+
+
+def test_restart(db_path: pathlib.Path) -> None:
+    """Batches, and their backoff, survive a restart, and are then the backlog."""
+    outbox = edsm.EDSMOutboxDB(db_path)
+    assert outbox.backlog_id == 0
+    outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:00Z')])
+    batch = outbox.next_batch(edsm.MAX_EVENTS_PER_SEND)
+    assert batch is not None
+    outbox.failed(batch[0], 1000)
+    outbox.close()
+
+    outbox = edsm.EDSMOutboxDB(db_path)
+    try:
+        assert outbox.next_due() == 1000 + edsm.RETRY_DELAY
+        assert outbox.next_batch(edsm.MAX_EVENTS_PER_SEND) == batch
+        assert outbox.backlog_id == batch[0][-1]
+        outbox.add('Jameson', '4.0', 'r1', [event('2024-01-01T00:00:01Z')])
+        new_batch = outbox.next_batch(edsm.MAX_EVENTS_PER_SEND)
+        assert new_batch is not None
+        assert new_batch[0][-1] > outbox.backlog_id
+
+    finally:
+        outbox.close()
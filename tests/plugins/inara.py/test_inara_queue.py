@@ -0,0 +1,147 @@
+"""Tests of the persistent Inara event queue."""
+from __future__ import annotations
+
+import os
+import pathlib
+from collections import defaultdict, deque
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import pytest
+
+with mock.patch.dict(os.environ, EDMC_NO_UI='1'):  # Else importing the plugin needs a Tk root
+    from plugins import inara
+
+CREDS = inara.Credentials('Jameson', 'F1234', 'key')
+
+
+def location(timestamp: str, system: str) -> inara.Event:
+    """Make a setCommanderTravelLocation event."""
+    return inara.Event('setCommanderTravelLocation', timestamp, {'starsystemName': system})
+
+
+@pytest.fixture
+def db_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Path of the queue database."""
+    return tmp_path / inara.InaraQueueDB.SQLITE_DB_FILENAME
+
+
+@pytest.fixture
+def queue(db_path: pathlib.Path):
+    """Make an empty queue."""
+    queue = inara.InaraQueueDB(db_path)
+    yield queue
+    queue.close()
+
+
+def test_backlog_reply_not_shown(monkeypatch: pytest.MonkeyPatch, db_path: pathlib.Path) -> None:
+    """Replies to a previous session's events don't update the location, and are only sent once, even without UI."""
+    previous = inara.InaraQueueDB(db_path)
+    previous.add({CREDS: [location('2024-01-01T00:00:00Z', 'Sol')]})
+    previous.close()
+    queue = inara.InaraQueueDB(db_path)
+    queue.add({CREDS: [location('2024-01-02T00:00:00Z', 'Achenar')]})
+
+    posted: list[dict[str, Any]] = []
+
+    def post(url: str, data: bytes, timeout: float) -> SimpleNamespace:
+        posted.append(inara.json_codec.loads(data))
+        reply = {
+            'header': {'eventStatus': 200},
+            'events': [
+                {'eventStatus': 200, 'eventData': {'starsystemName': event['eventData']['starsystemName']}}
+                for event in posted[-1]['events']
+            ]
+        }
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: reply)
+
+    monkeypatch.setattr(inara.this, 'event_db', queue)
+    monkeypatch.setattr(inara.this, 'session', SimpleNamespace(post=post))
+    monkeypatch.setattr(inara.this, 'system_link', None)  # plugin_app() not called yet
+    monkeypatch.setattr(inara.this, 'lastlocation', None)
+    monkeypatch.setattr(inara, 'credentials', lambda cmdr: CREDS.api_key)
+    try:
+        inara.send_queued_events()
+        inara.send_queued_events()
+        remaining = queue.summary()
+
+    finally:
+        queue.close()
+
+    assert [[event['eventData'] for event in data['events']] for data in posted] == [
+        [{'starsystemName': 'Sol'}, {'starsystemName': 'Achenar'}]
+    ]
+    assert remaining == []  # Not left to be sent again
+    assert inara.this.lastlocation == {'starsystemName': 'Achenar'}
+
+
+def test_filter_events(monkeypatch: pytest.MonkeyPatch, queue: inara.InaraQueueDB) -> None:
+    """Queued events are filtered by the worker, and events collected after a filter aren't."""
+    monkeypatch.setattr(inara.this, 'event_db', queue)
+    monkeypatch.setattr(inara.this, 'events', defaultdict(deque))
+    monkeypatch.setattr(inara.this, 'queue_filters', [])
+    queue.add({CREDS: [location('2024-01-01T00:00:00Z', 'Sol')]})
+    inara.this.events[CREDS].append(location('2024-01-01T00:00:01Z', 'Alpha Centauri'))
+
+    with mock.patch.object(queue, 'filter', wraps=queue.filter) as db_filter:
+        inara.this.filter_events(CREDS, lambda e: e.name != 'setCommanderTravelLocation')
+        db_filter.assert_not_called()
+
+    inara.this.events[CREDS].append(location('2024-01-01T00:00:02Z', 'Achenar'))
+    inara.flush_events()
+
+    assert [event for _, event in queue.batch(CREDS.cmdr, CREDS.fid, 10)] == [
+        location('2024-01-01T00:00:02Z', 'Achenar')
+    ]
+
+
+def test_backoff(queue: inara.InaraQueueDB) -> None:
+    """A commander's events aren't due again until a failed send has backed off, doubling each time."""
+    queue.add({CREDS: [location('2024-01-01T00:00:00Z', 'Sol')]})
+    row_ids = [row_id for row_id, _ in queue.batch(CREDS.cmdr, CREDS.fid, 10)]
+    assert queue.due(0) == [(CREDS.cmdr, CREDS.fid)]
+
+    assert queue.failed(row_ids, 1000) == 0
+    assert queue.due(1000 + inara.WORKER_WAIT_TIME - 1) == []
+    assert queue.due(1000 + inara.WORKER_WAIT_TIME) == [(CREDS.cmdr, CREDS.fid)]
+
+    queue.failed(row_ids, 2000)
+    assert queue.due(2000 + 2 * inara.WORKER_WAIT_TIME - 1) == []
+    assert queue.due(2000 + 2 * inara.WORKER_WAIT_TIME) == [(CREDS.cmdr, CREDS.fid)]
+
+
+def test_max_attempts(queue: inara.InaraQueueDB) -> None:
+    """Events are dropped after failing to send MAX_ATTEMPTS times, others aren't."""
+    queue.add({CREDS: [location('2024-01-01T00:00:00Z', 'Sol')]})
+    row_ids = [row_id for row_id, _ in queue.batch(CREDS.cmdr, CREDS.fid, 10)]
+    queue.add({CREDS: [location('2024-01-01T00:00:01Z', 'Achenar')]})
+    for _ in range(inara.InaraQueueDB.MAX_ATTEMPTS - 1):
+        assert queue.failed(row_ids, 0) == 0
+
+    assert queue.failed(row_ids, 0) == 1
+    assert [event for _, event in queue.batch(CREDS.cmdr, CREDS.fid, 10)] == [
+        location('2024-01-01T00:00:01Z', 'Achenar')
+    ]
+
+
+def test_restart(db_path: pathlib.Path) -> None:
+    """Queued events, and their backoff, survive a restart, and are then the backlog."""
+    queue = inara.InaraQueueDB(db_path)
+    assert queue.backlog_id == 0
+    queue.add({CREDS: [location('2024-01-01T00:00:00Z', 'Sol'), location('2024-01-01T00:00:01Z', 'Achenar')]})
+    row_ids = [row_id for row_id, _ in queue.batch(CREDS.cmdr, CREDS.fid, 1)]
+    queue.failed(row_ids, 1000)
+    queue.close()
+
+    queue = inara.InaraQueueDB(db_path)
+    try:
+        assert queue.summary() == [(CREDS.cmdr, 2, '2024-01-01T00:00:00Z', 1)]
+        assert queue.due(1000) == []
+        assert [event for _, event in queue.batch(CREDS.cmdr, CREDS.fid, 10)] == [
+            location('2024-01-01T00:00:00Z', 'Sol'), location('2024-01-01T00:00:01Z', 'Achenar')
+        ]
+        assert queue.backlog_id == max(row_id for row_id, _ in queue.batch(CREDS.cmdr, CREDS.fid, 10))
+
+    finally:
+        queue.close()
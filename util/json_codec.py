@@ -0,0 +1,84 @@
+"""
+json_codec.py - JSON encoding and decoding, using a faster backend if available.
+
+Copyright (c) EDCD, All Rights Reserved
+Licensed under the GNU General Public License.
+See LICENSE file.
+
+`orjson` is used if it can be imported, otherwise the stdlib `json`.  Setting
+the environment variable `EDMC_JSON_BACKEND=json` forces the latter.
+
+Encoding is always compact, and UTF-8 rather than ASCII-escaped.  If `orjson`
+can't encode something, e.g. non-str dict keys or a >64-bit int, the stdlib
+is used for that instead.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable
+
+__all__ = ['BACKEND', 'JSONDecodeError', 'dumps', 'dumps_bytes', 'loads']
+
+# Raised by loads() for invalid JSON, whichever the backend.  orjson's is a subclass.
+JSONDecodeError = json.JSONDecodeError
+
+_loads: Callable[[str | bytes | bytearray], Any] = json.loads
+_dumps_bytes: Callable[[Any], bytes] | None = None
+
+BACKEND = 'json'
+if os.getenv('EDMC_JSON_BACKEND', 'orjson') == 'orjson':
+    try:
+        import orjson
+
+    except ImportError:
+        pass
+
+    else:
+        BACKEND = 'orjson'
+        _loads = orjson.loads
+        _dumps_bytes = orjson.dumps
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """
+    Decode JSON.
+
+    :param data: The JSON.
+    :return: The decoded object.
+    """
+    return _loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Encode an object as compact, UTF-8, JSON.
+
+    :param obj: The object.
+    :return: The JSON.
+    """
+    if _dumps_bytes is not None:
+        try:
+            return _dumps_bytes(obj)
+
+        except TypeError:
+            pass
+
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encode an object as compact JSON.
+
+    :param obj: The object.
+    :return: The JSON.
+    """
+    if _dumps_bytes is not None:
+        try:
+            return _dumps_bytes(obj).decode('utf-8')
+
+        except TypeError:
+            pass
+
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)